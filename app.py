@@ -1,322 +1,114 @@
-from datetime import date
+import os
+from typing import Optional
 
-import tabatu as tb
-from flask import redirect, url_for
 from flask_cors import CORS
-from flask_openapi3 import Info, OpenAPI, Tag
-from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlalchemy_utils import database_exists
-
-from model.database import db, init_db
-from model.produto import Produto
-from model.queries import (
-    pegar_formula,
-    pegar_juros,
-    pegar_parametros_produto,
-    pegar_taxas,
-)
-from model.segurado import Matricula, Segurado
-from schemas.cliente import ClienteSchema
-from schemas.error import ErrorSchema
-from schemas.produto import (
-    BeneficioSchema,
-    ListagemProdutosSchema,
-    ParametrosProdutoSchema,
-    PrazoRendaSchema,
-    ProdutoBuscaSchema,
-    ProdutoSchema,
-)
-from schemas.simulacao import (
-    ResultadoSimulacaoSchema,
-    SimulacaoAposentadoriaSchema,
-    SimulacaoPeculioSchema,
-    SimulacaoSchema,
-)
-from src.produtos.aposentadoria import aposentadoria_capitalizado
-from src.produtos.peculio import peculio_capitalizado_fluxo
+from flask_openapi3 import Info, OpenAPI
+
+from comandos import comandos, inicializar_banco
+from model.armazenamento import aplicar_pragmas_engines, configurar_armazenamento
+from model.cache import configurar_sinais_caches
+from model.database import db
+from model.instrumentacao import instrumentar_engines
+from rotas import blueprints
+from rotas.consultas import configurar_consultas
+from rotas.medicao import configurar_medicao
+from rotas.metricas import configurar_metricas
 
 info = Info(title="Sistema Seguros", version="1.0.0")
-app = OpenAPI(__name__, info=info)
-CORS(app)
-
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///db.sqlite3"
-db.init_app(app)
-
-with app.app_context():
-    if not database_exists(db.engine.url):
-        print("Inicializando o banco de dados.")
-        init_db(db)
-
-home_tag = Tag(
-    name="Documentação",
-    description="Seleção de documentação: Swagger, Redoc ou RapiDoc",
-)
-produto_tag = Tag(
-    name="Produto",
-    description="Consulta produtos disponíveis e informações adicionais sobre eles.",
-)
-simular_tag = Tag(
-    name="Simular",
-    description="Realiza simulações para potenciais novos clientes.",
-)
-contratar_tag = Tag(
-    name="Contratar",
-    description="Realiza o cadastro de um novo cliente.",
-)
-
-
-@app.get("/", tags=[home_tag])
-def home():
-    """Redireciona para /openapi, tela que permite a escolha do estilo de documentação."""
-    return redirect("/openapi")
 
 
-@app.get(
-    "/produtos",
-    tags=[produto_tag],
-    responses={"200": ListagemProdutosSchema, "404": ErrorSchema},
-)
-def get_produtos():
-    """Faz a busca por todos os produto cadastrados.
+def create_app(config: Optional[dict] = None) -> OpenAPI:
+    """Cria e configura a aplicação.
 
-    Retorna uma representação da listagem de produtos.
-    """
-    produtos = db.session.execute(db.select(Produto)).scalars()
-
-    result = []
-    for produto in produtos:
-        result.append(
-            {
-                "id": produto.id,
-                "nome": produto.nome,
-                "descricao": produto.descricao,
-            }
-        )
+    A configuração padrão pode ser alterada por variáveis de ambiente com o prefixo FLASK_
+    (por exemplo, FLASK_SQLALCHEMY_DATABASE_URI) e pelo dicionário config, nessa ordem. Os
+    módulos de cálculo (tabatu, numpy e src) são importados apenas quando utilizados pela
+    primeira vez, e não durante a criação da aplicação.
 
-    return ListagemProdutosSchema(result).model_dump(), 200
+    Args:
+        config (dict, optional): Valores que substituem a configuração.
 
-
-@app.get(
-    "/produtos/<int:produto_id>",
-    tags=[produto_tag],
-    responses={"200": ProdutoSchema, "404": ErrorSchema},
-)
-def get_produto(path: ProdutoBuscaSchema):
-    """Faz a busca por um produto específico.
-
-    Retorna uma representação do produtos.
+    Returns:
+        OpenAPI: Aplicação configurada.
     """
-    produto = db.session.execute(
-        db.select(Produto).where(Produto.id == path.produto_id)
-    ).scalar()
-
-    result = {
-        "id": produto.id,
-        "nome": produto.nome,
-        "descricao": produto.descricao,
+    app = OpenAPI(__name__, info=info)
+    CORS(app)
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///db.sqlite3"
+    # Perfil de armazenamento (model.armazenamento.PERFIS): PRAGMAs do SQLite e pools de conexões.
+    app.config["ARMAZENAMENTO_PERFIL"] = "concorrente"
+    # Quando ativo, cria o banco de dados, se necessário, e atualiza as tábuas empacotadas e o
+    # armazém na criação da aplicação. Quando inativo, isso é feito por flask inicializar-banco.
+    app.config["INICIALIZAR_BANCO"] = True
+    # Quando ativo, as simulações atendidas pela tarifa pré-calculada também são feitas pelo
+    # motor completo, e divergências são registradas no log.
+    app.config["TARIFA_VERIFICAR"] = False
+    # Cache-Control das respostas do catálogo de produtos, que também recebem um ETag forte.
+    app.config["CATALOGO_CACHE_CONTROL"] = "public, max-age=60"
+    # Quantidade de itens gravados por transação em /contratar/lote. None usa uma única transação.
+    app.config["CONTRATACAO_TAMANHO_LOTE"] = 10_000
+    # Quantidade de threads que executam os cálculos das rotas da entrada ASGI (asgi.py). Limita
+    # o uso de CPU e de threads, independentemente da quantidade de requisições abertas.
+    app.config["ASSINCRONO_THREADS_CALCULO"] = 4
+    # Fração das requisições em que o tempo de cada fase (consultas, tábuas, idades, VPA) é
+    # medido e registrado no log. 0 desativa a medição.
+    app.config["MEDICAO_AMOSTRAGEM"] = 0.0
+    # Quando ativo, as requisições medidas também recebem os tempos no cabeçalho Server-Timing.
+    app.config["MEDICAO_SERVER_TIMING"] = True
+    # Diretório onde cada processo grava as suas métricas, somadas pela rota /metrics. Deve ser
+    # compartilhado pelos workers e esvaziado antes de iniciá-los, com flask limpar-metricas.
+    app.config["METRICAS_DIRETORIO"] = os.path.join(app.instance_path, "metricas")
+    # Intervalo mínimo, em segundos, entre as gravações das métricas de cada processo.
+    app.config["METRICAS_INTERVALO_GRAVACAO"] = 5.0
+    # Duração, em segundos, a partir da qual as instruções SQL são registradas no log, com os
+    # parâmetros e o plano de execução. None desativa o registro.
+    app.config["CONSULTAS_LIMITE_LENTA"] = 0.1
+    # Quantidade máxima de instruções SQL por requisição de cada rota ("METODO /rota"), no pior
+    # caso, com os caches vazios. Requisições acima do orçamento são registradas no log. A
+    # contratação em lote tem orçamento para uma fatia (CONTRATACAO_TAMANHO_LOTE), e a simulação
+    # em lote não tem, já que as consultas crescem com os produtos e prazos distintos do lote.
+    app.config["CONSULTAS_ORCAMENTO"] = {
+        "GET /produtos": 2,
+        "GET /produtos/<int:produto_id>": 2,
+        "GET /produtos/parametros/<int:produto_id>": 2,
+        "POST /simular": 16,
+        "POST /simular/peculio": 12,
+        "POST /simular/aposentadoria": 12,
+        "POST /simular/curva": 6,
+        "POST /contratar": 5,
+        "POST /contratar/lote": 5,
+        "GET /apolices/<int:apolice_id>/reservas": 8,
     }
-
-    return ProdutoSchema(**result).model_dump(), 200
-
-
-@app.get(
-    "/produtos/parametros/<int:produto_id>",
-    tags=[produto_tag],
-    responses={"200": ParametrosProdutoSchema, "404": ErrorSchema},
-)
-def get_parametros_produto(path: ProdutoBuscaSchema):
-    """Faz a busca pelos parâmetros de um produto específico.
-
-    Retorna os possíveis parâmetros de contratação de um produto específico.
-    """
-    try:
-        beneficio, prazos, prazos_renda = pegar_parametros_produto(db, path.produto_id)
-    except NoResultFound:
-        return (
-            ErrorSchema(
-                mesage=f"Produto {path.produto_id} não encontrado."
-            ).model_dump(),
-            404,
-        )
-
-    prazos = [prazo.prazo for prazo in prazos]
-    prazos_renda = [
-        PrazoRendaSchema(prazo=prazo.prazo, prazo_certo=prazo.prazoCerto)
-        for prazo in prazos_renda
-    ]
-    beneficio = BeneficioSchema(
-        beneficio_minimo=beneficio.beneficioMinimo,
-        beneficio_maximo=beneficio.beneficioMaximo,
-    )
-
-    return (
-        ParametrosProdutoSchema(
-            prazos=prazos, prazos_renda=prazos_renda, beneficio=beneficio
-        ).model_dump(),
-        200,
-    )
-
-
-@app.post(
-    "/contratar",
-    tags=[contratar_tag],
-    responses={"200": ClienteSchema, "409": ErrorSchema, "400": ErrorSchema},
-)
-def add_cliente(form: ClienteSchema):
-    """Adiciona um novo cliente à base de dados
-
-    Retorna as informações do cliente adicionado.
-    """
-    segurado = db.session.query(Segurado).filter_by(cpf=form.cpf).first()
-    print(segurado)
-    if not segurado:
-        segurado = Segurado(
-            cpf=form.cpf,
-            nome=form.nome,
-            email=form.email,
-            sexo=form.sexo,
-            dataNascimento=form.data_nascimento,
-        )
-        db.session.add(segurado)
-
-    cliente = Matricula(
-        cpfSegurado=form.cpf,
-        produtoId=form.produto_id,
-        dataAssinatura=form.data_assinatura,
-        prazo=form.prazo,
-        prazoRenda=form.prazo_renda,
-        prazoCertoRenda=form.prazo_certo_renda,
-        beneficio=form.beneficio,
-    )
-    try:
-        db.session.add(cliente)
-        db.session.commit()
-        return form.model_dump(), 200
-
-    except IntegrityError:
-        return ErrorSchema(message="Cliente já existe na base.").model_dump(), 409
-
-    except Exception as e:
-        return ErrorSchema(message=e).model_dump(), 400
-
-
-@app.post(
-    "/simular",
-    tags=[simular_tag],
-    responses={
-        "200": ResultadoSimulacaoSchema,
-        "302": {"description": "Redirecianado para a rota de simulação adequada."},
-        "404": ErrorSchema,
-    },
-)
-def post_simulacao(form: SimulacaoSchema):
-    """Faz a simulação de um produto genérico.
-
-    Essa rota recebe um produto e um conjunto de parâmetros e redireciona para a rota
-    adequada para simulação do produto. Os parâmetros podem conter valores que não
-    serão utilizados.
-    """
-    try:
-        formula = pegar_formula(db, form.produto_id)
-    except NoResultFound:
-        return (
-            ErrorSchema(
-                mesage=f"Produto {form.produto_id} não encontrado."
-            ).model_dump(),
-            404,
-        )
-    return redirect(url_for(f"post_simulacao_{formula.nome}"), code=307)
-
-
-@app.post(
-    "/simular/peculio",
-    tags=[simular_tag],
-    responses={"200": ResultadoSimulacaoSchema, "400": ErrorSchema, "404": ErrorSchema},
-)
-def post_simulacao_peculio(form: SimulacaoPeculioSchema):
-    """Faz a simulação de um produto do tipo pecúlio.
-
-    Retorna o valor do prêmio comercial para o produto e os parâmetros informados."""
-    try:
-        juros = pegar_juros(db, form.produto_id, form.prazo)
-        taxa = pegar_taxas(db, form.produto_id, form.sexo, "Sinistro")
-        taxa_dpi = pegar_taxas(db, form.produto_id, form.sexo, "DPI")
-    except NoResultFound:
-        return (
-            ErrorSchema(
-                mesage=f"Produto {form.produto_id} não encontrado."
-            ).model_dump(),
-            404,
-        )
-
-    try:
-        tabua_sinistro = tb.Tabua(taxa)
-        tabua_pagamento = tabua_sinistro
-
-        if len(taxa_dpi) > 0:
-            tabua_dpi = tb.Tabua(taxa_dpi)
-            tabua_pagamento = tb.TabuaMDT(tabua_sinistro, tabua_dpi)
-
-        produto = peculio_capitalizado_fluxo(
-            tabua_beneficio=tabua_sinistro,
-            tabua_pagamento=tabua_pagamento,
-            juros=tb.JurosConstante(juros),
-            data_assinatura=date.today(),
-            data_nascimento_segurado=form.data_nascimento,
-            prazo_cobertura=form.prazo,
-            prazo_pagamento=form.prazo,
-            beneficio=form.beneficio,
-            percentual_beneficio=[1.0],
-        )
-
-    except Exception as e:
-        return ErrorSchema(message=e).model_dump(), 400
-
-    return (
-        ResultadoSimulacaoSchema(premio=produto.premio_comercial(0)).model_dump(),
-        200,
-    )
-
-
-@app.post(
-    "/simular/aposentadoria",
-    tags=[simular_tag],
-    responses={"200": ResultadoSimulacaoSchema, "400": ErrorSchema, "404": ErrorSchema},
-)
-def post_simulacao_aposentadoria(form: SimulacaoAposentadoriaSchema):
-    """Faz a simulação de um produto do tipo aposentadoria.
-
-    Retorna o valor do prêmio comercial para o produto e os parâmetros informados."""
-    try:
-        juros = pegar_juros(db, form.produto_id, form.prazo)
-        taxa_acumulacao = pegar_taxas(db, form.produto_id, form.sexo, "Acumulacao")
-        taxa_concessao = pegar_taxas(db, form.produto_id, form.sexo, "Concessao")
-    except NoResultFound:
-        return (
-            ErrorSchema(
-                mesage=f"Produto {form.produto_id} não encontrado."
-            ).model_dump(),
-            404,
-        )
-
-    try:
-        produto = aposentadoria_capitalizado(
-            tabua_acumulacao=tb.Tabua(taxa_acumulacao),
-            tabua_concessao=tb.Tabua(taxa_concessao),
-            juros=tb.JurosConstante(juros),
-            data_assinatura=date.today(),
-            data_nascimento_segurado=form.data_nascimento,
-            prazo_cobertura=form.prazo,
-            prazo_pagamento=form.prazo,
-            prazo_renda=form.prazo_renda,
-            prazo_certo_renda=form.prazo_certo_renda,
-            beneficio=form.beneficio,
-            percentual_beneficio=[1.0],
+    # Quando ativo, requisições acima do orçamento falham, em vez de apenas gerar um log. Para
+    # testes e benchmarks.
+    app.config["CONSULTAS_ORCAMENTO_ESTRITO"] = False
+    # Diretório do armazém de tábuas e vetores derivados, compartilhado pelos processos.
+    app.config["ARMAZEM_TABUAS"] = os.path.join(app.instance_path, "tabuas")
+    # Diretório dos sinais de invalidação dos caches (model.cache), compartilhado pelos workers,
+    # de forma que uma alteração feita em um processo descarta os caches de todos. None mantém
+    # cada processo com seus caches até a próxima alteração feita nele mesmo.
+    app.config["CACHES_DIRETORIO"] = os.path.join(app.instance_path, "caches")
+    app.config.from_prefixed_env()
+    app.config.update(config or {})
+
+    configurar_sinais_caches(app.config["CACHES_DIRETORIO"])
+    perfil_armazenamento = configurar_armazenamento(app, app.config["ARMAZENAMENTO_PERFIL"])
+    db.init_app(app)
+
+    for blueprint in blueprints:
+        app.register_api(blueprint)
+    for comando in comandos:
+        app.cli.add_command(comando)
+    configurar_medicao(app)
+    configurar_metricas(app)
+    configurar_consultas(app)
+
+    with app.app_context():
+        aplicar_pragmas_engines(db, perfil_armazenamento)
+        instrumentar_engines(
+            db, app.config["CONSULTAS_LIMITE_LENTA"], app.logger.getChild("consultas")
         )
-    except Exception as e:
-        return ErrorSchema(message=e).model_dump(), 400
+        if app.config["INICIALIZAR_BANCO"]:
+            inicializar_banco(app)
 
-    return (
-        ResultadoSimulacaoSchema(premio=produto.premio_comercial(0)).model_dump(),
-        200,
-    )
+    return app
@@ -0,0 +1,206 @@
+"""Entrada ASGI da aplicação.
+
+As rotas /produtos* e /simular* são atendidas por corrotinas (rotas.assincronas), que
+consultam o banco de dados pelo engine assíncrono e executam os cálculos em um pool de
+threads limitado, de forma que clientes lentos não ocupam uma thread cada. As demais rotas,
+inclusive a documentação OpenAPI, são atendidas pela aplicação Flask, que continua
+declarando todas as rotas com os mesmos esquemas.
+
+Uso:
+    uvicorn --factory asgi:create_asgi_app
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
+from time import perf_counter
+from typing import Optional
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+from pydantic import BaseModel, ValidationError
+
+from app import create_app
+from model.armazem_tabuas import preparar_armazem_tabuas
+from model.armazenamento import engine_leitura, pegar_perfil
+from model.database import db
+from model.instrumentacao import encerrar_contagem, iniciar_contagem, instrumentar_engine
+from model.queries_assincronas import criar_engine_assincrona
+from rotas.assincronas import ContextoAssincrono, Resposta, RotaAssincrona, encontrar_rota
+from rotas.consultas import encerrar_contagem_requisicao
+from rotas.medicao import amostrar, registrar_medicao
+from rotas.metricas import registrar_requisicao
+from src.medicao import encerrar_medicao, iniciar_medicao
+
+
+async def ler_corpo(receive) -> bytes:
+    corpo = b""
+    while True:
+        mensagem = await receive()
+        corpo += mensagem.get("body", b"")
+        if not mensagem.get("more_body", False):
+            return corpo
+
+
+@lru_cache
+def propriedades_esquema(esquema: type[BaseModel]) -> dict:
+    return esquema.model_json_schema().get("properties", {})
+
+
+def validar_form(esquema: type[BaseModel], corpo: bytes) -> BaseModel:
+    """Valida o formulário como o flask-openapi3, que envia os campos ausentes como None e
+    decodifica os campos sem tipo simples como JSON."""
+    valores = parse_qs(corpo.decode(), keep_blank_values=True)
+    dados = {}
+    for nome, propriedade in propriedades_esquema(esquema).items():
+        lista = valores.get(nome, [])
+        valor = lista[0] if lista else None
+        if propriedade.get("type") == "array":
+            valor = lista
+        elif propriedade.get("type") in ("object", "null", None) and valor:
+            try:
+                valor = json.loads(valor)
+            except json.JSONDecodeError:
+                pass
+        elif propriedade.get("type") in ("object", "null", None):
+            valor = None
+        dados[nome] = valor
+    return esquema.model_validate(dados)
+
+
+def validar_body(esquema: type[BaseModel], corpo: bytes) -> BaseModel:
+    """Valida o corpo JSON como o flask-openapi3, que trata um corpo inválido como vazio."""
+    try:
+        dados = json.loads(corpo) or {}
+    except ValueError:
+        dados = {}
+    if isinstance(dados, str):
+        return esquema.model_validate_json(dados)
+    return esquema.model_validate(dados)
+
+
+class AplicacaoAssincrona:
+    """Aplicação ASGI que atende as rotas assíncronas e repassa as demais ao Flask.
+
+    Args:
+        app (Flask): Aplicação criada por create_app.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.wsgi = WsgiToAsgi(app)
+        with app.app_context():
+            url = engine_leitura(db).url
+            # As rotas assíncronas leem as tábuas pelo engine assíncrono, sem pegar_tabua.
+            preparar_armazem_tabuas(db)
+        engine = criar_engine_assincrona(url, pegar_perfil(app.config["ARMAZENAMENTO_PERFIL"]))
+        instrumentar_engine(
+            engine.sync_engine,
+            app.config["CONSULTAS_LIMITE_LENTA"],
+            app.logger.getChild("consultas"),
+        )
+        self.contexto = ContextoAssincrono(
+            app=app,
+            engine=engine,
+            executor=ThreadPoolExecutor(
+                max_workers=app.config["ASSINCRONO_THREADS_CALCULO"],
+                thread_name_prefix="calculo",
+            ),
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.ciclo_de_vida(receive, send)
+            return
+        if scope["type"] == "http":
+            encontrada = encontrar_rota(scope["method"], scope["path"])
+            if encontrada is not None:
+                await self.atender(*encontrada, scope, receive, send)
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def ciclo_de_vida(self, receive, send) -> None:
+        while True:
+            mensagem = await receive()
+            if mensagem["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif mensagem["type"] == "lifespan.shutdown":
+                await self.contexto.engine.dispose()
+                self.contexto.executor.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def atender(
+        self, rota: RotaAssincrona, parametros: dict, scope, receive, send
+    ) -> None:
+        cabecalhos = {
+            nome.decode("latin-1").lower(): valor.decode("latin-1")
+            for nome, valor in scope["headers"]
+        }
+        argumentos = {}
+        try:
+            if rota.path is not None:
+                argumentos["path"] = rota.path.model_validate(parametros)
+            if rota.form is not None:
+                argumentos["form"] = validar_form(rota.form, await ler_corpo(receive))
+            if rota.body is not None:
+                argumentos["body"] = validar_body(rota.body, await ler_corpo(receive))
+        except ValidationError as e:
+            # Mesma resposta da validação do flask-openapi3.
+            await self.enviar(send, Resposta(None, 422), e.json().encode(), cabecalhos)
+            return
+
+        inicio = perf_counter()
+        medicao = iniciar_medicao() if amostrar(self.app.config) else None
+        contagem = iniciar_contagem()
+        try:
+            resposta = await rota.tratar(self.contexto, cabecalhos, **argumentos)
+            encerrar_contagem_requisicao(self.app, contagem, scope["method"], rota.caminho)
+        except Exception:
+            encerrar_contagem(contagem)
+            self.app.logger.exception("Erro em %s %s", scope["method"], scope["path"])
+            resposta = Resposta(None, 500)
+        if medicao is not None:
+            encerrar_medicao(medicao)
+            if self.app.config["MEDICAO_SERVER_TIMING"]:
+                resposta = replace(
+                    resposta,
+                    cabecalhos={**resposta.cabecalhos, "Server-Timing": medicao.server_timing()},
+                )
+            registrar_medicao(
+                self.app, medicao, scope["method"], scope["path"], rota.caminho, resposta.status
+            )
+        corpo = b""
+        if isinstance(resposta.conteudo, bytes):
+            corpo = resposta.conteudo
+        elif resposta.conteudo is not None:
+            corpo = f"{self.app.json.dumps(resposta.conteudo)}\n".encode()
+        await self.enviar(send, resposta, corpo, cabecalhos)
+        registrar_requisicao(
+            self.app, scope["method"], rota.caminho, resposta.status, perf_counter() - inicio
+        )
+
+    async def enviar(
+        self, send, resposta: Resposta, corpo: bytes, cabecalhos_requisicao: dict
+    ) -> None:
+        cabecalhos = {"Content-Type": "application/json", **resposta.cabecalhos}
+        if "origin" in cabecalhos_requisicao:
+            # Mesmo comportamento do flask-cors, configurado sem restrições em create_app.
+            cabecalhos["Access-Control-Allow-Origin"] = "*"
+        cabecalhos["Content-Length"] = str(len(corpo))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": resposta.status,
+                "headers": [
+                    (nome.lower().encode("latin-1"), valor.encode("latin-1"))
+                    for nome, valor in cabecalhos.items()
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": corpo})
+
+
+def create_asgi_app(config: Optional[dict] = None) -> AplicacaoAssincrona:
+    """Cria a aplicação ASGI. Os argumentos são os de create_app."""
+    return AplicacaoAssincrona(create_app(config))
@@ -0,0 +1,549 @@
+"""Teste de carga das rotas HTTP em um banco de dados sintético, sem acesso à rede.
+
+O comando gerar cria um banco SQLite com os dados iniciais, produtos extras (cópias dos
+produtos iniciais com tábuas próprias, de taxas perturbadas) e segurados com matrículas
+sintéticas. O comando executar envia requisições às rotas /simular, /simular/peculio,
+/simular/aposentadoria, /produtos/parametros/<id> e /contratar, em uma proporção
+configurável, por várias threads concorrentes, e informa a vazão e as latências p50, p95 e
+p99 de cada rota.
+
+As requisições são atendidas pelo cliente de teste do Flask, no mesmo processo, ou por um
+servidor WSGI local (werkzeug) em outro processo. Cada execução usa uma cópia do banco de
+dados, de forma que as contratações não alteram o banco gerado e as execuções com a mesma
+semente enviam as mesmas requisições.
+
+Uso:
+    python -m benchmarks.carga_http gerar --banco /tmp/carga.sqlite3 --segurados 100000
+    python -m benchmarks.carga_http executar --banco /tmp/carga.sqlite3 --concorrencia 8
+    python -m benchmarks.carga_http executar --banco /tmp/carga.sqlite3 --modo servidor \\
+        --mix simular=4,parametros=4,contratar=1 --requisicoes 5000 --saida carga.json
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from math import ceil
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlencode
+
+from sqlalchemy import func, insert, select
+
+from app import create_app
+from comandos import migrar_banco
+from model.contratacao import fatiar
+from model.database import db
+from model.produto import Produto, ProdutoPrazo, ProdutoPrazoRenda, ProdutoTabua
+from model.queries import pegar_produtos_completos
+from model.segurado import Matricula, Segurado
+from model.tabua import Tabua, Taxa
+
+# Quantidade de linhas por executemany na geração do banco sintético.
+TAMANHO_LOTE_INSERCAO = 10_000
+# Primeiro cpf dos segurados sintéticos, acima dos cpfs dos dados iniciais.
+CPF_INICIAL = 20_000_000_000
+# Proporção padrão de requisições de cada rota.
+MIX_PADRAO = "simular=4,peculio=3,aposentadoria=2,parametros=4,contratar=1"
+
+
+def configuracao(banco: Path) -> dict:
+    """Configuração da aplicação para o banco informado, com o armazém de tábuas ao lado."""
+    return {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{banco.resolve()}",
+        "ARMAZEM_TABUAS": str(banco.resolve().with_suffix(".tabuas")),
+    }
+
+
+def data_aleatoria(rng: random.Random, inicio: date, fim: date) -> date:
+    return inicio + timedelta(days=rng.randrange((fim - inicio).days))
+
+
+def inserir_em_lotes(conexao, tabela, linhas: list[dict]) -> None:
+    for lote in fatiar(linhas, TAMANHO_LOTE_INSERCAO):
+        conexao.execute(insert(tabela), lote)
+
+
+def gerar_produtos_extras(conexao, quantidade: int, rng: random.Random) -> None:
+    """Copia os produtos iniciais, em ciclo, com novas tábuas de taxas perturbadas."""
+    bases = conexao.execute(select(Produto.__table__).order_by(Produto.id)).mappings().all()
+    proximo_produto = conexao.execute(select(func.max(Produto.id))).scalar_one() + 1
+    proxima_tabua = conexao.execute(select(func.max(Tabua.id))).scalar_one() + 1
+    for indice in range(quantidade):
+        base = bases[indice % len(bases)]
+        produto_id = proximo_produto + indice
+        conexao.execute(
+            insert(Produto).values(
+                {**base, "id": produto_id, "nome": f"{base['nome']} {produto_id}"[:50]}
+            )
+        )
+        for tabela in (ProdutoPrazo, ProdutoPrazoRenda):
+            linhas = conexao.execute(
+                select(tabela.__table__).where(tabela.produtoId == base["id"])
+            ).mappings()
+            inserir_em_lotes(
+                conexao, tabela, [{**linha, "produtoId": produto_id} for linha in linhas]
+            )
+
+        novas_tabuas = {}
+        associacoes = conexao.execute(
+            select(ProdutoTabua.__table__).where(ProdutoTabua.produtoId == base["id"])
+        ).mappings()
+        for associacao in associacoes:
+            if associacao["tabuaId"] not in novas_tabuas:
+                tabua_id = proxima_tabua
+                proxima_tabua += 1
+                fator = rng.uniform(0.8, 1.2)
+                conexao.execute(
+                    insert(Tabua).values(id=tabua_id, nome=f"Sintética {tabua_id}")
+                )
+                taxas = conexao.execute(
+                    select(Taxa.idade, Taxa.taxa).where(
+                        Taxa.tabuaId == associacao["tabuaId"]
+                    )
+                )
+                # As taxas iguais a 1 são mantidas, já que o tabatu não aceita tábuas sem
+                # idade final.
+                inserir_em_lotes(
+                    conexao,
+                    Taxa,
+                    [
+                        {
+                            "tabuaId": tabua_id,
+                            "idade": idade,
+                            "taxa": taxa if taxa >= 1.0 else min(taxa * fator, 1.0),
+                        }
+                        for idade, taxa in taxas
+                    ],
+                )
+                novas_tabuas[associacao["tabuaId"]] = tabua_id
+            conexao.execute(
+                insert(ProdutoTabua).values(
+                    {
+                        **associacao,
+                        "produtoId": produto_id,
+                        "tabuaId": novas_tabuas[associacao["tabuaId"]],
+                    }
+                )
+            )
+
+
+def gerar_segurados(
+    conexao, quantidade: int, planos: list["PlanoProduto"], rng: random.Random
+) -> None:
+    """Insere os segurados sintéticos, cada um com uma matrícula em um produto aleatório."""
+    segurados = []
+    matriculas = []
+    for indice in range(quantidade):
+        cpf = CPF_INICIAL + indice
+        plano = rng.choice(planos)
+        prazo_renda = rng.choice(plano.prazos_renda) if plano.prazos_renda else (None, None)
+        segurados.append(
+            {
+                "cpf": cpf,
+                "nome": f"Segurado {indice}",
+                "email": f"segurado{indice}@email.com",
+                "sexo": rng.choice("MF"),
+                "dataNascimento": data_aleatoria(rng, date(1960, 1, 1), date(2005, 1, 1)),
+            }
+        )
+        matriculas.append(
+            {
+                "cpfSegurado": cpf,
+                "produtoId": plano.produto_id,
+                "dataAssinatura": data_aleatoria(rng, date(2015, 1, 1), date(2025, 1, 1)),
+                "prazo": rng.choice(plano.prazos),
+                "prazoRenda": prazo_renda[0],
+                "prazoCertoRenda": prazo_renda[1],
+                "beneficio": float(rng.randint(*plano.beneficio)),
+            }
+        )
+    inserir_em_lotes(conexao, Segurado, segurados)
+    inserir_em_lotes(conexao, Matricula, matriculas)
+
+
+def gerar_banco(banco: Path, segurados: int, produtos_extras: int, semente: int) -> None:
+    """Cria o banco de dados sintético e o seu armazém de tábuas.
+
+    Raises:
+        FileExistsError: Se o banco de dados já existe.
+    """
+    if banco.exists():
+        raise FileExistsError(f"O banco de dados {banco} já existe.")
+    rng = random.Random(semente)
+    app = create_app(configuracao(banco))
+    with app.app_context():
+        with db.engine.begin() as conexao:
+            gerar_produtos_extras(conexao, produtos_extras, rng)
+        planos = pegar_planos()
+        # Devolve a conexão da sessão, já que o perfil concorrente tem um único escritor.
+        db.session.remove()
+        with db.engine.begin() as conexao:
+            gerar_segurados(conexao, segurados, planos, rng)
+        # Empacota as novas tábuas e atualiza o armazém.
+        migrar_banco(app)
+
+
+@dataclass(frozen=True)
+class PlanoProduto:
+    """Parâmetros válidos de contratação de um produto, usados para montar as requisições."""
+
+    produto_id: int
+    formula: str
+    prazos: list[int]
+    prazos_renda: list[tuple[int, int]]
+    beneficio: tuple[int, int]
+
+
+def pegar_planos() -> list[PlanoProduto]:
+    """Parâmetros de todos os produtos. Deve ser chamada no contexto da aplicação."""
+    return [
+        PlanoProduto(
+            produto_id=produto.id,
+            formula=produto.formula.nome,
+            prazos=sorted(prazo.prazo for prazo in produto.produtoPrazos),
+            prazos_renda=sorted(
+                (prazo.prazo, prazo.prazoCerto) for prazo in produto.produtoPrazosRenda
+            ),
+            beneficio=(produto.beneficioMinimo, produto.beneficioMaximo),
+        )
+        for produto in pegar_produtos_completos(db)
+    ]
+
+
+@dataclass(frozen=True)
+class Requisicao:
+    rota: str
+    metodo: str
+    caminho: str
+    form: Optional[dict] = None
+
+
+class GeradorRequisicoes:
+    """Monta requisições válidas para cada rota, a partir dos parâmetros dos produtos.
+
+    Args:
+        planos (list[PlanoProduto]): Parâmetros dos produtos.
+        cpf_inicial (int): Primeiro cpf das contratações, que recebem cpfs sequenciais.
+        rng (random.Random): Gerador de números aleatórios.
+    """
+
+    def __init__(self, planos: list[PlanoProduto], cpf_inicial: int, rng: random.Random):
+        self.planos = planos
+        self.por_formula = {
+            formula: [plano for plano in planos if plano.formula == formula]
+            for formula in {plano.formula for plano in planos}
+        }
+        self.proximo_cpf = cpf_inicial
+        self.rng = rng
+        self.rotas = {
+            "simular": self.simular,
+            "peculio": self.peculio,
+            "aposentadoria": self.aposentadoria,
+            "parametros": self.parametros,
+            "contratar": self.contratar,
+        }
+
+    def proposta(self, plano: PlanoProduto) -> dict:
+        proposta = {
+            "sexo": self.rng.choice("MF"),
+            "data_nascimento": data_aleatoria(
+                self.rng, date(1970, 1, 1), date(2005, 1, 1)
+            ).isoformat(),
+            "prazo": self.rng.choice(plano.prazos),
+            "produto_id": plano.produto_id,
+            "beneficio": self.rng.randint(*plano.beneficio),
+        }
+        if plano.prazos_renda:
+            prazo_renda, prazo_certo = self.rng.choice(plano.prazos_renda)
+            proposta["prazo_renda"] = prazo_renda
+            proposta["prazo_certo_renda"] = prazo_certo
+        return proposta
+
+    def simular(self) -> Requisicao:
+        plano = self.rng.choice(self.planos)
+        return Requisicao("simular", "POST", "/simular", self.proposta(plano))
+
+    def peculio(self) -> Requisicao:
+        plano = self.rng.choice(self.por_formula["peculio"])
+        return Requisicao("peculio", "POST", "/simular/peculio", self.proposta(plano))
+
+    def aposentadoria(self) -> Requisicao:
+        plano = self.rng.choice(self.por_formula["aposentadoria"])
+        return Requisicao(
+            "aposentadoria", "POST", "/simular/aposentadoria", self.proposta(plano)
+        )
+
+    def parametros(self) -> Requisicao:
+        plano = self.rng.choice(self.planos)
+        return Requisicao("parametros", "GET", f"/produtos/parametros/{plano.produto_id}")
+
+    def contratar(self) -> Requisicao:
+        plano = self.rng.choice(self.planos)
+        cpf = self.proximo_cpf
+        self.proximo_cpf += 1
+        form = {
+            "cpf": cpf,
+            "nome": f"Cliente {cpf}",
+            "email": f"cliente{cpf}@email.com",
+            "data_assinatura": date(2024, 1, 1).isoformat(),
+            **self.proposta(plano),
+        }
+        return Requisicao("contratar", "POST", "/contratar", form)
+
+    def gerar(self, quantidade: int, mix: dict[str, int]) -> list[Requisicao]:
+        """Requisições na proporção do mix, em ordem aleatória."""
+        rotas = self.rng.choices(list(mix), weights=list(mix.values()), k=quantidade)
+        return [self.rotas[rota]() for rota in rotas]
+
+
+def ler_mix(texto: str) -> dict[str, int]:
+    """Lê o mix de requisições no formato rota=peso,rota=peso.
+
+    Raises:
+        argparse.ArgumentTypeError: Se a rota não existe ou o peso não é positivo.
+    """
+    mix = {}
+    for item in texto.split(","):
+        rota, _, peso = item.partition("=")
+        rota = rota.strip()
+        if rota not in ("simular", "peculio", "aposentadoria", "parametros", "contratar"):
+            raise argparse.ArgumentTypeError(f"Rota {rota} desconhecida.")
+        if not peso.strip().isdigit() or int(peso) <= 0:
+            raise argparse.ArgumentTypeError(f"Peso inválido para a rota {rota}.")
+        mix[rota] = int(peso)
+    return mix
+
+
+class ClienteTeste:
+    """Envia as requisições pelo cliente de teste do Flask, no mesmo processo."""
+
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def enviar(self, requisicao: Requisicao) -> int:
+        if not hasattr(self.local, "cliente"):
+            self.local.cliente = self.app.test_client()
+        resposta = self.local.cliente.open(
+            requisicao.caminho, method=requisicao.metodo, data=requisicao.form
+        )
+        return resposta.status_code
+
+
+def servir(banco: Path, porta, pronto) -> None:
+    """Executa o servidor WSGI local em uma porta livre, informada em porta."""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class RequisicaoSilenciosa(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    app = create_app(configuracao(banco))
+    servidor = make_server(
+        "127.0.0.1", 0, app, threaded=True, request_handler=RequisicaoSilenciosa
+    )
+    porta.value = servidor.server_port
+    pronto.set()
+    servidor.serve_forever()
+
+
+class ClienteServidor:
+    """Envia as requisições por HTTP a um servidor WSGI local, em outro processo."""
+
+    def __init__(self, banco: Path):
+        contexto = multiprocessing.get_context("spawn")
+        porta = contexto.Value("i", 0)
+        pronto = contexto.Event()
+        self.processo = contexto.Process(
+            target=servir, args=(banco, porta, pronto), daemon=True
+        )
+        self.processo.start()
+        if not pronto.wait(timeout=60):
+            self.processo.terminate()
+            raise RuntimeError("O servidor local não iniciou.")
+        self.porta = porta.value
+
+    def enviar(self, requisicao: Requisicao) -> int:
+        conexao = http.client.HTTPConnection("127.0.0.1", self.porta, timeout=60)
+        try:
+            cabecalhos = {}
+            corpo = None
+            if requisicao.form is not None:
+                corpo = urlencode(requisicao.form)
+                cabecalhos["Content-Type"] = "application/x-www-form-urlencoded"
+            conexao.request(requisicao.metodo, requisicao.caminho, corpo, cabecalhos)
+            resposta = conexao.getresponse()
+            resposta.read()
+            return resposta.status
+        finally:
+            conexao.close()
+
+    def encerrar(self) -> None:
+        self.processo.terminate()
+        self.processo.join()
+
+
+def enviar_requisicoes(
+    cliente, requisicoes: list[Requisicao], concorrencia: int
+) -> tuple[list[tuple[str, float, int]], float]:
+    """Envia as requisições por concorrencia threads, cada uma pegando a próxima da fila.
+
+    Returns:
+        tuple: Rota, latência em segundos e status de cada requisição, e a duração total.
+    """
+    proxima = iter(requisicoes)
+    trava = threading.Lock()
+    medicoes = []
+
+    def trabalhar():
+        while True:
+            with trava:
+                requisicao = next(proxima, None)
+            if requisicao is None:
+                return
+            inicio = time.perf_counter()
+            try:
+                status = cliente.enviar(requisicao)
+            except Exception:
+                status = 0
+            medicoes.append((requisicao.rota, time.perf_counter() - inicio, status))
+
+    threads = [threading.Thread(target=trabalhar) for _ in range(concorrencia)]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return medicoes, time.perf_counter() - inicio
+
+
+def percentil(ordenados: list[float], p: float) -> float:
+    """Percentil pelo método do posto mais próximo."""
+    return ordenados[max(0, ceil(p / 100 * len(ordenados)) - 1)]
+
+
+def resumir(medicoes: list[tuple[str, float, int]], duracao: float) -> dict[str, dict]:
+    """Vazão, erros e latências (ms) de cada rota e do total."""
+    por_rota = {}
+    for rota, latencia, status in medicoes:
+        por_rota.setdefault(rota, []).append((latencia, status))
+    por_rota["total"] = [(latencia, status) for _, latencia, status in medicoes]
+    resumo = {}
+    for rota, valores in por_rota.items():
+        latencias = sorted(latencia * 1000 for latencia, _ in valores)
+        resumo[rota] = {
+            "requisicoes": len(valores),
+            "erros": sum(1 for _, status in valores if not 200 <= status < 400),
+            "vazao": len(valores) / duracao,
+            "p50": percentil(latencias, 50),
+            "p95": percentil(latencias, 95),
+            "p99": percentil(latencias, 99),
+            "maximo": latencias[-1],
+        }
+    return resumo
+
+
+def executar(argumentos) -> dict:
+    with tempfile.TemporaryDirectory() as diretorio:
+        copia = Path(diretorio) / "carga.sqlite3"
+        shutil.copy(argumentos.banco, copia)
+        tabuas = argumentos.banco.resolve().with_suffix(".tabuas")
+        if tabuas.exists():
+            shutil.copytree(tabuas, copia.with_suffix(".tabuas"))
+
+        app = create_app(configuracao(copia))
+        with app.app_context():
+            planos = pegar_planos()
+            cpf_inicial = db.session.execute(select(func.max(Segurado.cpf))).scalar_one()
+        gerador = GeradorRequisicoes(planos, cpf_inicial + 1, random.Random(argumentos.semente))
+        aquecimento = gerador.gerar(argumentos.aquecimento, argumentos.mix)
+        requisicoes = gerador.gerar(argumentos.requisicoes, argumentos.mix)
+
+        if argumentos.modo == "servidor":
+            cliente = ClienteServidor(copia)
+        else:
+            cliente = ClienteTeste(app)
+        try:
+            enviar_requisicoes(cliente, aquecimento, argumentos.concorrencia)
+            medicoes, duracao = enviar_requisicoes(
+                cliente, requisicoes, argumentos.concorrencia
+            )
+        finally:
+            if argumentos.modo == "servidor":
+                cliente.encerrar()
+    return {
+        "configuracao": {
+            "modo": argumentos.modo,
+            "concorrencia": argumentos.concorrencia,
+            "requisicoes": argumentos.requisicoes,
+            "mix": argumentos.mix,
+            "semente": argumentos.semente,
+        },
+        "duracao": duracao,
+        "rotas": resumir(medicoes, duracao),
+    }
+
+
+def imprimir(resultado: dict) -> None:
+    print(
+        f"{'rota':<16}{'requisições':>12}{'erros':>8}{'req/s':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'máx ms':>10}"
+    )
+    for rota, valores in resultado["rotas"].items():
+        print(
+            f"{rota:<16}{valores['requisicoes']:>12}{valores['erros']:>8}"
+            f"{valores['vazao']:>10.1f}{valores['p50']:>10.2f}{valores['p95']:>10.2f}"
+            f"{valores['p99']:>10.2f}{valores['maximo']:>10.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    gerar = comandos.add_parser("gerar", help="Cria o banco de dados sintético.")
+    gerar.add_argument("--banco", type=Path, required=True)
+    gerar.add_argument("--segurados", type=int, default=10_000)
+    gerar.add_argument("--produtos-extras", type=int, default=20)
+    gerar.add_argument("--semente", type=int, default=0)
+
+    carga = comandos.add_parser("executar", help="Executa o teste de carga.")
+    carga.add_argument("--banco", type=Path, required=True)
+    carga.add_argument("--modo", choices=("cliente", "servidor"), default="cliente")
+    carga.add_argument("--concorrencia", type=int, default=4)
+    carga.add_argument("--requisicoes", type=int, default=2000)
+    carga.add_argument("--aquecimento", type=int, default=100)
+    carga.add_argument("--mix", type=ler_mix, default=ler_mix(MIX_PADRAO))
+    carga.add_argument("--semente", type=int, default=0)
+    carga.add_argument("--saida", type=Path, default=None)
+    argumentos = parser.parse_args()
+
+    if argumentos.comando == "gerar":
+        try:
+            gerar_banco(
+                argumentos.banco,
+                argumentos.segurados,
+                argumentos.produtos_extras,
+                argumentos.semente,
+            )
+        except FileExistsError as e:
+            sys.exit(str(e))
+        print(f"Banco de dados {argumentos.banco} gerado.")
+        return
+
+    resultado = executar(argumentos)
+    imprimir(resultado)
+    if argumentos.saida is not None:
+        argumentos.saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
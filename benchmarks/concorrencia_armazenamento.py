@@ -0,0 +1,142 @@
+"""Compara a vazão de leituras e escritas concorrentes entre os perfis de armazenamento.
+
+Cada perfil é avaliado em uma cópia do banco de dados. Processos leitores executam as
+consultas de precificação (juros, taxas e fórmula), como workers que atendem simulações,
+enquanto um processo escritor grava matrículas, uma por transação, como /contratar.
+
+Uso:
+    python -m benchmarks.concorrencia_armazenamento --banco instance/db.sqlite3
+"""
+import argparse
+import multiprocessing
+import shutil
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+
+from model.armazenamento import (
+    PERFIS,
+    opcoes_engine,
+    opcoes_engine_leitura,
+    registrar_pragmas,
+)
+from model.queries import consultar_formula, consultar_juros, consultar_taxas
+from model.segurado import Matricula
+
+
+def criar_engine(url: str, nome_perfil: str, leitura: bool):
+    perfil = PERFIS[nome_perfil]
+    opcoes = (
+        opcoes_engine_leitura(perfil)
+        if leitura and perfil.tamanho_pool_leitura is not None
+        else opcoes_engine(perfil, url)
+    )
+    engine = create_engine(url, **opcoes)
+    registrar_pragmas(engine, perfil.pragmas)
+    return engine
+
+
+def leitor(url, nome_perfil, inicio, fim, resultados):
+    engine = criar_engine(url, nome_perfil, leitura=True)
+    consultas = 0
+    erros = 0
+    while time.time() < inicio:
+        time.sleep(0.001)
+    while time.time() < fim:
+        try:
+            with engine.connect() as conexao:
+                conexao.execute(consultar_juros(1, 10)).scalar_one()
+                conexao.execute(consultar_taxas(1, "M", "Sinistro")).scalars().all()
+                conexao.execute(consultar_formula(1)).first()
+            consultas += 1
+        except Exception:
+            erros += 1
+    resultados.put(("leitura", consultas, erros))
+
+
+def escritor(url, nome_perfil, inicio, fim, resultados):
+    engine = criar_engine(url, nome_perfil, leitura=False)
+    escritas = 0
+    erros = 0
+    while time.time() < inicio:
+        time.sleep(0.001)
+    while time.time() < fim:
+        try:
+            with engine.begin() as conexao:
+                conexao.execute(
+                    insert(Matricula).values(
+                        cpfSegurado=12345678900,
+                        produtoId=1,
+                        dataAssinatura=date(2024, 1, 1),
+                        prazo=10,
+                        beneficio=1000.0,
+                    )
+                )
+            escritas += 1
+        except Exception:
+            erros += 1
+    resultados.put(("escrita", escritas, erros))
+
+
+def executar_perfil(banco: Path, nome_perfil: str, leitores: int, segundos: float) -> dict:
+    with tempfile.TemporaryDirectory() as diretorio:
+        copia = Path(diretorio) / "db.sqlite3"
+        shutil.copy(banco, copia)
+        url = f"sqlite:///{copia}"
+        resultados = multiprocessing.Queue()
+        inicio = time.time() + 1.0
+        fim = inicio + segundos
+        processos = [
+            multiprocessing.Process(
+                target=leitor, args=(url, nome_perfil, inicio, fim, resultados)
+            )
+            for _ in range(leitores)
+        ]
+        processos.append(
+            multiprocessing.Process(
+                target=escritor, args=(url, nome_perfil, inicio, fim, resultados)
+            )
+        )
+        for processo in processos:
+            processo.start()
+        totais = {"leitura": [0, 0], "escrita": [0, 0]}
+        for _ in processos:
+            tipo, quantidade, erros = resultados.get()
+            totais[tipo][0] += quantidade
+            totais[tipo][1] += erros
+        for processo in processos:
+            processo.join()
+    return {
+        "perfil": nome_perfil,
+        "leituras_por_segundo": totais["leitura"][0] / segundos,
+        "escritas_por_segundo": totais["escrita"][0] / segundos,
+        "erros": totais["leitura"][1] + totais["escrita"][1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--banco", type=Path, default=Path("instance/db.sqlite3"))
+    parser.add_argument("--perfis", nargs="+", default=list(PERFIS))
+    parser.add_argument("--leitores", type=int, default=4)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    argumentos = parser.parse_args()
+
+    print(f"{'perfil':<16}{'leituras/s':>12}{'escritas/s':>12}{'erros':>8}")
+    for nome_perfil in argumentos.perfis:
+        resultado = executar_perfil(
+            argumentos.banco, nome_perfil, argumentos.leitores, argumentos.segundos
+        )
+        print(
+            f"{resultado['perfil']:<16}"
+            f"{resultado['leituras_por_segundo']:>12.0f}"
+            f"{resultado['escritas_por_segundo']:>12.0f}"
+            f"{resultado['erros']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""Micro-benchmarks do motor atuarial, para detectar regressões de desempenho.
+
+Mede fluxo_peculio, fluxo_renda, FluxoPagamento.calcular_vpa, Capitalizado.taxa_pura,
+calcula_idade, calcula_idades, ArrayInfinita.__getitem__ e ArrayInfinitaLote.__getitem__ em
+uma grade de idade de ingresso, prazo (inclusive vitalício), tábua de decremento único ou com
+DPI (TabuaMDT) e periodicidade anual ou mensal.
+As tábuas são as dos dados iniciais (model/dados), de forma que o banco de dados não é usado.
+
+Os resultados são gravados em JSON, com as versões do python, numpy e tabatu, e o comando
+comparar aponta os casos mais lentos que a referência além de um limite, por exemplo antes e
+depois de atualizar o tabatu ou o numpy.
+
+Uso:
+    python -m benchmarks.motor_atuarial executar --saida referencia.json
+    python -m benchmarks.motor_atuarial executar --saida atual.json --filtro fluxo_peculio
+    python -m benchmarks.motor_atuarial comparar referencia.json atual.json --limite 0.1
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import partial
+from importlib.metadata import version
+from itertools import product
+from math import inf, isinf
+from statistics import median
+from typing import Callable, Union
+
+import tabatu as tb
+from dateutil.relativedelta import relativedelta
+from numpy import arange, linspace
+from tabatu.periodicidade import Periodicidade
+from tabatu.premissas import Premissas
+
+from model.carga_inicial import DIRETORIO_DADOS, ler_tabela
+from model.tabua import Taxa
+from src.array_infinita import ArrayInfinita, ArrayInfinitaLote
+from src.fluxo.fluxo_pagamento import FluxoPagamento
+from src.fluxo.fluxo_peculio import fluxo_peculio
+from src.fluxo.fluxo_renda import fluxo_renda
+from src.idades_prazos import IdadesPrazosPagamento, calcula_idade, calcula_idades
+from src.produtos.peculio import peculio_capitalizado_fluxo
+
+# Tábuas dos dados iniciais: sinistro (BREMS MT M), DPI (Alvaro Vindas DPI) e concessão
+# de renda (BREMS SB M).
+TABUA_SINISTRO = 2
+TABUA_DPI = 5
+TABUA_CONCESSAO = 6
+JUROS_ANUAL = 0.04
+DATA_ASSINATURA = date(2024, 1, 1)
+
+IDADES = (20, 40, 60)
+PRAZOS = (10, 30, inf)
+PERIODICIDADES = (Periodicidade.ANUAL, Periodicidade.MENSAL)
+# Quantidade de datas de nascimento do caso calcula_idades.
+QUANTIDADE_DATAS = 10_000
+# Quantidade de propostas do caso ArrayInfinitaLote.__getitem__.
+QUANTIDADE_PROPOSTAS = 1_000
+
+
+@dataclass(frozen=True)
+class Cenario:
+    """Parâmetros de um caso, com a idade e o prazo em anos.
+
+    Args:
+        idade (int): Idade de ingresso, em anos.
+        prazo (int or float): Prazo em anos, inf para vitalício.
+        dpi (bool): Se a tábua de pagamento é a TabuaMDT de sinistro e DPI.
+        periodicidade (Periodicidade): Periodicidade das tábuas, dos juros e dos prazos.
+    """
+
+    idade: int
+    prazo: Union[int, float]
+    dpi: bool
+    periodicidade: Periodicidade
+
+    def nome(self, dimensoes: tuple[str, ...]) -> str:
+        """Identificação do cenário pelos campos informados."""
+        valores = {
+            "idade": self.idade,
+            "prazo": "vitalicio" if isinf(self.prazo) else self.prazo,
+            "dpi": "sim" if self.dpi else "nao",
+            "periodicidade": self.periodicidade.name,
+        }
+        return ",".join(f"{campo}={valores[campo]}" for campo in dimensoes)
+
+    @property
+    def periodos_ano(self) -> int:
+        return self.periodicidade.quantidade_periodos_1_ano()
+
+    @property
+    def data_nascimento(self) -> date:
+        return DATA_ASSINATURA - relativedelta(years=self.idade)
+
+
+@dataclass(frozen=True)
+class Premissa:
+    """Tábuas e juros de um cenário, na periodicidade do cenário."""
+
+    tabua: tb.Tabua
+    tabua_pagamento: Union[tb.Tabua, tb.TabuaMDT]
+    tabua_concessao: tb.Tabua
+    juros: tb.JurosConstante
+
+
+def ler_taxas() -> dict[int, list[float]]:
+    taxas = defaultdict(list)
+    linhas = ler_tabela(Taxa.__table__, DIRETORIO_DADOS / "taxa.csv")
+    for linha in sorted(linhas, key=lambda linha: (linha["tabuaId"], linha["idade"])):
+        taxas[linha["tabuaId"]].append(linha["taxa"])
+    return taxas
+
+
+def criar_premissa(taxas: dict, cenario: Cenario) -> Premissa:
+    def tabua(tabua_id: int) -> tb.Tabua:
+        qx = tb.alterar_periodicidade_qx(
+            taxas[tabua_id], Periodicidade.ANUAL, cenario.periodicidade
+        )
+        return tb.Tabua(qx, periodicidade=cenario.periodicidade)
+
+    sinistro = tabua(TABUA_SINISTRO)
+    juros = tb.alterar_periodicidade_juros(
+        JUROS_ANUAL, Periodicidade.ANUAL, cenario.periodicidade
+    )
+    return Premissa(
+        tabua=sinistro,
+        tabua_pagamento=tb.TabuaMDT(sinistro, tabua(TABUA_DPI)) if cenario.dpi else sinistro,
+        tabua_concessao=tabua(TABUA_CONCESSAO),
+        juros=tb.JurosConstante(juros, cenario.periodicidade),
+    )
+
+
+def caso_fluxo_peculio(premissa: Premissa, cenario: Cenario) -> Callable[[], object]:
+    tabua = premissa.tabua_pagamento
+    return partial(
+        fluxo_peculio,
+        tempo_atual=0,
+        tabua=tabua,
+        juros=premissa.juros,
+        idade_ingresso_segurado=[cenario.idade * cenario.periodos_ano] * len(tabua.tabuas),
+        prazo_cobertura=cenario.prazo * cenario.periodos_ano,
+        percentual_beneficio=ArrayInfinita([1.0]),
+        imediato=False,
+    )
+
+
+def caso_fluxo_renda(premissa: Premissa, cenario: Cenario) -> Callable[[], object]:
+    """Renda vitalícia diferida pelo prazo do cenário, ou imediata se o prazo é vitalício.
+
+    A idade de ingresso é a mesma na tábua de acumulação e na de concessão, que é de
+    decremento único, então a acumulação também é de decremento único, como na aposentadoria.
+    """
+    diferimento = 0 if isinf(cenario.prazo) else cenario.prazo * cenario.periodos_ano
+    return partial(
+        fluxo_renda,
+        tempo_atual=0,
+        idade_ingresso=[cenario.idade * cenario.periodos_ano],
+        prazo_cobertura=diferimento,
+        prazo_renda=inf,
+        prazo_certo_renda=0,
+        tabua=premissa.tabua,
+        tabua_concessao=premissa.tabua_concessao,
+        juros=premissa.juros,
+        percentual_beneficio=ArrayInfinita([1.0]),
+        postecipada=False,
+    )
+
+
+def caso_fluxo_pagamento(premissa: Premissa, cenario: Cenario) -> Callable[[], object]:
+    tabua = premissa.tabua_pagamento
+    fluxo = FluxoPagamento(
+        idades_prazos=IdadesPrazosPagamento(
+            data_assinatura=DATA_ASSINATURA,
+            data_nascimento_segurado=[cenario.data_nascimento] * len(tabua.tabuas),
+            prazo_pagamento=cenario.prazo * cenario.periodos_ano,
+            periodicidade=cenario.periodicidade,
+        ),
+        premissas_atuariais=Premissas(tabua=tabua, juros=premissa.juros),
+    )
+    return partial(fluxo.calcular_vpa, 0)
+
+
+def caso_taxa_pura(premissa: Premissa, cenario: Cenario) -> Callable[[], object]:
+    contrato = peculio_capitalizado_fluxo(
+        tabua_beneficio=premissa.tabua,
+        tabua_pagamento=premissa.tabua_pagamento,
+        juros=premissa.juros,
+        data_assinatura=DATA_ASSINATURA,
+        data_nascimento_segurado=cenario.data_nascimento,
+        prazo_cobertura=cenario.prazo * cenario.periodos_ano,
+        prazo_pagamento=cenario.prazo * cenario.periodos_ano,
+    )
+    return lambda: contrato.taxa_pura
+
+
+def caso_calcula_idade(premissa: Premissa, cenario: Cenario) -> Callable[[], object]:
+    return partial(
+        calcula_idade, cenario.data_nascimento, DATA_ASSINATURA, cenario.periodicidade
+    )
+
+
+def caso_calcula_idades(premissa: Premissa, cenario: Cenario) -> Callable[[], object]:
+    """Idades de datas de nascimento distribuídas pelo ano anterior à data do cenário."""
+    datas = [
+        cenario.data_nascimento - timedelta(days=dia % 366) for dia in range(QUANTIDADE_DATAS)
+    ]
+    return partial(calcula_idades, datas, DATA_ASSINATURA, cenario.periodicidade)
+
+
+def caso_array_infinita(premissa: Premissa, cenario: Cenario) -> Callable[[], object]:
+    """Leitura do percentual do benefício em todos os tempos de um fluxo do prazo."""
+    tamanho = cenario.prazo * cenario.periodos_ano
+    percentual = ArrayInfinita(linspace(1.0, 2.0, int(tamanho)))
+    tempos = arange(2 * tamanho)
+    return partial(percentual.__getitem__, tempos)
+
+
+def caso_array_infinita_lote(premissa: Premissa, cenario: Cenario) -> Callable[[], object]:
+    """Leitura do percentual do benefício de várias propostas, com tamanhos até o do prazo,
+    em todos os tempos de um fluxo do prazo."""
+    tamanho = int(cenario.prazo * cenario.periodos_ano)
+    percentual = ArrayInfinitaLote(
+        [
+            linspace(1.0, 2.0, 1 + proposta % tamanho)
+            for proposta in range(QUANTIDADE_PROPOSTAS)
+        ]
+    )
+    tempos = arange(2 * tamanho)
+    return partial(percentual.__getitem__, tempos)
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """Função medida e as dimensões da grade das quais ela depende.
+
+    Args:
+        nome (str): Nome do benchmark.
+        criar (Callable): Recebe a premissa e o cenário e retorna a chamada medida.
+        dimensoes (tuple[str, ...]): Campos de Cenario que variam. Os demais ficam no
+            primeiro valor da grade.
+        vitalicio (bool): Se o caso com prazo vitalício é medido.
+    """
+
+    nome: str
+    criar: Callable[[Premissa, Cenario], Callable[[], object]]
+    dimensoes: tuple[str, ...]
+    vitalicio: bool = True
+
+
+BENCHMARKS = (
+    Benchmark(
+        "fluxo_peculio", caso_fluxo_peculio, ("idade", "prazo", "dpi", "periodicidade")
+    ),
+    Benchmark("fluxo_renda", caso_fluxo_renda, ("idade", "prazo", "periodicidade")),
+    Benchmark(
+        "FluxoPagamento.calcular_vpa",
+        caso_fluxo_pagamento,
+        ("idade", "prazo", "dpi", "periodicidade"),
+    ),
+    Benchmark(
+        "Capitalizado.taxa_pura", caso_taxa_pura, ("idade", "prazo", "dpi", "periodicidade")
+    ),
+    Benchmark("calcula_idade", caso_calcula_idade, ("idade", "periodicidade")),
+    Benchmark("calcula_idades", caso_calcula_idades, ("periodicidade",)),
+    Benchmark(
+        "ArrayInfinita.__getitem__",
+        caso_array_infinita,
+        ("prazo", "periodicidade"),
+        vitalicio=False,
+    ),
+    Benchmark(
+        "ArrayInfinitaLote.__getitem__",
+        caso_array_infinita_lote,
+        ("prazo", "periodicidade"),
+        vitalicio=False,
+    ),
+)
+
+
+def cenarios(benchmark: Benchmark) -> list[Cenario]:
+    grade = {
+        "idade": IDADES,
+        "prazo": PRAZOS if benchmark.vitalicio else tuple(p for p in PRAZOS if not isinf(p)),
+        "dpi": (False, True),
+        "periodicidade": PERIODICIDADES,
+    }
+    valores = [
+        grade[campo] if campo in benchmark.dimensoes else grade[campo][:1]
+        for campo in ("idade", "prazo", "dpi", "periodicidade")
+    ]
+    return [Cenario(*combinacao) for combinacao in product(*valores)]
+
+
+def medir(chamada: Callable[[], object], repeticoes: int, tempo_minimo: float) -> dict:
+    """Segundos por chamada em cada repetição. A quantidade de chamadas por repetição é
+    escolhida para que cada repetição dure ao menos tempo_minimo."""
+    temporizador = timeit.Timer(chamada)
+    execucoes = 1
+    while temporizador.timeit(execucoes) < tempo_minimo:
+        execucoes *= 2
+    tempos = [tempo / execucoes for tempo in temporizador.repeat(repeticoes, execucoes)]
+    return {
+        "minimo": min(tempos),
+        "mediana": median(tempos),
+        "execucoes": execucoes,
+        "repeticoes": repeticoes,
+    }
+
+
+def executar(args) -> None:
+    taxas = ler_taxas()
+    premissas = {}
+    resultados = {}
+    for benchmark in BENCHMARKS:
+        for cenario in cenarios(benchmark):
+            nome = f"{benchmark.nome}[{cenario.nome(benchmark.dimensoes)}]"
+            if args.filtro and args.filtro not in nome:
+                continue
+            chave_premissa = (cenario.dpi, cenario.periodicidade)
+            if chave_premissa not in premissas:
+                premissas[chave_premissa] = criar_premissa(taxas, cenario)
+            chamada = benchmark.criar(premissas[chave_premissa], cenario)
+            resultados[nome] = medir(chamada, args.repeticoes, args.tempo_minimo)
+            print(f"{resultados[nome]['minimo'] * 1e6:12.2f} us  {nome}", flush=True)
+
+    saida = {
+        "metadados": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": version("numpy"),
+            "tabatu": version("tabatu"),
+            "plataforma": platform.platform(),
+        },
+        "resultados": resultados,
+    }
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(saida, arquivo, indent=2, ensure_ascii=False)
+    print(f"{len(resultados)} casos gravados em {args.saida}.")
+
+
+def comparar(args) -> None:
+    """Compara o tempo mínimo de cada caso presente nos dois arquivos e termina com erro se
+    algum ficou mais lento que a referência além do limite."""
+    with open(args.referencia, encoding="utf-8") as arquivo:
+        referencia = json.load(arquivo)["resultados"]
+    with open(args.atual, encoding="utf-8") as arquivo:
+        atual = json.load(arquivo)["resultados"]
+
+    regressoes = []
+    for nome in sorted(referencia.keys() & atual.keys()):
+        razao = atual[nome]["minimo"] / referencia[nome]["minimo"]
+        marcador = ""
+        if razao > 1 + args.limite:
+            marcador = "  REGRESSÃO"
+            regressoes.append(nome)
+        elif razao < 1 - args.limite:
+            marcador = "  melhora"
+        print(
+            f"{referencia[nome]['minimo'] * 1e6:12.2f} us {atual[nome]['minimo'] * 1e6:12.2f} us"
+            f" {razao:6.2f}x  {nome}{marcador}"
+        )
+    ausentes = referencia.keys() ^ atual.keys()
+    if ausentes:
+        print(f"{len(ausentes)} casos presentes em apenas um dos arquivos foram ignorados.")
+    if regressoes:
+        print(
+            f"{len(regressoes)} casos mais lentos que a referência além de "
+            f"{args.limite:.0%}.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    parser_executar = comandos.add_parser("executar", help="Executa os benchmarks.")
+    parser_executar.add_argument("--saida", default="benchmark_motor.json")
+    parser_executar.add_argument("--filtro", default=None, help="Trecho do nome dos casos.")
+    parser_executar.add_argument("--repeticoes", type=int, default=5)
+    parser_executar.add_argument(
+        "--tempo-minimo",
+        type=float,
+        default=0.05,
+        help="Duração mínima de cada repetição, em segundos.",
+    )
+    parser_executar.set_defaults(funcao=executar)
+
+    parser_comparar = comandos.add_parser(
+        "comparar", help="Compara dois resultados e aponta regressões."
+    )
+    parser_comparar.add_argument("referencia")
+    parser_comparar.add_argument("atual")
+    parser_comparar.add_argument(
+        "--limite",
+        type=float,
+        default=0.1,
+        help="Aumento relativo do tempo mínimo considerado regressão.",
+    )
+    parser_comparar.set_defaults(funcao=comparar)
+
+    args = parser.parse_args()
+    args.funcao(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Verifica a quantidade de instruções SQL de cada rota em relação ao orçamento.
+
+Cada caso é enviado pelo cliente de teste do Flask duas vezes: com os caches em memória vazios
+(pior caso, comparado com o orçamento da rota em CONSULTAS_ORCAMENTO) e novamente com os
+caches preenchidos. O comando termina com erro se algum caso excede o orçamento, o que indica
+uma consulta N+1, como o carregamento implícito de um relacionamento em um laço.
+
+Por padrão, os casos são executados em um banco de dados novo, criado em um diretório
+temporário; com --banco, em uma cópia do banco informado.
+
+Uso:
+    python -m benchmarks.orcamento_consultas
+    python -m benchmarks.orcamento_consultas --banco /tmp/carga.sqlite3 --saida consultas.json
+"""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from app import create_app
+from model.cache import caches
+from model.instrumentacao import contar_consultas
+from rotas.consultas import pegar_orcamento
+
+PROPOSTA_PECULIO = {
+    "produto_id": 2,
+    "sexo": "M",
+    "data_nascimento": "1990-01-01",
+    "prazo": 10,
+    "beneficio": 100000,
+}
+PROPOSTA_APOSENTADORIA = {
+    "produto_id": 7,
+    "sexo": "F",
+    "data_nascimento": "1980-05-01",
+    "prazo": 30,
+    "prazo_renda": 30,
+    "prazo_certo_renda": 5,
+    "beneficio": 1000,
+}
+
+
+@dataclass(frozen=True)
+class Caso:
+    metodo: str
+    caminho: str
+    form: Optional[dict] = None
+    json: Optional[object] = None
+    cabecalhos: dict = field(default_factory=dict)
+
+
+def contratacao(cpf: int, proposta: dict) -> dict:
+    return {
+        "cpf": cpf,
+        "nome": f"Cliente {cpf}",
+        "email": f"cliente{cpf}@email.com",
+        "data_assinatura": "2024-01-01",
+        **proposta,
+    }
+
+
+CASOS = [
+    Caso("GET", "/produtos"),
+    Caso("GET", "/produtos/1"),
+    Caso("GET", "/produtos/parametros/7"),
+    Caso("POST", "/simular", form=PROPOSTA_PECULIO),
+    Caso("POST", "/simular", form={**PROPOSTA_PECULIO, "prazo": 13}),
+    Caso("POST", "/simular", form=PROPOSTA_APOSENTADORIA),
+    Caso("POST", "/simular/peculio", form=PROPOSTA_PECULIO),
+    Caso("POST", "/simular/aposentadoria", form=PROPOSTA_APOSENTADORIA),
+    Caso("POST", "/simular/lote", json=[PROPOSTA_PECULIO, PROPOSTA_APOSENTADORIA] * 10),
+    Caso("POST", "/simular/curva", form={**PROPOSTA_PECULIO, "produto_id": 1}),
+    Caso("POST", "/simular/curva", form=PROPOSTA_APOSENTADORIA),
+    Caso("POST", "/contratar", form=contratacao(30_000_000_001, PROPOSTA_PECULIO)),
+    Caso(
+        "POST",
+        "/contratar",
+        form=contratacao(30_000_000_002, PROPOSTA_APOSENTADORIA),
+        cabecalhos={"Idempotency-Key": "orcamento-consultas"},
+    ),
+    Caso(
+        "POST",
+        "/contratar/lote",
+        json=[contratacao(30_000_000_100 + i, PROPOSTA_PECULIO) for i in range(20)],
+    ),
+    Caso("GET", "/apolices/1/reservas"),
+]
+
+
+def executar_caso(app, cliente, caso: Caso) -> dict:
+    """Envia o caso com os caches vazios e novamente com os caches preenchidos."""
+    adaptador = app.url_map.bind("localhost")
+    regra, _ = adaptador.match(caso.caminho, method=caso.metodo, return_rule=True)
+    for cache in list(caches.values()):
+        cache.invalidar()
+    quantidades = []
+    for _ in range(2):
+        with contar_consultas() as contagem:
+            resposta = cliente.open(
+                caso.caminho,
+                method=caso.metodo,
+                data=caso.form,
+                json=caso.json,
+                headers=caso.cabecalhos,
+            )
+        quantidades.append(contagem.quantidade)
+    return {
+        "metodo": caso.metodo,
+        "caminho": caso.caminho,
+        "rota": regra.rule,
+        "status": resposta.status_code,
+        "frio": quantidades[0],
+        "quente": quantidades[1],
+        "orcamento": pegar_orcamento(app.config, caso.metodo, regra.rule),
+    }
+
+
+def executar(banco: Optional[Path]) -> list[dict]:
+    with tempfile.TemporaryDirectory() as diretorio:
+        copia = Path(diretorio) / "db.sqlite3"
+        if banco is not None:
+            shutil.copy(banco, copia)
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{copia}",
+                "ARMAZEM_TABUAS": str(Path(diretorio) / "tabuas"),
+                "METRICAS_DIRETORIO": str(Path(diretorio) / "metricas"),
+            }
+        )
+        cliente = app.test_client()
+        return [executar_caso(app, cliente, caso) for caso in CASOS]
+
+
+def excedidos(resultados: list[dict]) -> list[dict]:
+    return [
+        resultado
+        for resultado in resultados
+        if resultado["orcamento"] is not None and resultado["frio"] > resultado["orcamento"]
+    ]
+
+
+def imprimir(resultados: list[dict]) -> None:
+    print(f"{'caso':<32}{'status':>8}{'frio':>8}{'quente':>8}{'orçamento':>11}")
+    for resultado in resultados:
+        orcamento = resultado["orcamento"] if resultado["orcamento"] is not None else "-"
+        caso = f"{resultado['metodo']} {resultado['caminho']}"
+        print(
+            f"{caso:<32}{resultado['status']:>8}{resultado['frio']:>8}"
+            f"{resultado['quente']:>8}{orcamento:>11}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--banco", type=Path, default=None)
+    parser.add_argument("--saida", type=Path, default=None)
+    argumentos = parser.parse_args()
+
+    resultados = executar(argumentos.banco)
+    imprimir(resultados)
+    if argumentos.saida is not None:
+        argumentos.saida.write_text(json.dumps(resultados, indent=2, ensure_ascii=False))
+    acima = excedidos(resultados)
+    if acima:
+        sys.exit(
+            "Acima do orçamento: "
+            + ", ".join(f"{r['metodo']} {r['caminho']} ({r['frio']})" for r in acima)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Verifica o tempo de importação da aplicação contra um orçamento.
+
+Executa, em um processo novo, python -X importtime importando app e chamando create_app com
+a configuração padrão, como um worker que acabou de subir com um banco de dados existente.
+Soma o tempo acumulado dos módulos de primeiro nível e falha se ele excede o orçamento, ou se
+algum dos módulos de cálculo, que devem ser importados apenas na primeira requisição que os
+utiliza, foi importado. O mesmo orçamento é verificado por tests/test_tempo_importacao.py.
+
+Uso:
+    python -m benchmarks.tempo_importacao --orcamento-ms 1000
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+RAIZ = Path(__file__).resolve().parent.parent
+MODULOS_ADIADOS = ("numpy", "tabatu", "src")
+# Módulos de instrumentação do pacote src, que dependem apenas da biblioteca padrão.
+MODULOS_LEVES = ("src", "src.medicao", "src.metricas")
+ORCAMENTO_MS = 1000
+
+
+def medir_importacao(config: Optional[dict] = None) -> tuple[dict[str, int], set[str]]:
+    """Tempo acumulado, em microssegundos, de cada módulo de primeiro nível importado, e
+    os nomes de todos os módulos importados.
+
+    Args:
+        config (dict, optional): Configuração passada a create_app.
+    """
+    ambiente = {**os.environ, "PYTHONPATH": str(RAIZ)}
+    codigo = f"import app; app.create_app({config or {}!r})"
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ,
+        env=ambiente,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    tempos = {}
+    modulos = set()
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, acumulado, nome = linha.removeprefix("import time:").split("|")
+        modulos.add(nome.strip())
+        if nome.startswith("  "):
+            # Importação aninhada, já contabilizada no módulo que a importou.
+            continue
+        tempos[nome.strip()] = int(acumulado)
+    return tempos, modulos
+
+
+def modulos_adiados_importados(modulos: set[str]) -> list[str]:
+    """Módulos de cálculo entre os módulos importados."""
+    return sorted(
+        nome
+        for nome in modulos
+        if any(nome == modulo or nome.startswith(modulo + ".") for modulo in MODULOS_ADIADOS)
+        and nome not in MODULOS_LEVES
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orcamento-ms", type=float, default=ORCAMENTO_MS)
+    parser.add_argument("--maiores", type=int, default=10)
+    args = parser.parse_args()
+
+    tempos, modulos = medir_importacao()
+    total_ms = sum(tempos.values()) / 1000
+    for nome, acumulado in sorted(tempos.items(), key=lambda item: -item[1])[: args.maiores]:
+        print(f"{acumulado / 1000:8.1f} ms  {nome}")
+    print(f"{total_ms:8.1f} ms  total (orçamento {args.orcamento_ms:.0f} ms)")
+
+    falhas = []
+    if total_ms > args.orcamento_ms:
+        falhas.append(f"tempo de importação {total_ms:.0f} ms acima do orçamento.")
+    adiados = modulos_adiados_importados(modulos)
+    if adiados:
+        falhas.append(f"módulos importados na criação da aplicação: {', '.join(adiados)}.")
+    for falha in falhas:
+        print(f"Falha: {falha}", file=sys.stderr)
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+from datetime import date
+from functools import partial
+from pathlib import Path
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from model.database import db
+
+
+def esquema_desatualizado(db) -> bool:
+    """Se alguma tabela ou coluna dos modelos não existe no banco de dados."""
+    from sqlalchemy import inspect
+
+    inspetor = inspect(db.engine)
+    for tabela in db.metadata.sorted_tables:
+        if not inspetor.has_table(tabela.name):
+            return True
+        existentes = {coluna["name"] for coluna in inspetor.get_columns(tabela.name)}
+        if any(coluna.name not in existentes for coluna in tabela.columns):
+            return True
+    return False
+
+
+def inicializar_banco(app) -> None:
+    """Cria o banco de dados, se ainda não existe. Executada na criação da aplicação, no
+    contexto da aplicação, e não altera o esquema de um banco existente.
+
+    Os módulos de cálculo são importados apenas para criar um banco novo. O armazém de tábuas
+    é atualizado na primeira utilização das tábuas em cada processo
+    (model.armazem_tabuas.preparar_armazem_tabuas).
+    """
+    from sqlalchemy import inspect
+
+    from model.database import importar_modelos, init_db
+
+    importar_modelos()
+    if not inspect(db.engine).has_table("produto"):
+        print("Inicializando o banco de dados.")
+        init_db(db)
+    elif esquema_desatualizado(db):
+        app.logger.warning(
+            "O esquema do banco de dados está desatualizado. Execute flask inicializar-banco."
+        )
+
+
+def migrar_banco(app) -> None:
+    """Cria o banco de dados, ou atualiza o esquema de um banco existente: cria as tabelas
+    ausentes, adiciona as colunas das taxas empacotadas, empacota as tábuas e atualiza o
+    armazém. Deve ser chamada no contexto da aplicação."""
+    from sqlalchemy import inspect
+
+    from model.armazem_tabuas import configurar_armazem_tabuas
+    from model.database import importar_modelos, init_db
+    from model.tabua_empacotada import adicionar_colunas_empacotadas, empacotar_tabuas
+
+    importar_modelos()
+    if not inspect(db.engine).has_table("produto"):
+        print("Inicializando o banco de dados.")
+        init_db(db)
+    else:
+        db.create_all()
+        adicionar_colunas_empacotadas(db)
+        empacotar_tabuas(db)
+    configurar_armazem_tabuas(db, Path(app.config["ARMAZEM_TABUAS"]))
+
+
+@click.command("inicializar-banco")
+@with_appcontext
+def inicializar_banco_command():
+    """Cria ou migra o banco de dados, empacota as tábuas e atualiza o armazém."""
+    migrar_banco(current_app)
+
+
+@click.command("empacotar-tabuas")
+@with_appcontext
+def empacotar_tabuas_command():
+    """Empacota as taxas das tábuas que ainda estão apenas no formato de uma linha por idade."""
+    from model.tabua_empacotada import adicionar_colunas_empacotadas, empacotar_tabuas
+
+    adicionar_colunas_empacotadas(db)
+    print(f"{empacotar_tabuas(db)} tábuas empacotadas.")
+
+
+@click.command("construir-armazem")
+@with_appcontext
+def construir_armazem_command():
+    """Reconstrói o armazém de tábuas e remove as versões antigas."""
+    from model.armazem_tabuas import configurar_armazem_tabuas, remover_versoes_antigas
+
+    raiz = Path(current_app.config["ARMAZEM_TABUAS"])
+    armazem = configurar_armazem_tabuas(db, raiz)
+    removidas = remover_versoes_antigas(raiz)
+    print(f"Armazém {armazem.assinatura[:12]} atual, {removidas} versões removidas.")
+
+
+@click.command("limpar-metricas")
+@with_appcontext
+def limpar_metricas_command():
+    """Remove os instantâneos de métricas dos processos. Deve ser executado antes de iniciar os
+    workers."""
+    from src.metricas import limpar_instantaneos
+
+    removidos = limpar_instantaneos(Path(current_app.config["METRICAS_DIRETORIO"]))
+    print(f"{removidos} instantâneos de métricas removidos.")
+
+
+@click.command("gerar-tarifas")
+@with_appcontext
+def gerar_tarifas_command():
+    """Calcula e persiste as tarifas de todos os produtos."""
+    from model.grade_tarifa import gerar_tarifas
+    from model.produto import Produto
+
+    for produto_id in db.session.execute(db.select(Produto.id)).scalars().all():
+        print(f"Produto {produto_id}: {gerar_tarifas(db, produto_id)} grades geradas.")
+
+
+def inicializar_processo_avaliacao(app) -> None:
+    """Disponibiliza o contexto da aplicação em um processo do pool de avaliação."""
+    app.app_context().push()
+    for engine in db.engines.values():
+        engine.dispose(close=False)
+
+
+@click.command("avaliar-carteira")
+@click.option(
+    "--data-base",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="Data base da avaliação (AAAA-MM-DD). Por padrão, a data de hoje.",
+)
+@click.option(
+    "--tamanho-lote",
+    type=int,
+    default=10_000,
+    show_default=True,
+    help="Quantidade de apólices lidas e gravadas por vez.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Quantidade de processos. Quando informado, a carteira é dividida em fatias "
+    "de ids avaliadas em paralelo.",
+)
+@click.option(
+    "--tamanho-fatia",
+    type=click.IntRange(min=1),
+    default=50_000,
+    show_default=True,
+    help="Quantidade de apólices por fatia, com --workers.",
+)
+@click.option(
+    "--tentativas",
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+    help="Tentativas de cada fatia, com --workers.",
+)
+@with_appcontext
+def avaliar_carteira_command(
+    data_base, tamanho_lote, workers, tamanho_fatia, tentativas
+):
+    """Calcula e grava a reserva de todas as apólices na data base."""
+    from model.avaliacao import avaliar_carteira, avaliar_carteira_paralela
+
+    data_base = data_base.date() if data_base is not None else date.today()
+
+    if workers is None:
+
+        def progresso(resumo):
+            click.echo(
+                f"{resumo.quantidade + resumo.ignoradas} apólices processadas "
+                f"({resumo.apolices_por_segundo:.0f} apólices/s)."
+            )
+
+        resumo = avaliar_carteira(db, data_base, tamanho_lote, progresso=progresso)
+    else:
+
+        def progresso(resumo, concluidas, total):
+            click.echo(
+                f"Fatia {concluidas}/{total}: {resumo.quantidade + resumo.ignoradas} "
+                f"apólices processadas ({resumo.apolices_por_segundo:.0f} apólices/s)."
+            )
+
+        try:
+            resumo = avaliar_carteira_paralela(
+                db,
+                data_base,
+                processos=workers,
+                inicializador=partial(
+                    inicializar_processo_avaliacao, current_app._get_current_object()
+                ),
+                tamanho_fatia=tamanho_fatia,
+                tamanho_lote=tamanho_lote,
+                tentativas=tentativas,
+                progresso=progresso,
+            )
+        except RuntimeError as erro:
+            raise click.ClickException(str(erro))
+
+    click.echo(
+        f"Data base {resumo.data_base}: {resumo.quantidade} apólices avaliadas, "
+        f"{resumo.ignoradas} ignoradas, reserva total {resumo.reserva_total:.2f}, "
+        f"{resumo.segundos:.1f}s ({resumo.apolices_por_segundo:.0f} apólices/s)."
+    )
+
+
+comandos = [
+    inicializar_banco_command,
+    empacotar_tabuas_command,
+    construir_armazem_command,
+    limpar_metricas_command,
+    gerar_tarifas_command,
+    avaliar_carteira_command,
+]
@@ -0,0 +1,333 @@
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from hashlib import sha256
+from itertools import product
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+import tabatu as tb
+from flask import current_app
+from numpy import asarray, float64, isfinite, load, save, stack
+from numpy.typing import NDArray
+from sqlalchemy import select
+
+from model import database
+from model.armazenamento import engine_leitura, executar_em_segundo_plano
+from model.cache import invalidar_apos_commit
+from model.produto import Juros, ProdutoTabua, TipoTabua
+from model.tabua import Tabua, Taxa
+from model.tabua_empacotada import desempacotar_taxas
+from src.comutacao.tabela_comutacao import (
+    ChaveComutacao,
+    TabelaComutacao,
+    calcular_tabela_comutacao,
+    registrar_fonte_tabela_comutacao,
+)
+
+VERSAO_ARMAZEM = 2
+# Arquivo, na raiz do armazém, com o nome do diretório da versão atual.
+ARQUIVO_ATUAL = "ATUAL"
+# Tipos de tábua combinados em uma tábua de múltiplos decrementos, como em pegar_tabua_mdt.
+TIPOS_MDT = ("Sinistro", "DPI")
+
+
+@dataclass(frozen=True)
+class DadosArmazem:
+    """Dados do banco de dados dos quais o armazém é derivado.
+
+    Args:
+        tabuas (dict[int, NDArray]): Taxas de cada tábua, pelo id.
+        juros (dict[int, float]): Taxa de cada juros, pelo id.
+        mdts (list[tuple[int, ...]]): Combinações de tábuas usadas como múltiplos decrementos.
+    """
+
+    tabuas: dict[int, NDArray[float64]]
+    juros: dict[int, float]
+    mdts: list[tuple[int, ...]]
+
+    @property
+    def assinatura(self) -> str:
+        conteudo = sha256(f"versao={VERSAO_ARMAZEM}".encode())
+        for tabua_id, taxas in sorted(self.tabuas.items()):
+            conteudo.update(f"|tabua={tabua_id}|".encode())
+            conteudo.update(asarray(taxas, dtype="<f8").tobytes())
+        for juros_id, taxa in sorted(self.juros.items()):
+            conteudo.update(f"|juros={juros_id}={taxa!r}".encode())
+        conteudo.update(f"|mdts={sorted(self.mdts)}".encode())
+        return conteudo.hexdigest()
+
+
+def ler_dados_armazem(conexao) -> DadosArmazem:
+    """Lê as tábuas, os juros e as combinações de múltiplos decrementos dos produtos."""
+    tabuas = {}
+    for tabua in conexao.execute(
+        select(Tabua.id, Tabua.taxas, Tabua.dtypeTaxas, Tabua.versaoTaxas)
+    ):
+        if tabua.taxas is not None:
+            tabuas[tabua.id] = desempacotar_taxas(*tabua[1:])
+        else:
+            taxas = conexao.execute(
+                select(Taxa.taxa).where(Taxa.tabuaId == tabua.id).order_by(Taxa.idade)
+            ).scalars()
+            tabuas[tabua.id] = asarray(list(taxas), dtype=float64)
+    tabuas = {id: taxas for id, taxas in tabuas.items() if len(taxas) > 0}
+
+    juros = dict(conexao.execute(select(Juros.id, Juros.juros)).all())
+
+    tipos_produto = {}
+    for produto_id, sexo, tipo, tabua_id in conexao.execute(
+        select(
+            ProdutoTabua.produtoId, ProdutoTabua.sexo, TipoTabua.nome, ProdutoTabua.tabuaId
+        ).join(TipoTabua, TipoTabua.id == ProdutoTabua.tipoTabuaId)
+    ):
+        tipos_produto.setdefault((produto_id, sexo), {})[tipo] = tabua_id
+    mdts = {
+        tuple(tipos[tipo] for tipo in TIPOS_MDT)
+        for tipos in tipos_produto.values()
+        if all(tipo in tipos for tipo in TIPOS_MDT)
+    }
+    return DadosArmazem(tabuas=tabuas, juros=juros, mdts=sorted(mdts))
+
+
+def criar_tabua(dados: DadosArmazem, tabua_ids: tuple[int, ...]):
+    tabuas = [tb.Tabua(dados.tabuas[tabua_id]) for tabua_id in tabua_ids]
+    return tabuas[0] if len(tabuas) == 1 else tb.TabuaMDT(*tabuas)
+
+
+def colunas_comutacao(tabela: TabelaComutacao) -> NDArray[float64]:
+    return stack(
+        [
+            tabela.lx,
+            tabela.dx,
+            tabela.Dx,
+            tabela.Nx,
+            tabela.Cx,
+            tabela.Mx,
+            tabela.desconto,
+            tabela.desconto_acumulado,
+        ]
+    )
+
+
+def gravar_versao(diretorio: Path, dados: DadosArmazem) -> None:
+    """Calcula e grava as tabelas de comutação e o índice da versão no diretório.
+
+    As taxas das tábuas e os fatores de desconto não são gravados: o tabatu copia as taxas para
+    a sua própria memória ao construir uma tábua, então vetores mapeados não seriam
+    compartilhados, e as tábuas continuam sendo construídas a partir das taxas empacotadas.
+    As tabelas de comutação, ao contrário, são usadas diretamente a partir do mapeamento.
+    """
+    indice = {"versao": VERSAO_ARMAZEM, "assinatura": dados.assinatura, "comutacao": {}}
+
+    # Funções de comutação exigem tábuas com fim, como tábuas de mortalidade.
+    combinacoes = [
+        tabua_ids
+        for tabua_ids in [(tabua_id,) for tabua_id in dados.tabuas] + list(dados.mdts)
+        if isfinite(
+            criar_tabua(dados, tabua_ids).tempo_futuro_maximo([0] * len(tabua_ids))
+        )
+    ]
+    for tabua_ids, taxa, imediato in product(
+        combinacoes, set(dados.juros.values()), (False, True)
+    ):
+        chave = ChaveComutacao(
+            criar_tabua(dados, tabua_ids), tb.JurosConstante(taxa), imediato
+        )
+        arquivo = f"comutacao_{chave.assinatura}.npy"
+        save(diretorio / arquivo, colunas_comutacao(calcular_tabela_comutacao(chave)))
+        indice["comutacao"][chave.assinatura] = arquivo
+
+    with open(diretorio / "indice.json", "w", encoding="utf-8") as arquivo:
+        json.dump(indice, arquivo)
+
+
+def substituir_arquivo(caminho: Path, conteudo: str) -> None:
+    """Substitui o conteúdo do arquivo de forma atômica."""
+    temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}")
+    temporario.write_text(conteudo, encoding="utf-8")
+    os.replace(temporario, caminho)
+
+
+def construir_armazem(raiz: Path, dados: DadosArmazem) -> Path:
+    """Grava a versão do armazém correspondente aos dados e a torna a versão atual.
+
+    A versão é gravada em um diretório temporário, renomeado para o nome definitivo apenas
+    quando completo, e o arquivo ATUAL é substituído de forma atômica. Leitores nunca
+    observam uma versão incompleta, e processos que mantêm a versão anterior aberta não são
+    afetados.
+
+    Returns:
+        Path: Diretório da versão.
+    """
+    raiz.mkdir(parents=True, exist_ok=True)
+    destino = raiz / dados.assinatura
+    if not destino.exists():
+        temporario = Path(tempfile.mkdtemp(prefix=".construcao-", dir=raiz))
+        try:
+            gravar_versao(temporario, dados)
+            os.rename(temporario, destino)
+        except OSError:
+            # Outro processo gravou a mesma versão ao mesmo tempo.
+            if not destino.exists():
+                raise
+        finally:
+            shutil.rmtree(temporario, ignore_errors=True)
+    atual = raiz / ARQUIVO_ATUAL
+    if not atual.exists() or atual.read_text(encoding="utf-8") != dados.assinatura:
+        substituir_arquivo(atual, dados.assinatura)
+    return destino
+
+
+def remover_versoes_antigas(raiz: Path) -> int:
+    """Remove as versões diferentes da atual. Processos que ainda as mantêm mapeadas
+    continuam lendo os arquivos até fechá-los."""
+    atual = (raiz / ARQUIVO_ATUAL).read_text(encoding="utf-8")
+    removidas = 0
+    for diretorio in raiz.iterdir():
+        if (
+            diretorio.is_dir()
+            and diretorio.name != atual
+            and not diretorio.name.startswith(".")
+        ):
+            shutil.rmtree(diretorio, ignore_errors=True)
+            removidas += 1
+    return removidas
+
+
+@dataclass(frozen=True)
+class ArmazemTabuas:
+    """Versão do armazém aberta somente para leitura.
+
+    Os vetores são abertos com numpy.load(mmap_mode="r"), de forma que as páginas são
+    compartilhadas entre os processos pelo cache do sistema operacional.
+    """
+
+    diretorio: Path
+    indice: dict
+    _vetores: dict = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def assinatura(self) -> str:
+        return self.indice["assinatura"]
+
+    def vetor(self, arquivo: str) -> NDArray[float64]:
+        if arquivo not in self._vetores:
+            self._vetores[arquivo] = load(self.diretorio / arquivo, mmap_mode="r")
+        return self._vetores[arquivo]
+
+    def tabela_comutacao(self, chave: ChaveComutacao) -> Optional[TabelaComutacao]:
+        """Tabela de comutação gravada para a chave, ou None se ela não está no armazém."""
+        arquivo = self.indice["comutacao"].get(chave.assinatura)
+        if arquivo is None:
+            return None
+        return TabelaComutacao(*self.vetor(arquivo))
+
+
+def abrir_armazem(raiz: Path) -> Optional[ArmazemTabuas]:
+    """Abre a versão atual do armazém, ou retorna None se ele ainda não foi construído."""
+    try:
+        assinatura = (raiz / ARQUIVO_ATUAL).read_text(encoding="utf-8")
+        diretorio = raiz / assinatura
+        with open(diretorio / "indice.json", encoding="utf-8") as arquivo:
+            indice = json.load(arquivo)
+    except FileNotFoundError:
+        return None
+    if indice["versao"] != VERSAO_ARMAZEM:
+        return None
+    return ArmazemTabuas(diretorio=diretorio, indice=indice)
+
+
+class ArmazemAtual:
+    """Mantém aberta a versão atual do armazém e a reabre quando o arquivo ATUAL muda,
+    inclusive quando ele é atualizado por outro processo."""
+
+    def __init__(self, raiz: Path):
+        self.raiz = raiz
+        self._marca = None
+        self._armazem: Optional[ArmazemTabuas] = None
+
+    def pegar(self) -> Optional[ArmazemTabuas]:
+        try:
+            marca = (self.raiz / ARQUIVO_ATUAL).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if marca != self._marca:
+            self._armazem = abrir_armazem(self.raiz)
+            self._marca = marca
+        return self._armazem
+
+    def tabela_comutacao(self, chave: ChaveComutacao) -> Optional[TabelaComutacao]:
+        armazem = self.pegar()
+        return None if armazem is None else armazem.tabela_comutacao(chave)
+
+
+armazem_atual: Optional[ArmazemAtual] = None
+
+
+def configurar_armazem_tabuas(db, raiz: Path) -> Optional[ArmazemTabuas]:
+    """Atualiza o armazém a partir do banco de dados e o registra como fonte das tabelas
+    de comutação do processo. Deve ser chamada no contexto da aplicação."""
+    global armazem_atual
+    with engine_leitura(db).connect() as conexao:
+        construir_armazem(raiz, ler_dados_armazem(conexao))
+    if armazem_atual is None:
+        armazem_atual = ArmazemAtual(raiz)
+        registrar_fonte_tabela_comutacao(armazem_atual.tabela_comutacao)
+    else:
+        armazem_atual.raiz = raiz
+    return armazem_atual.pegar()
+
+
+lock_preparacao = Lock()
+
+
+def preparar_armazem_tabuas(db) -> None:
+    """Configura o armazém do processo na primeira utilização das tábuas, com o diretório
+    ARMAZEM_TABUAS da aplicação atual, de forma que a criação da aplicação não importa os
+    módulos de cálculo. Chamadas seguintes não fazem nada."""
+    if armazem_atual is not None:
+        return
+    with lock_preparacao:
+        if armazem_atual is None:
+            configurar_armazem_tabuas(db, Path(current_app.config["ARMAZEM_TABUAS"]))
+
+
+# Se uma reconstrução já foi agendada e ainda não começou, o que torna desnecessário agendar
+# outra.
+reconstrucao_pendente = False
+lock_reconstrucao = Lock()
+
+
+def reconstruir_armazem() -> None:
+    """Reconstrói o armazém a partir do banco de dados, pelo pool de leitura."""
+    global reconstrucao_pendente
+    with lock_reconstrucao:
+        reconstrucao_pendente = False
+    with engine_leitura(database.db).connect() as conexao:
+        construir_armazem(armazem_atual.raiz, ler_dados_armazem(conexao))
+
+
+def agendar_reconstrucao_armazem() -> None:
+    """Agenda a reconstrução do armazém após o commit de uma alteração nas tábuas ou juros.
+
+    A reconstrução é executada em segundo plano, e não na thread da requisição que fez o
+    commit. Commits feitos antes do início de uma reconstrução já agendada são atendidos por
+    ela, de forma que uma sequência de alterações resulta em poucas reconstruções.
+    """
+    global reconstrucao_pendente
+    if armazem_atual is None:
+        return
+    with lock_reconstrucao:
+        if reconstrucao_pendente:
+            return
+        reconstrucao_pendente = True
+    executar_em_segundo_plano(reconstruir_armazem)
+
+
+invalidar_apos_commit(
+    (Tabua, Taxa, Juros, ProdutoTabua, TipoTabua), agendar_reconstrucao_armazem
+)
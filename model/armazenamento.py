@@ -0,0 +1,167 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Union
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+# Nome do bind do Flask-SQLAlchemy usado pelas consultas somente leitura.
+BIND_LEITURA = "leitura"
+
+
+@dataclass(frozen=True)
+class PerfilArmazenamento:
+    """Configuração do banco de dados e dos pools de conexões.
+
+    Args:
+        pragmas (dict): PRAGMAs aplicados a cada nova conexão SQLite, na ordem informada.
+        tamanho_pool_leitura (int, optional): Tamanho do pool das consultas somente leitura.
+            Se None, as leituras utilizam o mesmo pool das escritas.
+        escritor_unico (bool): Se as escritas utilizam um pool com uma única conexão, o que
+            enfileira as escritas do processo em vez de disputar o lock do SQLite.
+    """
+
+    pragmas: dict[str, Union[int, str]] = field(default_factory=dict)
+    tamanho_pool_leitura: Optional[int] = None
+    escritor_unico: bool = False
+
+
+PERFIS = {
+    # Configuração padrão do SQLite, com um único pool.
+    "compatibilidade": PerfilArmazenamento(),
+    # Leituras não são bloqueadas pelas escritas (WAL) e esperam pelo lock em vez de falhar.
+    "concorrente": PerfilArmazenamento(
+        pragmas={
+            "busy_timeout": 5000,
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 256 * 1024 * 1024,
+            "cache_size": -64 * 1024,
+        },
+        tamanho_pool_leitura=8,
+        escritor_unico=True,
+    ),
+}
+
+
+def pegar_perfil(nome: str) -> PerfilArmazenamento:
+    """Perfil de armazenamento com o nome informado.
+
+    Raises:
+        ValueError: Se o perfil não existe.
+    """
+    try:
+        return PERFIS[nome]
+    except KeyError:
+        raise ValueError(f"Perfil de armazenamento {nome} não existe.") from None
+
+
+def eh_sqlite_arquivo(url: str) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def opcoes_engine(perfil: PerfilArmazenamento, url: str) -> dict:
+    """Opções de create_engine do pool de escrita.
+
+    Com um único escritor, a conexão de escrita deve ser usada apenas pelas transações que
+    gravam: as consultas somente leitura passam por executar_leitura, e as gravações que não
+    precisam terminar antes da resposta, por executar_em_segundo_plano.
+    """
+    if perfil.escritor_unico and eh_sqlite_arquivo(url):
+        return {"pool_size": 1, "max_overflow": 0}
+    return {}
+
+
+def opcoes_engine_leitura(perfil: PerfilArmazenamento) -> dict:
+    """Opções de create_engine do pool de leitura."""
+    return {"pool_size": perfil.tamanho_pool_leitura, "max_overflow": 0}
+
+
+def registrar_pragmas(engine: Engine, pragmas: dict[str, Union[int, str]]) -> None:
+    """Aplica os PRAGMAs a cada nova conexão do engine, se ele for SQLite."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def aplicar_pragmas(conexao_dbapi, registro_conexao) -> None:
+        cursor = conexao_dbapi.cursor()
+        for pragma, valor in pragmas.items():
+            cursor.execute(f"PRAGMA {pragma}={valor}")
+        cursor.close()
+
+
+def configurar_armazenamento(app, nome_perfil: str) -> PerfilArmazenamento:
+    """Configura os engines do Flask-SQLAlchemy de acordo com o perfil.
+
+    Deve ser chamada antes de db.init_app. O pool de leitura é criado apenas para bancos
+    SQLite em arquivo, já que um banco em memória não é compartilhado entre conexões.
+    """
+    perfil = pegar_perfil(nome_perfil)
+    url = app.config["SQLALCHEMY_DATABASE_URI"]
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **opcoes_engine(perfil, url),
+        **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+    }
+    if perfil.tamanho_pool_leitura is not None and eh_sqlite_arquivo(url):
+        app.config.setdefault("SQLALCHEMY_BINDS", {})[BIND_LEITURA] = {
+            "url": url,
+            **opcoes_engine_leitura(perfil),
+        }
+    return perfil
+
+
+def aplicar_pragmas_engines(db, perfil: PerfilArmazenamento) -> None:
+    """Registra os PRAGMAs do perfil em todos os engines. Exige o contexto da aplicação e
+    deve ser chamada antes da primeira conexão."""
+    for engine in db.engines.values():
+        registrar_pragmas(engine, perfil.pragmas)
+
+
+def engine_leitura(db) -> Engine:
+    """Engine das consultas somente leitura, ou o engine padrão se não houver pool de leitura."""
+    return db.engines.get(BIND_LEITURA, db.engine)
+
+
+def executar_leitura(db, query):
+    """Executa uma consulta somente leitura no pool de leitura, na sessão atual."""
+    return db.session.execute(query, bind_arguments={"bind": engine_leitura(db)})
+
+
+# Executor das gravações adiadas do processo, com o pid em que foi criado, já que as threads
+# não sobrevivem a um fork.
+executor_segundo_plano: Optional[tuple[int, ThreadPoolExecutor]] = None
+
+
+def pegar_executor_segundo_plano() -> ThreadPoolExecutor:
+    global executor_segundo_plano
+    if executor_segundo_plano is None or executor_segundo_plano[0] != os.getpid():
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="segundo_plano")
+        executor_segundo_plano = (os.getpid(), executor)
+    return executor_segundo_plano[1]
+
+
+def executar_em_segundo_plano(funcao: Callable, *args) -> Future:
+    """Executa a função em uma thread do processo, no contexto da aplicação atual.
+
+    Usada para gravações que não precisam terminar antes da resposta, de forma que a
+    requisição não espera pela conexão de escrita. As funções são executadas uma de cada vez,
+    na ordem de chegada, e falhas são registradas no log.
+    """
+    app = current_app._get_current_object()
+
+    def executar():
+        with app.app_context():
+            try:
+                return funcao(*args)
+            except Exception:
+                app.logger.exception("Falha na execução de %s em segundo plano.", funcao.__name__)
+
+    return pegar_executor_segundo_plano().submit(executar)
+
+
+def aguardar_segundo_plano() -> None:
+    """Aguarda o fim das funções já enviadas para execução em segundo plano."""
+    pegar_executor_segundo_plano().submit(lambda: None).result()
@@ -0,0 +1,466 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date
+from time import perf_counter
+from typing import Callable, Iterable, Optional
+
+from numpy import arange, asarray, float64, full, int64, isnan, minimum, nan, rint, zeros
+from numpy.typing import ArrayLike, NDArray
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import NoResultFound
+from tabatu.periodicidade import Periodicidade
+
+from model import database
+from model.armazenamento import executar_leitura
+from model.contratos import criar_contrato
+from model.grade_tarifa import (
+    PremissasGrade,
+    datas_nascimento_idades,
+    pegar_premissas_grade,
+)
+from model.reserva import Reserva
+from model.segurado import Matricula, Segurado
+from src.idades_prazos import calcula_idades
+
+
+@dataclass(frozen=True)
+class GradeReserva:
+    """Reserva por unidade de benefício, indexada pela idade de ingresso e pelo tempo decorrido.
+
+    Args:
+        periodicidade (Periodicidade): Periodicidade das idades e dos tempos.
+        reservas (NDArray[float64]): Matriz (idade × tempo). Idades que não podem contratar o
+            produto possuem nan, e a última coluna, usada após o fim da cobertura, é zero.
+    """
+
+    periodicidade: Periodicidade
+    reservas: NDArray[float64]
+
+    def reserva(
+        self, idades: ArrayLike, tempos: ArrayLike, beneficios: ArrayLike
+    ) -> NDArray[float64]:
+        """Reserva de cada apólice, com nan para as apólices que a grade não cobre."""
+        idades = asarray(idades, dtype=int64)
+        tempos = asarray(tempos, dtype=int64)
+        beneficios = asarray(beneficios, dtype=float64)
+        numero_idades, numero_tempos = self.reservas.shape
+        valido = (idades >= 0) & (idades < numero_idades) & (tempos >= 0)
+        resultado = full(idades.shape, nan)
+        resultado[valido] = (
+            self.reservas[idades[valido], minimum(tempos[valido], numero_tempos - 1)]
+            * beneficios[valido]
+        )
+        return resultado
+
+
+def construir_grade_reserva(
+    premissas: PremissasGrade,
+    prazo: int,
+    prazo_renda: int = 0,
+    prazo_certo_renda: int = 0,
+) -> GradeReserva:
+    """Calcula a curva de reservas de um contrato com benefício unitário para cada idade."""
+    tabua = next(iter(premissas.tabuas.values()))
+    periodicidade = tabua.periodicidade
+    data_assinatura = date.today()
+    idades = arange(int(tabua.tempo_futuro_maximo([0] * len(tabua.tabuas))) + 1)
+    datas_nascimento = datas_nascimento_idades(data_assinatura, idades, periodicidade)
+
+    curvas = []
+    for data_nascimento in datas_nascimento:
+        try:
+            contrato = criar_contrato(
+                premissas,
+                data_assinatura=data_assinatura,
+                data_nascimento=data_nascimento,
+                prazo=prazo,
+                prazo_renda=prazo_renda,
+                prazo_certo_renda=prazo_certo_renda,
+            )
+            curvas.append(contrato.reserva_curva())
+        except ValueError:
+            curvas.append(None)
+
+    largura = max((len(curva) for curva in curvas if curva is not None), default=0)
+    reservas = zeros((len(idades), largura + 1))
+    for idade, curva in enumerate(curvas):
+        if curva is None:
+            reservas[idade] = nan
+        else:
+            reservas[idade, : len(curva)] = curva
+    return GradeReserva(periodicidade=periodicidade, reservas=reservas)
+
+
+@dataclass
+class ResumoAvaliacao:
+    """Resumo de uma avaliação da carteira.
+
+    Args:
+        data_base (date): Data base da avaliação.
+        quantidade (int): Quantidade de apólices avaliadas.
+        ignoradas (int): Quantidade de apólices que não puderam ser avaliadas.
+        reserva_total_centavos (int): Soma das reservas das apólices avaliadas, em centavos.
+            A soma de inteiros não depende da ordem, então o total é o mesmo qualquer que
+            seja a divisão da carteira.
+        segundos (float): Duração da avaliação.
+    """
+
+    data_base: date
+    quantidade: int = 0
+    ignoradas: int = 0
+    reserva_total_centavos: int = 0
+    segundos: float = 0.0
+
+    @property
+    def reserva_total(self) -> float:
+        return self.reserva_total_centavos / 100
+
+    def adicionar(self, reservas: list[dict], ignoradas: int) -> None:
+        """Acumula as reservas de um lote no resumo."""
+        self.quantidade += len(reservas)
+        self.ignoradas += ignoradas
+        if reservas:
+            valores = asarray([reserva["reserva"] for reserva in reservas])
+            self.reserva_total_centavos += int(rint(valores * 100).astype(int64).sum())
+
+    @property
+    def apolices_por_segundo(self) -> float:
+        if self.segundos == 0:
+            return 0.0
+        return (self.quantidade + self.ignoradas) / self.segundos
+
+
+def combinar_resumos(
+    data_base: date, resumos: Iterable[ResumoAvaliacao]
+) -> ResumoAvaliacao:
+    """Combina os resumos de várias fatias da carteira."""
+    resumo = ResumoAvaliacao(data_base=data_base)
+    for parcial in resumos:
+        resumo.quantidade += parcial.quantidade
+        resumo.ignoradas += parcial.ignoradas
+        resumo.reserva_total_centavos += parcial.reserva_total_centavos
+    return resumo
+
+
+def pegar_grade_reserva(
+    db, grades: dict, chave: tuple
+) -> Optional[GradeReserva]:
+    """Grade de reservas de um grupo de apólices, construída uma única vez por avaliação.
+
+    Retorna None quando o produto, o prazo ou os parâmetros do grupo não são válidos.
+    """
+    if chave not in grades:
+        produto_id, sexo, prazo, prazo_renda, prazo_certo_renda = chave
+        try:
+            premissas = pegar_premissas_grade(db, produto_id, sexo, prazo)
+            if premissas.formula == "aposentadoria" and prazo_renda is None:
+                raise ValueError("A aposentadoria deve possuir prazo de renda.")
+            grades[chave] = construir_grade_reserva(
+                premissas, prazo, prazo_renda or 0, prazo_certo_renda or 0
+            )
+        except (NoResultFound, ValueError):
+            grades[chave] = None
+    return grades[chave]
+
+
+def avaliar_lote(
+    db, grades: dict, data_base: date, apolices: list
+) -> tuple[list[dict], int]:
+    """Calcula a reserva de um lote de apólices, agrupando-as por produto, sexo e prazos.
+
+    Returns:
+        tuple[list[dict], int]: Reservas no formato da tabela reserva e a quantidade de
+            apólices ignoradas.
+    """
+    grupos: dict[tuple, list] = {}
+    for apolice in apolices:
+        chave = (
+            apolice.produtoId,
+            apolice.sexo,
+            apolice.prazo,
+            apolice.prazoRenda,
+            apolice.prazoCertoRenda,
+        )
+        grupos.setdefault(chave, []).append(apolice)
+
+    reservas = []
+    ignoradas = 0
+    for chave, grupo in grupos.items():
+        grade = pegar_grade_reserva(db, grades, chave)
+        if grade is None:
+            ignoradas += len(grupo)
+            continue
+        datas_assinatura = [apolice.dataAssinatura for apolice in grupo]
+        idades = calcula_idades(
+            [apolice.dataNascimento for apolice in grupo],
+            datas_assinatura,
+            grade.periodicidade,
+        )
+        tempos = calcula_idades(datas_assinatura, data_base, grade.periodicidade)
+        valores = grade.reserva(
+            idades, tempos, [apolice.beneficio for apolice in grupo]
+        )
+        for apolice, tempo, valor in zip(grupo, tempos.tolist(), valores.tolist()):
+            if isnan(valor):
+                ignoradas += 1
+                continue
+            reservas.append(
+                {
+                    "dataBase": data_base,
+                    "matriculaId": apolice.id,
+                    "tempoDecorrido": tempo,
+                    "reserva": valor,
+                }
+            )
+    return reservas, ignoradas
+
+
+def consultar_apolices(id_inicio: Optional[int] = None, id_fim: Optional[int] = None):
+    """Consulta as apólices, com os dados do segurado, em ordem de id."""
+    query = (
+        select(
+            Matricula.id,
+            Matricula.produtoId,
+            Matricula.prazo,
+            Matricula.prazoRenda,
+            Matricula.prazoCertoRenda,
+            Matricula.dataAssinatura,
+            Matricula.beneficio,
+            Segurado.sexo,
+            Segurado.dataNascimento,
+        )
+        .join(Segurado, Segurado.cpf == Matricula.cpfSegurado)
+        .order_by(Matricula.id)
+    )
+    if id_inicio is not None:
+        query = query.where(Matricula.id >= id_inicio)
+    if id_fim is not None:
+        query = query.where(Matricula.id <= id_fim)
+    return query
+
+
+def remover_reservas(
+    db, data_base: date, id_inicio: Optional[int] = None, id_fim: Optional[int] = None
+) -> None:
+    """Remove as reservas da data base das matrículas no intervalo de ids."""
+    query = delete(Reserva).where(Reserva.dataBase == data_base)
+    if id_inicio is not None:
+        query = query.where(Reserva.matriculaId >= id_inicio)
+    if id_fim is not None:
+        query = query.where(Reserva.matriculaId <= id_fim)
+    db.session.execute(query)
+
+
+def avaliar_carteira(
+    db,
+    data_base: date,
+    tamanho_lote: int = 10_000,
+    progresso: Optional[Callable[[ResumoAvaliacao], None]] = None,
+) -> ResumoAvaliacao:
+    """Calcula e grava a reserva de todas as apólices da carteira na data base.
+
+    As apólices são lidas em lotes de tamanho_lote, em ordem de id e a partir do último id do
+    lote anterior, de forma que o uso de memória não depende do tamanho da carteira. As grades
+    de reserva são construídas uma única vez por produto, sexo e prazos, e as reservas de cada
+    lote são gravadas com um único insert em lote e confirmadas em seguida, o que mantém as
+    transações, e o WAL do SQLite, limitados ao tamanho do lote. Reservas anteriores da mesma
+    data base são removidas antes do primeiro lote; se a avaliação for interrompida, os lotes
+    já gravados permanecem, e uma nova avaliação da data base os substitui.
+
+    Args:
+        db: Instância do banco de dados.
+        data_base (date): Data base da avaliação.
+        tamanho_lote (int, optional): Quantidade de apólices lidas e gravadas por vez.
+        progresso (Callable, optional): Chamado com o resumo parcial após cada lote.
+
+    Returns:
+        ResumoAvaliacao: Resumo da avaliação.
+    """
+    inicio = perf_counter()
+    resumo = ResumoAvaliacao(data_base=data_base)
+    remover_reservas(db, data_base)
+    db.session.commit()
+
+    grades: dict = {}
+    id_inicio = None
+    while True:
+        query = consultar_apolices(id_inicio).limit(tamanho_lote)
+        apolices = executar_leitura(db, query).all()
+        if not apolices:
+            break
+        reservas, ignoradas = avaliar_lote(db, grades, data_base, apolices)
+        if reservas:
+            db.session.execute(insert(Reserva), reservas)
+        db.session.commit()
+        id_inicio = apolices[-1].id + 1
+        resumo.adicionar(reservas, ignoradas)
+        resumo.segundos = perf_counter() - inicio
+        if progresso is not None:
+            progresso(resumo)
+
+    resumo.segundos = perf_counter() - inicio
+    return resumo
+
+
+def fatiar_carteira(db, tamanho_fatia: int) -> list[tuple[int, Optional[int]]]:
+    """Divide a carteira em intervalos de ids com tamanho_fatia apólices cada.
+
+    As fatias dependem apenas da carteira e de tamanho_fatia, e não da quantidade de
+    processos, de forma que o resultado da avaliação é sempre o mesmo.
+
+    Returns:
+        list[tuple[int, Optional[int]]]: Primeiro e último id de cada fatia. A última fatia
+            não possui limite superior.
+    """
+    numero = func.row_number().over(order_by=Matricula.id).label("numero")
+    ids = select(Matricula.id, numero).subquery()
+    query = (
+        select(ids.c.id).where((ids.c.numero - 1) % tamanho_fatia == 0).order_by(ids.c.id)
+    )
+    inicios = db.session.execute(query).scalars().all()
+    fins = [proximo - 1 for proximo in inicios[1:]] + [None]
+    return list(zip(inicios, fins))
+
+
+def avaliar_fatia(
+    db,
+    data_base: date,
+    id_inicio: int,
+    id_fim: Optional[int],
+    tamanho_lote: int = 10_000,
+    grades: Optional[dict] = None,
+) -> ResumoAvaliacao:
+    """Calcula e grava a reserva das apólices de uma fatia da carteira.
+
+    A fatia é lida e calculada por completo antes da gravação, de forma que a transação de
+    escrita é curta e vários processos podem avaliar fatias ao mesmo tempo.
+    """
+    inicio = perf_counter()
+    resumo = ResumoAvaliacao(data_base=data_base)
+    grades = {} if grades is None else grades
+    apolices = db.session.execute(consultar_apolices(id_inicio, id_fim)).all()
+    db.session.rollback()
+
+    reservas = []
+    for posicao in range(0, len(apolices), tamanho_lote):
+        reservas_lote, ignoradas = avaliar_lote(
+            db, grades, data_base, apolices[posicao : posicao + tamanho_lote]
+        )
+        reservas.extend(reservas_lote)
+        resumo.adicionar(reservas_lote, ignoradas)
+
+    try:
+        remover_reservas(db, data_base, id_inicio, id_fim)
+        if reservas:
+            db.session.execute(insert(Reserva), reservas)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    resumo.segundos = perf_counter() - inicio
+    return resumo
+
+
+_grades_processo: dict = {}
+
+
+def _avaliar_fatia_processo(
+    data_base: date, id_inicio: int, id_fim: Optional[int], tamanho_lote: int
+) -> ResumoAvaliacao:
+    """Avalia uma fatia em um processo do pool, reaproveitando as grades do processo."""
+    return avaliar_fatia(
+        database.db, data_base, id_inicio, id_fim, tamanho_lote, _grades_processo
+    )
+
+
+def avaliar_carteira_paralela(
+    db,
+    data_base: date,
+    processos: int,
+    inicializador: Callable[[], None],
+    tamanho_fatia: int = 50_000,
+    tamanho_lote: int = 10_000,
+    tentativas: int = 3,
+    progresso: Optional[Callable[[ResumoAvaliacao, int, int], None]] = None,
+) -> ResumoAvaliacao:
+    """Calcula e grava a reserva de todas as apólices, dividindo a carteira entre processos.
+
+    A carteira é dividida em fatias de ids, avaliadas por um ProcessPoolExecutor. Cada
+    processo constrói as suas grades de reserva uma única vez e as reutiliza em todas as
+    fatias que avaliar. Fatias com falha são avaliadas novamente, em um novo pool, até
+    tentativas vezes. Os resumos são combinados na ordem das fatias e a reserva total é
+    somada em centavos, então o resultado não depende da quantidade de processos.
+
+    Args:
+        db: Instância do banco de dados.
+        data_base (date): Data base da avaliação.
+        processos (int): Quantidade de processos. Com 1, as fatias são avaliadas no
+            próprio processo.
+        inicializador (Callable): Executado em cada processo do pool antes da primeira
+            fatia. Deve disponibilizar um contexto da aplicação, com o banco de dados.
+        tamanho_fatia (int, optional): Quantidade de apólices por fatia.
+        tamanho_lote (int, optional): Quantidade de apólices calculadas por vez.
+        tentativas (int, optional): Quantidade máxima de tentativas de cada fatia.
+        progresso (Callable, optional): Chamado com o resumo parcial, a quantidade de fatias
+            concluídas e o total de fatias, após cada fatia.
+
+    Returns:
+        ResumoAvaliacao: Resumo da avaliação.
+
+    Raises:
+        RuntimeError: Se alguma fatia falhar em todas as tentativas. As demais fatias
+            permanecem gravadas.
+    """
+    inicio = perf_counter()
+    fatias = fatiar_carteira(db, tamanho_fatia)
+    db.session.commit()
+    resumos: dict[int, ResumoAvaliacao] = {}
+    erros: dict[int, BaseException] = {}
+
+    def concluir(indice: int, resumo: ResumoAvaliacao) -> None:
+        resumos[indice] = resumo
+        erros.pop(indice, None)
+        if progresso is not None:
+            parcial = combinar_resumos(data_base, resumos.values())
+            parcial.segundos = perf_counter() - inicio
+            progresso(parcial, len(resumos), len(fatias))
+
+    pendentes = list(range(len(fatias)))
+    for _ in range(tentativas):
+        if not pendentes:
+            break
+        if processos == 1:
+            grades: dict = {}
+            for indice in pendentes:
+                try:
+                    concluir(
+                        indice,
+                        avaliar_fatia(db, data_base, *fatias[indice], tamanho_lote, grades),
+                    )
+                except Exception as erro:
+                    erros[indice] = erro
+        else:
+            with ProcessPoolExecutor(
+                max_workers=processos, initializer=inicializador
+            ) as executor:
+                futuros = {
+                    executor.submit(
+                        _avaliar_fatia_processo, data_base, *fatias[indice], tamanho_lote
+                    ): indice
+                    for indice in pendentes
+                }
+                for futuro in as_completed(futuros):
+                    try:
+                        concluir(futuros[futuro], futuro.result())
+                    except Exception as erro:
+                        erros[futuros[futuro]] = erro
+        pendentes = sorted(erros)
+
+    if erros:
+        descricao = ", ".join(
+            f"{fatias[indice]}: {erro!r}" for indice, erro in sorted(erros.items())
+        )
+        raise RuntimeError(f"Fatias com falha após {tentativas} tentativas: {descricao}")
+    resumo = combinar_resumos(data_base, (resumos[indice] for indice in sorted(resumos)))
+    resumo.segundos = perf_counter() - inicio
+    return resumo
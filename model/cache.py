@@ -0,0 +1,229 @@
+import os
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Awaitable, Callable, Hashable, Iterable, Optional, TypeVar
+from weakref import WeakValueDictionary
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+# Caches nomeados, pelo nome, cujos acertos e falhas são exportados nas métricas.
+caches: WeakValueDictionary = WeakValueDictionary()
+
+# Diretório dos arquivos de sinal usados para propagar invalidações entre processos, um
+# arquivo por cache nomeado. None desativa a propagação.
+diretorio_sinais: Optional[Path] = None
+
+
+def configurar_sinais_caches(diretorio: Optional[Path]) -> None:
+    """Define o diretório compartilhado pelos processos para propagar invalidações.
+
+    Cada invalidação de um cache nomeado substitui o arquivo de sinal do cache, e os demais
+    processos descartam seus itens na próxima consulta ao cache em que o arquivo mudou. Valores
+    em construção durante a invalidação em outro processo podem ser armazenados, mas são
+    descartados nessa mesma consulta seguinte.
+    """
+    global diretorio_sinais
+    if diretorio is not None:
+        diretorio = Path(diretorio)
+        diretorio.mkdir(parents=True, exist_ok=True)
+    diretorio_sinais = diretorio
+
+
+def marca_sinal(arquivo: Path) -> Optional[tuple[int, int, int]]:
+    """Identificação da versão do arquivo de sinal, ou None caso ele não exista."""
+    try:
+        estado = arquivo.stat()
+    except FileNotFoundError:
+        return None
+    return estado.st_ino, estado.st_mtime_ns, estado.st_ctime_ns
+
+
+def sinalizar(arquivo: Path) -> Optional[tuple[int, int, int]]:
+    """Substitui atomicamente o arquivo de sinal e retorna a sua nova marca."""
+    temporario = arquivo.with_name(f".{arquivo.name}.{os.getpid()}")
+    temporario.write_bytes(b"")
+    os.replace(temporario, arquivo)
+    return marca_sinal(arquivo)
+
+
+class CacheLRU:
+    """Cache em memória, limitado, que descarta o item usado há mais tempo (LRU).
+
+    Mantém contadores de acertos e falhas. Uma invalidação descarta todos os itens, e
+    valores que estavam sendo construídos durante a invalidação não são armazenados.
+
+    Args:
+        tamanho_maximo (int): Quantidade máxima de itens mantidos no cache.
+        nome (str, optional): Nome do cache nas métricas. Caches sem nome não são exportados.
+    """
+
+    def __init__(self, tamanho_maximo: int = 128, nome: Optional[str] = None):
+        if tamanho_maximo <= 0:
+            raise ValueError("tamanho_maximo deve ser maior que zero.")
+        if nome is not None:
+            caches[nome] = self
+        self.nome = nome
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        self._geracao = 0
+        self._itens: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self._marca_sinal: Optional[tuple[int, int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    @property
+    def geracao(self) -> int:
+        """Quantidade de invalidações do cache, usada como versão do conteúdo."""
+        return self._geracao
+
+    @property
+    def arquivo_sinal(self) -> Optional[Path]:
+        if diretorio_sinais is None or self.nome is None:
+            return None
+        return diretorio_sinais / self.nome
+
+    def _descartar(self) -> None:
+        self._itens.clear()
+        self._geracao += 1
+
+    def _consultar(self, chave: Hashable) -> tuple[bool, object, int]:
+        arquivo = self.arquivo_sinal
+        marca = None if arquivo is None else marca_sinal(arquivo)
+        with self._lock:
+            if marca != self._marca_sinal:
+                self._descartar()
+                self._marca_sinal = marca
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return True, self._itens[chave], self._geracao
+            self.falhas += 1
+            return False, None, self._geracao
+
+    def _armazenar(self, chave: Hashable, valor: object, geracao: int) -> None:
+        """Armazena o valor, a menos que o cache tenha sido invalidado durante a construção."""
+        with self._lock:
+            if geracao == self._geracao:
+                self._itens[chave] = valor
+                self._itens.move_to_end(chave)
+                while len(self._itens) > self.tamanho_maximo:
+                    self._itens.popitem(last=False)
+
+    def pegar(self, chave: Hashable, construir: Callable[[], T]) -> T:
+        """Retorna o item associado a chave, construindo-o caso não esteja em cache.
+
+        Args:
+            chave (Hashable): Chave do item.
+            construir (Callable): Função sem argumentos que constrói o item.
+
+        Returns:
+            O item em cache ou recém construído.
+        """
+        encontrado, valor, geracao = self._consultar(chave)
+        if encontrado:
+            return valor
+        valor = construir()
+        self._armazenar(chave, valor, geracao)
+        return valor
+
+    async def pegar_assincrono(
+        self, chave: Hashable, construir: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Como pegar, para uma função de construção assíncrona.
+
+        Args:
+            chave (Hashable): Chave do item.
+            construir (Callable): Função assíncrona sem argumentos que constrói o item.
+
+        Returns:
+            O item em cache ou recém construído.
+        """
+        encontrado, valor, geracao = self._consultar(chave)
+        if encontrado:
+            return valor
+        valor = await construir()
+        self._armazenar(chave, valor, geracao)
+        return valor
+
+    def invalidar(self) -> None:
+        """Descarta todos os itens do cache, neste e, caso configurado, nos demais processos."""
+        arquivo = self.arquivo_sinal
+        marca = None if arquivo is None else sinalizar(arquivo)
+        with self._lock:
+            self._descartar()
+            if arquivo is not None:
+                self._marca_sinal = marca
+
+    def estatisticas(self) -> dict:
+        """Quantidade de itens, acertos e falhas do cache."""
+        return {
+            "itens": len(self._itens),
+            "tamanho_maximo": self.tamanho_maximo,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+        }
+
+
+# Chave de Session.info com os modelos alterados na transação corrente da sessão.
+CHAVE_MODELOS_ALTERADOS = "modelos_alterados"
+
+# Funções chamadas após o commit de uma sessão que alterou algum dos modelos associados.
+invalidacoes: list[tuple[frozenset, Callable[[], None]]] = []
+
+
+def modelos_alterados(sessao: Session) -> set:
+    """Modelos inseridos, alterados ou removidos na transação corrente da sessão."""
+    return sessao.info.setdefault(CHAVE_MODELOS_ALTERADOS, set())
+
+
+def invalidar_apos_commit(modelos: Iterable[type], funcao: Callable[[], None]) -> None:
+    """Registra uma função a ser chamada após o commit de qualquer sessão que tenha alterado
+    algum dos modelos, seja por objetos ORM ou por insert, update ou delete em lote.
+
+    A chamada após o commit, e não durante o flush, impede que uma leitura concorrente
+    armazene novamente as linhas anteriores ao commit depois da invalidação.
+
+    Args:
+        modelos (Iterable[type]): Modelos cujas alterações acionam a função.
+        funcao (Callable): Função sem argumentos, em geral o invalidar de um CacheLRU.
+    """
+    invalidacoes.append((frozenset(modelos), funcao))
+
+
+@event.listens_for(Session, "after_flush")
+def registrar_modelos_alterados(sessao, contexto_flush) -> None:
+    alterados = modelos_alterados(sessao)
+    for objeto in (*sessao.new, *sessao.dirty, *sessao.deleted):
+        alterados.add(type(objeto))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def registrar_modelos_alterados_em_lote(orm_execute_state) -> None:
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        modelos_alterados(orm_execute_state.session).add(mapper.class_)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidar_modelos_alterados(sessao) -> None:
+    alterados = sessao.info.pop(CHAVE_MODELOS_ALTERADOS, None)
+    if not alterados:
+        return
+    for modelos, funcao in invalidacoes:
+        if not modelos.isdisjoint(alterados):
+            funcao()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def descartar_modelos_alterados(sessao, transacao_anterior) -> None:
+    if transacao_anterior.parent is None:
+        sessao.info.pop(CHAVE_MODELOS_ALTERADOS, None)
@@ -0,0 +1,56 @@
+import csv
+from datetime import date, datetime
+from pathlib import Path
+
+from sqlalchemy import Table, insert
+
+# Diretório com um CSV por tabela, nomeado pela tabela, com os nomes das colunas no cabeçalho.
+DIRETORIO_DADOS = Path(__file__).parent / "dados"
+
+
+def converter_valor(tipo: type, valor: str):
+    """Converte um valor do CSV para o tipo python da coluna. Valores vazios são nulos."""
+    if valor == "":
+        return None
+    if tipo is date:
+        return date.fromisoformat(valor)
+    if tipo is datetime:
+        return datetime.fromisoformat(valor)
+    return tipo(valor)
+
+
+def ler_tabela(tabela: Table, arquivo: Path) -> list[dict]:
+    """Lê as linhas de uma tabela a partir do seu CSV."""
+    with open(arquivo, newline="", encoding="utf-8") as csv_tabela:
+        leitor = csv.reader(csv_tabela)
+        colunas = next(leitor)
+        tipos = [tabela.columns[coluna].type.python_type for coluna in colunas]
+        return [
+            {
+                coluna: converter_valor(tipo, valor)
+                for coluna, tipo, valor in zip(colunas, tipos, linha)
+            }
+            for linha in leitor
+        ]
+
+
+def carregar_dados_iniciais(db, diretorio: Path = DIRETORIO_DADOS) -> dict[str, int]:
+    """Insere os dados iniciais em uma única transação, com um executemany por tabela.
+
+    As tabelas são carregadas na ordem das chaves estrangeiras, e tabelas sem CSV no
+    diretório são ignoradas.
+
+    Returns:
+        dict[str, int]: Quantidade de linhas inseridas em cada tabela.
+    """
+    inseridas = {}
+    with db.engine.begin() as conexao:
+        for tabela in db.metadata.sorted_tables:
+            arquivo = diretorio / f"{tabela.name}.csv"
+            if not arquivo.exists():
+                continue
+            linhas = ler_tabela(tabela, arquivo)
+            if linhas:
+                conexao.execute(insert(tabela), linhas)
+            inseridas[tabela.name] = len(linhas)
+    return inseridas
@@ -0,0 +1,102 @@
+import json
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Any
+
+from model.cache import CacheLRU, invalidar_apos_commit
+from model.produto import Produto, ProdutoPrazo, ProdutoPrazoRenda
+from model.queries import duracao_consultas, pegar_produtos_completos
+from src.metricas import cronometrado
+
+
+@dataclass(frozen=True)
+class RecursoCatalogo:
+    """Conteúdo de um recurso do catálogo e o seu ETag forte, calculado a partir do conteúdo.
+
+    Como o ETag depende apenas do conteúdo, ele é o mesmo em todos os processos e após
+    reinícios da aplicação.
+    """
+
+    conteudo: Any
+    etag: str
+
+
+def criar_recurso(conteudo: Any) -> RecursoCatalogo:
+    serializado = json.dumps(
+        conteudo, sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return RecursoCatalogo(
+        conteudo=conteudo, etag=sha256(serializado.encode()).hexdigest()
+    )
+
+
+@dataclass(frozen=True)
+class Catalogo:
+    """Cópia em memória dos produtos e dos seus parâmetros de contratação.
+
+    Args:
+        versao (int): Versão do catálogo, incrementada a cada alteração dos produtos.
+        produtos (RecursoCatalogo): Listagem de todos os produtos.
+        produto (dict[int, RecursoCatalogo]): Cada produto, pelo id.
+        parametros (dict[int, RecursoCatalogo]): Parâmetros de cada produto, pelo id.
+    """
+
+    versao: int
+    produtos: RecursoCatalogo
+    produto: dict[int, RecursoCatalogo]
+    parametros: dict[int, RecursoCatalogo]
+
+
+def montar_catalogo(produtos_completos: list[Produto], versao: int) -> Catalogo:
+    """Monta o catálogo a partir dos produtos, com os seus prazos já carregados."""
+    produtos = {}
+    parametros = {}
+    for produto in produtos_completos:
+        produtos[produto.id] = {
+            "id": produto.id,
+            "nome": produto.nome,
+            "descricao": produto.descricao,
+        }
+        parametros[produto.id] = {
+            "prazos": sorted(prazo.prazo for prazo in produto.produtoPrazos),
+            "prazos_renda": [
+                {"prazo": prazo.prazo, "prazo_certo": prazo.prazoCerto}
+                for prazo in sorted(
+                    produto.produtoPrazosRenda,
+                    key=lambda prazo: (prazo.prazo, prazo.prazoCerto),
+                )
+            ],
+            "beneficio": {
+                "beneficio_minimo": produto.beneficioMinimo,
+                "beneficio_maximo": produto.beneficioMaximo,
+            },
+        }
+    return Catalogo(
+        versao=versao,
+        produtos=criar_recurso(list(produtos.values())),
+        produto={id: criar_recurso(conteudo) for id, conteudo in produtos.items()},
+        parametros={
+            id: criar_recurso(conteudo) for id, conteudo in parametros.items()
+        },
+    )
+
+
+def construir_catalogo(db, versao: int) -> Catalogo:
+    """Constrói o catálogo com uma única consulta, que já carrega os prazos dos produtos."""
+    return montar_catalogo(pegar_produtos_completos(db), versao)
+
+
+cache_catalogo = CacheLRU(tamanho_maximo=1, nome="catalogo")
+
+
+@cronometrado(duracao_consultas, consulta="pegar_catalogo")
+def pegar_catalogo(db) -> Catalogo:
+    """Catálogo de produtos, reconstruído apenas quando os produtos são alterados."""
+    return cache_catalogo.pegar(
+        "catalogo", lambda: construir_catalogo(db, cache_catalogo.geracao)
+    )
+
+
+MODELOS_CATALOGO = (Produto, ProdutoPrazo, ProdutoPrazoRenda)
+
+invalidar_apos_commit(MODELOS_CATALOGO, cache_catalogo.invalidar)
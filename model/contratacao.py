@@ -0,0 +1,273 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import sha256
+from typing import Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from model.armazenamento import executar_leitura
+from model.idempotencia import ChaveIdempotencia
+from model.produto import ProdutoPrazo
+from model.segurado import Matricula, Segurado
+from schemas.cliente import ClienteSchema
+
+# Quantidade máxima de valores em uma cláusula IN, abaixo do limite de parâmetros do SQLite.
+LIMITE_PARAMETROS_IN = 10_000
+# Colunas retornadas junto com o id das matrículas inseridas em lote, que as identificam.
+COLUNAS_MATRICULA = (
+    "cpfSegurado",
+    "produtoId",
+    "dataAssinatura",
+    "prazo",
+    "prazoRenda",
+    "prazoCertoRenda",
+    "beneficio",
+)
+
+
+@dataclass(frozen=True)
+class ResultadoContratacao:
+    """Resultado da contratação de um item do lote.
+
+    Args:
+        matricula_id (int, optional): Id da matrícula criada, vazio quando há erro.
+        erro (str, optional): Motivo pelo qual o item não foi contratado.
+    """
+
+    matricula_id: Optional[int] = None
+    erro: Optional[str] = None
+
+
+def insert_ignorando_conflito(db, modelo):
+    """INSERT que ignora as linhas cuja chave já existe, no dialeto do banco de dados.
+
+    Raises:
+        ValueError: Se o dialeto do banco de dados não é suportado.
+    """
+    dialeto = db.session.get_bind().dialect.name
+    if dialeto == "sqlite":
+        return sqlite.insert(modelo).on_conflict_do_nothing()
+    if dialeto == "postgresql":
+        return postgresql.insert(modelo).on_conflict_do_nothing()
+    if dialeto in ("mysql", "mariadb"):
+        return insert(modelo).prefix_with("IGNORE")
+    raise ValueError(f"Dialeto {dialeto} não suportado.")
+
+
+def dados_segurado(cliente: ClienteSchema) -> dict:
+    return dict(
+        cpf=cliente.cpf,
+        nome=cliente.nome,
+        email=cliente.email,
+        sexo=cliente.sexo,
+        dataNascimento=cliente.data_nascimento,
+    )
+
+
+def dados_matricula(cliente: ClienteSchema) -> dict:
+    return dict(
+        cpfSegurado=cliente.cpf,
+        produtoId=cliente.produto_id,
+        dataAssinatura=cliente.data_assinatura,
+        prazo=cliente.prazo,
+        prazoRenda=cliente.prazo_renda,
+        prazoCertoRenda=cliente.prazo_certo_renda,
+        beneficio=cliente.beneficio,
+    )
+
+
+def assinatura_cliente(cliente: ClienteSchema) -> str:
+    return sha256(cliente.model_dump_json().encode()).hexdigest()
+
+
+def pegar_chave_idempotencia(db, chave: str) -> Optional[ChaveIdempotencia]:
+    query = select(ChaveIdempotencia).where(ChaveIdempotencia.chave == chave)
+    return executar_leitura(db, query).scalar_one_or_none()
+
+
+def repetir_contratacao(chave: ChaveIdempotencia, assinatura: str) -> int:
+    if chave.assinatura != assinatura:
+        raise ValueError(
+            f"Chave de idempotência {chave.chave} já utilizada com outros parâmetros."
+        )
+    return chave.matriculaId
+
+
+def contratar(
+    db, cliente: ClienteSchema, chave_idempotencia: Optional[str] = None
+) -> tuple[int, bool]:
+    """Contrata um cliente em uma única transação curta.
+
+    O segurado é inserido com INSERT ... ON CONFLICT DO NOTHING, o que mantém o cadastro
+    existente sem uma consulta prévia e sem disputa entre requisições do mesmo cpf. Quando
+    uma chave de idempotência é informada, uma nova tentativa com a mesma chave retorna a
+    matrícula da primeira, sem gravar novamente.
+
+    Args:
+        db: Instância do banco de dados.
+        cliente (ClienteSchema): Cliente a contratar.
+        chave_idempotencia (str, optional): Chave que identifica a contratação.
+
+    Returns:
+        tuple[int, bool]: Id da matrícula e se ela foi criada por uma tentativa anterior.
+
+    Raises:
+        ValueError: Se a chave de idempotência já foi utilizada com outros parâmetros.
+    """
+    assinatura = assinatura_cliente(cliente)
+    if chave_idempotencia is not None:
+        existente = pegar_chave_idempotencia(db, chave_idempotencia)
+        if existente is not None:
+            return repetir_contratacao(existente, assinatura), True
+
+    try:
+        db.session.execute(
+            insert_ignorando_conflito(db, Segurado).values(**dados_segurado(cliente))
+        )
+        matricula_id = db.session.execute(
+            insert(Matricula)
+            .values(**dados_matricula(cliente))
+            .returning(Matricula.id)
+        ).scalar_one()
+        if chave_idempotencia is not None:
+            db.session.execute(
+                insert(ChaveIdempotencia).values(
+                    chave=chave_idempotencia,
+                    assinatura=assinatura,
+                    matriculaId=matricula_id,
+                    dataCriacao=datetime.now(),
+                )
+            )
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        existente = (
+            None
+            if chave_idempotencia is None
+            else pegar_chave_idempotencia(db, chave_idempotencia)
+        )
+        if existente is None:
+            raise
+        return repetir_contratacao(existente, assinatura), True
+    return matricula_id, False
+
+
+def fatiar(itens: list, tamanho: Optional[int]) -> list[list]:
+    """Divide os itens em fatias de tamanho informado, ou em uma única fatia se for None."""
+    if tamanho is None:
+        return [itens] if itens else []
+    return [itens[inicio : inicio + tamanho] for inicio in range(0, len(itens), tamanho)]
+
+
+def pegar_cpfs_existentes(db, cpfs: set[int]) -> set[int]:
+    """Cpfs já cadastrados, consultados com cláusulas IN de até LIMITE_PARAMETROS_IN valores."""
+    existentes = set()
+    for fatia in fatiar(sorted(cpfs), LIMITE_PARAMETROS_IN):
+        query = select(Segurado.cpf).where(Segurado.cpf.in_(fatia))
+        existentes.update(executar_leitura(db, query).scalars())
+    return existentes
+
+
+def pegar_prazos_validos(db, produtos: set[int]) -> set[tuple[int, int]]:
+    """Pares (produto, prazo) existentes para os produtos informados."""
+    query = select(ProdutoPrazo.produtoId, ProdutoPrazo.prazo).where(
+        ProdutoPrazo.produtoId.in_(produtos)
+    )
+    return {tuple(linha) for linha in executar_leitura(db, query)}
+
+
+def inserir_matriculas(db, matriculas: list[dict]) -> list[int]:
+    """Insere as matrículas com executemany e retorna os ids na ordem das matrículas.
+
+    Os ids são associados às matrículas pelos valores retornados junto com eles, e não pela
+    ordem do RETURNING, já que com sort_by_parameter_order o SQLAlchemy insere uma matrícula
+    por instrução no SQLite. Matrículas com os mesmos valores são intercambiáveis.
+    """
+    colunas = [getattr(Matricula, coluna) for coluna in COLUNAS_MATRICULA]
+    linhas = db.session.execute(insert(Matricula).returning(Matricula.id, *colunas), matriculas)
+    ids = defaultdict(deque)
+    for matricula_id, *valores in linhas:
+        ids[tuple(valores)].append(matricula_id)
+    return [
+        ids[tuple(matricula[coluna] for coluna in COLUNAS_MATRICULA)].popleft()
+        for matricula in matriculas
+    ]
+
+
+def contratar_fatia(db, clientes: list[ClienteSchema]) -> list[ResultadoContratacao]:
+    """Contrata uma fatia do lote em uma única transação.
+
+    Os segurados existentes são resolvidos com uma consulta IN e os novos segurados e as
+    matrículas são inseridos com executemany. Segurados já cadastrados são mantidos, como
+    em /contratar, inclusive os cadastrados por outra requisição durante a contratação, e
+    um cpf repetido na fatia é inserido uma única vez.
+    """
+    prazos_validos = pegar_prazos_validos(db, {cliente.produto_id for cliente in clientes})
+    validos = [
+        (cliente.produto_id, cliente.prazo) in prazos_validos for cliente in clientes
+    ]
+    existentes = pegar_cpfs_existentes(
+        db, {cliente.cpf for cliente, valido in zip(clientes, validos) if valido}
+    )
+
+    segurados = {}
+    matriculas = []
+    for cliente, valido in zip(clientes, validos):
+        if not valido:
+            continue
+        if cliente.cpf not in existentes and cliente.cpf not in segurados:
+            segurados[cliente.cpf] = dados_segurado(cliente)
+        matriculas.append(dados_matricula(cliente))
+
+    try:
+        if segurados:
+            db.session.execute(
+                insert_ignorando_conflito(db, Segurado), list(segurados.values())
+            )
+        ids = []
+        if matriculas:
+            ids = inserir_matriculas(db, matriculas)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    ids = iter(ids)
+    return [
+        ResultadoContratacao(matricula_id=next(ids))
+        if valido
+        else ResultadoContratacao(
+            erro=f"Produto {cliente.produto_id} com prazo {cliente.prazo} não encontrado."
+        )
+        for cliente, valido in zip(clientes, validos)
+    ]
+
+
+def contratar_lote(
+    db, clientes: list[ClienteSchema], tamanho_lote: Optional[int] = None
+) -> list[ResultadoContratacao]:
+    """Contrata um lote de clientes, na mesma ordem do lote.
+
+    Args:
+        db: Instância do banco de dados.
+        clientes (list[ClienteSchema]): Clientes a contratar.
+        tamanho_lote (int, optional): Quantidade de itens por transação. Se None, todo o lote
+            é contratado em uma única transação.
+
+    Returns:
+        list[ResultadoContratacao]: Resultado de cada item. Quando uma transação falha, os
+            itens da fatia são retornados com erro e as demais fatias não são afetadas.
+    """
+    if tamanho_lote is not None and tamanho_lote <= 0:
+        raise ValueError("tamanho_lote deve ser maior que zero.")
+    resultados = []
+    for fatia in fatiar(clientes, tamanho_lote):
+        try:
+            resultados.extend(contratar_fatia(db, fatia))
+        except Exception as e:
+            erro = str(getattr(e, "orig", e))
+            resultados.extend(ResultadoContratacao(erro=erro) for _ in fatia)
+    return resultados
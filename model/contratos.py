@@ -0,0 +1,71 @@
+from datetime import date
+
+import tabatu as tb
+
+from model.grade_tarifa import PremissasGrade, pegar_premissas_grade
+from model.segurado import Matricula
+from src.capitalizado import Capitalizado
+from src.produtos.aposentadoria import aposentadoria_capitalizado
+from src.produtos.peculio import peculio_capitalizado_fluxo
+
+
+def criar_contrato(
+    premissas: PremissasGrade,
+    data_assinatura: date,
+    data_nascimento: date,
+    prazo: int,
+    beneficio: float = 1.0,
+    prazo_renda: int = 0,
+    prazo_certo_renda: int = 0,
+) -> Capitalizado:
+    """Cria o contrato capitalizado de um produto a partir das suas premissas.
+
+    Raises:
+        ValueError: Se os parâmetros são inválidos para o produto.
+    """
+    argumentos = dict(
+        juros=tb.JurosConstante(premissas.juros),
+        data_assinatura=data_assinatura,
+        data_nascimento_segurado=data_nascimento,
+        prazo_cobertura=prazo,
+        prazo_pagamento=prazo,
+        beneficio=beneficio,
+        percentual_beneficio=[1.0],
+        **premissas.tabuas,
+    )
+    if premissas.formula == "peculio":
+        return peculio_capitalizado_fluxo(**argumentos)
+    return aposentadoria_capitalizado(
+        prazo_renda=prazo_renda, prazo_certo_renda=prazo_certo_renda, **argumentos
+    )
+
+
+def pegar_contrato_matricula(db, matricula: Matricula) -> Capitalizado:
+    """Cria o contrato capitalizado de uma matrícula, com as premissas atuais do produto.
+
+    Args:
+        db: Instância do banco de dados.
+        matricula (Matricula): Matrícula do segurado.
+
+    Returns:
+        Capitalizado: Contrato da matrícula.
+
+    Raises:
+        NoResultFound: Se o produto ou o prazo da matrícula não existem.
+        ValueError: Se a fórmula do produto não é suportada ou os parâmetros são inválidos.
+    """
+    segurado = matricula.segurado
+    premissas = pegar_premissas_grade(
+        db, matricula.produtoId, segurado.sexo, matricula.prazo
+    )
+    if premissas.formula == "aposentadoria" and matricula.prazoRenda is None:
+        raise ValueError("A matrícula de aposentadoria deve possuir prazo de renda.")
+    return criar_contrato(
+        premissas,
+        data_assinatura=matricula.dataAssinatura,
+        data_nascimento=segurado.dataNascimento,
+        prazo=matricula.prazo,
+        beneficio=matricula.beneficio,
+        prazo_renda=matricula.prazoRenda or 0,
+        prazo_certo_renda=matricula.prazoCertoRenda or 0,
+    )
@@ -1,4 +1,4 @@
-from datetime import date
+from importlib import import_module
 
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
@@ -10,951 +10,29 @@ class Base(DeclarativeBase):
 
 db = SQLAlchemy(model_class=Base)
 
+# Módulos que definem as tabelas do banco de dados.
+MODULOS_MODELOS = (
+    "model.idempotencia",
+    "model.produto",
+    "model.reserva",
+    "model.segurado",
+    "model.tabua",
+    "model.tarifa",
+)
 
-def init_db(db):
-    from model.produto import (
-        Produto,
-        Formula,
-        TipoTabua,
-        ProdutoPrazo,
-        ProdutoPrazoRenda,
-        ProdutoTabua,
-        Juros,
-    )
-    from model.segurado import Segurado, Matricula
-    from model.tabua import Tabua, Taxa
-
-    db.create_all()
-
-    formulas = [
-        Formula(id=1, nome="peculio"),
-        Formula(id=2, nome="aposentadoria"),
-    ]
-
-    segurado = Segurado(
-        cpf=12345678900,
-        sexo="M",
-        dataNascimento=date(1990, 1, 1),
-        nome="Jose da Silva",
-        email="jose@email.com",
-    )
-
-    produtos = [
-        Produto(
-            id=1,
-            nome="Peculio por morte",
-            descricao="Protege financeiramente a sua família em caso de morte por qualquer causa.",
-            formulaId=1,
-            beneficioMinimo=50_000,
-            beneficioMaximo=1_000_000
-        ),
-        Produto(
-            id=2,
-            nome="Peculio por morte com DPI",
-            descricao="Garante uma indenização em caso de morte, e possui dispensa de pagamento de prêmio por invalidez.",
-            formulaId=1,
-            beneficioMinimo=50_000,
-            beneficioMaximo=1_000_000
-        ),
-        Produto(
-            id=3,
-            nome="Peculio por invalidez",
-            descricao="Garante uma indenização em caso de invalidez.",
-            formulaId=1,
-            beneficioMinimo=200_000,
-            beneficioMaximo=3_000_000
-        ),
-        Produto(
-            id=7,
-            nome="Aposentadoria",
-            descricao="Garante a manutenção da sua qualidade de vida ao se aposentar.",
-            formulaId=2,
-            beneficioMinimo=500,
-            beneficioMaximo=10_000
-        ),
-    ]
 
-    tabuas = [
-        Tabua(
-            id=1,
-            nome="AT-2000 MALE",
-            taxa=[
-                Taxa(idade=0, tabuaId=1, taxa=0.002311),
-                Taxa(idade=1, tabuaId=1, taxa=0.000906),
-                Taxa(idade=2, tabuaId=1, taxa=0.000504),
-                Taxa(idade=3, tabuaId=1, taxa=0.000408),
-                Taxa(idade=4, tabuaId=1, taxa=0.000357),
-                Taxa(idade=5, tabuaId=1, taxa=0.000324),
-                Taxa(idade=6, tabuaId=1, taxa=0.000301),
-                Taxa(idade=7, tabuaId=1, taxa=0.000286),
-                Taxa(idade=8, tabuaId=1, taxa=0.000328),
-                Taxa(idade=9, tabuaId=1, taxa=0.000362),
-                Taxa(idade=10, tabuaId=1, taxa=0.00039),
-                Taxa(idade=11, tabuaId=1, taxa=0.000413),
-                Taxa(idade=12, tabuaId=1, taxa=0.000431),
-                Taxa(idade=13, tabuaId=1, taxa=0.000446),
-                Taxa(idade=14, tabuaId=1, taxa=0.000458),
-                Taxa(idade=15, tabuaId=1, taxa=0.00047),
-                Taxa(idade=16, tabuaId=1, taxa=0.000481),
-                Taxa(idade=17, tabuaId=1, taxa=0.000495),
-                Taxa(idade=18, tabuaId=1, taxa=0.00051),
-                Taxa(idade=19, tabuaId=1, taxa=0.000528),
-                Taxa(idade=20, tabuaId=1, taxa=0.000549),
-                Taxa(idade=21, tabuaId=1, taxa=0.000573),
-                Taxa(idade=22, tabuaId=1, taxa=0.000599),
-                Taxa(idade=23, tabuaId=1, taxa=0.000627),
-                Taxa(idade=24, tabuaId=1, taxa=0.000657),
-                Taxa(idade=25, tabuaId=1, taxa=0.000686),
-                Taxa(idade=26, tabuaId=1, taxa=0.000714),
-                Taxa(idade=27, tabuaId=1, taxa=0.000738),
-                Taxa(idade=28, tabuaId=1, taxa=0.000758),
-                Taxa(idade=29, tabuaId=1, taxa=0.000774),
-                Taxa(idade=30, tabuaId=1, taxa=0.000784),
-                Taxa(idade=31, tabuaId=1, taxa=0.000789),
-                Taxa(idade=32, tabuaId=1, taxa=0.000789),
-                Taxa(idade=33, tabuaId=1, taxa=0.00079),
-                Taxa(idade=34, tabuaId=1, taxa=0.000791),
-                Taxa(idade=35, tabuaId=1, taxa=0.000792),
-                Taxa(idade=36, tabuaId=1, taxa=0.000794),
-                Taxa(idade=37, tabuaId=1, taxa=0.000823),
-                Taxa(idade=38, tabuaId=1, taxa=0.000872),
-                Taxa(idade=39, tabuaId=1, taxa=0.000945),
-                Taxa(idade=40, tabuaId=1, taxa=0.001043),
-                Taxa(idade=41, tabuaId=1, taxa=0.001168),
-                Taxa(idade=42, tabuaId=1, taxa=0.001322),
-                Taxa(idade=43, tabuaId=1, taxa=0.001505),
-                Taxa(idade=44, tabuaId=1, taxa=0.001715),
-                Taxa(idade=45, tabuaId=1, taxa=0.001948),
-                Taxa(idade=46, tabuaId=1, taxa=0.002198),
-                Taxa(idade=47, tabuaId=1, taxa=0.002463),
-                Taxa(idade=48, tabuaId=1, taxa=0.00274),
-                Taxa(idade=49, tabuaId=1, taxa=0.003028),
-                Taxa(idade=50, tabuaId=1, taxa=0.00333),
-                Taxa(idade=51, tabuaId=1, taxa=0.003647),
-                Taxa(idade=52, tabuaId=1, taxa=0.00398),
-                Taxa(idade=53, tabuaId=1, taxa=0.004331),
-                Taxa(idade=54, tabuaId=1, taxa=0.004698),
-                Taxa(idade=55, tabuaId=1, taxa=0.005077),
-                Taxa(idade=56, tabuaId=1, taxa=0.005465),
-                Taxa(idade=57, tabuaId=1, taxa=0.005861),
-                Taxa(idade=58, tabuaId=1, taxa=0.006265),
-                Taxa(idade=59, tabuaId=1, taxa=0.006694),
-                Taxa(idade=60, tabuaId=1, taxa=0.00717),
-                Taxa(idade=61, tabuaId=1, taxa=0.007714),
-                Taxa(idade=62, tabuaId=1, taxa=0.008348),
-                Taxa(idade=63, tabuaId=1, taxa=0.009093),
-                Taxa(idade=64, tabuaId=1, taxa=0.009968),
-                Taxa(idade=65, tabuaId=1, taxa=0.010993),
-                Taxa(idade=66, tabuaId=1, taxa=0.012188),
-                Taxa(idade=67, tabuaId=1, taxa=0.013572),
-                Taxa(idade=68, tabuaId=1, taxa=0.01516),
-                Taxa(idade=69, tabuaId=1, taxa=0.016946),
-                Taxa(idade=70, tabuaId=1, taxa=0.01892),
-                Taxa(idade=71, tabuaId=1, taxa=0.021071),
-                Taxa(idade=72, tabuaId=1, taxa=0.023388),
-                Taxa(idade=73, tabuaId=1, taxa=0.025871),
-                Taxa(idade=74, tabuaId=1, taxa=0.028552),
-                Taxa(idade=75, tabuaId=1, taxa=0.031477),
-                Taxa(idade=76, tabuaId=1, taxa=0.034686),
-                Taxa(idade=77, tabuaId=1, taxa=0.038225),
-                Taxa(idade=78, tabuaId=1, taxa=0.042132),
-                Taxa(idade=79, tabuaId=1, taxa=0.046427),
-                Taxa(idade=80, tabuaId=1, taxa=0.051128),
-                Taxa(idade=81, tabuaId=1, taxa=0.05625),
-                Taxa(idade=82, tabuaId=1, taxa=0.061809),
-                Taxa(idade=83, tabuaId=1, taxa=0.067826),
-                Taxa(idade=84, tabuaId=1, taxa=0.074322),
-                Taxa(idade=85, tabuaId=1, taxa=0.081326),
-                Taxa(idade=86, tabuaId=1, taxa=0.088863),
-                Taxa(idade=87, tabuaId=1, taxa=0.096958),
-                Taxa(idade=88, tabuaId=1, taxa=0.105631),
-                Taxa(idade=89, tabuaId=1, taxa=0.114858),
-                Taxa(idade=90, tabuaId=1, taxa=0.124612),
-                Taxa(idade=91, tabuaId=1, taxa=0.134861),
-                Taxa(idade=92, tabuaId=1, taxa=0.145575),
-                Taxa(idade=93, tabuaId=1, taxa=0.156727),
-                Taxa(idade=94, tabuaId=1, taxa=0.16829),
-                Taxa(idade=95, tabuaId=1, taxa=0.180245),
-                Taxa(idade=96, tabuaId=1, taxa=0.192565),
-                Taxa(idade=97, tabuaId=1, taxa=0.205229),
-                Taxa(idade=98, tabuaId=1, taxa=0.218683),
-                Taxa(idade=99, tabuaId=1, taxa=0.233371),
-                Taxa(idade=100, tabuaId=1, taxa=0.249741),
-                Taxa(idade=101, tabuaId=1, taxa=0.268237),
-                Taxa(idade=102, tabuaId=1, taxa=0.289305),
-                Taxa(idade=103, tabuaId=1, taxa=0.313391),
-                Taxa(idade=104, tabuaId=1, taxa=0.34094),
-                Taxa(idade=105, tabuaId=1, taxa=0.372398),
-                Taxa(idade=106, tabuaId=1, taxa=0.40821),
-                Taxa(idade=107, tabuaId=1, taxa=0.448823),
-                Taxa(idade=108, tabuaId=1, taxa=0.494681),
-                Taxa(idade=109, tabuaId=1, taxa=0.546231),
-                Taxa(idade=110, tabuaId=1, taxa=0.603917),
-                Taxa(idade=111, tabuaId=1, taxa=0.668186),
-                Taxa(idade=112, tabuaId=1, taxa=0.739483),
-                Taxa(idade=113, tabuaId=1, taxa=0.818254),
-                Taxa(idade=114, tabuaId=1, taxa=0.904945),
-                Taxa(idade=115, tabuaId=1, taxa=1.0),
-            ],
-        ),
-        Tabua(
-            id=2,
-            nome="BREMS 2021 MT M",
-            taxa=[
-                Taxa(idade=0, tabuaId=2, taxa=0.0003707975),
-                Taxa(idade=1, tabuaId=2, taxa=0.000242085),
-                Taxa(idade=2, tabuaId=2, taxa=0.0002129199),
-                Taxa(idade=3, tabuaId=2, taxa=0.0001991131),
-                Taxa(idade=4, tabuaId=2, taxa=0.0001916189),
-                Taxa(idade=5, tabuaId=2, taxa=0.0001876699),
-                Taxa(idade=6, tabuaId=2, taxa=0.0001861928),
-                Taxa(idade=7, tabuaId=2, taxa=0.0001866695),
-                Taxa(idade=8, tabuaId=2, taxa=0.000189483),
-                Taxa(idade=9, tabuaId=2, taxa=0.0001961013),
-                Taxa(idade=10, tabuaId=2, taxa=0.0002091557),
-                Taxa(idade=11, tabuaId=2, taxa=0.0002325625),
-                Taxa(idade=12, tabuaId=2, taxa=0.0002699656),
-                Taxa(idade=13, tabuaId=2, taxa=0.0003236332),
-                Taxa(idade=14, tabuaId=2, taxa=0.0003935276),
-                Taxa(idade=15, tabuaId=2, taxa=0.0004763501),
-                Taxa(idade=16, tabuaId=2, taxa=0.0005678099),
-                Taxa(idade=17, tabuaId=2, taxa=0.0006615395),
-                Taxa(idade=18, tabuaId=2, taxa=0.0007515943),
-                Taxa(idade=19, tabuaId=2, taxa=0.0008328873),
-                Taxa(idade=20, tabuaId=2, taxa=0.0009020711),
-                Taxa(idade=21, tabuaId=2, taxa=0.0009569951),
-                Taxa(idade=22, tabuaId=2, taxa=0.0009976223),
-                Taxa(idade=23, tabuaId=2, taxa=0.0010248766),
-                Taxa(idade=24, tabuaId=2, taxa=0.0010403836),
-                Taxa(idade=25, tabuaId=2, taxa=0.0010472052),
-                Taxa(idade=26, tabuaId=2, taxa=0.0010481314),
-                Taxa(idade=27, tabuaId=2, taxa=0.0010457511),
-                Taxa(idade=28, tabuaId=2, taxa=0.0010428245),
-                Taxa(idade=29, tabuaId=2, taxa=0.0010417837),
-                Taxa(idade=30, tabuaId=2, taxa=0.001044681),
-                Taxa(idade=31, tabuaId=2, taxa=0.0010533364),
-                Taxa(idade=32, tabuaId=2, taxa=0.0010691129),
-                Taxa(idade=33, tabuaId=2, taxa=0.0010931419),
-                Taxa(idade=34, tabuaId=2, taxa=0.0011263791),
-                Taxa(idade=35, tabuaId=2, taxa=0.0011698651),
-                Taxa(idade=36, tabuaId=2, taxa=0.0012239656),
-                Taxa(idade=37, tabuaId=2, taxa=0.001289608),
-                Taxa(idade=38, tabuaId=2, taxa=0.0013672425),
-                Taxa(idade=39, tabuaId=2, taxa=0.0014575733),
-                Taxa(idade=40, tabuaId=2, taxa=0.0015612104),
-                Taxa(idade=41, tabuaId=2, taxa=0.0016790018),
-                Taxa(idade=42, tabuaId=2, taxa=0.0018117265),
-                Taxa(idade=43, tabuaId=2, taxa=0.0019604799),
-                Taxa(idade=44, tabuaId=2, taxa=0.0021263296),
-                Taxa(idade=45, tabuaId=2, taxa=0.0023107433),
-                Taxa(idade=46, tabuaId=2, taxa=0.0025148862),
-                Taxa(idade=47, tabuaId=2, taxa=0.0027404001),
-                Taxa(idade=48, tabuaId=2, taxa=0.0029891469),
-                Taxa(idade=49, tabuaId=2, taxa=0.0032632387),
-                Taxa(idade=50, tabuaId=2, taxa=0.0035646488),
-                Taxa(idade=51, tabuaId=2, taxa=0.0038958811),
-                Taxa(idade=52, tabuaId=2, taxa=0.004259815),
-                Taxa(idade=53, tabuaId=2, taxa=0.0046592219),
-                Taxa(idade=54, tabuaId=2, taxa=0.005097523),
-                Taxa(idade=55, tabuaId=2, taxa=0.0055782956),
-                Taxa(idade=56, tabuaId=2, taxa=0.0061056374),
-                Taxa(idade=57, tabuaId=2, taxa=0.0066842113),
-                Taxa(idade=58, tabuaId=2, taxa=0.0073184713),
-                Taxa(idade=59, tabuaId=2, taxa=0.008013604),
-                Taxa(idade=60, tabuaId=2, taxa=0.0087755365),
-                Taxa(idade=61, tabuaId=2, taxa=0.0096104779),
-                Taxa(idade=62, tabuaId=2, taxa=0.0105256892),
-                Taxa(idade=63, tabuaId=2, taxa=0.0115288397),
-                Taxa(idade=64, tabuaId=2, taxa=0.0126271357),
-                Taxa(idade=65, tabuaId=2, taxa=0.0138316328),
-                Taxa(idade=66, tabuaId=2, taxa=0.0151510872),
-                Taxa(idade=67, tabuaId=2, taxa=0.0165960639),
-                Taxa(idade=68, tabuaId=2, taxa=0.018178971),
-                Taxa(idade=69, tabuaId=2, taxa=0.0199136179),
-                Taxa(idade=70, tabuaId=2, taxa=0.0218137531),
-                Taxa(idade=71, tabuaId=2, taxa=0.023894204),
-                Taxa(idade=72, tabuaId=2, taxa=0.0261708214),
-                Taxa(idade=73, tabuaId=2, taxa=0.0286630797),
-                Taxa(idade=74, tabuaId=2, taxa=0.0313923232),
-                Taxa(idade=75, tabuaId=2, taxa=0.0343781881),
-                Taxa(idade=76, tabuaId=2, taxa=0.0376456477),
-                Taxa(idade=77, tabuaId=2, taxa=0.0412216511),
-                Taxa(idade=78, tabuaId=2, taxa=0.0451314501),
-                Taxa(idade=79, tabuaId=2, taxa=0.0494118483),
-                Taxa(idade=80, tabuaId=2, taxa=0.0540943479),
-                Taxa(idade=81, tabuaId=2, taxa=0.0592134814),
-                Taxa(idade=82, tabuaId=2, taxa=0.064808708),
-                Taxa(idade=83, tabuaId=2, taxa=0.0709234783),
-                Taxa(idade=84, tabuaId=2, taxa=0.0776062615),
-                Taxa(idade=85, tabuaId=2, taxa=0.0849002274),
-                Taxa(idade=86, tabuaId=2, taxa=0.0928587468),
-                Taxa(idade=87, tabuaId=2, taxa=0.101542411),
-                Taxa(idade=88, tabuaId=2, taxa=0.1110108185),
-                Taxa(idade=89, tabuaId=2, taxa=0.1213272006),
-                Taxa(idade=90, tabuaId=2, taxa=0.1325679496),
-                Taxa(idade=91, tabuaId=2, taxa=0.1448080296),
-                Taxa(idade=92, tabuaId=2, taxa=0.1581182712),
-                Taxa(idade=93, tabuaId=2, taxa=0.1725814942),
-                Taxa(idade=94, tabuaId=2, taxa=0.1882813864),
-                Taxa(idade=95, tabuaId=2, taxa=0.205300071),
-                Taxa(idade=96, tabuaId=2, taxa=0.2237457027),
-                Taxa(idade=97, tabuaId=2, taxa=0.2436991431),
-                Taxa(idade=98, tabuaId=2, taxa=0.2652549372),
-                Taxa(idade=99, tabuaId=2, taxa=0.2885437547),
-                Taxa(idade=100, tabuaId=2, taxa=0.3135964381),
-                Taxa(idade=101, tabuaId=2, taxa=0.3405239004),
-                Taxa(idade=102, tabuaId=2, taxa=0.3693667774),
-                Taxa(idade=103, tabuaId=2, taxa=0.4062675254),
-                Taxa(idade=104, tabuaId=2, taxa=0.4486313948),
-                Taxa(idade=105, tabuaId=2, taxa=0.4951993429),
-                Taxa(idade=106, tabuaId=2, taxa=0.5461625216),
-                Taxa(idade=107, tabuaId=2, taxa=0.6016906041),
-                Taxa(idade=108, tabuaId=2, taxa=0.6615649727),
-                Taxa(idade=109, tabuaId=2, taxa=0.7250264216),
-                Taxa(idade=110, tabuaId=2, taxa=0.7905941252),
-                Taxa(idade=111, tabuaId=2, taxa=0.855635952),
-                Taxa(idade=112, tabuaId=2, taxa=0.9153523739),
-                Taxa(idade=113, tabuaId=2, taxa=0.9629801222),
-                Taxa(idade=114, tabuaId=2, taxa=0.9912628352),
-                Taxa(idade=115, tabuaId=2, taxa=0.9996218265),
-                Taxa(idade=116, tabuaId=2, taxa=0.9999999975),
-                Taxa(idade=117, tabuaId=2, taxa=1.0),
-            ],
-        ),
-        Tabua(
-            id=3,
-            nome="BREMS 2021 MT F",
-            taxa=[
-                Taxa(idade=0, tabuaId=3, taxa=0.0003545253),
-                Taxa(idade=1, tabuaId=3, taxa=0.0002256076),
-                Taxa(idade=2, tabuaId=3, taxa=0.0001953352),
-                Taxa(idade=3, tabuaId=3, taxa=0.00018014),
-                Taxa(idade=4, tabuaId=3, taxa=0.0001711131),
-                Taxa(idade=5, tabuaId=3, taxa=0.0001654968),
-                Taxa(idade=6, tabuaId=3, taxa=0.0001621639),
-                Taxa(idade=7, tabuaId=3, taxa=0.0001608317),
-                Taxa(idade=8, tabuaId=3, taxa=0.0001621559),
-                Taxa(idade=9, tabuaId=3, taxa=0.0001676263),
-                Taxa(idade=10, tabuaId=3, taxa=0.000179138),
-                Taxa(idade=11, tabuaId=3, taxa=0.0001979666),
-                Taxa(idade=12, tabuaId=3, taxa=0.0002240586),
-                Taxa(idade=13, tabuaId=3, taxa=0.0002555375),
-                Taxa(idade=14, tabuaId=3, taxa=0.0002898166),
-                Taxa(idade=15, tabuaId=3, taxa=0.0003238074),
-                Taxa(idade=16, tabuaId=3, taxa=0.000354625),
-                Taxa(idade=17, tabuaId=3, taxa=0.0003804072),
-                Taxa(idade=18, tabuaId=3, taxa=0.0004002628),
-                Taxa(idade=19, tabuaId=3, taxa=0.0004141746),
-                Taxa(idade=20, tabuaId=3, taxa=0.0004229018),
-                Taxa(idade=21, tabuaId=3, taxa=0.0004275454),
-                Taxa(idade=22, tabuaId=3, taxa=0.0004295039),
-                Taxa(idade=23, tabuaId=3, taxa=0.0004303008),
-                Taxa(idade=24, tabuaId=3, taxa=0.0004311444),
-                Taxa(idade=25, tabuaId=3, taxa=0.0004332122),
-                Taxa(idade=26, tabuaId=3, taxa=0.0004374191),
-                Taxa(idade=27, tabuaId=3, taxa=0.0004445264),
-                Taxa(idade=28, tabuaId=3, taxa=0.0004551075),
-                Taxa(idade=29, tabuaId=3, taxa=0.0004695738),
-                Taxa(idade=30, tabuaId=3, taxa=0.000488241),
-                Taxa(idade=31, tabuaId=3, taxa=0.0005112644),
-                Taxa(idade=32, tabuaId=3, taxa=0.000539028),
-                Taxa(idade=33, tabuaId=3, taxa=0.0005716513),
-                Taxa(idade=34, tabuaId=3, taxa=0.0006093606),
-                Taxa(idade=35, tabuaId=3, taxa=0.00065248),
-                Taxa(idade=36, tabuaId=3, taxa=0.0007012212),
-                Taxa(idade=37, tabuaId=3, taxa=0.000755949),
-                Taxa(idade=38, tabuaId=3, taxa=0.0008170885),
-                Taxa(idade=39, tabuaId=3, taxa=0.0008850899),
-                Taxa(idade=40, tabuaId=3, taxa=0.0009604207),
-                Taxa(idade=41, tabuaId=3, taxa=0.0010437384),
-                Taxa(idade=42, tabuaId=3, taxa=0.001135621),
-                Taxa(idade=43, tabuaId=3, taxa=0.0012368706),
-                Taxa(idade=44, tabuaId=3, taxa=0.0013483463),
-                Taxa(idade=45, tabuaId=3, taxa=0.0014708876),
-                Taxa(idade=46, tabuaId=3, taxa=0.0016056642),
-                Taxa(idade=47, tabuaId=3, taxa=0.0017536568),
-                Taxa(idade=48, tabuaId=3, taxa=0.0019163234),
-                Taxa(idade=49, tabuaId=3, taxa=0.0020948383),
-                Taxa(idade=50, tabuaId=3, taxa=0.0022907592),
-                Taxa(idade=51, tabuaId=3, taxa=0.0025058503),
-                Taxa(idade=52, tabuaId=3, taxa=0.0027417309),
-                Taxa(idade=53, tabuaId=3, taxa=0.0030007045),
-                Taxa(idade=54, tabuaId=3, taxa=0.0032849944),
-                Taxa(idade=55, tabuaId=3, taxa=0.0035968481),
-                Taxa(idade=56, tabuaId=3, taxa=0.0039388176),
-                Taxa(idade=57, tabuaId=3, taxa=0.0043144355),
-                Taxa(idade=58, tabuaId=3, taxa=0.0047266324),
-                Taxa(idade=59, tabuaId=3, taxa=0.0051783979),
-                Taxa(idade=60, tabuaId=3, taxa=0.0056748589),
-                Taxa(idade=61, tabuaId=3, taxa=0.0062190159),
-                Taxa(idade=62, tabuaId=3, taxa=0.0068166499),
-                Taxa(idade=63, tabuaId=3, taxa=0.0074716172),
-                Taxa(idade=64, tabuaId=3, taxa=0.0081906672),
-                Taxa(idade=65, tabuaId=3, taxa=0.0089797158),
-                Taxa(idade=66, tabuaId=3, taxa=0.0098449948),
-                Taxa(idade=67, tabuaId=3, taxa=0.0107955489),
-                Taxa(idade=68, tabuaId=3, taxa=0.0118386959),
-                Taxa(idade=69, tabuaId=3, taxa=0.0129839252),
-                Taxa(idade=70, tabuaId=3, taxa=0.0142412286),
-                Taxa(idade=71, tabuaId=3, taxa=0.0156207259),
-                Taxa(idade=72, tabuaId=3, taxa=0.0171349675),
-                Taxa(idade=73, tabuaId=3, taxa=0.0187982793),
-                Taxa(idade=74, tabuaId=3, taxa=0.0206242479),
-                Taxa(idade=75, tabuaId=3, taxa=0.0226288264),
-                Taxa(idade=76, tabuaId=3, taxa=0.0248314142),
-                Taxa(idade=77, tabuaId=3, taxa=0.0272495388),
-                Taxa(idade=78, tabuaId=3, taxa=0.0299051555),
-                Taxa(idade=79, tabuaId=3, taxa=0.0328239872),
-                Taxa(idade=80, tabuaId=3, taxa=0.0360314673),
-                Taxa(idade=81, tabuaId=3, taxa=0.0395550131),
-                Taxa(idade=82, tabuaId=3, taxa=0.0434281254),
-                Taxa(idade=83, tabuaId=3, taxa=0.0476853125),
-                Taxa(idade=84, tabuaId=3, taxa=0.0523680636),
-                Taxa(idade=85, tabuaId=3, taxa=0.0575149199),
-                Taxa(idade=86, tabuaId=3, taxa=0.063181791),
-                Taxa(idade=87, tabuaId=3, taxa=0.0694154581),
-                Taxa(idade=88, tabuaId=3, taxa=0.0762773546),
-                Taxa(idade=89, tabuaId=3, taxa=0.0838367079),
-                Taxa(idade=90, tabuaId=3, taxa=0.0921620481),
-                Taxa(idade=91, tabuaId=3, taxa=0.1013332766),
-                Taxa(idade=92, tabuaId=3, taxa=0.1114511145),
-                Taxa(idade=93, tabuaId=3, taxa=0.122605117),
-                Taxa(idade=94, tabuaId=3, taxa=0.1349130031),
-                Taxa(idade=95, tabuaId=3, taxa=0.1485020565),
-                Taxa(idade=96, tabuaId=3, taxa=0.1635039763),
-                Taxa(idade=97, tabuaId=3, taxa=0.1800885327),
-                Taxa(idade=98, tabuaId=3, taxa=0.1984233589),
-                Taxa(idade=99, tabuaId=3, taxa=0.2187140517),
-                Taxa(idade=100, tabuaId=3, taxa=0.2411831912),
-                Taxa(idade=101, tabuaId=3, taxa=0.2660654905),
-                Taxa(idade=102, tabuaId=3, taxa=0.2936315215),
-                Taxa(idade=103, tabuaId=3, taxa=0.3241673555),
-                Taxa(idade=104, tabuaId=3, taxa=0.3579788802),
-                Taxa(idade=105, tabuaId=3, taxa=0.3954921207),
-                Taxa(idade=106, tabuaId=3, taxa=0.4369781903),
-                Taxa(idade=107, tabuaId=3, taxa=0.4828689008),
-                Taxa(idade=108, tabuaId=3, taxa=0.533396625),
-                Taxa(idade=109, tabuaId=3, taxa=0.588770321),
-                Taxa(idade=110, tabuaId=3, taxa=0.651327613),
-                Taxa(idade=111, tabuaId=3, taxa=0.7366778976),
-                Taxa(idade=112, tabuaId=3, taxa=0.8282022535),
-                Taxa(idade=113, tabuaId=3, taxa=0.9165748019),
-                Taxa(idade=114, tabuaId=3, taxa=0.9809465143),
-                Taxa(idade=115, tabuaId=3, taxa=0.9998161972),
-                Taxa(idade=116, tabuaId=3, taxa=1.0),
-            ],
-        ),
-        Tabua(
-            id=4,
-            nome="Alvaro Vindas",
-            taxa=[
-                Taxa(idade=0, tabuaId=4, taxa=0.0),
-                Taxa(idade=1, tabuaId=4, taxa=0.0),
-                Taxa(idade=2, tabuaId=4, taxa=0.0),
-                Taxa(idade=3, tabuaId=4, taxa=0.0),
-                Taxa(idade=4, tabuaId=4, taxa=0.0),
-                Taxa(idade=5, tabuaId=4, taxa=0.0),
-                Taxa(idade=6, tabuaId=4, taxa=0.0),
-                Taxa(idade=7, tabuaId=4, taxa=0.0),
-                Taxa(idade=8, tabuaId=4, taxa=0.0),
-                Taxa(idade=9, tabuaId=4, taxa=0.0),
-                Taxa(idade=10, tabuaId=4, taxa=0.0),
-                Taxa(idade=11, tabuaId=4, taxa=0.0),
-                Taxa(idade=12, tabuaId=4, taxa=0.0),
-                Taxa(idade=13, tabuaId=4, taxa=0.0),
-                Taxa(idade=14, tabuaId=4, taxa=0.0),
-                Taxa(idade=15, tabuaId=4, taxa=0.000575),
-                Taxa(idade=16, tabuaId=4, taxa=0.000573),
-                Taxa(idade=17, tabuaId=4, taxa=0.000572),
-                Taxa(idade=18, tabuaId=4, taxa=0.00057),
-                Taxa(idade=19, tabuaId=4, taxa=0.000569),
-                Taxa(idade=20, tabuaId=4, taxa=0.000569),
-                Taxa(idade=21, tabuaId=4, taxa=0.000569),
-                Taxa(idade=22, tabuaId=4, taxa=0.000569),
-                Taxa(idade=23, tabuaId=4, taxa=0.00057),
-                Taxa(idade=24, tabuaId=4, taxa=0.000572),
-                Taxa(idade=25, tabuaId=4, taxa=0.000575),
-                Taxa(idade=26, tabuaId=4, taxa=0.000579),
-                Taxa(idade=27, tabuaId=4, taxa=0.000583),
-                Taxa(idade=28, tabuaId=4, taxa=0.000589),
-                Taxa(idade=29, tabuaId=4, taxa=0.000596),
-                Taxa(idade=30, tabuaId=4, taxa=0.000605),
-                Taxa(idade=31, tabuaId=4, taxa=0.000615),
-                Taxa(idade=32, tabuaId=4, taxa=0.000628),
-                Taxa(idade=33, tabuaId=4, taxa=0.000643),
-                Taxa(idade=34, tabuaId=4, taxa=0.00066),
-                Taxa(idade=35, tabuaId=4, taxa=0.000681),
-                Taxa(idade=36, tabuaId=4, taxa=0.000704),
-                Taxa(idade=37, tabuaId=4, taxa=0.000732),
-                Taxa(idade=38, tabuaId=4, taxa=0.000764),
-                Taxa(idade=39, tabuaId=4, taxa=0.000801),
-                Taxa(idade=40, tabuaId=4, taxa=0.000844),
-                Taxa(idade=41, tabuaId=4, taxa=0.000893),
-                Taxa(idade=42, tabuaId=4, taxa=0.000949),
-                Taxa(idade=43, tabuaId=4, taxa=0.001014),
-                Taxa(idade=44, tabuaId=4, taxa=0.001088),
-                Taxa(idade=45, tabuaId=4, taxa=0.001174),
-                Taxa(idade=46, tabuaId=4, taxa=0.001271),
-                Taxa(idade=47, tabuaId=4, taxa=0.001383),
-                Taxa(idade=48, tabuaId=4, taxa=0.001511),
-                Taxa(idade=49, tabuaId=4, taxa=0.001657),
-                Taxa(idade=50, tabuaId=4, taxa=0.001823),
-                Taxa(idade=51, tabuaId=4, taxa=0.002014),
-                Taxa(idade=52, tabuaId=4, taxa=0.002231),
-                Taxa(idade=53, tabuaId=4, taxa=0.002479),
-                Taxa(idade=54, tabuaId=4, taxa=0.002762),
-                Taxa(idade=55, tabuaId=4, taxa=0.003089),
-                Taxa(idade=56, tabuaId=4, taxa=0.003452),
-                Taxa(idade=57, tabuaId=4, taxa=0.003872),
-                Taxa(idade=58, tabuaId=4, taxa=0.00435),
-                Taxa(idade=59, tabuaId=4, taxa=0.004895),
-                Taxa(idade=60, tabuaId=4, taxa=0.005516),
-                Taxa(idade=61, tabuaId=4, taxa=0.006223),
-                Taxa(idade=62, tabuaId=4, taxa=0.007029),
-                Taxa(idade=63, tabuaId=4, taxa=0.007947),
-                Taxa(idade=64, tabuaId=4, taxa=0.008993),
-                Taxa(idade=65, tabuaId=4, taxa=0.010183),
-                Taxa(idade=66, tabuaId=4, taxa=0.011542),
-                Taxa(idade=67, tabuaId=4, taxa=0.013087),
-                Taxa(idade=68, tabuaId=4, taxa=0.014847),
-                Taxa(idade=69, tabuaId=4, taxa=0.016852),
-                Taxa(idade=70, tabuaId=4, taxa=0.019135),
-                Taxa(idade=71, tabuaId=4, taxa=0.021734),
-                Taxa(idade=72, tabuaId=4, taxa=0.024695),
-                Taxa(idade=73, tabuaId=4, taxa=0.028066),
-                Taxa(idade=74, tabuaId=4, taxa=0.031904),
-                Taxa(idade=75, tabuaId=4, taxa=0.036275),
-                Taxa(idade=76, tabuaId=4, taxa=0.041252),
-                Taxa(idade=77, tabuaId=4, taxa=0.046919),
-                Taxa(idade=78, tabuaId=4, taxa=0.055371),
-                Taxa(idade=79, tabuaId=4, taxa=0.060718),
-                Taxa(idade=80, tabuaId=4, taxa=0.069084),
-                Taxa(idade=81, tabuaId=4, taxa=0.078608),
-                Taxa(idade=82, tabuaId=4, taxa=0.089453),
-                Taxa(idade=83, tabuaId=4, taxa=0.1018),
-                Taxa(idade=84, tabuaId=4, taxa=0.115859),
-                Taxa(idade=85, tabuaId=4, taxa=0.131805),
-                Taxa(idade=86, tabuaId=4, taxa=0.15009),
-                Taxa(idade=87, tabuaId=4, taxa=0.17084),
-                Taxa(idade=88, tabuaId=4, taxa=0.194465),
-                Taxa(idade=89, tabuaId=4, taxa=0.221363),
-                Taxa(idade=90, tabuaId=4, taxa=0.251988),
-                Taxa(idade=91, tabuaId=4, taxa=1.0),
-            ],
-        ),
-        Tabua(
-            id=5,
-            nome="Alvaro Vindas DPI",
-            taxa=[
-                Taxa(idade=0, tabuaId=5, taxa=0.0),
-                Taxa(idade=1, tabuaId=5, taxa=0.0),
-                Taxa(idade=2, tabuaId=5, taxa=0.0),
-                Taxa(idade=3, tabuaId=5, taxa=0.0),
-                Taxa(idade=4, tabuaId=5, taxa=0.0),
-                Taxa(idade=5, tabuaId=5, taxa=0.0),
-                Taxa(idade=6, tabuaId=5, taxa=0.0),
-                Taxa(idade=7, tabuaId=5, taxa=0.0),
-                Taxa(idade=8, tabuaId=5, taxa=0.0),
-                Taxa(idade=9, tabuaId=5, taxa=0.0),
-                Taxa(idade=10, tabuaId=5, taxa=0.0),
-                Taxa(idade=11, tabuaId=5, taxa=0.0),
-                Taxa(idade=12, tabuaId=5, taxa=0.0),
-                Taxa(idade=13, tabuaId=5, taxa=0.0),
-                Taxa(idade=14, tabuaId=5, taxa=0.0),
-                Taxa(idade=15, tabuaId=5, taxa=0.000575),
-                Taxa(idade=16, tabuaId=5, taxa=0.000573),
-                Taxa(idade=17, tabuaId=5, taxa=0.000572),
-                Taxa(idade=18, tabuaId=5, taxa=0.00057),
-                Taxa(idade=19, tabuaId=5, taxa=0.000569),
-                Taxa(idade=20, tabuaId=5, taxa=0.000569),
-                Taxa(idade=21, tabuaId=5, taxa=0.000569),
-                Taxa(idade=22, tabuaId=5, taxa=0.000569),
-                Taxa(idade=23, tabuaId=5, taxa=0.00057),
-                Taxa(idade=24, tabuaId=5, taxa=0.000572),
-                Taxa(idade=25, tabuaId=5, taxa=0.000575),
-                Taxa(idade=26, tabuaId=5, taxa=0.000579),
-                Taxa(idade=27, tabuaId=5, taxa=0.000583),
-                Taxa(idade=28, tabuaId=5, taxa=0.000589),
-                Taxa(idade=29, tabuaId=5, taxa=0.000596),
-                Taxa(idade=30, tabuaId=5, taxa=0.000605),
-                Taxa(idade=31, tabuaId=5, taxa=0.000615),
-                Taxa(idade=32, tabuaId=5, taxa=0.000628),
-                Taxa(idade=33, tabuaId=5, taxa=0.000643),
-                Taxa(idade=34, tabuaId=5, taxa=0.00066),
-                Taxa(idade=35, tabuaId=5, taxa=0.000681),
-                Taxa(idade=36, tabuaId=5, taxa=0.000704),
-                Taxa(idade=37, tabuaId=5, taxa=0.000732),
-                Taxa(idade=38, tabuaId=5, taxa=0.000764),
-                Taxa(idade=39, tabuaId=5, taxa=0.000801),
-                Taxa(idade=40, tabuaId=5, taxa=0.000844),
-                Taxa(idade=41, tabuaId=5, taxa=0.000893),
-                Taxa(idade=42, tabuaId=5, taxa=0.000949),
-                Taxa(idade=43, tabuaId=5, taxa=0.001014),
-                Taxa(idade=44, tabuaId=5, taxa=0.001088),
-                Taxa(idade=45, tabuaId=5, taxa=0.001174),
-                Taxa(idade=46, tabuaId=5, taxa=0.001271),
-                Taxa(idade=47, tabuaId=5, taxa=0.001383),
-                Taxa(idade=48, tabuaId=5, taxa=0.001511),
-                Taxa(idade=49, tabuaId=5, taxa=0.001657),
-                Taxa(idade=50, tabuaId=5, taxa=0.001823),
-                Taxa(idade=51, tabuaId=5, taxa=0.002014),
-                Taxa(idade=52, tabuaId=5, taxa=0.002231),
-                Taxa(idade=53, tabuaId=5, taxa=0.002479),
-                Taxa(idade=54, tabuaId=5, taxa=0.002762),
-                Taxa(idade=55, tabuaId=5, taxa=0.003089),
-                Taxa(idade=56, tabuaId=5, taxa=0.003452),
-                Taxa(idade=57, tabuaId=5, taxa=0.003872),
-                Taxa(idade=58, tabuaId=5, taxa=0.00435),
-                Taxa(idade=59, tabuaId=5, taxa=0.004895),
-                Taxa(idade=60, tabuaId=5, taxa=0.005516),
-                Taxa(idade=61, tabuaId=5, taxa=0.006223),
-                Taxa(idade=62, tabuaId=5, taxa=0.007029),
-                Taxa(idade=63, tabuaId=5, taxa=0.007947),
-                Taxa(idade=64, tabuaId=5, taxa=0.008993),
-                Taxa(idade=65, tabuaId=5, taxa=0.010183),
-                Taxa(idade=66, tabuaId=5, taxa=0.011542),
-                Taxa(idade=67, tabuaId=5, taxa=0.013087),
-                Taxa(idade=68, tabuaId=5, taxa=0.014847),
-                Taxa(idade=69, tabuaId=5, taxa=0.016852),
-            ],
-        ),
-        Tabua(
-            id=6,
-            nome="BREMS 2021 SB M",
-            taxa=[
-                Taxa(idade=0, tabuaId=6, taxa=0.000352673),
-                Taxa(idade=1, tabuaId=6, taxa=0.0002263863),
-                Taxa(idade=2, tabuaId=6, taxa=0.0001963496),
-                Taxa(idade=3, tabuaId=6, taxa=0.0001813874),
-                Taxa(idade=4, tabuaId=6, taxa=0.000172686),
-                Taxa(idade=5, tabuaId=6, taxa=0.0001673759),
-                Taxa(idade=6, tabuaId=6, taxa=0.0001641625),
-                Taxa(idade=7, tabuaId=6, taxa=0.0001629112),
-                Taxa(idade=8, tabuaId=6, taxa=0.0001633819),
-                Taxa(idade=9, tabuaId=6, taxa=0.0001663195),
-                Taxa(idade=10, tabuaId=6, taxa=0.0001731675),
-                Taxa(idade=11, tabuaId=6, taxa=0.0001862037),
-                Taxa(idade=12, tabuaId=6, taxa=0.0002096997),
-                Taxa(idade=13, tabuaId=6, taxa=0.0002486764),
-                Taxa(idade=14, tabuaId=6, taxa=0.0003057705),
-                Taxa(idade=15, tabuaId=6, taxa=0.0003793169),
-                Taxa(idade=16, tabuaId=6, taxa=0.0004648048),
-                Taxa(idade=17, tabuaId=6, taxa=0.0005570015),
-                Taxa(idade=18, tabuaId=6, taxa=0.0006461586),
-                Taxa(idade=19, tabuaId=6, taxa=0.0007265512),
-                Taxa(idade=20, tabuaId=6, taxa=0.0007931791),
-                Taxa(idade=21, tabuaId=6, taxa=0.0008437119),
-                Taxa(idade=22, tabuaId=6, taxa=0.0008765021),
-                Taxa(idade=23, tabuaId=6, taxa=0.0008922445),
-                Taxa(idade=24, tabuaId=6, taxa=0.000895003),
-                Taxa(idade=25, tabuaId=6, taxa=0.0008864633),
-                Taxa(idade=26, tabuaId=6, taxa=0.0008697844),
-                Taxa(idade=27, tabuaId=6, taxa=0.0008498267),
-                Taxa(idade=28, tabuaId=6, taxa=0.000828435),
-                Taxa(idade=29, tabuaId=6, taxa=0.0008091954),
-                Taxa(idade=30, tabuaId=6, taxa=0.0007942939),
-                Taxa(idade=31, tabuaId=6, taxa=0.0007858324),
-                Taxa(idade=32, tabuaId=6, taxa=0.0007844502),
-                Taxa(idade=33, tabuaId=6, taxa=0.0007910742),
-                Taxa(idade=34, tabuaId=6, taxa=0.000806779),
-                Taxa(idade=35, tabuaId=6, taxa=0.0008312581),
-                Taxa(idade=36, tabuaId=6, taxa=0.0008650765),
-                Taxa(idade=37, tabuaId=6, taxa=0.0009090822),
-                Taxa(idade=38, tabuaId=6, taxa=0.0009629697),
-                Taxa(idade=39, tabuaId=6, taxa=0.0010267543),
-                Taxa(idade=40, tabuaId=6, taxa=0.0011018664),
-                Taxa(idade=41, tabuaId=6, taxa=0.0011874035),
-                Taxa(idade=42, tabuaId=6, taxa=0.0012847691),
-                Taxa(idade=43, tabuaId=6, taxa=0.0013940274),
-                Taxa(idade=44, tabuaId=6, taxa=0.0015160257),
-                Taxa(idade=45, tabuaId=6, taxa=0.0016514189),
-                Taxa(idade=46, tabuaId=6, taxa=0.0018018142),
-                Taxa(idade=47, tabuaId=6, taxa=0.0019683286),
-                Taxa(idade=48, tabuaId=6, taxa=0.0021525217),
-                Taxa(idade=49, tabuaId=6, taxa=0.0023562893),
-                Taxa(idade=50, tabuaId=6, taxa=0.0025803187),
-                Taxa(idade=51, tabuaId=6, taxa=0.0028275297),
-                Taxa(idade=52, tabuaId=6, taxa=0.0030996543),
-                Taxa(idade=53, tabuaId=6, taxa=0.0033995824),
-                Taxa(idade=54, tabuaId=6, taxa=0.003729461),
-                Taxa(idade=55, tabuaId=6, taxa=0.0040923344),
-                Taxa(idade=56, tabuaId=6, taxa=0.0044915374),
-                Taxa(idade=57, tabuaId=6, taxa=0.0049303584),
-                Taxa(idade=58, tabuaId=6, taxa=0.0054136483),
-                Taxa(idade=59, tabuaId=6, taxa=0.0059450334),
-                Taxa(idade=60, tabuaId=6, taxa=0.0065296007),
-                Taxa(idade=61, tabuaId=6, taxa=0.0071722161),
-                Taxa(idade=62, tabuaId=6, taxa=0.0078788852),
-                Taxa(idade=63, tabuaId=6, taxa=0.0086563625),
-                Taxa(idade=64, tabuaId=6, taxa=0.0095115578),
-                Taxa(idade=65, tabuaId=6, taxa=0.0104519497),
-                Taxa(idade=66, tabuaId=6, taxa=0.0114859391),
-                Taxa(idade=67, tabuaId=6, taxa=0.0126237559),
-                Taxa(idade=68, tabuaId=6, taxa=0.0138734835),
-                Taxa(idade=69, tabuaId=6, taxa=0.0152496783),
-                Taxa(idade=70, tabuaId=6, taxa=0.0167635518),
-                Taxa(idade=71, tabuaId=6, taxa=0.0184300559),
-                Taxa(idade=72, tabuaId=6, taxa=0.0202639879),
-                Taxa(idade=73, tabuaId=6, taxa=0.0222823196),
-                Taxa(idade=74, tabuaId=6, taxa=0.024504775),
-                Taxa(idade=75, tabuaId=6, taxa=0.0269506554),
-                Taxa(idade=76, tabuaId=6, taxa=0.029635836),
-                Taxa(idade=77, tabuaId=6, taxa=0.0325971686),
-                Taxa(idade=78, tabuaId=6, taxa=0.0358570079),
-                Taxa(idade=79, tabuaId=6, taxa=0.0394446464),
-                Taxa(idade=80, tabuaId=6, taxa=0.0433961328),
-                Taxa(idade=81, tabuaId=6, taxa=0.0477439739),
-                Taxa(idade=82, tabuaId=6, taxa=0.0525348101),
-                Taxa(idade=83, tabuaId=6, taxa=0.0578148445),
-                Taxa(idade=84, tabuaId=6, taxa=0.0636241407),
-                Taxa(idade=85, tabuaId=6, taxa=0.0700283914),
-                Taxa(idade=86, tabuaId=6, taxa=0.0770882108),
-                Taxa(idade=87, tabuaId=6, taxa=0.0848700717),
-                Taxa(idade=88, tabuaId=6, taxa=0.0934457259),
-                Taxa(idade=89, tabuaId=6, taxa=0.1029082626),
-                Taxa(idade=90, tabuaId=6, taxa=0.1133571933),
-                Taxa(idade=91, tabuaId=6, taxa=0.1248876218),
-                Taxa(idade=92, tabuaId=6, taxa=0.1376241205),
-                Taxa(idade=93, tabuaId=6, taxa=0.1517046674),
-                Taxa(idade=94, tabuaId=6, taxa=0.1672362831),
-                Taxa(idade=95, tabuaId=6, taxa=0.1844049862),
-                Taxa(idade=96, tabuaId=6, taxa=0.2033739768),
-                Taxa(idade=97, tabuaId=6, taxa=0.2243683381),
-                Taxa(idade=98, tabuaId=6, taxa=0.2475889855),
-                Taxa(idade=99, tabuaId=6, taxa=0.2732773833),
-                Taxa(idade=100, tabuaId=6, taxa=0.3016858435),
-                Taxa(idade=101, tabuaId=6, taxa=0.3331452048),
-                Taxa(idade=102, tabuaId=6, taxa=0.3678627306),
-                Taxa(idade=103, tabuaId=6, taxa=0.4062675254),
-                Taxa(idade=104, tabuaId=6, taxa=0.4486313948),
-                Taxa(idade=105, tabuaId=6, taxa=0.4951993429),
-                Taxa(idade=106, tabuaId=6, taxa=0.5461625216),
-                Taxa(idade=107, tabuaId=6, taxa=0.6016906041),
-                Taxa(idade=108, tabuaId=6, taxa=0.6615649727),
-                Taxa(idade=109, tabuaId=6, taxa=0.7250264216),
-                Taxa(idade=110, tabuaId=6, taxa=0.7905941252),
-                Taxa(idade=111, tabuaId=6, taxa=0.855635952),
-                Taxa(idade=112, tabuaId=6, taxa=0.9153523739),
-                Taxa(idade=113, tabuaId=6, taxa=0.9629801222),
-                Taxa(idade=114, tabuaId=6, taxa=0.9912628352),
-                Taxa(idade=115, tabuaId=6, taxa=0.9996218265),
-                Taxa(idade=116, tabuaId=6, taxa=0.9999999975),
-                Taxa(idade=117, tabuaId=6, taxa=1.0),
-            ],
-        ),
-        Tabua(
-            id=7,
-            nome="BREMS 2021 SB F",
-            taxa=[
-                Taxa(idade=0, tabuaId=7, taxa=0.0002926024),
-                Taxa(idade=1, tabuaId=7, taxa=0.0001921118),
-                Taxa(idade=2, tabuaId=7, taxa=0.0001545556),
-                Taxa(idade=3, tabuaId=7, taxa=0.0001342011),
-                Taxa(idade=4, tabuaId=7, taxa=0.0001214338),
-                Taxa(idade=5, tabuaId=7, taxa=0.0001131862),
-                Taxa(idade=6, tabuaId=7, taxa=0.0001087677),
-                Taxa(idade=7, tabuaId=7, taxa=0.0001089789),
-                Taxa(idade=8, tabuaId=7, taxa=0.0001148906),
-                Taxa(idade=9, tabuaId=7, taxa=0.0001271234),
-                Taxa(idade=10, tabuaId=7, taxa=0.0001454426),
-                Taxa(idade=11, tabuaId=7, taxa=0.0001684839),
-                Taxa(idade=12, tabuaId=7, taxa=0.000194344),
-                Taxa(idade=13, tabuaId=7, taxa=0.000220953),
-                Taxa(idade=14, tabuaId=7, taxa=0.0002465344),
-                Taxa(idade=15, tabuaId=7, taxa=0.0002694449),
-                Taxa(idade=16, tabuaId=7, taxa=0.0002887738),
-                Taxa(idade=17, tabuaId=7, taxa=0.0003041347),
-                Taxa(idade=18, tabuaId=7, taxa=0.0003156078),
-                Taxa(idade=19, tabuaId=7, taxa=0.0003234593),
-                Taxa(idade=20, tabuaId=7, taxa=0.0003283383),
-                Taxa(idade=21, tabuaId=7, taxa=0.0003308993),
-                Taxa(idade=22, tabuaId=7, taxa=0.0003319107),
-                Taxa(idade=23, tabuaId=7, taxa=0.0003319802),
-                Taxa(idade=24, tabuaId=7, taxa=0.0003318578),
-                Taxa(idade=25, tabuaId=7, taxa=0.0003320945),
-                Taxa(idade=26, tabuaId=7, taxa=0.0003333132),
-                Taxa(idade=27, tabuaId=7, taxa=0.0003359096),
-                Taxa(idade=28, tabuaId=7, taxa=0.0003403258),
-                Taxa(idade=29, tabuaId=7, taxa=0.0003468454),
-                Taxa(idade=30, tabuaId=7, taxa=0.0003559563),
-                Taxa(idade=31, tabuaId=7, taxa=0.0003676504),
-                Taxa(idade=32, tabuaId=7, taxa=0.0003823406),
-                Taxa(idade=33, tabuaId=7, taxa=0.0004003492),
-                Taxa(idade=34, tabuaId=7, taxa=0.000421797),
-                Taxa(idade=35, tabuaId=7, taxa=0.0004469061),
-                Taxa(idade=36, tabuaId=7, taxa=0.000476017),
-                Taxa(idade=37, tabuaId=7, taxa=0.0005094283),
-                Taxa(idade=38, tabuaId=7, taxa=0.0005474464),
-                Taxa(idade=39, tabuaId=7, taxa=0.0005902525),
-                Taxa(idade=40, tabuaId=7, taxa=0.000638368),
-                Taxa(idade=41, tabuaId=7, taxa=0.0006923977),
-                Taxa(idade=42, tabuaId=7, taxa=0.000752534),
-                Taxa(idade=43, tabuaId=7, taxa=0.0008194489),
-                Taxa(idade=44, tabuaId=7, taxa=0.0008936073),
-                Taxa(idade=45, tabuaId=7, taxa=0.0009759214),
-                Taxa(idade=46, tabuaId=7, taxa=0.0010669983),
-                Taxa(idade=47, tabuaId=7, taxa=0.0011674964),
-                Taxa(idade=48, tabuaId=7, taxa=0.0012785896),
-                Taxa(idade=49, tabuaId=7, taxa=0.0014010057),
-                Taxa(idade=50, tabuaId=7, taxa=0.0015362853),
-                Taxa(idade=51, tabuaId=7, taxa=0.0016854259),
-                Taxa(idade=52, tabuaId=7, taxa=0.0018494979),
-                Taxa(idade=53, tabuaId=7, taxa=0.0020305345),
-                Taxa(idade=54, tabuaId=7, taxa=0.0022300398),
-                Taxa(idade=55, tabuaId=7, taxa=0.0024493874),
-                Taxa(idade=56, tabuaId=7, taxa=0.0026910448),
-                Taxa(idade=57, tabuaId=7, taxa=0.0029569607),
-                Taxa(idade=58, tabuaId=7, taxa=0.0032498052),
-                Taxa(idade=59, tabuaId=7, taxa=0.0035721857),
-                Taxa(idade=60, tabuaId=7, taxa=0.0039266999),
-                Taxa(idade=61, tabuaId=7, taxa=0.0043169759),
-                Taxa(idade=62, tabuaId=7, taxa=0.0047468718),
-                Taxa(idade=63, tabuaId=7, taxa=0.0052206496),
-                Taxa(idade=64, tabuaId=7, taxa=0.0057413071),
-                Taxa(idade=65, tabuaId=7, taxa=0.0063149382),
-                Taxa(idade=66, tabuaId=7, taxa=0.0069471667),
-                Taxa(idade=67, tabuaId=7, taxa=0.007643038),
-                Taxa(idade=68, tabuaId=7, taxa=0.0084090081),
-                Taxa(idade=69, tabuaId=7, taxa=0.0092516938),
-                Taxa(idade=70, tabuaId=7, taxa=0.0101800969),
-                Taxa(idade=71, tabuaId=7, taxa=0.0112028796),
-                Taxa(idade=72, tabuaId=7, taxa=0.0123321401),
-                Taxa(idade=73, tabuaId=7, taxa=0.0135736618),
-                Taxa(idade=74, tabuaId=7, taxa=0.0149418726),
-                Taxa(idade=75, tabuaId=7, taxa=0.0164517928),
-                Taxa(idade=76, tabuaId=7, taxa=0.0181160009),
-                Taxa(idade=77, tabuaId=7, taxa=0.0199506903),
-                Taxa(idade=78, tabuaId=7, taxa=0.0219734791),
-                Taxa(idade=79, tabuaId=7, taxa=0.0242064957),
-                Taxa(idade=80, tabuaId=7, taxa=0.0266704878),
-                Taxa(idade=81, tabuaId=7, taxa=0.0293906119),
-                Taxa(idade=82, tabuaId=7, taxa=0.0323973578),
-                Taxa(idade=83, tabuaId=7, taxa=0.0357190201),
-                Taxa(idade=84, tabuaId=7, taxa=0.0393893076),
-                Taxa(idade=85, tabuaId=7, taxa=0.0434512088),
-                Taxa(idade=86, tabuaId=7, taxa=0.0479447806),
-                Taxa(idade=87, tabuaId=7, taxa=0.0529195081),
-                Taxa(idade=88, tabuaId=7, taxa=0.0584343089),
-                Taxa(idade=89, tabuaId=7, taxa=0.0645438741),
-                Taxa(idade=90, tabuaId=7, taxa=0.0713327682),
-                Taxa(idade=91, tabuaId=7, taxa=0.0788765414),
-                Taxa(idade=92, tabuaId=7, taxa=0.0872622022),
-                Taxa(idade=93, tabuaId=7, taxa=0.0965910721),
-                Taxa(idade=94, tabuaId=7, taxa=0.1069792537),
-                Taxa(idade=95, tabuaId=7, taxa=0.1185797068),
-                Taxa(idade=96, tabuaId=7, taxa=0.1315729034),
-                Taxa(idade=97, tabuaId=7, taxa=0.146098501),
-                Taxa(idade=98, tabuaId=7, taxa=0.162408948),
-                Taxa(idade=99, tabuaId=7, taxa=0.1807177584),
-                Taxa(idade=100, tabuaId=7, taxa=0.2013791948),
-                Taxa(idade=101, tabuaId=7, taxa=0.2246879252),
-                Taxa(idade=102, tabuaId=7, taxa=0.251041735),
-                Taxa(idade=103, tabuaId=7, taxa=0.2809524744),
-                Taxa(idade=104, tabuaId=7, taxa=0.3150074012),
-                Taxa(idade=105, tabuaId=7, taxa=0.3538938757),
-                Taxa(idade=106, tabuaId=7, taxa=0.3984032833),
-                Taxa(idade=107, tabuaId=7, taxa=0.4494033446),
-                Taxa(idade=108, tabuaId=7, taxa=0.5079349596),
-                Taxa(idade=109, tabuaId=7, taxa=0.5750130913),
-                Taxa(idade=110, tabuaId=7, taxa=0.651327613),
-                Taxa(idade=111, tabuaId=7, taxa=0.7366778976),
-                Taxa(idade=112, tabuaId=7, taxa=0.8282022535),
-                Taxa(idade=113, tabuaId=7, taxa=0.9165748019),
-                Taxa(idade=114, tabuaId=7, taxa=0.9809465143),
-                Taxa(idade=115, tabuaId=7, taxa=0.9998161972),
-                Taxa(idade=116, tabuaId=7, taxa=1.0),
-            ],
-        ),
-    ]
+def importar_modelos() -> None:
+    """Registra todas as tabelas nos metadados, para que db.create_all as crie."""
+    for modulo in MODULOS_MODELOS:
+        import_module(modulo)
 
-    tipo_tabua = [
-        TipoTabua(id=1, nome="Sinistro"),
-        TipoTabua(id=2, nome="DPI"),
-        TipoTabua(id=3, nome="Acumulacao"),
-        TipoTabua(id=4, nome="Concessao"),
-    ]
 
-    produto_tabua = [
-        ProdutoTabua(produtoId=1, sexo="M", tipoTabuaId=1, tabuaId=2),
-        ProdutoTabua(produtoId=1, sexo="F", tipoTabuaId=1, tabuaId=3),
-        ProdutoTabua(produtoId=2, sexo="M", tipoTabuaId=1, tabuaId=2),
-        ProdutoTabua(produtoId=2, sexo="F", tipoTabuaId=1, tabuaId=3),
-        ProdutoTabua(produtoId=2, sexo="M", tipoTabuaId=2, tabuaId=5),
-        ProdutoTabua(produtoId=2, sexo="F", tipoTabuaId=2, tabuaId=5),
-        ProdutoTabua(produtoId=3, sexo="M", tipoTabuaId=1, tabuaId=4),
-        ProdutoTabua(produtoId=3, sexo="F", tipoTabuaId=1, tabuaId=4),
-        ProdutoTabua(produtoId=7, sexo="M", tipoTabuaId=3, tabuaId=1),
-        ProdutoTabua(produtoId=7, sexo="F", tipoTabuaId=3, tabuaId=1),
-        ProdutoTabua(produtoId=7, sexo="M", tipoTabuaId=4, tabuaId=6),
-        ProdutoTabua(produtoId=7, sexo="F", tipoTabuaId=4, tabuaId=7),
-    ]
-
-    juros = [
-        Juros(id=1, juros=0.02),
-        Juros(id=2, juros=0.04),
-        Juros(id=3, juros=0.06),
-    ]
-
-    produto_prazo = [
-        ProdutoPrazo(produtoId=1, prazo=10, jurosId=1),
-        ProdutoPrazo(produtoId=1, prazo=20, jurosId=2),
-        ProdutoPrazo(produtoId=1, prazo=30, jurosId=3),
-        ProdutoPrazo(produtoId=2, prazo=10, jurosId=1),
-        ProdutoPrazo(produtoId=2, prazo=20, jurosId=2),
-        ProdutoPrazo(produtoId=2, prazo=30, jurosId=3),
-        ProdutoPrazo(produtoId=3, prazo=5, jurosId=1),
-        ProdutoPrazo(produtoId=3, prazo=10, jurosId=1),
-        ProdutoPrazo(produtoId=7, prazo=30, jurosId=1),
-        ProdutoPrazo(produtoId=7, prazo=40, jurosId=2),
-        ProdutoPrazo(produtoId=7, prazo=50, jurosId=3),
-    ]
-
-    produto_prazo_renda = [
-        ProdutoPrazoRenda(produtoId=7, prazo=30, prazoCerto=0),
-        ProdutoPrazoRenda(produtoId=7, prazo=30, prazoCerto=5),
-        ProdutoPrazoRenda(produtoId=7, prazo=30, prazoCerto=10),
-    ]
-
-    matricula = [
-        Matricula(
-            id=1,
-            cpfSegurado=12345678900,
-            produtoId=1,
-            dataAssinatura=date(2020, 1, 1),
-            prazo=10,
-            prazoRenda=None,
-            prazoCertoRenda=None,
-            beneficio=50000,
-            segurado=segurado,
-        ),
-        Matricula(
-            id=2,
-            cpfSegurado=12345678900,
-            produtoId=2,
-            dataAssinatura=date(2020, 1, 1),
-            prazo=15,
-            prazoRenda=None,
-            prazoCertoRenda=None,
-            beneficio=1000000,
-            segurado=segurado,
-        ),
-    ]
+def init_db(db):
+    """Cria as tabelas e carrega os dados iniciais, que ficam em model/dados."""
+    from model.carga_inicial import carregar_dados_iniciais
+    from model.tabua_empacotada import empacotar_tabuas
 
-    db.session.add_all(formulas)
-    db.session.commit()
-    db.session.add_all(tipo_tabua)
-    db.session.commit()
-    db.session.add_all(produtos)
-    db.session.commit()
-    db.session.add_all(tabuas)
-    db.session.commit()
-    db.session.add_all(produto_tabua)
-    db.session.commit()
-    db.session.add_all(juros)
-    db.session.commit()
-    db.session.add_all(produto_prazo)
-    db.session.commit()
-    db.session.add_all(matricula)
-    db.session.commit()
-    db.session.add_all(produto_prazo_renda)
-    db.session.commit()
+    importar_modelos()
+    db.create_all()
+    carregar_dados_iniciais(db)
+    empacotar_tabuas(db)
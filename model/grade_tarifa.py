@@ -0,0 +1,395 @@
+from dataclasses import dataclass
+from datetime import date
+from hashlib import sha256
+from math import isnan
+from typing import Awaitable, Callable, Optional
+
+import tabatu as tb
+from dateutil.relativedelta import relativedelta
+from flask import current_app
+from numpy import arange, asarray, float64, frombuffer
+from numpy.typing import NDArray
+from sqlalchemy import select
+from sqlalchemy.exc import NoResultFound, SQLAlchemyError
+from sqlalchemy.orm import Session
+from tabatu.periodicidade import Periodicidade
+
+from model.cache import CacheLRU, invalidar_apos_commit
+from model.produto import (
+    Formula,
+    Juros,
+    Produto,
+    ProdutoPrazo,
+    ProdutoPrazoRenda,
+    ProdutoTabua,
+    TipoTabua,
+)
+from model import queries_assincronas
+from model.armazenamento import executar_em_segundo_plano, executar_leitura
+from model.queries import (
+    pegar_juros,
+    pegar_nome_formula,
+    pegar_prazos,
+    pegar_prazos_renda,
+    pegar_tabuas_formula,
+)
+from model.tabua import Tabua, Taxa
+from model.tarifa import Tarifa
+from src.idades_prazos import calcula_idade
+from src.produtos.lote import aposentadoria_capitalizado_lote, peculio_capitalizado_lote
+
+VERSAO_TARIFA = 1
+
+
+@dataclass(frozen=True)
+class GradeTarifa:
+    """Prêmio por unidade de benefício para cada idade de ingresso.
+
+    Args:
+        periodicidade (Periodicidade): Periodicidade da idade de ingresso.
+        taxas (NDArray[float64]): Prêmio por unidade de benefício, indexado pela idade de
+            ingresso. Idades que não podem contratar o produto possuem nan.
+        assinatura (str): Identifica as premissas usadas na construção da grade.
+    """
+
+    periodicidade: Periodicidade
+    taxas: NDArray[float64]
+    assinatura: str
+
+    def premio(
+        self, data_assinatura: date, data_nascimento: date, beneficio: float
+    ) -> Optional[float]:
+        """Prêmio comercial no início do contrato, ou None caso a grade não cubra a proposta."""
+        idade = calcula_idade(data_nascimento, data_assinatura, self.periodicidade)
+        if idade < 0 or idade >= len(self.taxas) or beneficio <= 0:
+            return None
+        taxa = self.taxas[idade]
+        if isnan(taxa):
+            return None
+        return float(taxa * beneficio)
+
+
+@dataclass(frozen=True)
+class PremissasGrade:
+    """Premissas de uma grade: fórmula do produto, taxa de juros e tábuas, essas
+    últimas na forma de argumentos das fábricas de contratos."""
+
+    formula: str
+    juros: float
+    tabuas: dict
+
+    @property
+    def assinatura(self) -> str:
+        """Resumo das premissas, usado para detectar grades desatualizadas."""
+        resumo = sha256(f"{VERSAO_TARIFA}|{self.formula}|{self.juros!r}".encode())
+        for nome, tabua in sorted(self.tabuas.items()):
+            resumo.update(nome.encode())
+            if tabua is not None:
+                for tabua_base in tabua.tabuas:
+                    resumo.update(asarray(tabua_base.pega_qx(), dtype="<f8").tobytes())
+                    resumo.update(b"|")
+        return resumo.hexdigest()
+
+
+def pegar_premissas_grade(db, produto_id: int, sexo: str, prazo: int) -> PremissasGrade:
+    """Premissas atuais do produto para o sexo e o prazo.
+
+    Raises:
+        NoResultFound: Se o produto ou o prazo não existem.
+        ValueError: Se a fórmula não é suportada ou o produto não possui as tábuas do sexo.
+    """
+    formula = pegar_nome_formula(db, produto_id)
+    juros = pegar_juros(db, produto_id, prazo)
+    tabuas = pegar_tabuas_formula(db, formula, produto_id, sexo)
+    return PremissasGrade(formula=formula, juros=juros, tabuas=tabuas)
+
+
+async def pegar_premissas_grade_assincrono(
+    engine, produto_id: int, sexo: str, prazo: int
+) -> PremissasGrade:
+    """Como pegar_premissas_grade, pelo engine assíncrono."""
+    formula = await queries_assincronas.pegar_nome_formula(engine, produto_id)
+    juros = await queries_assincronas.pegar_juros(engine, produto_id, prazo)
+    tabuas = await queries_assincronas.pegar_tabuas_formula(engine, formula, produto_id, sexo)
+    return PremissasGrade(formula=formula, juros=juros, tabuas=tabuas)
+
+
+def datas_nascimento_idades(
+    data_assinatura: date, idades: NDArray, periodicidade: Periodicidade
+) -> list[date]:
+    """Datas de nascimento que resultam exatamente nas idades fornecidas na data de assinatura."""
+    meses_periodo = 12 // periodicidade.quantidade_periodos_1_ano()
+    return [
+        data_assinatura - relativedelta(months=int(idade) * meses_periodo)
+        for idade in idades
+    ]
+
+
+def construir_grade(
+    premissas: PremissasGrade,
+    prazo: int,
+    prazo_renda: int = 0,
+    prazo_certo_renda: int = 0,
+) -> GradeTarifa:
+    """Calcula a grade para todas as idades com o motor vetorizado de simulação em lote."""
+    tabua = next(iter(premissas.tabuas.values()))
+    periodicidade = tabua.periodicidade
+    data_assinatura = date.today()
+    idades = arange(int(tabua.tempo_futuro_maximo([0] * len(tabua.tabuas))) + 1)
+    datas_nascimento = datas_nascimento_idades(data_assinatura, idades, periodicidade)
+
+    argumentos = dict(
+        juros=tb.JurosConstante(premissas.juros),
+        data_assinatura=data_assinatura,
+        data_nascimento_segurado=datas_nascimento,
+        prazo_cobertura=prazo,
+        prazo_pagamento=prazo,
+        beneficio=1.0,
+        percentual_beneficio=[1.0],
+        **premissas.tabuas,
+    )
+    if premissas.formula == "peculio":
+        taxas = peculio_capitalizado_lote(**argumentos)
+    else:
+        taxas = aposentadoria_capitalizado_lote(
+            prazo_renda=prazo_renda, prazo_certo_renda=prazo_certo_renda, **argumentos
+        )
+    return GradeTarifa(
+        periodicidade=periodicidade, taxas=taxas, assinatura=premissas.assinatura
+    )
+
+
+def combinacoes_tarifa(
+    formula: str, prazos: list[ProdutoPrazo], prazos_renda: list[ProdutoPrazoRenda]
+) -> list[tuple[int, int, int]]:
+    """Combinações de (prazo, prazo_renda, prazo_certo_renda) dos prazos do produto."""
+    if formula == "aposentadoria":
+        return [
+            (prazo.prazo, renda.prazo, renda.prazoCerto)
+            for prazo in prazos
+            for renda in prazos_renda
+        ]
+    return [(prazo.prazo, 0, 0) for prazo in prazos]
+
+
+def chaves_tarifa(db, produto_id: int) -> list[tuple[int, int, int]]:
+    """Combinações de (prazo, prazo_renda, prazo_certo_renda) oferecidas pelo produto."""
+    return combinacoes_tarifa(
+        pegar_nome_formula(db, produto_id),
+        pegar_prazos(db, produto_id),
+        pegar_prazos_renda(db, produto_id),
+    )
+
+
+async def chaves_tarifa_assincrono(engine, produto_id: int) -> list[tuple[int, int, int]]:
+    """Como chaves_tarifa, pelo engine assíncrono."""
+    return combinacoes_tarifa(
+        await queries_assincronas.pegar_nome_formula(engine, produto_id),
+        await queries_assincronas.pegar_prazos(engine, produto_id),
+        await queries_assincronas.pegar_prazos_renda(engine, produto_id),
+    )
+
+
+def sexos_tarifa(db, produto_id: int) -> list[str]:
+    query = (
+        db.select(ProdutoTabua.sexo)
+        .where(ProdutoTabua.produtoId == produto_id)
+        .distinct()
+    )
+    return executar_leitura(db, query).scalars().all()
+
+
+def salvar_grade(sessao, chave: tuple, grade: GradeTarifa) -> None:
+    produto_id, sexo, prazo, prazo_renda, prazo_certo_renda = chave
+    sessao.merge(
+        Tarifa(
+            produtoId=produto_id,
+            sexo=sexo,
+            prazo=prazo,
+            prazoRenda=prazo_renda,
+            prazoCertoRenda=prazo_certo_renda,
+            periodicidade=grade.periodicidade.name,
+            assinatura=grade.assinatura,
+            taxas=grade.taxas.astype(float64).tobytes(),
+        )
+    )
+
+
+def gerar_tarifas(db, produto_id: int) -> int:
+    """Calcula e persiste todas as grades de um produto.
+
+    Returns:
+        int: Quantidade de grades geradas.
+    """
+    quantidade = 0
+    for sexo in sexos_tarifa(db, produto_id):
+        for prazo, prazo_renda, prazo_certo_renda in chaves_tarifa(db, produto_id):
+            premissas = pegar_premissas_grade(db, produto_id, sexo, prazo)
+            grade = construir_grade(premissas, prazo, prazo_renda, prazo_certo_renda)
+            chave = (produto_id, sexo, prazo, prazo_renda, prazo_certo_renda)
+            salvar_grade(db.session, chave, grade)
+            quantidade += 1
+    db.session.commit()
+    cache_tarifas.invalidar()
+    return quantidade
+
+
+cache_tarifas = CacheLRU(tamanho_maximo=1024, nome="tarifas")
+
+
+def persistir_grade(db, chave: tuple, grade: GradeTarifa) -> None:
+    """Grava a grade em uma sessão e transação próprias, sem confirmar a sessão da
+    requisição. Falhas são registradas no log, já que a grade continua em memória.
+
+    Executada em segundo plano por pegar_tarifa, de forma que a requisição de leitura não
+    espera pela conexão de escrita, única no perfil concorrente."""
+    try:
+        with Session(db.engine) as sessao:
+            salvar_grade(sessao, chave, grade)
+            sessao.commit()
+    except SQLAlchemyError:
+        current_app.logger.warning("Falha ao gravar a tarifa %s.", chave, exc_info=True)
+
+
+def consultar_tarifa(chave: tuple):
+    produto_id, sexo, prazo, prazo_renda, prazo_certo_renda = chave
+    return (
+        select(Tarifa)
+        .where(Tarifa.produtoId == produto_id)
+        .where(Tarifa.sexo == sexo)
+        .where(Tarifa.prazo == prazo)
+        .where(Tarifa.prazoRenda == prazo_renda)
+        .where(Tarifa.prazoCertoRenda == prazo_certo_renda)
+    )
+
+
+def grade_registrada(
+    registro: Optional[Tarifa], premissas: PremissasGrade
+) -> Optional[GradeTarifa]:
+    """Grade gravada na tabela tarifa, ou None se ela não existe ou foi construída com
+    premissas diferentes das atuais."""
+    if registro is None or registro.assinatura != premissas.assinatura:
+        return None
+    return GradeTarifa(
+        periodicidade=Periodicidade[registro.periodicidade],
+        taxas=frombuffer(registro.taxas, dtype=float64),
+        assinatura=registro.assinatura,
+    )
+
+
+def calcular_grade(db, chave: tuple, premissas: PremissasGrade) -> Optional[GradeTarifa]:
+    """Calcula a grade e a persiste em segundo plano (persistir_grade). Não consulta o banco
+    de dados, de forma que a entrada ASGI a executa no pool de cálculo.
+
+    Retorna None quando o motor de cálculo rejeita as premissas.
+    """
+    try:
+        grade = construir_grade(premissas, *chave[2:])
+    except ValueError:
+        # Premissas que o motor de cálculo rejeita, como tábuas com mais de uma vida.
+        return None
+    except Exception:
+        current_app.logger.exception("Falha ao construir a tarifa %s.", chave)
+        return None
+
+    executar_em_segundo_plano(persistir_grade, db, chave, grade)
+    return grade
+
+
+def chave_tarifa(
+    produto_id: int,
+    sexo: str,
+    prazo: int,
+    prazo_renda: Optional[int] = 0,
+    prazo_certo_renda: Optional[int] = 0,
+) -> tuple:
+    return (produto_id, sexo, prazo, prazo_renda or 0, prazo_certo_renda or 0)
+
+
+def pegar_tarifa(
+    db,
+    produto_id: int,
+    sexo: str,
+    prazo: int,
+    prazo_renda: Optional[int] = 0,
+    prazo_certo_renda: Optional[int] = 0,
+) -> Optional[GradeTarifa]:
+    """Grade de tarifas de um produto, mantida em memória e persistida na tabela tarifa.
+
+    Grades ausentes ou construídas com premissas diferentes das atuais são recalculadas e
+    persistidas em segundo plano, em uma transação própria (persistir_grade). A grade gravada
+    é lida pelo pool de leitura, de forma que a requisição não ocupa a conexão de escrita.
+    Retorna None quando a combinação de prazos não é oferecida pelo produto, ou o sexo não
+    possui as tábuas, e nesse caso a simulação deve ser feita pelo motor completo.
+    """
+    chave = chave_tarifa(produto_id, sexo, prazo, prazo_renda, prazo_certo_renda)
+
+    def construir() -> Optional[GradeTarifa]:
+        try:
+            if chave[2:] not in chaves_tarifa(db, produto_id):
+                return None
+            premissas = pegar_premissas_grade(db, produto_id, sexo, prazo)
+        except (NoResultFound, ValueError):
+            return None
+
+        registro = executar_leitura(db, consultar_tarifa(chave)).scalar_one_or_none()
+        grade = grade_registrada(registro, premissas)
+        if grade is not None:
+            return grade
+        return calcular_grade(db, chave, premissas)
+
+    return cache_tarifas.pegar(chave, construir)
+
+
+async def pegar_tarifa_assincrono(
+    engine,
+    calcular: Callable[..., Awaitable],
+    produto_id: int,
+    sexo: str,
+    prazo: int,
+    prazo_renda: Optional[int] = 0,
+    prazo_certo_renda: Optional[int] = 0,
+) -> Optional[GradeTarifa]:
+    """Como pegar_tarifa, com as consultas pelo engine assíncrono, no mesmo cache.
+
+    Args:
+        engine (AsyncEngine): Engine assíncrono das consultas somente leitura.
+        calcular (Callable): Corrotina que executa uma função no pool de cálculo, no
+            contexto da aplicação, usada apenas para calcular a grade (calcular_grade).
+    """
+    from model.database import db
+
+    chave = chave_tarifa(produto_id, sexo, prazo, prazo_renda, prazo_certo_renda)
+
+    async def construir() -> Optional[GradeTarifa]:
+        try:
+            if chave[2:] not in await chaves_tarifa_assincrono(engine, produto_id):
+                return None
+            premissas = await pegar_premissas_grade_assincrono(
+                engine, produto_id, sexo, prazo
+            )
+        except (NoResultFound, ValueError):
+            return None
+
+        resultado = await queries_assincronas.executar_leitura(engine, consultar_tarifa(chave))
+        grade = grade_registrada(resultado.scalar_one_or_none(), premissas)
+        if grade is not None:
+            return grade
+        return await calcular(calcular_grade, db, chave, premissas)
+
+    return await cache_tarifas.pegar_assincrono(chave, construir)
+
+
+MODELOS_TARIFA = (
+    Formula,
+    Produto,
+    Tabua,
+    Taxa,
+    TipoTabua,
+    ProdutoTabua,
+    Juros,
+    ProdutoPrazo,
+    ProdutoPrazoRenda,
+)
+
+invalidar_apos_commit(MODELOS_TARIFA, cache_tarifas.invalidar)
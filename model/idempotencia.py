@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from model.database import db
+
+
+class ChaveIdempotencia(db.Model):
+    """Chave de idempotência de uma contratação, com a matrícula criada na primeira tentativa.
+
+    A assinatura identifica o conteúdo da requisição, para que a mesma chave não seja
+    reaproveitada com outros parâmetros.
+    """
+
+    __tablename__ = "chaveidempotencia"
+    chave: Mapped[str] = mapped_column(String(100), primary_key=True)
+    assinatura: Mapped[str] = mapped_column(String(64))
+    matriculaId: Mapped[int] = mapped_column(ForeignKey("matricula.id"))
+    dataCriacao: Mapped[datetime] = mapped_column()
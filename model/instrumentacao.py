@@ -0,0 +1,148 @@
+"""Contagem e tempo das instruções SQL executadas pelos engines.
+
+Os eventos before_cursor_execute e after_cursor_execute de cada engine instrumentado somam
+as instruções e o tempo gasto no banco de dados nas contagens ativas no contexto atual
+(contextvars), iniciadas por contar_consultas, ou por iniciar_contagem e encerrar_contagem
+para cada requisição. As contagens podem ser aninhadas: uma instrução é somada na contagem
+ativa e em todas as externas a ela. O tempo também é registrado na fase sql da medição ativa
+(src.medicao), se houver.
+
+Instruções mais lentas que o limite são registradas no log com os parâmetros e o plano de
+execução (EXPLAIN QUERY PLAN, no SQLite).
+"""
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from time import perf_counter
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.medicao import medicao_atual
+
+# Prefixo da instrução que retorna o plano de execução, sem executá-la, em cada banco de dados.
+EXPLICACOES = {"sqlite": "EXPLAIN QUERY PLAN", "postgresql": "EXPLAIN"}
+# Instruções cujo plano de execução é registrado no log das instruções lentas.
+INSTRUCOES_EXPLICADAS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+# Tamanho máximo da representação dos parâmetros no log.
+TAMANHO_MAXIMO_PARAMETROS = 2000
+
+
+class ContagemConsultas:
+    """Quantidade de instruções SQL e tempo gasto no banco de dados, em segundos."""
+
+    def __init__(self, externa: Optional["ContagemConsultas"] = None):
+        self.quantidade = 0
+        self.duracao = 0.0
+        self.externa = externa
+        self.token: Optional[Token] = None
+        self.encerrada = False
+
+    def registrar(self, duracao: float) -> None:
+        contagem = self
+        while contagem is not None:
+            contagem.quantidade += 1
+            contagem.duracao += duracao
+            contagem = contagem.externa
+
+
+_contagem_atual: ContextVar[Optional[ContagemConsultas]] = ContextVar(
+    "contagem_consultas", default=None
+)
+
+
+def contagem_atual() -> Optional[ContagemConsultas]:
+    """Contagem ativa no contexto atual, ou None."""
+    return _contagem_atual.get()
+
+
+def iniciar_contagem() -> ContagemConsultas:
+    """Ativa uma nova contagem no contexto atual, dentro da contagem ativa, se houver."""
+    contagem = ContagemConsultas(_contagem_atual.get())
+    contagem.token = _contagem_atual.set(contagem)
+    return contagem
+
+
+def encerrar_contagem(contagem: ContagemConsultas) -> None:
+    """Encerra a contagem e restaura o contexto anterior. Contagens já encerradas são
+    ignoradas."""
+    if not contagem.encerrada:
+        contagem.encerrada = True
+        _contagem_atual.reset(contagem.token)
+
+
+@contextmanager
+def contar_consultas() -> Iterator[ContagemConsultas]:
+    """Conta as instruções executadas no contexto atual enquanto o bloco é executado.
+
+    Uso:
+        with contar_consultas() as contagem:
+            cliente.post("/simular", data=...)
+        assert contagem.quantidade <= 6
+    """
+    contagem = iniciar_contagem()
+    try:
+        yield contagem
+    finally:
+        encerrar_contagem(contagem)
+
+
+def explicar(conexao, instrucao: str, parametros) -> Optional[list[str]]:
+    """Plano de execução da instrução, obtido por um cursor separado na mesma conexão, ou
+    None se o banco de dados ou a instrução não são suportados."""
+    prefixo = EXPLICACOES.get(conexao.dialect.name)
+    if prefixo is None or not instrucao.lstrip().upper().startswith(INSTRUCOES_EXPLICADAS):
+        return None
+    cursor = conexao.connection.cursor()
+    try:
+        cursor.execute(f"{prefixo} {instrucao}", parametros)
+        return [str(linha[-1]) for linha in cursor.fetchall()]
+    except Exception:
+        return None
+    finally:
+        cursor.close()
+
+
+def instrumentar_engine(
+    engine: Engine, limite_lenta: Optional[float], logger: logging.Logger
+) -> None:
+    """Registra a contagem das instruções do engine e o log das instruções que levam pelo
+    menos limite_lenta segundos. Se limite_lenta é None, as instruções não são registradas
+    no log."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def iniciar_cronometro_instrucao(
+        conexao, cursor, instrucao, parametros, contexto, executemany
+    ) -> None:
+        conexao.info.setdefault("inicio_instrucoes", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def registrar_instrucao(conexao, cursor, instrucao, parametros, contexto, executemany):
+        duracao = perf_counter() - conexao.info["inicio_instrucoes"].pop()
+        contagem = _contagem_atual.get()
+        if contagem is not None:
+            contagem.registrar(duracao)
+        medicao = medicao_atual()
+        if medicao is not None:
+            medicao.registrar("sql", duracao)
+        if limite_lenta is None or duracao < limite_lenta:
+            return
+        logger.warning(
+            json.dumps(
+                {
+                    "duracao_ms": round(duracao * 1000, 3),
+                    "instrucao": instrucao,
+                    "parametros": repr(parametros)[:TAMANHO_MAXIMO_PARAMETROS],
+                    "plano": None if executemany else explicar(conexao, instrucao, parametros),
+                },
+                ensure_ascii=False,
+            )
+        )
+
+
+def instrumentar_engines(db, limite_lenta: Optional[float], logger: logging.Logger) -> None:
+    """Instrumenta todos os engines do Flask-SQLAlchemy. Exige o contexto da aplicação."""
+    for engine in db.engines.values():
+        instrumentar_engine(engine, limite_lenta, logger)
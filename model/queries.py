@@ -1,4 +1,14 @@
 from typing import Optional
+
+import tabatu as tb
+from numpy import asarray, float64
+from numpy.typing import NDArray
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from model.armazem_tabuas import preparar_armazem_tabuas
+from model.armazenamento import executar_leitura
+from model.cache import CacheLRU, invalidar_apos_commit
 from model.produto import (
     Formula,
     Juros,
@@ -9,21 +19,52 @@ from model.produto import (
     TipoTabua,
 )
 from model.tabua import Tabua, Taxa
+from model.tabua_empacotada import desempacotar_taxas
+from src.medicao import medido
+from src.metricas import LIMITES_CALCULOS, cronometrado, registro
 
+duracao_consultas = registro.histograma(
+    "sistema_seguros_consulta_duracao_segundos",
+    "Duração das consultas de model.queries, inclusive as atendidas pelo cache.",
+    ("consulta", "produto", "formula"),
+    LIMITES_CALCULOS,
+)
 
-def pegar_juros(db, produto_id: int, prazo: int) -> float:
-    query = (
-        db.select(Juros.juros)
+
+def consultar_juros(produto_id: int, prazo: int):
+    return (
+        select(Juros.juros)
         .join(Juros.produtoPrazos)
         .where(ProdutoPrazo.produtoId == produto_id)
         .where(ProdutoPrazo.prazo == prazo)
     )
-    return db.session.execute(query).scalars().one()
 
 
-def pegar_taxas(db, produto_id: int, sexo: str, tipo_tabua: str) -> list[float]:
-    query = (
-        db.select(Taxa.taxa)
+@cronometrado(duracao_consultas, consulta="pegar_juros")
+@medido("pegar_juros")
+def pegar_juros(db, produto_id: int, prazo: int) -> float:
+    return executar_leitura(db, consultar_juros(produto_id, prazo)).scalars().one()
+
+
+def consultar_juros_prazos(produto_id: int):
+    return (
+        select(ProdutoPrazo.prazo, Juros.juros)
+        .join(Juros.produtoPrazos)
+        .where(ProdutoPrazo.produtoId == produto_id)
+        .order_by(ProdutoPrazo.prazo)
+    )
+
+
+@cronometrado(duracao_consultas, consulta="pegar_juros_prazos")
+@medido("pegar_juros")
+def pegar_juros_prazos(db, produto_id: int) -> dict[int, float]:
+    """Juros de cada prazo oferecido pelo produto, em uma única consulta, em ordem de prazo."""
+    return dict(executar_leitura(db, consultar_juros_prazos(produto_id)).tuples().all())
+
+
+def consultar_taxas(produto_id: int, sexo: str, tipo_tabua: str):
+    return (
+        select(Taxa.taxa)
         .join(Tabua, Taxa.tabuaId == Tabua.id)
         .join(ProdutoTabua, ProdutoTabua.tabuaId == Tabua.id)
         .join(TipoTabua, TipoTabua.id == ProdutoTabua.tipoTabuaId)
@@ -31,42 +72,201 @@ def pegar_taxas(db, produto_id: int, sexo: str, tipo_tabua: str) -> list[float]:
         .where(ProdutoTabua.sexo == sexo)
         .where(TipoTabua.nome == tipo_tabua)
     )
-    return db.session.execute(query).scalars().all()
 
 
+@cronometrado(duracao_consultas, consulta="pegar_taxas")
+@medido("pegar_taxas")
+def pegar_taxas(db, produto_id: int, sexo: str, tipo_tabua: str) -> list[float]:
+    query = consultar_taxas(produto_id, sexo, tipo_tabua)
+    return executar_leitura(db, query).scalars().all()
+
+
+def consultar_taxas_empacotadas(produto_id: int, sexo: str, tipo_tabua: str):
+    return (
+        select(Tabua.taxas, Tabua.dtypeTaxas, Tabua.versaoTaxas)
+        .join(ProdutoTabua, ProdutoTabua.tabuaId == Tabua.id)
+        .join(TipoTabua, TipoTabua.id == ProdutoTabua.tipoTabuaId)
+        .where(ProdutoTabua.produtoId == produto_id)
+        .where(ProdutoTabua.sexo == sexo)
+        .where(TipoTabua.nome == tipo_tabua)
+    )
+
+
+@cronometrado(duracao_consultas, consulta="pegar_taxas_tabua")
+@medido("pegar_taxas_tabua")
+def pegar_taxas_tabua(
+    db, produto_id: int, sexo: str, tipo_tabua: str
+) -> NDArray[float64]:
+    """Taxas da tábua, lidas das taxas empacotadas sem materializar uma linha por idade.
+
+    Tábuas sem taxas empacotadas são lidas de pegar_taxas. Retorna um vetor vazio caso o
+    produto não possua tábua do tipo informado.
+    """
+    query = consultar_taxas_empacotadas(produto_id, sexo, tipo_tabua)
+    empacotada = executar_leitura(db, query).first()
+    if empacotada is None:
+        return asarray([], dtype=float64)
+    if empacotada.taxas is None:
+        return asarray(pegar_taxas(db, produto_id, sexo, tipo_tabua), dtype=float64)
+    return desempacotar_taxas(*empacotada)
+
+
+cache_tabuas = CacheLRU(tamanho_maximo=256, nome="tabuas")
+
+
+@cronometrado(duracao_consultas, consulta="pegar_tabua")
+def pegar_tabua(db, produto_id: int, sexo: str, tipo_tabua: str) -> Optional[tb.Tabua]:
+    """Tábua pronta para uso, construída a partir de pegar_taxas_tabua e mantida em cache.
+
+    Retorna None caso o produto não possua tábua do tipo informado.
+    """
+
+    @medido("construir_tabua")
+    def construir():
+        preparar_armazem_tabuas(db)
+        taxas = pegar_taxas_tabua(db, produto_id, sexo, tipo_tabua)
+        return tb.Tabua(taxas) if len(taxas) > 0 else None
+
+    return cache_tabuas.pegar(("Tabua", produto_id, sexo, tipo_tabua), construir)
+
+
+@cronometrado(duracao_consultas, consulta="pegar_tabua_mdt")
+def pegar_tabua_mdt(
+    db, produto_id: int, sexo: str, tipos_tabua: tuple[str, ...]
+) -> tb.TabuaMDT:
+    """Tábua de múltiplos decrementos composta pelas tábuas dos tipos informados,
+    mantida em cache."""
+
+    @medido("construir_tabua_mdt")
+    def construir():
+        tabuas = [pegar_tabua(db, produto_id, sexo, tipo) for tipo in tipos_tabua]
+        return tb.TabuaMDT(*tabuas)
+
+    return cache_tabuas.pegar(("TabuaMDT", produto_id, sexo, tipos_tabua), construir)
+
+
+def exigir_tabuas(produto_id: int, sexo: str, tabuas: dict) -> dict:
+    """Confere se todas as tábuas da fórmula foram encontradas.
+
+    Raises:
+        ValueError: Se o produto não possui alguma das tábuas para o sexo informado.
+    """
+    if any(tabua is None for tabua in tabuas.values()):
+        raise ValueError(f"Sexo {sexo} não disponível para o produto {produto_id}.")
+    return tabuas
+
+
+def pegar_tabuas_formula(db, formula: str, produto_id: int, sexo: str) -> dict:
+    """Tábuas usadas pela fórmula, na forma de argumentos das fábricas de contratos de
+    src.produtos.
+
+    Raises:
+        ValueError: Se a fórmula não é suportada ou o produto não possui as tábuas da
+            fórmula para o sexo informado.
+    """
+    if formula == "peculio":
+        tabua_sinistro = pegar_tabua(db, produto_id, sexo, "Sinistro")
+        tabua_pagamento = tabua_sinistro
+        if (
+            tabua_sinistro is not None
+            and pegar_tabua(db, produto_id, sexo, "DPI") is not None
+        ):
+            tabua_pagamento = pegar_tabua_mdt(db, produto_id, sexo, ("Sinistro", "DPI"))
+        tabuas = {"tabua_beneficio": tabua_sinistro, "tabua_pagamento": tabua_pagamento}
+    elif formula == "aposentadoria":
+        tabuas = {
+            "tabua_acumulacao": pegar_tabua(db, produto_id, sexo, "Acumulacao"),
+            "tabua_concessao": pegar_tabua(db, produto_id, sexo, "Concessao"),
+        }
+    else:
+        raise ValueError(f"Fórmula {formula} não suportada.")
+    return exigir_tabuas(produto_id, sexo, tabuas)
+
+
+invalidar_apos_commit((Tabua, Taxa, ProdutoTabua, TipoTabua), cache_tabuas.invalidar)
+
+
+def consultar_formula(produto_id: int):
+    return select(Formula).join(Formula.produto).where(Produto.id == produto_id)
+
+
+@cronometrado(duracao_consultas, consulta="pegar_formula")
 def pegar_formula(db, produto_id):
-    query = db.select(Formula).join(Formula.produto).where(Produto.id == produto_id)
-    return db.session.execute(query).scalars().one()
+    return executar_leitura(db, consultar_formula(produto_id)).scalars().one()
 
 
-def pegar_prazos_renda(db, produto_id):
-    query = (
-        db.select(ProdutoPrazoRenda)
+cache_formulas = CacheLRU(tamanho_maximo=1024, nome="formulas")
+
+
+@cronometrado(duracao_consultas, consulta="pegar_nome_formula")
+def pegar_nome_formula(db, produto_id: int) -> str:
+    """Nome da fórmula do produto, obtido de pegar_formula e mantido em cache.
+
+    Produtos inexistentes não são armazenados, e a consulta levanta NoResultFound.
+    """
+    return cache_formulas.pegar(
+        produto_id, lambda: pegar_formula(db, produto_id).nome
+    )
+
+
+invalidar_apos_commit((Formula, Produto), cache_formulas.invalidar)
+
+
+def consultar_prazos_renda(produto_id: int):
+    return (
+        select(ProdutoPrazoRenda)
         .join(ProdutoPrazoRenda.produto)
         .where(Produto.id == produto_id)
     )
-    return db.session.execute(query).scalars().all()
 
 
+@cronometrado(duracao_consultas, consulta="pegar_prazos_renda")
+def pegar_prazos_renda(db, produto_id):
+    return executar_leitura(db, consultar_prazos_renda(produto_id)).scalars().all()
+
+
+def consultar_prazos(produto_id: int):
+    return select(ProdutoPrazo).join(ProdutoPrazo.produto).where(Produto.id == produto_id)
+
+
+@cronometrado(duracao_consultas, consulta="pegar_prazos")
 def pegar_prazos(db, produto_id):
-    query = (
-        db.select(ProdutoPrazo)
-        .join(ProdutoPrazo.produto)
-        .where(Produto.id == produto_id)
-    )
-    return db.session.execute(query).scalars().all()
+    return executar_leitura(db, consultar_prazos(produto_id)).scalars().all()
 
 
+@cronometrado(duracao_consultas, consulta="pegar_beneficio")
 def pegar_beneficio(db, produto_id):
     query = db.select(Produto.beneficioMinimo, Produto.beneficioMaximo).where(
         Produto.id == produto_id
     )
 
-    return db.session.execute(query).one()
+    return executar_leitura(db, query).one()
+
+
+def consultar_produtos_completos():
+    """Consulta os produtos já com os seus prazos e prazos de renda, em um único SELECT."""
+    return (
+        select(Produto)
+        .options(
+            joinedload(Produto.produtoPrazos), joinedload(Produto.produtoPrazosRenda)
+        )
+        .order_by(Produto.id)
+    )
+
+
+@cronometrado(duracao_consultas, consulta="pegar_produtos_completos")
+def pegar_produtos_completos(db) -> list[Produto]:
+    query = consultar_produtos_completos()
+    return executar_leitura(db, query).unique().scalars().all()
+
+
+@cronometrado(duracao_consultas, consulta="pegar_produto_completo")
+def pegar_produto_completo(db, produto_id: int) -> Produto:
+    query = consultar_produtos_completos().where(Produto.id == produto_id)
+    return executar_leitura(db, query).unique().scalars().one()
 
 
+@cronometrado(duracao_consultas, consulta="pegar_parametros_produto")
 def pegar_parametros_produto(db, produto_id):
-    beneficio = pegar_beneficio(db, produto_id)
-    prazos = pegar_prazos(db, produto_id)
-    prazos_renda = pegar_prazos_renda(db, produto_id)
-    return beneficio, prazos, prazos_renda
+    produto = pegar_produto_completo(db, produto_id)
+    return produto, produto.produtoPrazos, produto.produtoPrazosRenda
@@ -0,0 +1,217 @@
+"""Versões assíncronas das consultas de model.queries, usadas pela entrada ASGI (asgi.py).
+
+As consultas são as mesmas (consultar_*), assim como a instrumentação (cronometrado e
+medido), e os caches são compartilhados com as versões síncronas, de forma que as
+invalidações pelos eventos do ORM valem para as duas.
+"""
+from typing import Optional
+
+import tabatu as tb
+from numpy import asarray, float64
+from numpy.typing import NDArray
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from model.armazenamento import PerfilArmazenamento, registrar_pragmas
+from model.catalogo import Catalogo, cache_catalogo, montar_catalogo
+from model.produto import Produto, ProdutoPrazo, ProdutoPrazoRenda
+from model.queries import (
+    cache_formulas,
+    cache_tabuas,
+    consultar_formula,
+    consultar_juros,
+    consultar_juros_prazos,
+    consultar_prazos,
+    consultar_prazos_renda,
+    consultar_produtos_completos,
+    consultar_taxas,
+    consultar_taxas_empacotadas,
+    duracao_consultas,
+    exigir_tabuas,
+)
+from model.tabua_empacotada import desempacotar_taxas
+from src.medicao import medido
+from src.metricas import cronometrado
+
+# Driver assíncrono de cada banco de dados suportado pela entrada ASGI, instalado pelo
+# requirements.txt.
+DRIVERS_ASSINCRONOS = {"sqlite": "aiosqlite"}
+
+
+def criar_engine_assincrona(url: str, perfil: PerfilArmazenamento) -> AsyncEngine:
+    """Engine assíncrono somente leitura, com os PRAGMAs e o tamanho do pool de leitura do
+    perfil.
+
+    Raises:
+        ValueError: Se o banco de dados não possui driver assíncrono.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in DRIVERS_ASSINCRONOS:
+        raise ValueError(f"Banco de dados {backend} não suportado na entrada assíncrona.")
+    opcoes = {}
+    if perfil.tamanho_pool_leitura is not None:
+        opcoes = {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": perfil.tamanho_pool_leitura,
+            "max_overflow": 0,
+        }
+    engine = create_async_engine(
+        url.set(drivername=f"{backend}+{DRIVERS_ASSINCRONOS[backend]}"), **opcoes
+    )
+    registrar_pragmas(engine.sync_engine, perfil.pragmas)
+    return engine
+
+
+async def executar_leitura(engine: AsyncEngine, query):
+    """Executa uma consulta somente leitura em uma sessão curta. O resultado é carregado
+    por completo antes de a conexão voltar ao pool."""
+    async with AsyncSession(engine) as sessao:
+        return await sessao.execute(query)
+
+
+@cronometrado(duracao_consultas, consulta="pegar_juros")
+@medido("pegar_juros")
+async def pegar_juros(engine: AsyncEngine, produto_id: int, prazo: int) -> float:
+    resultado = await executar_leitura(engine, consultar_juros(produto_id, prazo))
+    return resultado.scalars().one()
+
+
+@cronometrado(duracao_consultas, consulta="pegar_juros_prazos")
+@medido("pegar_juros")
+async def pegar_juros_prazos(engine: AsyncEngine, produto_id: int) -> dict[int, float]:
+    """Juros de cada prazo oferecido pelo produto, como em model.queries.pegar_juros_prazos."""
+    resultado = await executar_leitura(engine, consultar_juros_prazos(produto_id))
+    return dict(resultado.tuples().all())
+
+
+@cronometrado(duracao_consultas, consulta="pegar_taxas")
+@medido("pegar_taxas")
+async def pegar_taxas(
+    engine: AsyncEngine, produto_id: int, sexo: str, tipo_tabua: str
+) -> list[float]:
+    query = consultar_taxas(produto_id, sexo, tipo_tabua)
+    return (await executar_leitura(engine, query)).scalars().all()
+
+
+@cronometrado(duracao_consultas, consulta="pegar_taxas_tabua")
+@medido("pegar_taxas_tabua")
+async def pegar_taxas_tabua(
+    engine: AsyncEngine, produto_id: int, sexo: str, tipo_tabua: str
+) -> NDArray[float64]:
+    """Taxas da tábua, como em model.queries.pegar_taxas_tabua."""
+    query = consultar_taxas_empacotadas(produto_id, sexo, tipo_tabua)
+    empacotada = (await executar_leitura(engine, query)).first()
+    if empacotada is None:
+        return asarray([], dtype=float64)
+    if empacotada.taxas is None:
+        taxas = await pegar_taxas(engine, produto_id, sexo, tipo_tabua)
+        return asarray(taxas, dtype=float64)
+    return desempacotar_taxas(*empacotada)
+
+
+@cronometrado(duracao_consultas, consulta="pegar_tabua")
+async def pegar_tabua(
+    engine: AsyncEngine, produto_id: int, sexo: str, tipo_tabua: str
+) -> Optional[tb.Tabua]:
+    """Tábua pronta para uso, mantida no mesmo cache de model.queries.pegar_tabua."""
+
+    @medido("construir_tabua")
+    async def construir():
+        taxas = await pegar_taxas_tabua(engine, produto_id, sexo, tipo_tabua)
+        return tb.Tabua(taxas) if len(taxas) > 0 else None
+
+    return await cache_tabuas.pegar_assincrono(
+        ("Tabua", produto_id, sexo, tipo_tabua), construir
+    )
+
+
+@cronometrado(duracao_consultas, consulta="pegar_tabua_mdt")
+async def pegar_tabua_mdt(
+    engine: AsyncEngine, produto_id: int, sexo: str, tipos_tabua: tuple[str, ...]
+) -> tb.TabuaMDT:
+    """Tábua de múltiplos decrementos, mantida no mesmo cache de
+    model.queries.pegar_tabua_mdt."""
+
+    @medido("construir_tabua_mdt")
+    async def construir():
+        tabuas = [
+            await pegar_tabua(engine, produto_id, sexo, tipo) for tipo in tipos_tabua
+        ]
+        return tb.TabuaMDT(*tabuas)
+
+    return await cache_tabuas.pegar_assincrono(
+        ("TabuaMDT", produto_id, sexo, tipos_tabua), construir
+    )
+
+
+async def pegar_tabuas_formula(
+    engine: AsyncEngine, formula: str, produto_id: int, sexo: str
+) -> dict:
+    """Tábuas usadas pela fórmula, como em model.queries.pegar_tabuas_formula.
+
+    Raises:
+        ValueError: Se a fórmula não é suportada ou o produto não possui as tábuas da
+            fórmula para o sexo informado.
+    """
+    if formula == "peculio":
+        tabua_sinistro = await pegar_tabua(engine, produto_id, sexo, "Sinistro")
+        tabua_pagamento = tabua_sinistro
+        if (
+            tabua_sinistro is not None
+            and await pegar_tabua(engine, produto_id, sexo, "DPI") is not None
+        ):
+            tabua_pagamento = await pegar_tabua_mdt(
+                engine, produto_id, sexo, ("Sinistro", "DPI")
+            )
+        tabuas = {"tabua_beneficio": tabua_sinistro, "tabua_pagamento": tabua_pagamento}
+    elif formula == "aposentadoria":
+        tabuas = {
+            "tabua_acumulacao": await pegar_tabua(engine, produto_id, sexo, "Acumulacao"),
+            "tabua_concessao": await pegar_tabua(engine, produto_id, sexo, "Concessao"),
+        }
+    else:
+        raise ValueError(f"Fórmula {formula} não suportada.")
+    return exigir_tabuas(produto_id, sexo, tabuas)
+
+
+@cronometrado(duracao_consultas, consulta="pegar_nome_formula")
+async def pegar_nome_formula(engine: AsyncEngine, produto_id: int) -> str:
+    """Nome da fórmula do produto, mantido no mesmo cache de
+    model.queries.pegar_nome_formula. Levanta NoResultFound se o produto não existe."""
+
+    async def construir():
+        resultado = await executar_leitura(engine, consultar_formula(produto_id))
+        return resultado.scalars().one().nome
+
+    return await cache_formulas.pegar_assincrono(produto_id, construir)
+
+
+@cronometrado(duracao_consultas, consulta="pegar_prazos_renda")
+async def pegar_prazos_renda(engine: AsyncEngine, produto_id: int) -> list[ProdutoPrazoRenda]:
+    resultado = await executar_leitura(engine, consultar_prazos_renda(produto_id))
+    return resultado.scalars().all()
+
+
+@cronometrado(duracao_consultas, consulta="pegar_prazos")
+async def pegar_prazos(engine: AsyncEngine, produto_id: int) -> list[ProdutoPrazo]:
+    resultado = await executar_leitura(engine, consultar_prazos(produto_id))
+    return resultado.scalars().all()
+
+
+@cronometrado(duracao_consultas, consulta="pegar_produtos_completos")
+async def pegar_produtos_completos(engine: AsyncEngine) -> list[Produto]:
+    resultado = await executar_leitura(engine, consultar_produtos_completos())
+    return resultado.unique().scalars().all()
+
+
+@cronometrado(duracao_consultas, consulta="pegar_catalogo")
+async def pegar_catalogo(engine: AsyncEngine) -> Catalogo:
+    """Catálogo de produtos, mantido no mesmo cache de model.catalogo.pegar_catalogo."""
+    versao = cache_catalogo.geracao
+
+    async def construir():
+        return montar_catalogo(await pegar_produtos_completos(engine), versao)
+
+    return await cache_catalogo.pegar_assincrono("catalogo", construir)
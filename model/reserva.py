@@ -0,0 +1,18 @@
+from datetime import date
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from model.database import db
+
+
+class Reserva(db.Model):
+    """Reserva matemática de uma matrícula, calculada no fechamento de uma data base."""
+
+    __tablename__ = "reserva"
+    dataBase: Mapped[date] = mapped_column(primary_key=True)
+    matriculaId: Mapped[int] = mapped_column(
+        ForeignKey("matricula.id"), primary_key=True
+    )
+    tempoDecorrido: Mapped[int] = mapped_column()
+    reserva: Mapped[float] = mapped_column()
@@ -0,0 +1,230 @@
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Awaitable, Callable, Optional
+
+import tabatu as tb
+
+from model import queries_assincronas
+from model.queries import (
+    pegar_juros,
+    pegar_juros_prazos,
+    pegar_nome_formula,
+    pegar_prazos_renda,
+    pegar_tabuas_formula,
+)
+from schemas.simulacao import (
+    SimulacaoAposentadoriaSchema,
+    SimulacaoInterfaceSchema,
+    SimulacaoPeculioSchema,
+)
+from src.capitalizado import Capitalizado
+from src.produtos import produtos
+
+
+@dataclass(frozen=True)
+class FormulaSimulacao:
+    """Como uma fórmula é simulada.
+
+    Args:
+        esquema (type): Esquema com os parâmetros da simulação da fórmula.
+        vincular (Callable): Recebe o banco de dados e a simulação e retorna os argumentos
+            da função de precificação, com as premissas do produto. Levanta NoResultFound se
+            o produto ou o prazo não existem, e ValueError se o produto não possui as
+            tábuas para o sexo informado.
+        precificar (Callable): Cria o contrato capitalizado a partir dos argumentos.
+        vincular_assincrono (Callable, optional): Como vincular, mas recebe o engine
+            assíncrono e é uma corrotina. Usada pela entrada ASGI.
+    """
+
+    esquema: type[SimulacaoInterfaceSchema]
+    vincular: Callable[..., dict]
+    precificar: Callable[..., Capitalizado]
+    vincular_assincrono: Optional[Callable[..., Awaitable[dict]]] = None
+
+
+formulas_simulacao: dict[str, FormulaSimulacao] = {}
+
+
+def registrar_formula_simulacao(
+    nome: str,
+    esquema: type[SimulacaoInterfaceSchema],
+    precificar: Optional[Callable[..., Capitalizado]] = None,
+):
+    """Registra a função decorada como vinculação de parâmetros da fórmula.
+
+    Por padrão, a precificação é feita pela função de src.produtos.produtos com o mesmo nome.
+    """
+
+    def decorador(vincular: Callable[..., dict]) -> Callable[..., dict]:
+        formulas_simulacao[nome] = FormulaSimulacao(
+            esquema=esquema,
+            vincular=vincular,
+            precificar=produtos[nome] if precificar is None else precificar,
+        )
+        return vincular
+
+    return decorador
+
+
+def registrar_vinculacao_assincrona(nome: str):
+    """Registra a corrotina decorada como vinculação assíncrona da fórmula, que já deve
+    estar registrada."""
+
+    def decorador(vincular: Callable[..., Awaitable[dict]]):
+        formula = pegar_formula_simulacao(nome)
+        formulas_simulacao[nome] = replace(formula, vincular_assincrono=vincular)
+        return vincular
+
+    return decorador
+
+
+def pegar_formula_simulacao(nome: str) -> FormulaSimulacao:
+    """Formula registrada com o nome informado.
+
+    Raises:
+        ValueError: Se a fórmula não está registrada.
+    """
+    try:
+        return formulas_simulacao[nome]
+    except KeyError:
+        raise ValueError(f"Fórmula {nome} não suportada na simulação.") from None
+
+
+def argumentos_peculio(form: SimulacaoPeculioSchema, juros: float, tabuas: dict) -> dict:
+    return dict(
+        juros=tb.JurosConstante(juros),
+        data_assinatura=date.today(),
+        data_nascimento_segurado=form.data_nascimento,
+        prazo_cobertura=form.prazo,
+        prazo_pagamento=form.prazo,
+        beneficio=form.beneficio,
+        percentual_beneficio=[1.0],
+        **tabuas,
+    )
+
+
+@registrar_formula_simulacao("peculio", SimulacaoPeculioSchema)
+def vincular_peculio(db, form: SimulacaoPeculioSchema) -> dict:
+    return argumentos_peculio(
+        form,
+        pegar_juros(db, form.produto_id, form.prazo),
+        pegar_tabuas_formula(db, "peculio", form.produto_id, form.sexo),
+    )
+
+
+@registrar_vinculacao_assincrona("peculio")
+async def vincular_peculio_assincrono(engine, form: SimulacaoPeculioSchema) -> dict:
+    return argumentos_peculio(
+        form,
+        await queries_assincronas.pegar_juros(engine, form.produto_id, form.prazo),
+        await queries_assincronas.pegar_tabuas_formula(
+            engine, "peculio", form.produto_id, form.sexo
+        ),
+    )
+
+
+def argumentos_aposentadoria(
+    form: SimulacaoAposentadoriaSchema, juros: float, tabuas: dict
+) -> dict:
+    return dict(
+        juros=tb.JurosConstante(juros),
+        data_assinatura=date.today(),
+        data_nascimento_segurado=form.data_nascimento,
+        prazo_cobertura=form.prazo,
+        prazo_pagamento=form.prazo,
+        prazo_renda=form.prazo_renda,
+        prazo_certo_renda=form.prazo_certo_renda,
+        beneficio=form.beneficio,
+        percentual_beneficio=[1.0],
+        **tabuas,
+    )
+
+
+@registrar_formula_simulacao("aposentadoria", SimulacaoAposentadoriaSchema)
+def vincular_aposentadoria(db, form: SimulacaoAposentadoriaSchema) -> dict:
+    return argumentos_aposentadoria(
+        form,
+        pegar_juros(db, form.produto_id, form.prazo),
+        pegar_tabuas_formula(db, "aposentadoria", form.produto_id, form.sexo),
+    )
+
+
+@registrar_vinculacao_assincrona("aposentadoria")
+async def vincular_aposentadoria_assincrono(
+    engine, form: SimulacaoAposentadoriaSchema
+) -> dict:
+    return argumentos_aposentadoria(
+        form,
+        await queries_assincronas.pegar_juros(engine, form.produto_id, form.prazo),
+        await queries_assincronas.pegar_tabuas_formula(
+            engine, "aposentadoria", form.produto_id, form.sexo
+        ),
+    )
+
+
+@dataclass(frozen=True)
+class PremissasCurva:
+    """Premissas da simulação de todos os prazos de um produto.
+
+    Args:
+        formula (str): Nome da fórmula do produto.
+        juros_prazos (dict[int, float]): Juros de cada prazo oferecido, em ordem de prazo.
+        tabuas (dict): Tábuas da fórmula, na forma de argumentos das fábricas de contratos.
+        prazos_renda (list[tuple[int, int]]): Prazo de renda e prazo certo de cada renda
+            oferecida. Vazia para pecúlios.
+    """
+
+    formula: str
+    juros_prazos: dict[int, float]
+    tabuas: dict
+    prazos_renda: list[tuple[int, int]]
+
+
+def validar_formula_curva(formula: str) -> None:
+    if formula not in ("peculio", "aposentadoria"):
+        raise ValueError(f"Fórmula {formula} não suportada na simulação da curva.")
+
+
+def pegar_premissas_curva(db, produto_id: int, sexo: str) -> PremissasCurva:
+    """Premissas da curva de prêmios do produto para o sexo informado.
+
+    Raises:
+        NoResultFound: Se o produto não existe.
+        ValueError: Se a fórmula do produto não é suportada ou o produto não possui as
+            tábuas do sexo.
+    """
+    formula = pegar_nome_formula(db, produto_id)
+    validar_formula_curva(formula)
+    prazos_renda = []
+    if formula == "aposentadoria":
+        prazos_renda = [
+            (prazo.prazo, prazo.prazoCerto) for prazo in pegar_prazos_renda(db, produto_id)
+        ]
+    return PremissasCurva(
+        formula=formula,
+        juros_prazos=pegar_juros_prazos(db, produto_id),
+        tabuas=pegar_tabuas_formula(db, formula, produto_id, sexo),
+        prazos_renda=prazos_renda,
+    )
+
+
+async def pegar_premissas_curva_assincrono(
+    engine, produto_id: int, sexo: str
+) -> PremissasCurva:
+    """Como pegar_premissas_curva, pelo engine assíncrono."""
+    formula = await queries_assincronas.pegar_nome_formula(engine, produto_id)
+    validar_formula_curva(formula)
+    prazos_renda = []
+    if formula == "aposentadoria":
+        prazos_renda = [
+            (prazo.prazo, prazo.prazoCerto)
+            for prazo in await queries_assincronas.pegar_prazos_renda(engine, produto_id)
+        ]
+    return PremissasCurva(
+        formula=formula,
+        juros_prazos=await queries_assincronas.pegar_juros_prazos(engine, produto_id),
+        tabuas=await queries_assincronas.pegar_tabuas_formula(
+            engine, formula, produto_id, sexo
+        ),
+        prazos_renda=prazos_renda,
+    )
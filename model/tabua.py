@@ -1,13 +1,29 @@
-from sqlalchemy import ForeignKey, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from typing import Optional
 
+from sqlalchemy import ForeignKey, LargeBinary, String, event
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
+
+from model.cache import modelos_alterados
 from model.database import db
 
 
 class Tabua(db.Model):
+    """Tábua de decremento.
+
+    As taxas ficam em taxas, um vetor empacotado com o dtype numpy dtypeTaxas no formato
+    versaoTaxas, lido sem materializar uma linha por idade. A tabela taxa, com uma linha por
+    idade, é mantida por compatibilidade, igual às taxas empacotadas ao fim de cada transação
+    (model.tabua_empacotada.sincronizar_taxas_empacotadas). Apenas em bancos de dados ainda
+    não migrados por flask inicializar-banco as taxas empacotadas ficam vazias, e as taxas são
+    lidas da tabela taxa.
+    """
+
     __tablename__ = "tabua"
     id: Mapped[int] = mapped_column(primary_key=True)
     nome: Mapped[str] = mapped_column(String(50))
+    taxas: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    dtypeTaxas: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    versaoTaxas: Mapped[Optional[int]] = mapped_column(nullable=True)
 
     taxa: Mapped[list["Taxa"]] = relationship(
         back_populates="tabua", cascade="all, delete-orphan"
@@ -21,3 +37,15 @@ class Taxa(db.Model):
     taxa: Mapped[float] = mapped_column()
 
     tabua: Mapped["Tabua"] = relationship(back_populates="taxa")
+
+
+@event.listens_for(Session, "before_commit")
+def sincronizar_taxas(sessao) -> None:
+    """Atualiza as taxas empacotadas ou a tabela taxa antes do commit de uma transação que
+    alterou alguma delas."""
+    sessao.flush()
+    alterados = modelos_alterados(sessao)
+    if Taxa in alterados or Tabua in alterados:
+        from model.tabua_empacotada import sincronizar_taxas_empacotadas
+
+        sincronizar_taxas_empacotadas(sessao, linhas_alteradas=Taxa in alterados)
@@ -0,0 +1,142 @@
+from itertools import groupby
+from struct import pack
+
+from numpy import dtype, float64, frombuffer
+from numpy.typing import NDArray
+from sqlalchemy import delete, insert, inspect, select, text, update
+from sqlalchemy.exc import OperationalError
+
+from model.tabua import Tabua, Taxa
+
+# Formato das taxas empacotadas: vetor contíguo, indexado pela idade a partir de zero.
+VERSAO_TAXAS = 1
+DTYPE_TAXAS = "<f8"
+
+COLUNAS_EMPACOTADAS = {
+    "taxas": "BLOB",
+    "dtypeTaxas": "VARCHAR(10)",
+    "versaoTaxas": "INTEGER",
+}
+
+
+def empacotar_taxas(taxas: list[float]) -> bytes:
+    return pack(f"<{len(taxas)}d", *taxas)
+
+
+def desempacotar_taxas(taxas: bytes, dtype_taxas: str, versao: int) -> NDArray[float64]:
+    """Vetor de taxas que compartilha a memória do blob, sem cópia.
+
+    Raises:
+        ValueError: Se a versão do formato não é suportada.
+    """
+    if versao != VERSAO_TAXAS:
+        raise ValueError(f"Versão {versao} das taxas empacotadas não suportada.")
+    return frombuffer(taxas, dtype=dtype(dtype_taxas))
+
+
+def colunas_empacotadas_ausentes(db) -> list[str]:
+    """Colunas das taxas empacotadas que ainda não existem na tabela tabua."""
+    existentes = {coluna["name"] for coluna in inspect(db.engine).get_columns("tabua")}
+    return [coluna for coluna in COLUNAS_EMPACOTADAS if coluna not in existentes]
+
+
+def adicionar_colunas_empacotadas(db) -> None:
+    """Adiciona à tabela tabua as colunas das taxas empacotadas, se ainda não existem.
+
+    Parte da migração de bancos de dados anteriores às taxas empacotadas, executada por flask
+    inicializar-banco e flask empacotar-tabuas, e não na criação da aplicação.
+    """
+    tipos = dict(COLUNAS_EMPACOTADAS)
+    for coluna in colunas_empacotadas_ausentes(db):
+        try:
+            with db.engine.begin() as conexao:
+                conexao.execute(text(f'ALTER TABLE tabua ADD COLUMN "{coluna}" {tipos[coluna]}'))
+        except OperationalError:
+            # Outro processo adicionou a coluna ao mesmo tempo.
+            if coluna in colunas_empacotadas_ausentes(db):
+                raise
+
+
+def empacotar_tabuas(db) -> int:
+    """Migra as tábuas do formato de uma linha por idade para as taxas empacotadas.
+
+    Apenas as tábuas sem taxas empacotadas são migradas, em uma única transação. As linhas
+    da tabela taxa são mantidas. Exige as colunas de adicionar_colunas_empacotadas.
+
+    Returns:
+        int: Quantidade de tábuas migradas.
+    """
+    pendentes = db.session.execute(
+        select(Tabua.id).where(Tabua.taxas.is_(None))
+    ).scalars().all()
+    migradas = 0
+    for tabua_id in pendentes:
+        taxas = db.session.execute(
+            select(Taxa.taxa).where(Taxa.tabuaId == tabua_id).order_by(Taxa.idade)
+        ).scalars().all()
+        if len(taxas) == 0:
+            continue
+        db.session.execute(
+            update(Tabua)
+            .where(Tabua.id == tabua_id)
+            .values(
+                taxas=empacotar_taxas(taxas),
+                dtypeTaxas=DTYPE_TAXAS,
+                versaoTaxas=VERSAO_TAXAS,
+            )
+        )
+        migradas += 1
+    db.session.commit()
+    return migradas
+
+
+def sincronizar_taxas_empacotadas(sessao, linhas_alteradas: bool) -> None:
+    """Mantém as taxas empacotadas e a tabela taxa iguais na transação que altera uma delas.
+
+    Executada antes do commit, na sessão que alterou as tábuas. Quando a tabela taxa foi
+    alterada, por objetos ORM ou em lote, as taxas empacotadas de todas as tábuas cujas linhas
+    mudaram são recalculadas; quando apenas as taxas empacotadas foram alteradas, as linhas
+    das tábuas correspondentes são regravadas a partir delas. Assim a tabela taxa se comporta
+    como uma visão das taxas empacotadas, e os leitores nunca encontram uma tábua
+    desatualizada.
+
+    Args:
+        sessao (Session): Sessão com as alterações já enviadas ao banco de dados (flush).
+        linhas_alteradas (bool): Se a tabela taxa foi alterada na transação, caso em que
+            prevalece sobre as taxas empacotadas.
+    """
+    linhas = sessao.execute(
+        select(Taxa.tabuaId, Taxa.taxa).order_by(Taxa.tabuaId, Taxa.idade)
+    ).all()
+    taxas_linhas = {
+        tabua_id: empacotar_taxas([linha.taxa for linha in grupo])
+        for tabua_id, grupo in groupby(linhas, key=lambda linha: linha.tabuaId)
+    }
+    empacotadas = sessao.execute(
+        select(Tabua.id, Tabua.taxas, Tabua.dtypeTaxas, Tabua.versaoTaxas)
+    ).all()
+
+    for tabua_id, taxas, dtype_taxas, versao in empacotadas:
+        esperadas = taxas_linhas.get(tabua_id)
+        if taxas == esperadas:
+            continue
+        if linhas_alteradas or taxas is None:
+            sessao.execute(
+                update(Tabua)
+                .where(Tabua.id == tabua_id)
+                .values(
+                    taxas=esperadas,
+                    dtypeTaxas=None if esperadas is None else DTYPE_TAXAS,
+                    versaoTaxas=None if esperadas is None else VERSAO_TAXAS,
+                )
+            )
+        else:
+            sessao.execute(delete(Taxa).where(Taxa.tabuaId == tabua_id))
+            valores = desempacotar_taxas(taxas, dtype_taxas, versao).tolist()
+            sessao.execute(
+                insert(Taxa),
+                [
+                    {"tabuaId": tabua_id, "idade": idade, "taxa": taxa}
+                    for idade, taxa in enumerate(valores)
+                ],
+            )
@@ -0,0 +1,21 @@
+from sqlalchemy import ForeignKey, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from model.database import db
+
+
+class Tarifa(db.Model):
+    """Grade de prêmios por unidade de benefício, indexada pela idade de ingresso.
+
+    Pecúlios utilizam prazoRenda e prazoCertoRenda iguais a zero.
+    """
+
+    __tablename__ = "tarifa"
+    produtoId: Mapped[int] = mapped_column(ForeignKey("produto.id"), primary_key=True)
+    sexo: Mapped[str] = mapped_column(String(1), primary_key=True)
+    prazo: Mapped[int] = mapped_column(primary_key=True)
+    prazoRenda: Mapped[int] = mapped_column(primary_key=True)
+    prazoCertoRenda: Mapped[int] = mapped_column(primary_key=True)
+    periodicidade: Mapped[str] = mapped_column(String(20))
+    assinatura: Mapped[str] = mapped_column(String(64))
+    taxas: Mapped[bytes] = mapped_column(LargeBinary)
@@ -0,0 +1,15 @@
+from rotas.apolices import rotas_apolices
+from rotas.contratacao import rotas_contratacao
+from rotas.documentacao import rotas_documentacao
+from rotas.metricas import rotas_metricas
+from rotas.produtos import rotas_produtos
+from rotas.simulacao import rotas_simulacao
+
+blueprints = [
+    rotas_documentacao,
+    rotas_produtos,
+    rotas_contratacao,
+    rotas_apolices,
+    rotas_simulacao,
+    rotas_metricas,
+]
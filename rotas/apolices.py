@@ -0,0 +1,74 @@
+from datetime import date
+
+from flask_openapi3 import APIBlueprint
+from sqlalchemy import select
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import joinedload
+
+from model.database import db
+from rotas.tags import apolice_tag
+from schemas.apolice import ApoliceBuscaSchema, ReservasApoliceSchema
+from schemas.error import ErrorSchema
+
+rotas_apolices = APIBlueprint("apolices", __name__)
+
+
+@rotas_apolices.get(
+    "/apolices/<int:apolice_id>/reservas",
+    tags=[apolice_tag],
+    responses={"200": ReservasApoliceSchema, "400": ErrorSchema, "404": ErrorSchema},
+)
+def get_reservas_apolice(path: ApoliceBuscaSchema):
+    """Calcula a curva de reservas matemáticas de uma apólice.
+
+    Retorna a reserva prospectiva para cada tempo desde a assinatura até o fim da cobertura,
+    e a reserva no tempo decorrido até hoje.
+    """
+    from model.armazenamento import executar_leitura
+    from model.contratos import pegar_contrato_matricula
+    from model.segurado import Matricula
+    from src.idades_prazos import calcula_idade
+
+    query = (
+        select(Matricula)
+        .options(joinedload(Matricula.segurado))
+        .where(Matricula.id == path.apolice_id)
+    )
+    matricula = executar_leitura(db, query).scalar_one_or_none()
+    if matricula is None:
+        return (
+            ErrorSchema(mesage=f"Apólice {path.apolice_id} não encontrada.").model_dump(),
+            404,
+        )
+
+    try:
+        contrato = pegar_contrato_matricula(db, matricula)
+    except NoResultFound:
+        return (
+            ErrorSchema(
+                mesage=f"Produto {matricula.produtoId} com prazo {matricula.prazo} não encontrado."
+            ).model_dump(),
+            404,
+        )
+    except ValueError as e:
+        return ErrorSchema(mesage=str(e)).model_dump(), 400
+
+    reservas = contrato.reserva_curva()
+    periodicidade = contrato.cobertura.periodicidade
+    tempo_decorrido = max(
+        calcula_idade(matricula.dataAssinatura, date.today(), periodicidade), 0
+    )
+    reserva_atual = (
+        float(reservas[tempo_decorrido]) if tempo_decorrido < len(reservas) else 0.0
+    )
+    return (
+        ReservasApoliceSchema(
+            apolice_id=matricula.id,
+            produto_id=matricula.produtoId,
+            periodicidade=periodicidade.name,
+            tempo_decorrido=tempo_decorrido,
+            reserva_atual=reserva_atual,
+            reservas=reservas.tolist(),
+        ).model_dump(),
+        200,
+    )
@@ -0,0 +1,294 @@
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Awaitable, Callable, Optional
+
+from flask import Flask
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncEngine
+from werkzeug.http import parse_etags, quote_etag
+
+from model.catalogo import RecursoCatalogo
+from model.grade_tarifa import pegar_premissas_grade_assincrono, pegar_tarifa_assincrono
+from model.queries_assincronas import pegar_catalogo, pegar_nome_formula
+from model.simulacao import (
+    FormulaSimulacao,
+    pegar_formula_simulacao,
+    pegar_premissas_curva_assincrono,
+)
+from rotas.simulacao import (
+    agrupar_lote,
+    calcular_curva,
+    erro_grupo_lote,
+    precificar_lote,
+    premio_da_tarifa,
+    validar_parametros,
+    verificar_tarifa,
+)
+from schemas.error import ErrorSchema
+from schemas.produto import ProdutoBuscaSchema
+from schemas.simulacao import (
+    ResultadoCurvaSchema,
+    ResultadoSimulacaoLoteSchema,
+    ResultadoSimulacaoSchema,
+    SimulacaoAposentadoriaSchema,
+    SimulacaoCurvaSchema,
+    SimulacaoInterfaceSchema,
+    SimulacaoLoteSchema,
+    SimulacaoPeculioSchema,
+    SimulacaoSchema,
+)
+from src.medicao import Fase
+from src.metricas import rotular
+
+
+@dataclass(frozen=True)
+class Resposta:
+    """Resposta de uma rota assíncrona. O conteúdo é serializado em JSON, exceto None e
+    bytes, que é enviado como está."""
+
+    conteudo: Any
+    status: int = 200
+    cabecalhos: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ContextoAssincrono:
+    """Recursos compartilhados pelas rotas assíncronas de um processo.
+
+    Args:
+        app (Flask): Aplicação, usada pela configuração, pelo log e pelas funções síncronas
+            que dependem do contexto da aplicação.
+        engine (AsyncEngine): Engine assíncrono das consultas somente leitura.
+        executor (ThreadPoolExecutor): Pool limitado onde são feitos os cálculos, de forma
+            que eles não bloqueiam o loop de eventos e o uso de threads não depende da
+            quantidade de requisições abertas.
+    """
+
+    app: Flask
+    engine: AsyncEngine
+    executor: ThreadPoolExecutor
+
+    async def calcular(self, funcao: Callable, *args):
+        """Executa a função no pool de cálculo, com uma cópia do contexto atual, de forma que
+        as fases do cálculo são registradas na medição da requisição (src.medicao)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, partial(copy_context().run, funcao, *args)
+        )
+
+    async def calcular_no_contexto(self, funcao: Callable, *args):
+        """Executa a função no pool de cálculo, no contexto da aplicação, para cálculos que
+        dependem da aplicação, como o log ou as tarefas em segundo plano. As consultas são
+        feitas pelo engine assíncrono, fora do pool."""
+
+        def executar():
+            with self.app.app_context():
+                return funcao(*args)
+
+        return await self.calcular(executar)
+
+
+@dataclass(frozen=True)
+class RotaAssincrona:
+    """Rota atendida pela entrada ASGI, com os mesmos esquemas da rota do Flask.
+
+    Args:
+        metodo (str): Método HTTP.
+        caminho (str): Caminho no formato do Flask, como na rota correspondente.
+        padrao (re.Pattern): Expressão que reconhece o caminho e extrai os parâmetros.
+        tratar (Callable): Corrotina que recebe o contexto, os cabeçalhos e os argumentos
+            validados (path, form ou body) e retorna a Resposta.
+        path, form, body (type[BaseModel], optional): Esquemas dos argumentos.
+    """
+
+    metodo: str
+    caminho: str
+    padrao: re.Pattern
+    tratar: Callable[..., Awaitable[Resposta]]
+    path: Optional[type[BaseModel]] = None
+    form: Optional[type[BaseModel]] = None
+    body: Optional[type[BaseModel]] = None
+
+
+rotas_assincronas: list[RotaAssincrona] = []
+
+
+def compilar_caminho(caminho: str) -> re.Pattern:
+    """Converte um caminho no formato do Flask, com parâmetros <int:nome>, em uma expressão."""
+    return re.compile(re.sub(r"<int:(\w+)>", r"(?P<\1>\\d+)", caminho))
+
+
+def rota_assincrona(metodo: str, caminho: str, **esquemas):
+    """Registra a corrotina decorada como rota assíncrona."""
+
+    def decorador(tratar):
+        rotas_assincronas.append(
+            RotaAssincrona(metodo, caminho, compilar_caminho(caminho), tratar, **esquemas)
+        )
+        return tratar
+
+    return decorador
+
+
+def encontrar_rota(metodo: str, caminho: str) -> Optional[tuple[RotaAssincrona, dict]]:
+    """Rota assíncrona e os parâmetros do caminho, ou None se o caminho não é atendido."""
+    for rota in rotas_assincronas:
+        encontrado = rota.padrao.fullmatch(caminho)
+        if encontrado is not None and rota.metodo == metodo:
+            return rota, encontrado.groupdict()
+    return None
+
+
+def resposta_catalogo(
+    contexto: ContextoAssincrono, cabecalhos: dict, recurso: RecursoCatalogo
+) -> Resposta:
+    """Como rotas.produtos.resposta_catalogo."""
+    cabecalhos_resposta = {
+        "ETag": quote_etag(recurso.etag),
+        "Cache-Control": contexto.app.config["CATALOGO_CACHE_CONTROL"],
+    }
+    if recurso.etag in parse_etags(cabecalhos.get("if-none-match")):
+        return Resposta(None, 304, cabecalhos_resposta)
+    return Resposta(recurso.conteudo, 200, cabecalhos_resposta)
+
+
+def produto_nao_encontrado(produto_id: int) -> Resposta:
+    return Resposta(
+        ErrorSchema(mesage=f"Produto {produto_id} não encontrado.").model_dump(), 404
+    )
+
+
+@rota_assincrona("GET", "/produtos")
+async def get_produtos(contexto: ContextoAssincrono, cabecalhos: dict):
+    catalogo = await pegar_catalogo(contexto.engine)
+    return resposta_catalogo(contexto, cabecalhos, catalogo.produtos)
+
+
+@rota_assincrona("GET", "/produtos/<int:produto_id>", path=ProdutoBuscaSchema)
+async def get_produto(contexto, cabecalhos: dict, path: ProdutoBuscaSchema):
+    recurso = (await pegar_catalogo(contexto.engine)).produto.get(path.produto_id)
+    if recurso is None:
+        return produto_nao_encontrado(path.produto_id)
+    return resposta_catalogo(contexto, cabecalhos, recurso)
+
+
+@rota_assincrona(
+    "GET", "/produtos/parametros/<int:produto_id>", path=ProdutoBuscaSchema
+)
+async def get_parametros_produto(contexto, cabecalhos: dict, path: ProdutoBuscaSchema):
+    recurso = (await pegar_catalogo(contexto.engine)).parametros.get(path.produto_id)
+    if recurso is None:
+        return produto_nao_encontrado(path.produto_id)
+    return resposta_catalogo(contexto, cabecalhos, recurso)
+
+
+def premio_comercial(formula: FormulaSimulacao, argumentos: dict) -> float:
+    with Fase("precificar"):
+        produto = formula.precificar(**argumentos)
+    return produto.premio_comercial(0)
+
+
+async def simular(
+    contexto: ContextoAssincrono, nome_formula: str, form: SimulacaoInterfaceSchema
+) -> Resposta:
+    """Como rotas.simulacao.simular. As premissas e a tarifa são consultadas pelo engine
+    assíncrono, e apenas os cálculos (grade de tarifas e motor) são executados no pool de
+    cálculo."""
+    formula = pegar_formula_simulacao(nome_formula)
+    with rotular(produto=form.produto_id, formula=nome_formula):
+        with Fase("tarifa"):
+            tarifa = await pegar_tarifa_assincrono(
+                contexto.engine,
+                contexto.calcular_no_contexto,
+                form.produto_id,
+                form.sexo,
+                form.prazo,
+                getattr(form, "prazo_renda", 0),
+                getattr(form, "prazo_certo_renda", 0),
+            )
+            premio = premio_da_tarifa(tarifa, form)
+        if premio is not None and not contexto.app.config["TARIFA_VERIFICAR"]:
+            return Resposta(ResultadoSimulacaoSchema(premio=premio).model_dump())
+
+        try:
+            with Fase("vincular"):
+                argumentos = await formula.vincular_assincrono(contexto.engine, form)
+            premio_motor = await contexto.calcular(premio_comercial, formula, argumentos)
+        except NoResultFound:
+            return produto_nao_encontrado(form.produto_id)
+        except Exception as e:
+            return Resposta(ErrorSchema(mesage=str(e)).model_dump(), 400)
+
+        with contexto.app.app_context():
+            verificar_tarifa(form, premio, premio_motor)
+        return Resposta(ResultadoSimulacaoSchema(premio=premio_motor).model_dump())
+
+
+@rota_assincrona("POST", "/simular", form=SimulacaoSchema)
+async def post_simulacao(contexto, cabecalhos: dict, form: SimulacaoSchema):
+    try:
+        nome_formula = await pegar_nome_formula(contexto.engine, form.produto_id)
+        formula = pegar_formula_simulacao(nome_formula)
+    except NoResultFound:
+        return produto_nao_encontrado(form.produto_id)
+    except ValueError as e:
+        return Resposta(ErrorSchema(mesage=str(e)).model_dump(), 400)
+
+    try:
+        parametros = validar_parametros(formula, form)
+    except ValidationError as e:
+        # Mesma resposta da validação do flask-openapi3.
+        return Resposta(e.json().encode(), 422)
+    return await simular(contexto, nome_formula, parametros)
+
+
+@rota_assincrona("POST", "/simular/peculio", form=SimulacaoPeculioSchema)
+async def post_simulacao_peculio(contexto, cabecalhos: dict, form: SimulacaoPeculioSchema):
+    return await simular(contexto, "peculio", form)
+
+
+@rota_assincrona("POST", "/simular/aposentadoria", form=SimulacaoAposentadoriaSchema)
+async def post_simulacao_aposentadoria(
+    contexto, cabecalhos: dict, form: SimulacaoAposentadoriaSchema
+):
+    return await simular(contexto, "aposentadoria", form)
+
+
+@rota_assincrona("POST", "/simular/lote", body=SimulacaoLoteSchema)
+async def post_simulacao_lote(contexto, cabecalhos: dict, body: SimulacaoLoteSchema):
+    """Como rotas.simulacao.simular_lote. As premissas de cada grupo são consultadas pelo
+    engine assíncrono, e o cálculo vetorizado do lote é feito no pool de cálculo."""
+    grupos = agrupar_lote(body.root)
+    premissas = {}
+    for produto_id, sexo, prazo in grupos:
+        try:
+            with rotular(produto=produto_id):
+                premissas[(produto_id, sexo, prazo)] = await pegar_premissas_grade_assincrono(
+                    contexto.engine, produto_id, sexo, prazo
+                )
+        except Exception as e:
+            premissas[(produto_id, sexo, prazo)] = erro_grupo_lote(produto_id, prazo, e)
+    resultado = await contexto.calcular(precificar_lote, body.root, grupos, premissas)
+    return Resposta(ResultadoSimulacaoLoteSchema(resultado).model_dump())
+
+
+@rota_assincrona("POST", "/simular/curva", form=SimulacaoCurvaSchema)
+async def post_simulacao_curva(contexto, cabecalhos: dict, form: SimulacaoCurvaSchema):
+    """Como rotas.simulacao.simular_curva. As premissas são consultadas pelo engine
+    assíncrono, e a curva é calculada no pool de cálculo."""
+    try:
+        with rotular(produto=form.produto_id), Fase("vincular"):
+            premissas = await pegar_premissas_curva_assincrono(
+                contexto.engine, form.produto_id, form.sexo
+            )
+        resultado = await contexto.calcular(calcular_curva, form, premissas)
+    except NoResultFound:
+        return produto_nao_encontrado(form.produto_id)
+    except ValueError as e:
+        return Resposta(ErrorSchema(mesage=str(e)).model_dump(), 400)
+    return Resposta(ResultadoCurvaSchema(resultado).model_dump())
@@ -0,0 +1,85 @@
+"""Contagem das instruções SQL de cada requisição (model.instrumentacao).
+
+A quantidade de instruções e o tempo gasto no banco de dados são registrados nas métricas, por
+rota, e a quantidade é comparada com o orçamento da rota em CONSULTAS_ORCAMENTO, para detectar
+consultas N+1, como carregamentos implícitos de relacionamentos em laços. Requisições acima do
+orçamento são registradas no log e, se CONSULTAS_ORCAMENTO_ESTRITO, falham com
+OrcamentoConsultasExcedido, o que faz falhar os testes e o benchmark orcamento_consultas.
+"""
+from typing import Optional
+
+from flask import Flask, g, request
+
+from model.instrumentacao import ContagemConsultas, encerrar_contagem, iniciar_contagem
+from src.metricas import registro
+
+consultas_requisicoes = registro.histograma(
+    "sistema_seguros_requisicao_consultas",
+    "Instruções SQL executadas por requisição, por rota.",
+    ("metodo", "rota"),
+    limites=(1, 2, 3, 5, 10, 20, 50, 100, 500),
+)
+duracao_consultas_requisicoes = registro.contador(
+    "sistema_seguros_requisicao_consultas_duracao_segundos_total",
+    "Tempo gasto no banco de dados pelas requisições, por rota.",
+    ("metodo", "rota"),
+)
+
+
+class OrcamentoConsultasExcedido(AssertionError):
+    """A requisição executou mais instruções SQL que o orçamento da rota."""
+
+
+def pegar_orcamento(config, metodo: str, rota: Optional[str]) -> Optional[int]:
+    """Quantidade máxima de instruções da rota, ou None se a rota não tem orçamento."""
+    return config["CONSULTAS_ORCAMENTO"].get(f"{metodo} {rota}")
+
+
+def encerrar_contagem_requisicao(
+    app: Flask, contagem: ContagemConsultas, metodo: str, rota: Optional[str]
+) -> None:
+    """Encerra a contagem da requisição, registra nas métricas e verifica o orçamento.
+
+    Raises:
+        OrcamentoConsultasExcedido: Se a requisição excedeu o orçamento da rota e
+            CONSULTAS_ORCAMENTO_ESTRITO está ativo.
+    """
+    encerrar_contagem(contagem)
+    rota_metricas = rota if rota is not None else ""
+    consultas_requisicoes.observar(contagem.quantidade, metodo=metodo, rota=rota_metricas)
+    duracao_consultas_requisicoes.incrementar(
+        contagem.duracao, metodo=metodo, rota=rota_metricas
+    )
+    orcamento = pegar_orcamento(app.config, metodo, rota)
+    if orcamento is None or contagem.quantidade <= orcamento:
+        return
+    mensagem = (
+        f"{metodo} {rota} executou {contagem.quantidade} instruções SQL, "
+        f"acima do orçamento de {orcamento}."
+    )
+    if app.config["CONSULTAS_ORCAMENTO_ESTRITO"]:
+        raise OrcamentoConsultasExcedido(mensagem)
+    app.logger.getChild("consultas").warning(mensagem)
+
+
+def configurar_consultas(app: Flask) -> None:
+    """Registra a contagem das instruções SQL de cada requisição na aplicação."""
+
+    @app.before_request
+    def iniciar_contagem_requisicao():
+        g.contagem_consultas = iniciar_contagem()
+
+    @app.after_request
+    def verificar_contagem_requisicao(resposta):
+        contagem = g.pop("contagem_consultas", None)
+        if contagem is not None:
+            rota = request.url_rule.rule if request.url_rule is not None else None
+            encerrar_contagem_requisicao(app, contagem, request.method, rota)
+        return resposta
+
+    @app.teardown_request
+    def descartar_contagem_requisicao(excecao):
+        # Requisições interrompidas por uma exceção não passam por after_request.
+        contagem = g.pop("contagem_consultas", None)
+        if contagem is not None:
+            encerrar_contagem(contagem)
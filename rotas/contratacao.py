@@ -0,0 +1,81 @@
+from flask import current_app
+from flask_openapi3 import APIBlueprint
+from sqlalchemy.exc import IntegrityError
+
+from model.database import db
+from rotas.tags import contratar_tag
+from schemas.cliente import (
+    ClienteSchema,
+    ContratacaoLoteSchema,
+    IdempotenciaSchema,
+    ResultadoContratacaoLoteSchema,
+)
+from schemas.error import ErrorSchema
+
+rotas_contratacao = APIBlueprint("contratacao", __name__)
+
+
+@rotas_contratacao.post(
+    "/contratar",
+    tags=[contratar_tag],
+    responses={
+        "200": ClienteSchema,
+        "409": ErrorSchema,
+        "400": ErrorSchema,
+        "422": ErrorSchema,
+    },
+)
+def add_cliente(form: ClienteSchema, header: IdempotenciaSchema):
+    """Adiciona um novo cliente à base de dados
+
+    Retorna as informações do cliente adicionado. Com o cabeçalho Idempotency-Key, novas
+    tentativas da mesma contratação retornam o resultado original sem gravar novamente.
+    """
+    from model.contratacao import contratar
+
+    try:
+        _, repetida = contratar(db, form, header.idempotency_key)
+
+    except ValueError as e:
+        return ErrorSchema(mesage=str(e)).model_dump(), 422
+
+    except IntegrityError:
+        return ErrorSchema(mesage="Cliente já existe na base.").model_dump(), 409
+
+    except Exception as e:
+        return ErrorSchema(mesage=str(e)).model_dump(), 400
+
+    headers = {"Idempotent-Replayed": "true"} if repetida else {}
+    return form.model_dump(), 200, headers
+
+
+@rotas_contratacao.post(
+    "/contratar/lote",
+    tags=[contratar_tag],
+    responses={"200": ResultadoContratacaoLoteSchema},
+)
+def add_clientes_lote(body: ContratacaoLoteSchema):
+    """Adiciona um lote de clientes à base de dados.
+
+    Os segurados já cadastrados são consultados de uma só vez e os novos segurados e
+    matrículas são gravados em lote. Retorna, na mesma ordem do lote, a matrícula criada
+    para cada cliente ou o motivo pelo qual ele não foi contratado.
+    """
+    from model.contratacao import contratar_lote
+
+    resultados = contratar_lote(
+        db, body.root, current_app.config["CONTRATACAO_TAMANHO_LOTE"]
+    )
+    return (
+        ResultadoContratacaoLoteSchema(
+            [
+                {
+                    "matricula_id": resultado.matricula_id,
+                    "status": "erro" if resultado.erro else "contratado",
+                    "erro": resultado.erro,
+                }
+                for resultado in resultados
+            ]
+        ).model_dump(),
+        200,
+    )
@@ -0,0 +1,12 @@
+from flask import redirect
+from flask_openapi3 import APIBlueprint
+
+from rotas.tags import home_tag
+
+rotas_documentacao = APIBlueprint("documentacao", __name__)
+
+
+@rotas_documentacao.get("/", tags=[home_tag])
+def home():
+    """Redireciona para /openapi, tela que permite a escolha do estilo de documentação."""
+    return redirect("/openapi")
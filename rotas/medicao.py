@@ -0,0 +1,73 @@
+"""Medição das fases das requisições amostradas (src.medicao).
+
+Em uma fração MEDICAO_AMOSTRAGEM das requisições, os tempos das fases são enviados no
+cabeçalho Server-Timing (se MEDICAO_SERVER_TIMING) e registrados em uma linha de log JSON no
+logger <app>.medicao, com o método, o caminho, a rota e o status da resposta.
+"""
+import json
+import logging
+import random
+from typing import Optional
+
+from flask import Flask, g, request
+
+
+def amostrar(config) -> bool:
+    """Sorteia se a requisição será medida, de acordo com MEDICAO_AMOSTRAGEM."""
+    amostragem = config["MEDICAO_AMOSTRAGEM"]
+    return amostragem > 0 and random.random() < amostragem
+
+
+def registrar_medicao(
+    app: Flask, medicao, metodo: str, caminho: str, rota: Optional[str], status: int
+) -> None:
+    """Registra a medição de uma requisição no log, em uma linha JSON."""
+    app.logger.getChild("medicao").info(
+        json.dumps(
+            {
+                "metodo": metodo,
+                "caminho": caminho,
+                "rota": rota,
+                "status": status,
+                **medicao.resumo(),
+            },
+            ensure_ascii=False,
+        )
+    )
+
+
+def configurar_medicao(app: Flask) -> None:
+    """Registra a medição das requisições amostradas na aplicação."""
+    app.logger.getChild("medicao").setLevel(logging.INFO)
+
+    @app.before_request
+    def iniciar_medicao_requisicao():
+        if amostrar(app.config):
+            from src.medicao import iniciar_medicao
+
+            g.medicao = iniciar_medicao()
+
+    @app.after_request
+    def encerrar_medicao_requisicao(resposta):
+        medicao = g.pop("medicao", None)
+        if medicao is None:
+            return resposta
+        from src.medicao import encerrar_medicao
+
+        encerrar_medicao(medicao)
+        if app.config["MEDICAO_SERVER_TIMING"]:
+            resposta.headers["Server-Timing"] = medicao.server_timing()
+        rota = request.url_rule.rule if request.url_rule is not None else None
+        registrar_medicao(
+            app, medicao, request.method, request.path, rota, resposta.status_code
+        )
+        return resposta
+
+    @app.teardown_request
+    def descartar_medicao_requisicao(excecao):
+        # Requisições interrompidas por uma exceção não passam por after_request.
+        medicao = g.pop("medicao", None)
+        if medicao is not None:
+            from src.medicao import encerrar_medicao
+
+            encerrar_medicao(medicao)
@@ -0,0 +1,78 @@
+from pathlib import Path
+from time import perf_counter
+
+from flask import Flask, Response, current_app, g, request
+from flask_openapi3 import APIBlueprint
+
+from model.cache import caches
+from rotas.tags import metricas_tag
+from src.metricas import exportar, registro
+
+rotas_metricas = APIBlueprint("metricas", __name__)
+
+requisicoes = registro.contador(
+    "sistema_seguros_requisicoes_total",
+    "Requisições atendidas, por rota e status.",
+    ("metodo", "rota", "status"),
+)
+duracao_requisicoes = registro.histograma(
+    "sistema_seguros_requisicao_duracao_segundos",
+    "Duração das requisições, por rota.",
+    ("metodo", "rota"),
+)
+acertos_cache = registro.contador(
+    "sistema_seguros_cache_acertos_total", "Acertos dos caches em memória.", ("cache",)
+)
+falhas_cache = registro.contador(
+    "sistema_seguros_cache_falhas_total", "Falhas dos caches em memória.", ("cache",)
+)
+
+
+@registro.coletor
+def coletar_caches() -> None:
+    for nome, cache in list(caches.items()):
+        acertos_cache.definir(cache.acertos, cache=nome)
+        falhas_cache.definir(cache.falhas, cache=nome)
+
+
+def registrar_requisicao(
+    app: Flask, metodo: str, rota: str, status: int, duracao: float
+) -> None:
+    """Registra a requisição nas métricas e grava o instantâneo do processo, se necessário."""
+    requisicoes.incrementar(metodo=metodo, rota=rota, status=status)
+    duracao_requisicoes.observar(duracao, metodo=metodo, rota=rota)
+    registro.gravar_periodicamente(
+        Path(app.config["METRICAS_DIRETORIO"]), app.config["METRICAS_INTERVALO_GRAVACAO"]
+    )
+
+
+def configurar_metricas(app: Flask) -> None:
+    """Registra as métricas das requisições na aplicação. Requisições que não correspondem a
+    nenhuma rota são agrupadas na rota vazia, para limitar a quantidade de séries."""
+
+    @app.before_request
+    def iniciar_cronometro_requisicao():
+        g.inicio_requisicao = perf_counter()
+
+    @app.after_request
+    def registrar_metricas_requisicao(resposta):
+        inicio = g.pop("inicio_requisicao", None)
+        if inicio is not None:
+            rota = request.url_rule.rule if request.url_rule is not None else ""
+            registrar_requisicao(
+                app, request.method, rota, resposta.status_code, perf_counter() - inicio
+            )
+        return resposta
+
+
+@rotas_metricas.get("/metrics", tags=[metricas_tag])
+def get_metricas():
+    """Métricas de todos os processos da aplicação, no formato texto do Prometheus.
+
+    Cada processo grava as suas métricas periodicamente no diretório METRICAS_DIRETORIO, e
+    o processo que atende a requisição soma os valores de todos eles.
+    """
+    return Response(
+        exportar(Path(current_app.config["METRICAS_DIRETORIO"])),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
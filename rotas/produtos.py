@@ -0,0 +1,86 @@
+from flask import current_app, make_response, request
+from flask_openapi3 import APIBlueprint
+
+from model.database import db
+from rotas.tags import produto_tag
+from schemas.error import ErrorSchema
+from schemas.produto import (
+    ListagemProdutosSchema,
+    ParametrosProdutoSchema,
+    ProdutoBuscaSchema,
+    ProdutoSchema,
+)
+
+rotas_produtos = APIBlueprint("produtos", __name__)
+
+
+def pegar_catalogo():
+    from model.catalogo import pegar_catalogo
+
+    return pegar_catalogo(db)
+
+
+def resposta_catalogo(recurso):
+    """Responde com um recurso do catálogo, ou com 304 se o cliente já possui a versão atual."""
+    if recurso.etag in request.if_none_match:
+        resposta = make_response("", 304)
+    else:
+        resposta = make_response(recurso.conteudo, 200)
+    resposta.set_etag(recurso.etag)
+    resposta.headers["Cache-Control"] = current_app.config["CATALOGO_CACHE_CONTROL"]
+    return resposta
+
+
+def produto_nao_encontrado(produto_id: int):
+    return (
+        ErrorSchema(mesage=f"Produto {produto_id} não encontrado.").model_dump(),
+        404,
+    )
+
+
+@rotas_produtos.get(
+    "/produtos",
+    tags=[produto_tag],
+    responses={"200": ListagemProdutosSchema, "404": ErrorSchema},
+)
+def get_produtos():
+    """Faz a busca por todos os produto cadastrados.
+
+    Retorna uma representação da listagem de produtos. A resposta inclui um ETag, e
+    requisições com If-None-Match correspondente recebem 304.
+    """
+    return resposta_catalogo(pegar_catalogo().produtos)
+
+
+@rotas_produtos.get(
+    "/produtos/<int:produto_id>",
+    tags=[produto_tag],
+    responses={"200": ProdutoSchema, "404": ErrorSchema},
+)
+def get_produto(path: ProdutoBuscaSchema):
+    """Faz a busca por um produto específico.
+
+    Retorna uma representação do produtos. A resposta inclui um ETag, e requisições com
+    If-None-Match correspondente recebem 304.
+    """
+    recurso = pegar_catalogo().produto.get(path.produto_id)
+    if recurso is None:
+        return produto_nao_encontrado(path.produto_id)
+    return resposta_catalogo(recurso)
+
+
+@rotas_produtos.get(
+    "/produtos/parametros/<int:produto_id>",
+    tags=[produto_tag],
+    responses={"200": ParametrosProdutoSchema, "404": ErrorSchema},
+)
+def get_parametros_produto(path: ProdutoBuscaSchema):
+    """Faz a busca pelos parâmetros de um produto específico.
+
+    Retorna os possíveis parâmetros de contratação de um produto específico. A resposta
+    inclui um ETag, e requisições com If-None-Match correspondente recebem 304.
+    """
+    recurso = pegar_catalogo().parametros.get(path.produto_id)
+    if recurso is None:
+        return produto_nao_encontrado(path.produto_id)
+    return resposta_catalogo(recurso)
@@ -0,0 +1,396 @@
+from collections import defaultdict
+from datetime import date
+from math import isclose, isnan
+from typing import Optional
+
+from flask import current_app
+from flask_openapi3 import APIBlueprint
+from pydantic import ValidationError
+from sqlalchemy.exc import NoResultFound
+
+from model.database import db
+from rotas.tags import simular_tag
+from schemas.error import ErrorSchema
+from schemas.simulacao import (
+    ResultadoCurvaSchema,
+    ResultadoSimulacaoLoteSchema,
+    ResultadoSimulacaoSchema,
+    SimulacaoAposentadoriaSchema,
+    SimulacaoCurvaSchema,
+    SimulacaoInterfaceSchema,
+    SimulacaoLoteSchema,
+    SimulacaoPeculioSchema,
+    SimulacaoSchema,
+)
+
+rotas_simulacao = APIBlueprint("simulacao", __name__)
+
+
+def premio_pela_tarifa(
+    form: SimulacaoSchema, prazo_renda: int = 0, prazo_certo_renda: int = 0
+) -> Optional[float]:
+    """Prêmio obtido da tarifa pré-calculada, ou None se a tarifa não cobre a simulação."""
+    from model.grade_tarifa import pegar_tarifa
+
+    tarifa = pegar_tarifa(
+        db, form.produto_id, form.sexo, form.prazo, prazo_renda, prazo_certo_renda
+    )
+    return premio_da_tarifa(tarifa, form)
+
+
+def premio_da_tarifa(tarifa, form: SimulacaoSchema) -> Optional[float]:
+    """Prêmio da simulação pela grade de tarifas, ou None se não há grade."""
+    if tarifa is None:
+        return None
+    return tarifa.premio(date.today(), form.data_nascimento, form.beneficio)
+
+
+def verificar_tarifa(
+    form: SimulacaoSchema, premio_tarifa: Optional[float], premio_motor: float
+) -> None:
+    """Registra no log as divergências entre a tarifa pré-calculada e o motor completo."""
+    if premio_tarifa is not None and not isclose(premio_tarifa, premio_motor):
+        current_app.logger.warning(
+            "Tarifa divergente do motor de cálculo: %s, tarifa=%s, motor=%s",
+            form.model_dump(),
+            premio_tarifa,
+            premio_motor,
+        )
+
+
+def validar_parametros(formula, form: SimulacaoSchema) -> SimulacaoInterfaceSchema:
+    """Parâmetros da simulação no esquema da fórmula.
+
+    Os campos ausentes do formulário são mantidos como None, como o flask-openapi3 os envia
+    às rotas de cada fórmula, de forma que os campos exigidos pela fórmula e não informados
+    falham na validação, em vez de receberem o valor padrão do esquema.
+
+    Raises:
+        ValidationError: Se os parâmetros não são válidos para a fórmula.
+    """
+    return formula.esquema.model_validate(form.model_dump())
+
+
+def simular(nome_formula: str, form: SimulacaoInterfaceSchema):
+    """Simula o prêmio pela fórmula registrada, usando a tarifa pré-calculada quando possível."""
+    from model.simulacao import pegar_formula_simulacao
+    from src.medicao import Fase
+    from src.metricas import rotular
+
+    formula = pegar_formula_simulacao(nome_formula)
+    with rotular(produto=form.produto_id, formula=nome_formula):
+        with Fase("tarifa"):
+            premio = premio_pela_tarifa(
+                form,
+                getattr(form, "prazo_renda", 0),
+                getattr(form, "prazo_certo_renda", 0),
+            )
+        if premio is not None and not current_app.config["TARIFA_VERIFICAR"]:
+            return ResultadoSimulacaoSchema(premio=premio).model_dump(), 200
+
+        try:
+            with Fase("vincular"):
+                argumentos = formula.vincular(db, form)
+            with Fase("precificar"):
+                produto = formula.precificar(**argumentos)
+        except NoResultFound:
+            return (
+                ErrorSchema(
+                    mesage=f"Produto {form.produto_id} não encontrado."
+                ).model_dump(),
+                404,
+            )
+        except Exception as e:
+            return ErrorSchema(mesage=str(e)).model_dump(), 400
+
+        premio_motor = produto.premio_comercial(0)
+        verificar_tarifa(form, premio, premio_motor)
+        return ResultadoSimulacaoSchema(premio=premio_motor).model_dump(), 200
+
+
+@rotas_simulacao.post(
+    "/simular",
+    tags=[simular_tag],
+    responses={"200": ResultadoSimulacaoSchema, "400": ErrorSchema, "404": ErrorSchema},
+)
+def post_simulacao(form: SimulacaoSchema):
+    """Faz a simulação de um produto genérico.
+
+    Essa rota recebe um produto e um conjunto de parâmetros e simula o produto pela sua
+    fórmula. Os parâmetros podem conter valores que não serão utilizados.
+    """
+    from model.queries import pegar_nome_formula
+    from model.simulacao import pegar_formula_simulacao
+
+    try:
+        nome_formula = pegar_nome_formula(db, form.produto_id)
+        formula = pegar_formula_simulacao(nome_formula)
+    except NoResultFound:
+        return (
+            ErrorSchema(
+                mesage=f"Produto {form.produto_id} não encontrado."
+            ).model_dump(),
+            404,
+        )
+    except ValueError as e:
+        return ErrorSchema(mesage=str(e)).model_dump(), 400
+
+    try:
+        parametros = validar_parametros(formula, form)
+    except ValidationError as e:
+        return current_app.validation_error_callback(e)
+    return simular(nome_formula, parametros)
+
+
+@rotas_simulacao.post(
+    "/simular/peculio",
+    tags=[simular_tag],
+    responses={"200": ResultadoSimulacaoSchema, "400": ErrorSchema, "404": ErrorSchema},
+)
+def post_simulacao_peculio(form: SimulacaoPeculioSchema):
+    """Faz a simulação de um produto do tipo pecúlio.
+
+    Retorna o valor do prêmio comercial para o produto e os parâmetros informados."""
+    return simular("peculio", form)
+
+
+@rotas_simulacao.post(
+    "/simular/aposentadoria",
+    tags=[simular_tag],
+    responses={"200": ResultadoSimulacaoSchema, "400": ErrorSchema, "404": ErrorSchema},
+)
+def post_simulacao_aposentadoria(form: SimulacaoAposentadoriaSchema):
+    """Faz a simulação de um produto do tipo aposentadoria.
+
+    Retorna o valor do prêmio comercial para o produto e os parâmetros informados."""
+    return simular("aposentadoria", form)
+
+
+def precificar_grupo_lote(premissas, prazo: int, propostas: list[SimulacaoSchema]):
+    """Precifica um grupo de propostas com o mesmo produto, sexo e prazo, a partir das
+    premissas do grupo (model.grade_tarifa.PremissasGrade). Não consulta o banco de dados.
+
+    Retorna o prêmio de cada proposta, nan para as propostas com parâmetros inválidos.
+    """
+    import tabatu as tb
+
+    from src.produtos.lote import (
+        aposentadoria_capitalizado_lote,
+        peculio_capitalizado_lote,
+    )
+
+    argumentos = dict(
+        juros=tb.JurosConstante(premissas.juros),
+        data_assinatura=date.today(),
+        data_nascimento_segurado=[proposta.data_nascimento for proposta in propostas],
+        prazo_cobertura=prazo,
+        prazo_pagamento=prazo,
+        beneficio=[proposta.beneficio for proposta in propostas],
+        percentual_beneficio=[1.0],
+        **premissas.tabuas,
+    )
+    if premissas.formula == "peculio":
+        return peculio_capitalizado_lote(**argumentos)
+
+    if premissas.formula == "aposentadoria":
+        return aposentadoria_capitalizado_lote(
+            prazo_renda=[
+                float("nan") if proposta.prazo_renda is None else proposta.prazo_renda
+                for proposta in propostas
+            ],
+            prazo_certo_renda=[
+                proposta.prazo_certo_renda or 0 for proposta in propostas
+            ],
+            **argumentos,
+        )
+
+    raise ValueError(f"Fórmula {premissas.formula} não suportada na simulação em lote.")
+
+
+def agrupar_lote(propostas: list[SimulacaoSchema]) -> dict[tuple, list[int]]:
+    """Índices das propostas do lote agrupados por produto, sexo e prazo."""
+    grupos = defaultdict(list)
+    for indice, proposta in enumerate(propostas):
+        grupos[(proposta.produto_id, proposta.sexo, proposta.prazo)].append(indice)
+    return grupos
+
+
+def erro_grupo_lote(produto_id: int, prazo: int, erro: Exception) -> str:
+    if isinstance(erro, NoResultFound):
+        return f"Produto {produto_id} com prazo {prazo} não encontrado."
+    return str(erro)
+
+
+def pegar_premissas_lote(grupos: dict[tuple, list[int]]) -> dict:
+    """Premissas de cada grupo do lote, ou a mensagem de erro do grupo, buscadas uma única
+    vez por grupo."""
+    from model.grade_tarifa import pegar_premissas_grade
+    from src.metricas import rotular
+
+    premissas = {}
+    for produto_id, sexo, prazo in grupos:
+        try:
+            with rotular(produto=produto_id):
+                premissas[(produto_id, sexo, prazo)] = pegar_premissas_grade(
+                    db, produto_id, sexo, prazo
+                )
+        except Exception as e:
+            premissas[(produto_id, sexo, prazo)] = erro_grupo_lote(produto_id, prazo, e)
+    return premissas
+
+
+def precificar_lote(
+    propostas: list[SimulacaoSchema], grupos: dict[tuple, list[int]], premissas: dict
+) -> list[dict]:
+    """Resultado de cada proposta do lote, na mesma ordem, a partir das premissas de cada
+    grupo (pegar_premissas_lote). Não consulta o banco de dados."""
+    from src.metricas import rotular
+
+    resultado = [None] * len(propostas)
+    for (produto_id, sexo, prazo), indices in grupos.items():
+        premissas_grupo = premissas[(produto_id, sexo, prazo)]
+        erro = f"Parâmetros inválidos para o produto {produto_id}."
+        if isinstance(premissas_grupo, str):
+            premios = [float("nan")] * len(indices)
+            erro = premissas_grupo
+        else:
+            try:
+                with rotular(produto=produto_id, formula=premissas_grupo.formula):
+                    premios = precificar_grupo_lote(
+                        premissas_grupo, prazo, [propostas[indice] for indice in indices]
+                    )
+            except Exception as e:
+                premios = [float("nan")] * len(indices)
+                erro = erro_grupo_lote(produto_id, prazo, e)
+
+        for indice, premio in zip(indices, premios):
+            if isnan(premio):
+                resultado[indice] = {"premio": None, "erro": erro}
+            else:
+                resultado[indice] = {"premio": float(premio)}
+    return resultado
+
+
+def simular_lote(propostas: list[SimulacaoSchema]) -> list[dict]:
+    """Resultado de cada proposta do lote, na mesma ordem, agrupando-as por produto, sexo e
+    prazo."""
+    grupos = agrupar_lote(propostas)
+    return precificar_lote(propostas, grupos, pegar_premissas_lote(grupos))
+
+
+@rotas_simulacao.post(
+    "/simular/lote",
+    tags=[simular_tag],
+    responses={"200": ResultadoSimulacaoLoteSchema},
+)
+def post_simulacao_lote(body: SimulacaoLoteSchema):
+    """Faz a simulação de um lote de propostas de produtos genéricos.
+
+    As propostas são agrupadas por produto, sexo e prazo, e cada grupo é precificado
+    com uma única busca de premissas e um único cálculo vetorizado. Retorna o resultado
+    de cada proposta na mesma ordem do lote.
+    """
+    return ResultadoSimulacaoLoteSchema(simular_lote(body.root)).model_dump(), 200
+
+
+def calcular_curva(form: SimulacaoCurvaSchema, premissas) -> list[dict]:
+    """Prêmio de todas as combinações de prazos, em ordem de prazo, a partir das premissas
+    do produto (model.simulacao.PremissasCurva). Não consulta o banco de dados.
+
+    Os prazos com o mesmo juros são precificados juntos, a partir das mesmas tabelas de
+    comutação. Combinações que o segurado não pode contratar possuem prêmio None.
+    """
+    import tabatu as tb
+
+    from src.medicao import Fase
+    from src.metricas import rotular
+    from src.produtos.curva import (
+        aposentadoria_capitalizado_curva,
+        peculio_capitalizado_curva,
+    )
+
+    grupos = defaultdict(list)
+    for prazo, juros in premissas.juros_prazos.items():
+        grupos[juros].append(prazo)
+
+    resultado = []
+    with rotular(produto=form.produto_id, formula=premissas.formula), Fase("precificar"):
+        for juros, prazos in grupos.items():
+            argumentos = dict(
+                juros=tb.JurosConstante(juros),
+                data_assinatura=date.today(),
+                data_nascimento_segurado=form.data_nascimento,
+                beneficio=form.beneficio,
+            )
+            if premissas.formula == "peculio":
+                combinacoes = [{"prazo": prazo} for prazo in prazos]
+                premios = peculio_capitalizado_curva(
+                    prazos=prazos, **premissas.tabuas, **argumentos
+                )
+            else:
+                combinacoes = [
+                    {"prazo": prazo, "prazo_renda": renda, "prazo_certo_renda": certo}
+                    for prazo in prazos
+                    for renda, certo in premissas.prazos_renda
+                ]
+                premios = aposentadoria_capitalizado_curva(
+                    prazos=[c["prazo"] for c in combinacoes],
+                    prazos_renda=[c["prazo_renda"] for c in combinacoes],
+                    prazos_certos_renda=[c["prazo_certo_renda"] for c in combinacoes],
+                    **premissas.tabuas,
+                    **argumentos,
+                )
+            for combinacao, premio in zip(combinacoes, premios):
+                resultado.append(
+                    {**combinacao, "premio": None if isnan(premio) else float(premio)}
+                )
+    return sorted(
+        resultado,
+        key=lambda item: (
+            item["prazo"], item.get("prazo_renda", 0), item.get("prazo_certo_renda", 0)
+        ),
+    )
+
+
+def simular_curva(form: SimulacaoCurvaSchema) -> list[dict]:
+    """Prêmio de todas as combinações de prazos oferecidas pelo produto, em ordem de prazo.
+
+    Raises:
+        NoResultFound: Se o produto não existe.
+        ValueError: Se a fórmula do produto não é suportada ou o produto não possui as
+            tábuas do sexo.
+    """
+    from model.simulacao import pegar_premissas_curva
+    from src.medicao import Fase
+    from src.metricas import rotular
+
+    with rotular(produto=form.produto_id), Fase("vincular"):
+        premissas = pegar_premissas_curva(db, form.produto_id, form.sexo)
+    return calcular_curva(form, premissas)
+
+
+@rotas_simulacao.post(
+    "/simular/curva",
+    tags=[simular_tag],
+    responses={"200": ResultadoCurvaSchema, "400": ErrorSchema, "404": ErrorSchema},
+)
+def post_simulacao_curva(form: SimulacaoCurvaSchema):
+    """Faz a simulação de todos os prazos de um produto.
+
+    Retorna o prêmio comercial de cada prazo oferecido pelo produto (e, para aposentadorias,
+    de cada prazo de renda), de forma que a tela de cotação pode buscar a curva uma única vez
+    e atualizar o prêmio localmente quando o prazo é alterado. Os prazos são precificados a
+    partir das funções de comutação, em uma única passada para cada juros do produto.
+    """
+    try:
+        resultado = simular_curva(form)
+    except NoResultFound:
+        return (
+            ErrorSchema(
+                mesage=f"Produto {form.produto_id} não encontrado."
+            ).model_dump(),
+            404,
+        )
+    except ValueError as e:
+        return ErrorSchema(mesage=str(e)).model_dump(), 400
+    return ResultadoCurvaSchema(resultado).model_dump(), 200
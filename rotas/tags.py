@@ -0,0 +1,26 @@
+from flask_openapi3 import Tag
+
+home_tag = Tag(
+    name="Documentação",
+    description="Seleção de documentação: Swagger, Redoc ou RapiDoc",
+)
+produto_tag = Tag(
+    name="Produto",
+    description="Consulta produtos disponíveis e informações adicionais sobre eles.",
+)
+simular_tag = Tag(
+    name="Simular",
+    description="Realiza simulações para potenciais novos clientes.",
+)
+contratar_tag = Tag(
+    name="Contratar",
+    description="Realiza o cadastro de um novo cliente.",
+)
+apolice_tag = Tag(
+    name="Apólice",
+    description="Consulta informações das apólices contratadas.",
+)
+metricas_tag = Tag(
+    name="Métricas",
+    description="Métricas de requisições, consultas, precificação e caches para o Prometheus.",
+)
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+
+class ApoliceBuscaSchema(BaseModel):
+    """Define como deve ser a estrutura que representa a busca de uma apólice, que será
+    feita apenas com base no id da matrícula.
+    """
+
+    apolice_id: int = 1
+
+
+class ReservasApoliceSchema(BaseModel):
+    """Define como as reservas de uma apólice serão retornadas.
+
+    As reservas são indexadas pelo tempo decorrido desde a assinatura, na periodicidade
+    das tábuas do produto.
+    """
+
+    apolice_id: int = 1
+    produto_id: int = 1
+    periodicidade: str = "ANUAL"
+    tempo_decorrido: int = 0
+    reserva_atual: float = 0.0
+    reservas: list[float] = [0.0, 95.3, 190.1]
@@ -1,6 +1,6 @@
 from datetime import date
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, RootModel
 
 
 class ClienteSchema(BaseModel):
@@ -17,3 +17,31 @@ class ClienteSchema(BaseModel):
     beneficio: int = 10000
     prazo_renda: Optional[int] = None
     prazo_certo_renda: Optional[int] = None
+
+
+class IdempotenciaSchema(BaseModel):
+    """Define o cabeçalho Idempotency-Key, que identifica uma contratação. Novas tentativas
+    com a mesma chave retornam a contratação original, sem gravar novamente."""
+
+    idempotency_key: Optional[str] = Field(None, max_length=100)
+
+
+class ContratacaoLoteSchema(RootModel):
+    """Representa um lote de contratações."""
+
+    root: list[ClienteSchema]
+
+
+class ResultadoContratacaoItemSchema(BaseModel):
+    """Representa o resultado de uma contratação do lote. Quando a contratação não pode
+    ser realizada, a matrícula é vazia e o erro é informado."""
+
+    matricula_id: Optional[int] = 1
+    status: str = "contratado"
+    erro: Optional[str] = None
+
+
+class ResultadoContratacaoLoteSchema(RootModel):
+    """Representa os resultados de um lote de contratações, na mesma ordem do lote."""
+
+    root: list[ResultadoContratacaoItemSchema]
@@ -1,6 +1,6 @@
 from datetime import date
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, RootModel
 
 
 class SimulacaoInterfaceSchema(BaseModel):
@@ -35,3 +35,49 @@ class ResultadoSimulacaoSchema(BaseModel):
     """Representa os dados que fazem parte do output da simulação."""
 
     premio: float = 0.0
+
+
+class SimulacaoLoteSchema(RootModel):
+    """Representa um lote de simulações genéricas."""
+
+    root: list[SimulacaoSchema]
+
+
+class ResultadoSimulacaoLoteItemSchema(BaseModel):
+    """Representa o resultado de uma simulação do lote. Quando a simulação não pode
+    ser realizada, o prêmio é vazio e o erro é informado."""
+
+    premio: Optional[float] = 0.0
+    erro: Optional[str] = None
+
+
+class ResultadoSimulacaoLoteSchema(RootModel):
+    """Representa os resultados de um lote de simulações, na mesma ordem do lote."""
+
+    root: list[ResultadoSimulacaoLoteItemSchema]
+
+
+class SimulacaoCurvaSchema(BaseModel):
+    """Representa os dados para a simulação de todos os prazos de um produto."""
+
+    sexo: str = "M"
+    data_nascimento: date = date(1990, 1, 1)
+    produto_id: int = 1
+    beneficio: float = 10000
+
+
+class ResultadoCurvaItemSchema(BaseModel):
+    """Representa o prêmio de uma combinação de prazos oferecida pelo produto. Pecúlios não
+    possuem prazos de renda. Quando o segurado não pode contratar o prazo, o prêmio é vazio."""
+
+    prazo: int
+    prazo_renda: Optional[int] = None
+    prazo_certo_renda: Optional[int] = None
+    premio: Optional[float] = None
+
+
+class ResultadoCurvaSchema(RootModel):
+    """Representa os prêmios de todas as combinações de prazos do produto, em ordem de
+    prazo."""
+
+    root: list[ResultadoCurvaItemSchema]
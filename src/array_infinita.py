@@ -1,15 +1,146 @@
-from numpy import allclose, atleast_1d, float64
+from typing import Sequence
+
+from numpy import (
+    allclose,
+    arange,
+    array_equal,
+    asarray,
+    atleast_1d,
+    broadcast_shapes,
+    broadcast_to,
+    float64,
+    full,
+    int64,
+    minimum,
+    shape,
+    zeros,
+)
 from numpy.typing import ArrayLike, NDArray
 
 
+def indices_inteiros(index: ArrayLike) -> NDArray[int64]:
+    index = asarray(index)
+    if index.ndim == 0:
+        index = index.reshape(1)
+    if index.dtype.kind not in "iu":
+        index = index.astype(int64)
+    return index
+
+
 class ArrayInfinita:
+    """Array em que as posições após o fim repetem o último valor.
+
+    Args:
+        data (ArrayLike): Valores, por exemplo o percentual do benefício em cada tempo.
+    """
+
     def __init__(self, data: ArrayLike):
         self.data = atleast_1d(data)
+        self.constante = self.data.shape == (1,)
 
     def __getitem__(self, index) -> NDArray[float64]:
-        tamanho = len(self.data)
-        index = atleast_1d(index).clip(max=tamanho - 1).astype(int)
-        return self.data[index]
+        index = indices_inteiros(index)
+        if self.constante:
+            return full(index.shape, self.data[0])
+        return self.data.take(minimum(index, len(self.data) - 1))
 
     def __eq__(self, other):
         return allclose(self.data, other.data)
+
+
+class ArrayInfinitaLote:
+    """Várias ArrayInfinita, uma por proposta, com tamanhos diferentes, em uma única matriz.
+
+    Cada linha é completada com o seu último valor até o tamanho da maior, de forma que a
+    leitura de qualquer tempo de qualquer proposta é uma única indexação da matriz. Um lote
+    com uma única linha é compartilhado por todas as propostas, como no broadcasting do
+    numpy. Quando todas as linhas são o mesmo valor constante (por exemplo, o percentual de
+    100% do benefício em todos os tempos), a leitura retorna uma view somente leitura, sem
+    alocar memória.
+
+    Uso:
+        percentual = ArrayInfinitaLote([[1.0], [1.0, 1.1, 1.2], [0.5, 1.0]])
+        percentual[arange(4)]  # matriz (proposta × tempo)
+        percentual[[0, 2], [3, 0]]  # tempo 3 da proposta 0 e tempo 0 da proposta 2
+
+    Args:
+        linhas (Sequence[ArrayLike]): Valores de cada proposta.
+    """
+
+    def __init__(self, linhas: Sequence[ArrayLike]):
+        linhas = [asarray(linha, dtype=float64).reshape(-1) for linha in linhas]
+        if not linhas or min(len(linha) for linha in linhas) == 0:
+            raise ValueError("ArrayInfinitaLote deve ter ao menos uma linha e nenhuma vazia.")
+        self.tamanhos = asarray([len(linha) for linha in linhas], dtype=int64)
+        self.dados = zeros((len(linhas), self.tamanhos.max()))
+        for i, linha in enumerate(linhas):
+            self.dados[i, : len(linha)] = linha
+            self.dados[i, len(linha) :] = linha[-1]
+        self._definir_constante()
+
+    @classmethod
+    def de_matriz(
+        cls, dados: NDArray[float64], tamanhos: NDArray[int64]
+    ) -> "ArrayInfinitaLote":
+        """Cria o lote a partir de uma matriz já completada com o último valor de cada linha."""
+        lote = cls.__new__(cls)
+        lote.dados = dados
+        lote.tamanhos = tamanhos
+        lote._definir_constante()
+        return lote
+
+    def _definir_constante(self) -> None:
+        constante = self.dados.shape[1] == 1 and (self.dados == self.dados[0, 0]).all()
+        # View de dimensão zero, que broadcast_to expande sem copiar.
+        self._constante = self.dados[0, 0:1].reshape(()) if constante else None
+
+    def __len__(self) -> int:
+        return len(self.dados)
+
+    def __getitem__(self, index) -> NDArray[float64]:
+        """Valores nos tempos informados.
+
+        O índice pode ser (propostas, tempos), combinados por broadcasting, ou apenas os
+        tempos, em que a última dimensão é o tempo e a anterior, se houver, a proposta. Com
+        tempos de uma dimensão, o resultado é a matriz (proposta × tempo).
+        """
+        if isinstance(index, tuple):
+            propostas, tempos = index
+            propostas = indices_inteiros(propostas)
+        else:
+            propostas, tempos = self.propostas(), index
+        tempos = indices_inteiros(tempos)
+        if self._constante is not None:
+            formato = broadcast_shapes(shape(propostas), tempos.shape)
+            return broadcast_to(self._constante, formato)
+        return self.dados[propostas, minimum(tempos, self.dados.shape[1] - 1)]
+
+    def propostas(self) -> NDArray[int64]:
+        """Índice das propostas, em uma coluna, para o broadcasting com os tempos."""
+        if len(self) == 1:
+            return zeros((1, 1), dtype=int64)
+        return arange(len(self))[:, None]
+
+    def linha(self, proposta: int) -> ArrayInfinita:
+        """Valores de uma proposta, para os cálculos de um único contrato."""
+        return ArrayInfinita(self.dados[proposta, : self.tamanhos[proposta]])
+
+    def filtrar(self, mascara: NDArray) -> "ArrayInfinitaLote":
+        """Lote com as propostas selecionadas pela máscara. Um lote com uma única linha é
+        compartilhado por todas as propostas e não é filtrado."""
+        if len(self) == 1:
+            return self
+        if len(self) != len(mascara):
+            raise ValueError("ArrayInfinitaLote deve ter uma linha por proposta.")
+        return ArrayInfinitaLote.de_matriz(self.dados[mascara], self.tamanhos[mascara])
+
+    def __eq__(self, other):
+        # As matrizes podem ter larguras diferentes (filtrar mantém a largura do lote
+        # original); os valores são comparados até o fim da maior delas.
+        if not (
+            isinstance(other, ArrayInfinitaLote)
+            and array_equal(self.tamanhos, other.tamanhos)
+        ):
+            return False
+        tempos = arange(max(self.dados.shape[1], other.dados.shape[1]))
+        return allclose(self[tempos], other[tempos])
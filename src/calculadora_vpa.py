@@ -2,6 +2,9 @@ from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
 
+from numpy import array, float64
+from numpy.typing import NDArray
+
 from src.idades_prazos import IdadesPrazos
 from src.idades_prazos import IdadesPrazosPagamento
 from tabatu.premissas import Premissas
@@ -17,6 +20,14 @@ class CalculadoraVPA(ABC):
     def calcular_vpa(self, tempo_atual: int) -> float:
         raise NotImplementedError
 
+    def calcular_vpa_curva(self, tempo_maximo: int) -> NDArray[float64]:
+        """VPA para todos os tempos de 0 a tempo_maximo.
+
+        Por padrão, chama calcular_vpa para cada tempo. Calculadoras que conseguem obter a
+        curva inteira em uma única passada devem sobrescrever este método.
+        """
+        return array([self.calcular_vpa(t) for t in range(tempo_maximo + 1)], dtype=float64)
+
 
 @dataclass(frozen=True)
 class CalculadoraVPAPagamento(ABC):
@@ -27,3 +38,11 @@ class CalculadoraVPAPagamento(ABC):
     @abstractmethod
     def calcular_vpa(self, tempo_atual: int) -> float:
         raise NotImplementedError
+
+    def calcular_vpa_curva(self, tempo_maximo: int) -> NDArray[float64]:
+        """VPA para todos os tempos de 0 a tempo_maximo.
+
+        Por padrão, chama calcular_vpa para cada tempo. Calculadoras que conseguem obter a
+        curva inteira em uma única passada devem sobrescrever este método.
+        """
+        return array([self.calcular_vpa(t) for t in range(tempo_maximo + 1)], dtype=float64)
@@ -1,8 +1,12 @@
 from dataclasses import dataclass
+from typing import Optional
 
+from numpy import float64
+from numpy.typing import NDArray
 from tabatu.periodicidade import periodicidade2meses
 
 from src.cobertura import Cobertura
+from src.medicao import Fase, medido
 from src.pagamento import Pagamento
 
 
@@ -50,8 +54,10 @@ class Capitalizado:
     @property
     def taxa_pura(self) -> float:
         """Taxa pura do contrato."""
-        vpa_cobertura = self.cobertura.vpa(0)
-        vpa_pagamento = self.pagamento.vpa(0)
+        with Fase("vpa_cobertura"):
+            vpa_cobertura = self.cobertura.vpa(0)
+        with Fase("vpa_pagamento"):
+            vpa_pagamento = self.pagamento.vpa(0)
         parcelamento = self.parcelamento
         if vpa_pagamento == 0:
             return 0.0
@@ -75,6 +81,30 @@ class Capitalizado:
 
         return self.taxa_pura * self.beneficio
 
+    def reserva_curva(self, tempo_maximo: Optional[int] = None) -> NDArray[float64]:
+        """Reserva matemática prospectiva para todos os tempos de 0 a tempo_maximo.
+
+        A reserva em t é o benefício vezes o VPA da cobertura em t, menos o prêmio puro vezes o VPA
+        dos pagamentos em t. Os VPAs de todos os tempos são obtidos de uma única vez pelas
+        calculadoras, ao invés de um cálculo de VPA por tempo.
+
+        Args:
+            tempo_maximo (int, optional): Último tempo da curva, na periodicidade da cobertura. Por
+                padrão, o fim da cobertura (incluindo a renda), limitado pela tábua.
+
+        Returns:
+            NDArray[float64]: Reserva em cada tempo, com tamanho tempo_maximo + 1.
+        """
+        if tempo_maximo is None:
+            tempo_maximo = self.cobertura.prazo_total_efetivo
+        vpa_cobertura = self.cobertura.vpa_curva(tempo_maximo)
+        vpa_pagamento = self.pagamento.vpa_curva(tempo_maximo)
+        taxa_pura = 0.0
+        if vpa_pagamento[0] != 0:
+            taxa_pura = vpa_cobertura[0] / vpa_pagamento[0]
+        return self.beneficio * (vpa_cobertura - taxa_pura * vpa_pagamento)
+
+    @medido("premio_comercial")
     def premio_comercial(self, tempo_decorrido_meses: int) -> float:
         return self.premio_puro(tempo_decorrido_meses) / (1 - self.carregamento)
 
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from datetime import date
 from typing import Union
 
+from numpy import float64
+from numpy.typing import NDArray
 from tabatu.periodicidade import Periodicidade
 
 from src.calculadora_vpa import CalculadoraVPA
@@ -45,6 +47,19 @@ class Cobertura:
         tabua = self.premissas_atuariais.tabua
         return int(min(tabua.tempo_futuro_maximo(idade), prazo))
 
+    @property
+    def prazo_total_efetivo(self) -> int:
+        """Último tempo em que a cobertura pode ter obrigações, incluindo o prazo de renda,
+        limitado pela tábua."""
+        prazo = self.idades_prazos.prazo_cobertura + getattr(
+            self.idades_prazos, "prazo_renda", 0
+        )
+        idade = self.idades_prazos.idade_ingresso_segurado
+        tabua = getattr(
+            self.premissas_atuariais, "tabua_concessao", self.premissas_atuariais.tabua
+        )
+        return int(min(tabua.tempo_futuro_maximo(idade), prazo))
+
     @property
     def periodicidade(self) -> Periodicidade:
         return self.premissas_atuariais.periodicidade
@@ -62,3 +77,17 @@ class Cobertura:
         if tempo_decorrido < 0:
             raise ValueError("O tempo_decorrido deve ser positivo")
         return self.calculadora_vpa.calcular_vpa(tempo_decorrido)
+
+    def vpa_curva(self, tempo_maximo: int) -> NDArray[float64]:
+        """Cálculo do valor presente atuarial das obrigações futuras para todos os tempos de 0 a
+        tempo_maximo.
+
+        Args:
+            tempo_maximo (int): Último tempo da curva, na periodicidade da cobertura.
+
+        Returns:
+            NDArray[float64]: Valor presente das obrigações futuras em cada tempo.
+        """
+        if tempo_maximo < 0:
+            raise ValueError("O tempo_maximo deve ser positivo")
+        return self.calculadora_vpa.calcular_vpa_curva(tempo_maximo)
@@ -0,0 +1,56 @@
+from abc import ABC
+from dataclasses import dataclass
+
+from numpy import arange, float64
+from numpy.typing import NDArray
+from tabatu.premissas import Premissas
+
+from src.array_infinita import ArrayInfinita
+from src.calculadora_vpa import CalculadoraVPA
+from src.fluxo.fluxo_interface import valida_tabua_prazo_idade
+from src.idades_prazos import IdadesPrazos
+
+
+def soma_comutacao(
+    coluna: NDArray[float64],
+    acumulada: NDArray[float64],
+    inicio: int,
+    fim: int,
+    percentual_beneficio: ArrayInfinita,
+    inicio_beneficio: int,
+) -> float:
+    """Soma coluna[inicio:fim] ponderada pelo percentual de benefício.
+
+    O percentual de benefício usado em coluna[inicio] é o da posição inicio_beneficio. Quando o
+    percentual é constante, a soma é obtida da coluna acumulada (soma de coluna[y] para y >= x)
+    lendo apenas duas posições.
+    """
+    ultima_posicao = len(coluna) - 1
+    inicio, fim = min(inicio, ultima_posicao), min(fim, ultima_posicao)
+    if fim <= inicio:
+        return 0.0
+    if len(percentual_beneficio.data) == 1:
+        return float(percentual_beneficio.data[0] * (acumulada[inicio] - acumulada[fim]))
+    percentual = percentual_beneficio[arange(fim - inicio) + inicio_beneficio]
+    return float((percentual * coluna[inicio:fim]).sum())
+
+
+@dataclass(frozen=True)
+class ComutacaoInterface(CalculadoraVPA, ABC):
+    """Cálculo do VPA através de funções de comutação."""
+
+    premissas_atuariais: Premissas
+    idades_prazos: IdadesPrazos
+    percentual_beneficio: ArrayInfinita
+
+    def __post_init__(self):
+        if self.premissas_atuariais.periodicidade != self.idades_prazos.periodicidade:
+            raise ValueError(
+                "periodicidade das premissas_atuariais e idades_prazos devem ser iguais"
+            )
+
+        valida_tabua_prazo_idade(
+            self.premissas_atuariais.tabua,
+            self.idades_prazos.prazo_cobertura,
+            self.idades_prazos.idade_ingresso_segurado,
+        )
@@ -0,0 +1,74 @@
+from dataclasses import dataclass, field
+
+from tabatu.periodicidade import Periodicidade
+from tabatu.premissas import Premissas
+
+from src.array_infinita import ArrayInfinita
+from src.calculadora_vpa import CalculadoraVPAPagamento
+from src.comutacao.comutacao_renda import vpa_renda_comutacao
+from src.comutacao.tabela_comutacao import TabelaComutacao, tabela_comutacao
+from src.fluxo.fluxo_interface import valida_tabua_prazo_idade
+from src.idades_prazos import IdadesPrazosPagamento
+
+
+@dataclass(frozen=True)
+class ComutacaoPagamento(CalculadoraVPAPagamento):
+    """Calculo do VPA dos pagamentos futuros via comutação.
+
+    Equivale a FluxoPagamento, mas o VPA é obtido de (Nx - Nx+n) / Dx, sem gerar o fluxo.
+
+    Args:
+        idades_prazos (IdadesPrazosPagamento): Idades e prazos de pagamento.
+        premissas_atuariais (Premissas): Premissas atuariais. O juros deve ser constante.
+    """
+
+    idades_prazos: IdadesPrazosPagamento
+    premissas_atuariais: Premissas
+    periodicidade_pagamento: Periodicidade = field(init=False)
+    comutacao: TabelaComutacao = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self,
+            "periodicidade_pagamento",
+            self.premissas_atuariais.tabua.periodicidade,
+        )
+        if self.premissas_atuariais.periodicidade != self.idades_prazos.periodicidade:
+            raise ValueError(
+                "periodicidade das premissas_atuariais e idades_prazos devem ser iguais"
+            )
+
+        valida_tabua_prazo_idade(
+            self.premissas_atuariais.tabua,
+            self.idades_prazos.prazo_pagamento,
+            self.idades_prazos.idade_ingresso_segurado,
+        )
+        object.__setattr__(
+            self,
+            "comutacao",
+            tabela_comutacao(
+                self.premissas_atuariais.tabua, self.premissas_atuariais.juros
+            ),
+        )
+
+    def calcular_vpa(self, tempo_atual: int) -> float:
+        """Cálculo do valor presente atuarial das obrigações futuras via comutação.
+
+        Args:
+            tempo_atual (int): Tempo atual, na periodicidade das premissas atuariais.
+
+        Returns:
+            float: Valor presente atuarial das obrigações futuras.
+        """
+        return vpa_renda_comutacao(
+            tempo_atual=tempo_atual,
+            idade_ingresso=self.idades_prazos.idade_ingresso_segurado,
+            prazo_cobertura=0,
+            prazo_renda=self.idades_prazos.prazo_pagamento,
+            prazo_certo_renda=0,
+            tabua_concessao=self.premissas_atuariais.tabua,
+            acumulacao=self.comutacao,
+            concessao=self.comutacao,
+            percentual_beneficio=ArrayInfinita([1.0]),
+            postecipada=False,
+        )
@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field
+
+from tabatu.premissas import Premissas
+
+from src.array_infinita import ArrayInfinita
+from src.comutacao.comutacao_interface import ComutacaoInterface, soma_comutacao
+from src.comutacao.tabela_comutacao import TabelaComutacao, tabela_comutacao
+from src.idades_prazos import IdadesPrazos
+
+
+@dataclass(frozen=True)
+class ComutacaoPeculio(ComutacaoInterface):
+    """Cálculo do VPA dos benefícios futuros de uma cobertura de pecúlio via comutação.
+
+    Equivale a FluxoPeculio, mas o VPA é obtido de (Mx - Mx+n) / Dx, sem gerar o fluxo. A tabela de
+    comutação é obtida uma única vez, na criação da calculadora.
+
+    Args:
+        idades_prazos (IdadesPrazos): Idades e prazos de pagamento.
+        premissas_atuariais (Premissas): Premissas atuariais. O juros deve ser constante.
+        percentual_beneficio (ArrayInfinita): Percentual do benefício na mesma periodicidade das premissas.
+        imediato (bool): Indica se o benefício é imediato.
+    """
+
+    premissas_atuariais: Premissas
+    idades_prazos: IdadesPrazos
+    percentual_beneficio: ArrayInfinita
+    imediato: bool
+    comutacao: TabelaComutacao = field(init=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        object.__setattr__(
+            self,
+            "comutacao",
+            tabela_comutacao(
+                self.premissas_atuariais.tabua,
+                self.premissas_atuariais.juros,
+                self.imediato,
+            ),
+        )
+
+    def calcular_vpa(self, tempo_atual: int) -> float:
+        """Cálculo do valor presente atuarial das obrigações futuras via comutação.
+
+        Args:
+            tempo_atual (int): Tempo atual, na periodicidade das premissas atuariais.
+
+        Returns:
+            float: Valor presente atuarial das obrigações futuras.
+        """
+        prazo_cobertura = self.idades_prazos.prazo_cobertura
+        if prazo_cobertura <= tempo_atual:
+            return 0.0
+        tabua = self.premissas_atuariais.tabua
+        idade_ingresso = self.idades_prazos.idade_ingresso_segurado
+        comutacao = self.comutacao
+        prazo_cobertura_efetivo = min(
+            tabua.tempo_futuro_maximo(idade_ingresso), prazo_cobertura
+        )
+        limite = int(max(prazo_cobertura_efetivo - tempo_atual, 1))
+        idade_atual = idade_ingresso[0] + tempo_atual
+        Dx = comutacao.ler(comutacao.Dx, idade_atual)
+        if Dx == 0:
+            return 0.0
+        return (
+            soma_comutacao(
+                comutacao.Cx,
+                comutacao.Mx,
+                idade_atual,
+                idade_atual + limite,
+                self.percentual_beneficio,
+                tempo_atual,
+            )
+            / Dx
+        )
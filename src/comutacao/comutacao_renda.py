@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from typing import Union
+
+from tabatu.premissas import PremissasRenda
+from tabatu.typing import TabuaInterface
+
+from src.array_infinita import ArrayInfinita
+from src.comutacao.comutacao_interface import ComutacaoInterface, soma_comutacao
+from src.comutacao.tabela_comutacao import TabelaComutacao, tabela_comutacao
+from src.fluxo.fluxo_interface import valida_tabua_prazo_idade
+from src.idades_prazos import IdadesPrazosAposentadoria
+
+
+def vpa_renda_comutacao(
+    tempo_atual: int,
+    idade_ingresso: list[int],
+    prazo_cobertura: int,
+    prazo_renda: Union[int, float],
+    prazo_certo_renda: int,
+    tabua_concessao: TabuaInterface,
+    acumulacao: TabelaComutacao,
+    concessao: TabelaComutacao,
+    percentual_beneficio: ArrayInfinita,
+    postecipada: bool,
+) -> float:
+    """Versão de fluxo_renda(...).vpa() calculada via comutação.
+
+    O fator de diferimento é Dy / Dx da tábua de acumulação, o período de renda certa é uma
+    anuidade certa e o período de renda vitalícia usa Ny da tábua de concessão. Após o fim da
+    tábua de acumulação o VPA é zero.
+    """
+    if prazo_cobertura + prazo_renda <= tempo_atual:
+        return 0.0
+
+    tempo_ate_renda = max(prazo_cobertura - tempo_atual, 0)
+    tempo_ja_decorrido_da_renda = max(tempo_atual - prazo_cobertura, 0)
+    prazo_renda_efetivo = min(
+        tabua_concessao.tempo_futuro_maximo(idade_ingresso) - prazo_cobertura,
+        prazo_renda,
+    )
+    tempo_restante_renda = int(
+        max(prazo_renda_efetivo + postecipada - tempo_ja_decorrido_da_renda, 1)
+    )
+    inicio_renda = int(postecipada)
+    fim_prazo_certo = min(
+        max(prazo_certo_renda + postecipada - tempo_ja_decorrido_da_renda, inicio_renda),
+        tempo_restante_renda,
+    )
+
+    idade_atual = idade_ingresso[0] + tempo_atual
+    idade_renda = idade_atual + tempo_ate_renda
+
+    Dx = acumulacao.ler(acumulacao.Dx, idade_atual)
+    if Dx == 0:
+        return 0.0
+    diferimento = acumulacao.ler(acumulacao.Dx, idade_renda) / Dx
+
+    renda_certa = soma_comutacao(
+        concessao.desconto,
+        concessao.desconto_acumulado,
+        inicio_renda,
+        fim_prazo_certo,
+        percentual_beneficio,
+        tempo_ja_decorrido_da_renda,
+    )
+    renda_vitalicia = 0.0
+    Dy = concessao.ler(concessao.Dx, idade_renda)
+    if Dy > 0:
+        renda_vitalicia = (
+            soma_comutacao(
+                concessao.Dx,
+                concessao.Nx,
+                idade_renda + fim_prazo_certo,
+                idade_renda + tempo_restante_renda,
+                percentual_beneficio,
+                fim_prazo_certo - inicio_renda + tempo_ja_decorrido_da_renda,
+            )
+            / Dy
+        )
+    return diferimento * (renda_certa + renda_vitalicia)
+
+
+@dataclass(frozen=True)
+class ComutacaoRenda(ComutacaoInterface):
+    """Calculo do VPA dos benefícios futuros de uma cobertura de renda via comutação.
+
+    Args:
+        idades_prazos (IdadesPrazosAposentadoria): Idades e prazos de pagamento.
+        premissas_atuariais (PremissasRenda): Premissas atuariais. O juros deve ser constante.
+        percentual_beneficio (ArrayInfinita): Percentual do benefício na mesma periodicidade das premissas.
+        postecipada (bool): Indica se a renda é postecipada.
+    """
+
+    premissas_atuariais: PremissasRenda
+    idades_prazos: IdadesPrazosAposentadoria
+    percentual_beneficio: ArrayInfinita
+    postecipada: bool
+    comutacao: TabelaComutacao = field(init=False)
+    comutacao_concessao: TabelaComutacao = field(init=False)
+
+    def __post_init__(self):
+        valida_tabua_prazo_idade(
+            self.premissas_atuariais.tabua_concessao,
+            self.idades_prazos.prazo_renda,
+            self.idades_prazos.idade_ingresso_beneficiario,
+        )
+        juros = self.premissas_atuariais.juros
+        object.__setattr__(
+            self, "comutacao", tabela_comutacao(self.premissas_atuariais.tabua, juros)
+        )
+        object.__setattr__(
+            self,
+            "comutacao_concessao",
+            tabela_comutacao(self.premissas_atuariais.tabua_concessao, juros),
+        )
+
+    def calcular_vpa(self, tempo_atual: int) -> float:
+        """Cálculo do valor presente atuarial das obrigações futuras via comutação.
+
+        Args:
+            tempo_atual (int): Tempo atual, na periodicidade das premissas atuariais.
+
+        Returns:
+            float: Valor presente atuarial das obrigações futuras.
+        """
+        return vpa_renda_comutacao(
+            tempo_atual=tempo_atual,
+            idade_ingresso=self.idades_prazos.idade_ingresso_segurado,
+            prazo_cobertura=self.idades_prazos.prazo_cobertura,
+            prazo_renda=self.idades_prazos.prazo_renda,
+            prazo_certo_renda=self.idades_prazos.prazo_certo_renda,
+            tabua_concessao=self.premissas_atuariais.tabua_concessao,
+            acumulacao=self.comutacao,
+            concessao=self.comutacao_concessao,
+            percentual_beneficio=self.percentual_beneficio,
+            postecipada=self.postecipada,
+        )
@@ -0,0 +1,153 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import sha256
+from typing import Callable, Optional
+
+from numpy import allclose, append, arange, asarray, cumsum, float64, int64, minimum, zeros
+from numpy.typing import NDArray
+from tabatu.typing import JurosInterface, TabuaInterface
+
+
+@dataclass(frozen=True)
+class TabelaComutacao:
+    """Funções de comutação de uma tábua e de um juros constante, indexadas pela idade.
+
+    Todas as colunas possuem duas posições a mais que a idade máxima da tábua, preenchidas com
+    zero, de forma que leituras logo após o fim da tábua não precisam de tratamento especial.
+
+    Args:
+        lx (NDArray[float64]): Quantidade de sobreviventes, partindo de l0 = 1.
+        dx (NDArray[float64]): Quantidade de falhas entre x e x + 1.
+        Dx (NDArray[float64]): lx descontado até a idade x.
+        Nx (NDArray[float64]): Soma de Dy para y >= x.
+        Cx (NDArray[float64]): dx descontado até a idade de pagamento do benefício.
+        Mx (NDArray[float64]): Soma de Cy para y >= x.
+        desconto (NDArray[float64]): Fator de desconto para cada tempo t.
+        desconto_acumulado (NDArray[float64]): Soma dos fatores de desconto para tempos >= t.
+    """
+
+    lx: NDArray[float64]
+    dx: NDArray[float64]
+    Dx: NDArray[float64]
+    Nx: NDArray[float64]
+    Cx: NDArray[float64]
+    Mx: NDArray[float64]
+    desconto: NDArray[float64]
+    desconto_acumulado: NDArray[float64]
+
+    def ler(self, coluna: NDArray[float64], idade: int) -> float:
+        """Lê a coluna na idade informada, considerando zero após o fim da tábua."""
+        return float(coluna[min(int(idade), len(coluna) - 1)])
+
+    def ler_lote(self, coluna: NDArray[float64], idades: NDArray[int64]) -> NDArray[float64]:
+        """Versão vetorizada de ler, para várias idades de uma só vez."""
+        return coluna[minimum(asarray(idades, dtype=int64), len(coluna) - 1)]
+
+
+class ChaveComutacao:
+    """Identifica uma tabela de comutação pelo conteúdo da tábua e do juros."""
+
+    def __init__(self, tabua: TabuaInterface, juros: JurosInterface, imediato: bool):
+        self.tabua = tabua
+        self.juros = juros
+        self.imediato = imediato
+        self.valor = (
+            tuple(tuple(tabua_base.pega_qx()) for tabua_base in tabua.tabuas),
+            tabua.periodicidade,
+            juros.periodicidade,
+            float(juros.taxa_juros([0])[0]),
+            imediato,
+        )
+
+    @property
+    def assinatura(self) -> str:
+        """Hash do conteúdo da chave, estável entre processos."""
+        qxs, periodicidade_tabua, periodicidade_juros, taxa_juros, imediato = self.valor
+        conteudo = sha256()
+        for qx in qxs:
+            conteudo.update(asarray(qx, dtype="<f8").tobytes())
+            conteudo.update(b"|")
+        conteudo.update(
+            f"{periodicidade_tabua.value}|{periodicidade_juros.value}|"
+            f"{taxa_juros!r}|{imediato}".encode()
+        )
+        return conteudo.hexdigest()
+
+    def __hash__(self) -> int:
+        return hash(self.valor)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ChaveComutacao) and self.valor == other.valor
+
+
+# Funções que retornam tabelas de comutação já calculadas, por exemplo de um armazenamento em
+# disco, ou None. São consultadas, em ordem, antes do cálculo.
+fontes_tabela_comutacao: list[Callable[[ChaveComutacao], Optional[TabelaComutacao]]] = []
+
+
+def registrar_fonte_tabela_comutacao(
+    fonte: Callable[[ChaveComutacao], Optional[TabelaComutacao]]
+) -> None:
+    """Registra uma fonte de tabelas de comutação já calculadas."""
+    fontes_tabela_comutacao.append(fonte)
+    _calcular_tabela_comutacao.cache_clear()
+
+
+@lru_cache(maxsize=128)
+def _calcular_tabela_comutacao(chave: ChaveComutacao) -> TabelaComutacao:
+    for fonte in fontes_tabela_comutacao:
+        tabela = fonte(chave)
+        if tabela is not None:
+            return tabela
+    return calcular_tabela_comutacao(chave)
+
+
+def calcular_tabela_comutacao(chave: ChaveComutacao) -> TabelaComutacao:
+    """Calcula a tabela de comutação, sem consultar o cache nem as fontes registradas."""
+    tabua, juros = chave.tabua, chave.juros
+    numero_tabuas = len(tabua.tabuas)
+    idade_maxima = int(tabua.tempo_futuro_maximo([0] * numero_tabuas))
+    idades = arange(idade_maxima + 1)
+
+    taxas = juros.taxa_juros(arange(idade_maxima + 2))
+    if not allclose(taxas, taxas[0]):
+        raise ValueError("As funções de comutação exigem juros constante.")
+
+    lx = append(tabua.tpx(x=[0] * numero_tabuas, t=idades), zeros(1))
+    dx = append(tabua.t_qx(x=[0] * numero_tabuas, t=idades), zeros(1))
+    desconto = juros.taxa_desconto(arange(idade_maxima + 2))
+    desconto_pagamento = juros.taxa_desconto(
+        arange(idade_maxima + 2) + (0.5 if chave.imediato else 1)
+    )
+    Dx = append(lx * desconto, zeros(1))
+    Cx = append(dx * desconto_pagamento, zeros(1))
+    Nx = cumsum(Dx[::-1])[::-1]
+    Mx = cumsum(Cx[::-1])[::-1]
+    return TabelaComutacao(
+        lx=append(lx, zeros(1)),
+        dx=append(dx, zeros(1)),
+        Dx=Dx,
+        Nx=Nx,
+        Cx=Cx,
+        Mx=Mx,
+        desconto=append(desconto, zeros(1)),
+        desconto_acumulado=append(cumsum(desconto[::-1])[::-1], zeros(1)),
+    )
+
+
+def tabela_comutacao(
+    tabua: TabuaInterface, juros: JurosInterface, imediato: bool = False
+) -> TabelaComutacao:
+    """Tabela de comutação da tábua e do juros, calculada uma única vez e mantida em cache.
+
+    Args:
+        tabua (TabuaInterface): Tábua biométrica. Para tábuas de múltiplos decrementos, lx
+            considera todos os decrementos.
+        juros (JurosInterface): Juros, deve ser constante no tempo.
+        imediato (bool, optional): Se o benefício é pago no meio do período da falha (True) ou
+            no final (False). Afeta apenas Cx e Mx.
+
+    Returns:
+        TabelaComutacao: Funções de comutação.
+    """
+    return _calcular_tabela_comutacao(ChaveComutacao(tabua, juros, imediato))
@@ -0,0 +1,149 @@
+from typing import Union
+
+from numpy import (
+    allclose,
+    append,
+    arange,
+    cumsum,
+    errstate,
+    float64,
+    maximum,
+    minimum,
+    where,
+    zeros,
+)
+from numpy.typing import NDArray
+from tabatu.typing import JurosInterface, TabuaInterface
+
+from src.array_infinita import ArrayInfinita
+
+
+def juros_constante(juros: JurosInterface, tempo_maximo: int) -> bool:
+    """Indica se a taxa de juros é constante até tempo_maximo.
+
+    As curvas de VPA dependem de v^(s - t) = v^s / v^t, o que só vale para juros constante.
+    """
+    taxas = juros.taxa_juros(arange(tempo_maximo + 2))
+    return bool(allclose(taxas, taxas[0]))
+
+
+def soma_acumulada_reversa(parcelas: NDArray[float64]) -> NDArray[float64]:
+    """Soma das parcelas a partir de cada posição, com um zero ao final."""
+    return append(cumsum(parcelas[::-1])[::-1], zeros(1))
+
+
+def curva_peculio(
+    tempo_maximo: int,
+    tabua: TabuaInterface,
+    juros: JurosInterface,
+    idade_ingresso_segurado: list[int],
+    prazo_cobertura: Union[int, float],
+    percentual_beneficio: ArrayInfinita,
+    imediato: bool,
+) -> NDArray[float64]:
+    """VPA de fluxo_peculio para todos os tempos de 0 a tempo_maximo, em uma única passada.
+
+    As probabilidades e os descontos são calculados uma única vez a partir da idade de ingresso,
+    e o VPA em cada tempo é obtido de uma soma acumulada reversa, dividida pela probabilidade
+    de sobrevivência e pelo desconto até o tempo. Exige juros constante. Após o fim da tábua o
+    VPA é zero.
+
+    Returns:
+        NDArray[float64]: VPA em cada tempo, com tamanho tempo_maximo + 1.
+    """
+    tempos = arange(tempo_maximo + 1)
+    fim_cobertura = int(min(tabua.tempo_futuro_maximo(idade_ingresso_segurado), prazo_cobertura))
+    tempos_cobertura = arange(fim_cobertura)
+    parcelas = (
+        percentual_beneficio[tempos_cobertura]
+        * tabua.t_qx(x=idade_ingresso_segurado, t=tempos_cobertura)
+        * juros.taxa_desconto(tempos_cobertura + (0.5 if imediato else 1))
+    )
+    acumulado = soma_acumulada_reversa(parcelas)[minimum(tempos, fim_cobertura)]
+    denominador = tabua.tpx(x=idade_ingresso_segurado, t=tempos) * juros.taxa_desconto(
+        tempos
+    )
+    with errstate(divide="ignore", invalid="ignore"):
+        vpa = acumulado / denominador
+    return where((tempos < fim_cobertura) & (denominador > 0), vpa, 0.0)
+
+
+def curva_renda(
+    tempo_maximo: int,
+    idade_ingresso: list[int],
+    prazo_cobertura: int,
+    prazo_renda: Union[int, float],
+    prazo_certo_renda: int,
+    tabua: TabuaInterface,
+    tabua_concessao: TabuaInterface,
+    juros: JurosInterface,
+    percentual_beneficio: ArrayInfinita,
+    postecipada: bool,
+) -> NDArray[float64]:
+    """VPA de fluxo_renda para todos os tempos de 0 a tempo_maximo, em uma única passada.
+
+    Os pagamentos são indexados pelo tempo decorrido desde o início da renda. As parcelas certas
+    e vitalícias são acumuladas de trás para frente uma única vez, e o VPA em cada tempo lê as
+    somas a partir do primeiro pagamento futuro. Antes do início da renda, aplica-se o fator de
+    diferimento da tábua de acumulação. Exige juros constante. Após o fim da tábua o VPA é zero.
+
+    Returns:
+        NDArray[float64]: VPA em cada tempo, com tamanho tempo_maximo + 1.
+    """
+    tempos = arange(tempo_maximo + 1)
+    postecipada = int(postecipada)
+    prazo_renda_efetivo = min(
+        tabua_concessao.tempo_futuro_maximo(idade_ingresso) - prazo_cobertura,
+        prazo_renda,
+    )
+    fim_renda = int(max(prazo_renda_efetivo + postecipada, postecipada))
+    fim_prazo_certo = min(prazo_certo_renda + postecipada, fim_renda)
+
+    tempo_renda = arange(fim_renda)
+    valor = percentual_beneficio[maximum(tempo_renda - postecipada, 0)]
+    valor[:postecipada] = 0.0
+    parcelas = valor * juros.taxa_desconto(tempo_renda)
+    eh_prazo_certo = tempo_renda < fim_prazo_certo
+    certo = soma_acumulada_reversa(where(eh_prazo_certo, parcelas, 0.0))
+    vitalicio = soma_acumulada_reversa(
+        where(
+            eh_prazo_certo,
+            0.0,
+            parcelas
+            * tabua_concessao.tpx(x=idade_ingresso, t=prazo_cobertura + tempo_renda),
+        )
+    )
+
+    primeiro_pagamento = minimum(
+        postecipada + maximum(tempos - prazo_cobertura, 0), fim_renda
+    )
+    sobrevivencia_concessao = tabua_concessao.tpx(
+        x=idade_ingresso, t=maximum(tempos, prazo_cobertura)
+    )
+    sobrevivencia_acumulacao = tabua.tpx(
+        x=idade_ingresso, t=minimum(tempos, prazo_cobertura)
+    )
+    diferimento = (
+        tabua.tpx(x=idade_ingresso, t=[prazo_cobertura])
+        * juros.taxa_desconto([prazo_cobertura])
+        / juros.taxa_desconto(tempos)
+    )
+    with errstate(divide="ignore", invalid="ignore"):
+        vpa = (
+            diferimento
+            / sobrevivencia_acumulacao
+            * (
+                certo[primeiro_pagamento]
+                + where(
+                    sobrevivencia_concessao > 0,
+                    vitalicio[primeiro_pagamento] / sobrevivencia_concessao,
+                    0.0,
+                )
+            )
+        )
+    ativo = (
+        (tempos < prazo_cobertura + prazo_renda)
+        & (primeiro_pagamento < fim_renda)
+        & (sobrevivencia_acumulacao > 0)
+    )
+    return where(ativo, vpa, 0.0)
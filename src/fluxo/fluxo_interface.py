@@ -20,7 +20,7 @@ class FluxoData:
     desconto: NDArray[float64]
 
     def vpa(self) -> float:
-        return (self.probabilidade * self.valor * self.desconto).sum()
+        return (self.probabilidade * self.valor * self.desconto).sum(axis=-1)
 
 
 def valida_tabua_prazo_idade(
@@ -0,0 +1,183 @@
+from typing import Callable, Union
+
+from numpy import (
+    arange,
+    asarray,
+    broadcast_to,
+    float64,
+    int64,
+    isinf,
+    maximum,
+    minimum,
+    take_along_axis,
+    unique,
+)
+from numpy.typing import ArrayLike, NDArray
+from tabatu.typing import JurosInterface, TabuaInterface
+
+from src.array_infinita import ArrayInfinita, ArrayInfinitaLote
+from src.fluxo.fluxo_interface import FluxoData
+
+
+def matriz_tabua(
+    metodo: Callable,
+    idades: NDArray[int64],
+    tempos: NDArray[int64],
+    numero_tabuas: int,
+) -> NDArray[float64]:
+    """Avalia um método da tábua (tpx, t_qx) para várias idades de uma só vez.
+
+    O método é chamado uma única vez para cada idade distinta, e as linhas resultantes
+    são replicadas para as demais propostas com a mesma idade.
+
+    Args:
+        metodo (Callable): Método da tábua, com assinatura (x, t).
+        idades (NDArray[int64]): Idade de cada proposta.
+        tempos (NDArray[int64]): Tempos em que o método será avaliado.
+        numero_tabuas (int): Quantidade de tábuas que compõem a tábua avaliada.
+
+    Returns:
+        NDArray[float64]: Matriz (proposta × tempo).
+    """
+    idades_unicas, inverso = unique(idades, return_inverse=True)
+    linhas = asarray(
+        [metodo(x=[idade] * numero_tabuas, t=tempos) for idade in idades_unicas]
+    ).reshape(len(idades_unicas), len(tempos))
+    return linhas[inverso]
+
+
+def tempo_futuro_maximo_lote(
+    tabua: TabuaInterface, idades: NDArray[int64]
+) -> NDArray[float64]:
+    """Tempo de vida futuro máximo para cada uma das idades fornecidas."""
+    idades_unicas, inverso = unique(idades, return_inverse=True)
+    numero_tabuas = len(tabua.tabuas)
+    tempos = asarray(
+        [tabua.tempo_futuro_maximo([idade] * numero_tabuas) for idade in idades_unicas],
+        dtype=float64,
+    )
+    return tempos[inverso]
+
+
+def prazo_valido_lote(
+    tabua: TabuaInterface, prazo: ArrayLike, idade_ingresso: NDArray[int64]
+) -> NDArray:
+    """Versão vetorizada de valida_tabua_prazo_idade, retorna uma máscara ao invés de
+    levantar uma exceção."""
+    prazo = asarray(prazo, dtype=float64)
+    tempo_futuro_maximo = tempo_futuro_maximo_lote(tabua, idade_ingresso)
+    return isinf(prazo) | (prazo == 0) | (prazo < tempo_futuro_maximo)
+
+
+def fluxo_peculio_lote(
+    tempo_atual: int,
+    tabua: TabuaInterface,
+    juros: JurosInterface,
+    idade_ingresso_segurado: ArrayLike,
+    prazo_cobertura: Union[ArrayLike, float],
+    percentual_beneficio: Union[ArrayInfinita, ArrayInfinitaLote],
+    imediato: bool,
+) -> FluxoData:
+    """Versão vetorizada de fluxo_peculio.
+
+    Gera o fluxo de várias propostas de uma só vez, em uma matriz (proposta × tempo).
+    Os tempos posteriores ao fim da cobertura de cada proposta possuem probabilidade zero.
+    O percentual do benefício pode ser o mesmo para todas as propostas (ArrayInfinita) ou
+    um por proposta (ArrayInfinitaLote).
+    """
+    idade_ingresso_segurado = asarray(idade_ingresso_segurado, dtype=int64)
+    prazo_cobertura = broadcast_to(
+        asarray(prazo_cobertura, dtype=float64), idade_ingresso_segurado.shape
+    )
+    prazo_cobertura_efetivo = minimum(
+        tempo_futuro_maximo_lote(tabua, idade_ingresso_segurado), prazo_cobertura
+    )
+    limite = maximum(prazo_cobertura_efetivo - tempo_atual, 1).astype(int64)
+    tempos = arange(start=0, stop=limite.max(initial=1)).astype(int64)
+    probabilidade = matriz_tabua(
+        tabua.t_qx, idade_ingresso_segurado + tempo_atual, tempos, len(tabua.tabuas)
+    )
+    encerrado = (tempos >= limite[:, None]) | (prazo_cobertura <= tempo_atual)[:, None]
+    probabilidade[encerrado] = 0.0
+    valor = percentual_beneficio[tempos + tempo_atual]
+    desconto = juros.taxa_desconto(tempos + (0.5 if imediato else 1))
+    return FluxoData(tempos + 1, probabilidade, valor, desconto)
+
+
+def fluxo_renda_lote(
+    tempo_atual: int,
+    idade_ingresso: ArrayLike,
+    prazo_cobertura: Union[ArrayLike, int],
+    prazo_renda: Union[ArrayLike, float],
+    prazo_certo_renda: Union[ArrayLike, int],
+    tabua: TabuaInterface,
+    tabua_concessao: TabuaInterface,
+    juros: JurosInterface,
+    percentual_beneficio: Union[ArrayInfinita, ArrayInfinitaLote],
+    postecipada: bool,
+) -> FluxoData:
+    """Versão vetorizada de fluxo_renda.
+
+    Gera o fluxo de várias propostas de uma só vez, em uma matriz (proposta × tempo).
+    Os prazos podem ser escalares ou conter um valor por proposta. Os tempos posteriores
+    ao fim da renda de cada proposta possuem probabilidade zero. O percentual do benefício
+    pode ser o mesmo para todas as propostas (ArrayInfinita) ou um por proposta
+    (ArrayInfinitaLote).
+    """
+    idade_ingresso = asarray(idade_ingresso, dtype=int64)
+    formato = idade_ingresso.shape
+    prazo_cobertura = broadcast_to(asarray(prazo_cobertura, dtype=int64), formato)
+    prazo_renda = broadcast_to(asarray(prazo_renda, dtype=float64), formato)
+    prazo_certo_renda = broadcast_to(asarray(prazo_certo_renda, dtype=int64), formato)
+
+    tempo_ate_renda = maximum(prazo_cobertura - tempo_atual, 0)
+    tempo_ja_decorrido_da_renda = maximum(tempo_atual - prazo_cobertura, 0)
+    prazo_renda_efetivo = minimum(
+        tempo_futuro_maximo_lote(tabua_concessao, idade_ingresso) - prazo_cobertura,
+        prazo_renda,
+    )
+    prazo_maximo_pagamento_renda = prazo_renda_efetivo + postecipada
+    tempo_restante_renda = maximum(
+        prazo_maximo_pagamento_renda - tempo_ja_decorrido_da_renda, 1
+    ).astype(int64)
+    tempo_pagamento_renda = arange(
+        start=int(postecipada), stop=tempo_restante_renda.max(initial=1)
+    ).astype(int64)
+    tempos_futuros = tempo_pagamento_renda + tempo_ate_renda[:, None]
+    idade_atual = idade_ingresso + tempo_atual
+
+    probabilidade_chegar_vivo_na_renda = take_along_axis(
+        matriz_tabua(
+            tabua.tpx,
+            idade_atual,
+            arange(tempo_ate_renda.max(initial=0) + 1),
+            len(tabua.tabuas),
+        ),
+        tempo_ate_renda[:, None],
+        axis=1,
+    )
+    probabilidade_sobreviver_renda = matriz_tabua(
+        tabua_concessao.tpx,
+        idade_atual + tempo_ate_renda,
+        tempo_pagamento_renda,
+        len(tabua_concessao.tabuas),
+    )
+    tempo_decorrido_renda = tempo_pagamento_renda + tempo_ja_decorrido_da_renda[:, None]
+    eh_prazo_certo = tempo_decorrido_renda < (prazo_certo_renda + postecipada)[:, None]
+    probabilidade_sobreviver_renda[eh_prazo_certo] = 1
+    probabilidade = probabilidade_chegar_vivo_na_renda * probabilidade_sobreviver_renda
+    encerrado = (tempo_pagamento_renda >= tempo_restante_renda[:, None]) | (
+        prazo_cobertura + prazo_renda <= tempo_atual
+    )[:, None]
+    probabilidade[encerrado] = 0.0
+    valor = percentual_beneficio[tempo_decorrido_renda - int(postecipada)]
+    desconto = juros.taxa_desconto(tempos_futuros.ravel()).reshape(
+        tempos_futuros.shape
+    )
+    return FluxoData(
+        tempos=tempos_futuros,
+        probabilidade=probabilidade,
+        valor=valor,
+        desconto=desconto,
+    )
+
@@ -1,12 +1,14 @@
 from dataclasses import dataclass, field
 from typing import Iterable, Union
 
-from numpy import ndarray, vectorize
+from numpy import float64, ndarray, vectorize
+from numpy.typing import NDArray
 from tabatu.periodicidade import Periodicidade
 from tabatu.premissas import Premissas
 
 from src.array_infinita import ArrayInfinita
 from src.calculadora_vpa import CalculadoraVPAPagamento
+from src.fluxo.fluxo_curva import curva_renda, juros_constante
 from src.fluxo.fluxo_interface import FluxoData, valida_tabua_prazo_idade
 from src.fluxo.fluxo_renda import fluxo_renda
 from src.idades_prazos import IdadesPrazosPagamento
@@ -78,3 +80,28 @@ class FluxoPagamento(CalculadoraVPAPagamento):
             ndarray[float]: Valor presente atuarial das obrigações futuras.
         """
         return self.gerar_fluxo(tempo_atual).vpa()
+
+    def calcular_vpa_curva(self, tempo_maximo: int) -> NDArray[float64]:
+        """VPA para todos os tempos de 0 a tempo_maximo, em uma única passada quando o juros é
+        constante.
+
+        Args:
+            tempo_maximo (int): Último tempo da curva, na periodicidade das premissas atuariais.
+
+        Returns:
+            NDArray[float64]: Valor presente atuarial dos pagamentos futuros em cada tempo.
+        """
+        if not juros_constante(self.premissas_atuariais.juros, tempo_maximo):
+            return super().calcular_vpa_curva(tempo_maximo)
+        return curva_renda(
+            tempo_maximo=tempo_maximo,
+            idade_ingresso=self.idades_prazos.idade_ingresso_segurado,
+            prazo_cobertura=0,
+            prazo_renda=self.idades_prazos.prazo_pagamento,
+            prazo_certo_renda=0,
+            tabua=self.premissas_atuariais.tabua,
+            tabua_concessao=self.premissas_atuariais.tabua,
+            juros=self.premissas_atuariais.juros,
+            percentual_beneficio=ArrayInfinita([1.0]),
+            postecipada=False,
+        )
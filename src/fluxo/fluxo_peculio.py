@@ -1,11 +1,13 @@
 from dataclasses import dataclass
 from typing import Union
 
-from numpy import arange, array
+from numpy import arange, array, float64
+from numpy.typing import NDArray
 from tabatu.premissas import Premissas
 from tabatu.typing import JurosInterface, TabuaInterface
 
 from src.array_infinita import ArrayInfinita
+from src.fluxo.fluxo_curva import curva_peculio, juros_constante
 from src.fluxo.fluxo_interface import FluxoData, FluxoInterface
 from src.idades_prazos import IdadesPrazos
 
@@ -72,3 +74,25 @@ class FluxoPeculio(FluxoInterface):
             percentual_beneficio=self.percentual_beneficio,
             imediato=self.imediato,
         )
+
+    def calcular_vpa_curva(self, tempo_maximo: int) -> NDArray[float64]:
+        """VPA para todos os tempos de 0 a tempo_maximo, em uma única passada quando o juros é
+        constante.
+
+        Args:
+            tempo_maximo (int): Último tempo da curva, na periodicidade das premissas atuariais.
+
+        Returns:
+            NDArray[float64]: Valor presente atuarial das obrigações futuras em cada tempo.
+        """
+        if not juros_constante(self.premissas_atuariais.juros, tempo_maximo):
+            return super().calcular_vpa_curva(tempo_maximo)
+        return curva_peculio(
+            tempo_maximo=tempo_maximo,
+            tabua=self.premissas_atuariais.tabua,
+            juros=self.premissas_atuariais.juros,
+            idade_ingresso_segurado=self.idades_prazos.idade_ingresso_segurado,
+            prazo_cobertura=self.idades_prazos.prazo_cobertura,
+            percentual_beneficio=self.percentual_beneficio,
+            imediato=self.imediato,
+        )
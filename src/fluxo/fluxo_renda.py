@@ -1,11 +1,13 @@
 from dataclasses import dataclass
 from typing import Union
 
-from numpy import arange, array
+from numpy import arange, array, float64
+from numpy.typing import NDArray
 from tabatu.premissas import PremissasRenda
 from tabatu.typing import JurosInterface, TabuaInterface
 
 from src.array_infinita import ArrayInfinita
+from src.fluxo.fluxo_curva import curva_renda, juros_constante
 from src.fluxo.fluxo_interface import (
     FluxoData,
     FluxoInterface,
@@ -59,6 +61,31 @@ class FluxoRenda(FluxoInterface):
             postecipada=self.postecipada,
         )
 
+    def calcular_vpa_curva(self, tempo_maximo: int) -> NDArray[float64]:
+        """VPA para todos os tempos de 0 a tempo_maximo, em uma única passada quando o juros é
+        constante.
+
+        Args:
+            tempo_maximo (int): Último tempo da curva, na periodicidade das premissas atuariais.
+
+        Returns:
+            NDArray[float64]: Valor presente atuarial das obrigações futuras em cada tempo.
+        """
+        if not juros_constante(self.premissas_atuariais.juros, tempo_maximo):
+            return super().calcular_vpa_curva(tempo_maximo)
+        return curva_renda(
+            tempo_maximo=tempo_maximo,
+            idade_ingresso=self.idades_prazos.idade_ingresso_segurado,
+            prazo_cobertura=self.idades_prazos.prazo_cobertura,
+            prazo_renda=self.idades_prazos.prazo_renda,
+            prazo_certo_renda=self.idades_prazos.prazo_certo_renda,
+            tabua=self.premissas_atuariais.tabua,
+            tabua_concessao=self.premissas_atuariais.tabua_concessao,
+            juros=self.premissas_atuariais.juros,
+            percentual_beneficio=self.percentual_beneficio,
+            postecipada=self.postecipada,
+        )
+
 
 def fluxo_renda(
     tempo_atual: int,
@@ -1,12 +1,31 @@
 from dataclasses import dataclass, field
 from datetime import date
+from functools import cached_property
 from typing import Union
 
 from dateutil.relativedelta import relativedelta
-from numpy import isinf
+from numpy import (
+    absolute,
+    broadcast_arrays,
+    datetime64,
+    floor_divide,
+    fromiter,
+    int64,
+    isinf,
+    minimum,
+    ndarray,
+    sign,
+)
+from numpy.typing import ArrayLike, NDArray
 from tabatu.periodicidade import Periodicidade
 
+from src.medicao import medido
 
+# Ordinal (date.toordinal) de 1970-01-01, a origem de datetime64.
+ORDINAL_EPOCA = date(1970, 1, 1).toordinal()
+
+
+@medido("calcula_idade")
 def calcula_idade(
     data_origem: date,
     data_calculo: date,
@@ -25,6 +44,59 @@ def calcula_idade(
     )
 
 
+def converter_datas(datas: ArrayLike) -> NDArray[datetime64]:
+    """Converte uma data, uma sequência de datas ou um array para datetime64[D].
+
+    Sequências de date são convertidas pelo ordinal de cada data, muito mais rápido que a
+    conversão de objetos date pelo numpy.
+    """
+    if isinstance(datas, date):
+        return datetime64(datas, "D")
+    if isinstance(datas, (ndarray, datetime64)):
+        return datas.astype("datetime64[D]")
+    ordinais = fromiter(map(date.toordinal, datas), dtype=int64)
+    return (ordinais - ORDINAL_EPOCA).astype("datetime64[D]")
+
+
+@medido("calcula_idades")
+def calcula_idades(
+    datas_origem: ArrayLike,
+    datas_calculo: ArrayLike,
+    periodicidade: Periodicidade = Periodicidade.MENSAL,
+) -> NDArray[int64]:
+    """Versão vetorizada de calcula_idade, com o mesmo resultado para cada par de datas.
+
+    As datas podem ser listas de date ou arrays datetime64, e são combinadas por broadcasting,
+    de forma que uma única data de cálculo pode ser usada para todas as datas de origem.
+
+    A quantidade de meses completos é a diferença entre os meses das datas, menos um se o dia
+    da data de cálculo é anterior ao dia da data de origem (limitado ao último dia do mês da
+    data de cálculo), como em relativedelta. Para datas de cálculo anteriores às de origem, o
+    ajuste é simétrico.
+    """
+    if periodicidade < Periodicidade.MENSAL:
+        raise ValueError("Periodicidade deve ser mensal ou maior.")
+    origem, calculo = broadcast_arrays(
+        converter_datas(datas_origem), converter_datas(datas_calculo)
+    )
+    mes_origem = origem.astype("datetime64[M]")
+    mes_calculo = calculo.astype("datetime64[M]")
+    dia_origem = (origem - mes_origem.astype("datetime64[D]")).astype(int64)
+    dia_calculo = (calculo - mes_calculo.astype("datetime64[D]")).astype(int64)
+    dias_mes_calculo = ((mes_calculo + 1).astype("datetime64[D]") - mes_calculo).astype(int64)
+    dia_aniversario = minimum(dia_origem, dias_mes_calculo - 1)
+
+    meses = (mes_calculo - mes_origem).astype(int64)
+    meses -= (calculo >= origem) & (dia_calculo < dia_aniversario)
+    meses += (calculo < origem) & (dia_calculo > dia_aniversario)
+
+    anos = sign(meses) * (absolute(meses) // 12)
+    qntd_periodos_1_ano = periodicidade.quantidade_periodos_1_ano()
+    return anos * qntd_periodos_1_ano + floor_divide(
+        meses - anos * 12, 12 // qntd_periodos_1_ano
+    )
+
+
 @dataclass(frozen=True)
 class IdadesPrazos:
     """Idades e prazos de uma cobertura.
@@ -51,7 +123,7 @@ class IdadesPrazos:
         if self.prazo_cobertura < 0:
             raise ValueError("prazo_cobertura não pode ser negativo.")
 
-    @property
+    @cached_property
     def idade_ingresso_segurado(self) -> list[int]:
         return [
             calcula_idade(data_nascimento, self.data_assinatura, self.periodicidade)
@@ -105,7 +177,7 @@ class IdadesPrazosRenda(IdadesPrazos):
         if self.prazo_renda < self.prazo_certo_renda:
             raise ValueError("prazo_renda deve englobar o prazo_certo_renda.")
 
-    @property
+    @cached_property
     def idade_ingresso_beneficiario(self) -> list[int]:
         return [
             calcula_idade(data_nascimento, self.data_assinatura, self.periodicidade)
@@ -157,7 +229,7 @@ class IdadesPrazosPagamento:
         if self.prazo_pagamento < 0:
             raise ValueError("O prazo de pagamento deve ser positivo.")
 
-    @property
+    @cached_property
     def idade_ingresso_segurado(self) -> list[int]:
         return [
             calcula_idade(data_nascimento, self.data_assinatura, self.periodicidade)
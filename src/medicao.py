@@ -0,0 +1,151 @@
+"""Medição do tempo gasto em cada fase de uma requisição.
+
+As fases (consultas, construção das tábuas, cálculo das idades, VPA etc.) são marcadas com o
+decorador medido ou com o gerenciador Fase, e os tempos são acumulados na medição ativa no
+contexto atual (contextvars), iniciada por medir, ou por iniciar_medicao e encerrar_medicao,
+para as requisições amostradas. Sem medição ativa, a marcação apenas consulta o contexto, de
+forma que o custo da instrumentação desativada é desprezível.
+
+Os tempos das fases são inclusivos: uma fase executada dentro de outra é contada nas duas.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Callable, Iterator, Optional
+
+
+class Medicao:
+    """Tempo total e tempos acumulados por fase de uma requisição."""
+
+    def __init__(self):
+        self.inicio = perf_counter()
+        self.fim: Optional[float] = None
+        self.fases: dict[str, list] = {}
+        self.token: Optional[Token] = None
+
+    def registrar(self, nome: str, duracao: float) -> None:
+        acumulado = self.fases.get(nome)
+        if acumulado is None:
+            self.fases[nome] = [duracao, 1]
+        else:
+            acumulado[0] += duracao
+            acumulado[1] += 1
+
+    @property
+    def duracao(self) -> float:
+        """Duração da medição em segundos, até o encerramento ou até agora."""
+        return (self.fim if self.fim is not None else perf_counter()) - self.inicio
+
+    def server_timing(self) -> str:
+        """Valor do cabeçalho Server-Timing, com as durações em milissegundos."""
+        metricas = [f"total;dur={self.duracao * 1000:.3f}"]
+        for nome, (duracao, _) in self.fases.items():
+            metricas.append(f"{nome};dur={duracao * 1000:.3f}")
+        return ", ".join(metricas)
+
+    def resumo(self) -> dict:
+        """Durações em milissegundos e quantidade de execuções de cada fase."""
+        return {
+            "duracao_ms": round(self.duracao * 1000, 3),
+            "fases": {
+                nome: {"duracao_ms": round(duracao * 1000, 3), "execucoes": execucoes}
+                for nome, (duracao, execucoes) in self.fases.items()
+            },
+        }
+
+
+_medicao_atual: ContextVar[Optional[Medicao]] = ContextVar("medicao_atual", default=None)
+
+
+def medicao_atual() -> Optional[Medicao]:
+    """Medição ativa no contexto atual, ou None."""
+    return _medicao_atual.get()
+
+
+def iniciar_medicao() -> Medicao:
+    """Ativa uma nova medição no contexto atual."""
+    medicao = Medicao()
+    medicao.token = _medicao_atual.set(medicao)
+    return medicao
+
+
+def encerrar_medicao(medicao: Medicao) -> None:
+    """Encerra a medição e restaura o contexto anterior. Medições já encerradas são
+    ignoradas."""
+    if medicao.fim is None:
+        medicao.fim = perf_counter()
+        _medicao_atual.reset(medicao.token)
+
+
+@contextmanager
+def medir() -> Iterator[Medicao]:
+    """Ativa uma nova medição no contexto atual enquanto o bloco é executado."""
+    medicao = iniciar_medicao()
+    try:
+        yield medicao
+    finally:
+        encerrar_medicao(medicao)
+
+
+class Fase:
+    """Marca um trecho de código como uma fase da medição ativa.
+
+    Uso:
+        with Fase("pegar_juros"):
+            ...
+
+    Args:
+        nome (str): Nome da fase, sem espaços, como no cabeçalho Server-Timing.
+    """
+
+    __slots__ = ("nome", "medicao", "inicio")
+
+    def __init__(self, nome: str):
+        self.nome = nome
+
+    def __enter__(self):
+        self.medicao = _medicao_atual.get()
+        if self.medicao is not None:
+            self.inicio = perf_counter()
+
+    def __exit__(self, *excecao):
+        if self.medicao is not None:
+            self.medicao.registrar(self.nome, perf_counter() - self.inicio)
+
+
+def medido(nome: str) -> Callable[[Callable], Callable]:
+    """Decorador que marca cada execução da função como uma fase da medição ativa, inclusive
+    de corrotinas."""
+
+    def decorador(funcao: Callable) -> Callable:
+        if iscoroutinefunction(funcao):
+
+            @wraps(funcao)
+            async def corrotina_medida(*args, **kwargs):
+                medicao = _medicao_atual.get()
+                if medicao is None:
+                    return await funcao(*args, **kwargs)
+                inicio = perf_counter()
+                try:
+                    return await funcao(*args, **kwargs)
+                finally:
+                    medicao.registrar(nome, perf_counter() - inicio)
+
+            return corrotina_medida
+
+        @wraps(funcao)
+        def funcao_medida(*args, **kwargs):
+            medicao = _medicao_atual.get()
+            if medicao is None:
+                return funcao(*args, **kwargs)
+            inicio = perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                medicao.registrar(nome, perf_counter() - inicio)
+
+        return funcao_medida
+
+    return decorador
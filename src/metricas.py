@@ -0,0 +1,346 @@
+"""Contadores e histogramas da aplicação, exportados no formato texto do Prometheus.
+
+Cada processo mantém as suas métricas em memória, no registro, e grava periodicamente um
+instantâneo em um arquivo JSON por processo em um diretório compartilhado. A exportação soma
+os valores atuais do processo e os instantâneos dos demais, de forma que o resultado não
+depende do worker que atende a requisição e nenhum serviço externo é necessário.
+
+Os rótulos não informados em uma observação são lidos dos rótulos do contexto (rotular), como
+o produto e a fórmula da simulação em andamento, ou ficam vazios.
+"""
+import json
+import os
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+from pathlib import Path
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Callable, Iterable, Iterator, Optional
+
+# Limites dos histogramas de duração, em segundos.
+LIMITES_REQUISICOES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_CALCULOS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+
+_rotulos_contexto: ContextVar[dict] = ContextVar("rotulos_metricas", default={})
+
+
+@contextmanager
+def rotular(**rotulos) -> Iterator[None]:
+    """Define rótulos para as observações feitas no contexto atual enquanto o bloco é
+    executado."""
+    novos = {nome: str(valor) for nome, valor in rotulos.items()}
+    token = _rotulos_contexto.set({**_rotulos_contexto.get(), **novos})
+    try:
+        yield
+    finally:
+        _rotulos_contexto.reset(token)
+
+
+class Metrica:
+    """Métrica com uma série de valores por combinação de rótulos.
+
+    Args:
+        nome (str): Nome da métrica no Prometheus.
+        ajuda (str): Descrição da métrica.
+        rotulos (tuple[str, ...]): Nomes dos rótulos.
+    """
+
+    tipo = ""
+
+    def __init__(self, nome: str, ajuda: str, rotulos: tuple[str, ...] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores: dict[tuple[str, ...], object] = {}
+        self._lock = Lock()
+
+    def _chave(self, rotulos: dict) -> tuple[str, ...]:
+        contexto = _rotulos_contexto.get()
+        return tuple(
+            str(rotulos[nome]) if nome in rotulos else contexto.get(nome, "")
+            for nome in self.rotulos
+        )
+
+    def descricao(self) -> dict:
+        return {"tipo": self.tipo, "ajuda": self.ajuda, "rotulos": list(self.rotulos)}
+
+
+class Contador(Metrica):
+    tipo = "counter"
+
+    def incrementar(self, valor: float = 1.0, **rotulos) -> None:
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0.0) + valor
+
+    def definir(self, valor: float, **rotulos) -> None:
+        """Define o valor, para contadores mantidos fora do registro e lidos por um coletor."""
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = float(valor)
+
+    def instantaneo(self) -> dict:
+        with self._lock:
+            valores = [[list(chave), valor] for chave, valor in self._valores.items()]
+        return {**self.descricao(), "valores": valores}
+
+
+class Histograma(Metrica):
+    """Histograma com limites fixos. Cada valor é contado no primeiro limite maior ou igual a
+    ele, ou no intervalo +Inf.
+
+    Args:
+        limites (tuple[float, ...]): Limites superiores dos intervalos, sem +Inf.
+    """
+
+    tipo = "histogram"
+
+    def __init__(
+        self,
+        nome: str,
+        ajuda: str,
+        rotulos: tuple[str, ...] = (),
+        limites: tuple[float, ...] = LIMITES_REQUISICOES,
+    ):
+        super().__init__(nome, ajuda, rotulos)
+        self.limites = tuple(sorted(limites))
+
+    def observar(self, valor: float, **rotulos) -> None:
+        chave = self._chave(rotulos)
+        intervalo = bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self._valores.get(chave)
+            if serie is None:
+                serie = self._valores[chave] = [[0] * (len(self.limites) + 1), 0.0]
+            serie[0][intervalo] += 1
+            serie[1] += valor
+
+    def descricao(self) -> dict:
+        return {**super().descricao(), "limites": list(self.limites)}
+
+    def instantaneo(self) -> dict:
+        with self._lock:
+            valores = [
+                [list(chave), list(contagens), soma]
+                for chave, (contagens, soma) in self._valores.items()
+            ]
+        return {**self.descricao(), "valores": valores}
+
+
+class Registro:
+    """Métricas de um processo e os coletores executados antes de cada instantâneo."""
+
+    def __init__(self):
+        self.metricas: dict[str, Metrica] = {}
+        self.coletores: list[Callable[[], None]] = []
+        self._ultima_gravacao = 0.0
+        self._lock_gravacao = Lock()
+
+    def _registrar(self, metrica: Metrica) -> Metrica:
+        existente = self.metricas.setdefault(metrica.nome, metrica)
+        if existente.descricao() != metrica.descricao():
+            raise ValueError(f"Métrica {metrica.nome} já registrada com outra definição.")
+        return existente
+
+    def contador(self, nome: str, ajuda: str, rotulos: tuple[str, ...] = ()) -> Contador:
+        return self._registrar(Contador(nome, ajuda, rotulos))
+
+    def histograma(
+        self,
+        nome: str,
+        ajuda: str,
+        rotulos: tuple[str, ...] = (),
+        limites: tuple[float, ...] = LIMITES_REQUISICOES,
+    ) -> Histograma:
+        return self._registrar(Histograma(nome, ajuda, rotulos, limites))
+
+    def coletor(self, coletar: Callable[[], None]) -> Callable[[], None]:
+        """Registra a função decorada, que atualiza métricas mantidas fora do registro."""
+        self.coletores.append(coletar)
+        return coletar
+
+    def instantaneo(self) -> dict[str, dict]:
+        for coletar in self.coletores:
+            coletar()
+        return {nome: metrica.instantaneo() for nome, metrica in self.metricas.items()}
+
+    def _gravar(self, diretorio: Path) -> None:
+        self._ultima_gravacao = monotonic()
+        diretorio.mkdir(parents=True, exist_ok=True)
+        arquivo = diretorio / f"{os.getpid()}.json"
+        temporario = arquivo.with_suffix(".tmp")
+        temporario.write_text(json.dumps(self.instantaneo()))
+        os.replace(temporario, arquivo)
+
+    def gravar(self, diretorio: Path) -> None:
+        """Grava o instantâneo do processo em diretorio/<pid>.json, de forma atômica."""
+        with self._lock_gravacao:
+            self._gravar(diretorio)
+
+    def gravar_periodicamente(self, diretorio: Path, intervalo: float) -> None:
+        """Grava o instantâneo se a última gravação foi há pelo menos intervalo segundos.
+        Enquanto uma thread grava, as demais não esperam."""
+        if monotonic() - self._ultima_gravacao < intervalo:
+            return
+        if not self._lock_gravacao.acquire(blocking=False):
+            return
+        try:
+            self._gravar(diretorio)
+        finally:
+            self._lock_gravacao.release()
+
+
+registro = Registro()
+
+
+def processo_ativo(pid: int) -> bool:
+    """Se existe um processo com o pid. Fora de sistemas POSIX, onde não há como verificar
+    sem afetar o processo, todos são considerados ativos."""
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def ler_instantaneos(diretorio: Path, exceto_pid: Optional[int] = None) -> list[dict]:
+    """Instantâneos gravados no diretório. Arquivos ilegíveis são ignorados, e os de processos
+    que já terminaram são removidos, para que os seus valores não sejam somados."""
+    instantaneos = []
+    for arquivo in sorted(diretorio.glob("*.json")):
+        if arquivo.stem == str(exceto_pid):
+            continue
+        if arquivo.stem.isdigit() and not processo_ativo(int(arquivo.stem)):
+            arquivo.unlink(missing_ok=True)
+            continue
+        try:
+            instantaneos.append(json.loads(arquivo.read_text()))
+        except (OSError, ValueError):
+            continue
+    return instantaneos
+
+
+def agregar(instantaneos: Iterable[dict]) -> dict[str, dict]:
+    """Soma os valores de cada métrica e combinação de rótulos dos instantâneos. Métricas
+    com definições diferentes entre os processos prevalecem como no primeiro instantâneo."""
+    agregado: dict[str, dict] = {}
+    for instantaneo in instantaneos:
+        for nome, metrica in instantaneo.items():
+            destino = agregado.setdefault(nome, {**metrica, "valores": {}})
+            if {**metrica, "valores": None} != {**destino, "valores": None}:
+                continue
+            for chave, *valores in metrica["valores"]:
+                chave = tuple(chave)
+                if metrica["tipo"] == "counter":
+                    destino["valores"][chave] = destino["valores"].get(chave, 0.0) + valores[0]
+                    continue
+                contagens, soma = valores
+                anterior = destino["valores"].get(chave, ([0] * len(contagens), 0.0))
+                destino["valores"][chave] = (
+                    [a + b for a, b in zip(anterior[0], contagens)],
+                    anterior[1] + soma,
+                )
+    return agregado
+
+
+def escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def formatar_rotulos(nomes: Iterable[str], valores: Iterable[str]) -> str:
+    pares = [f'{nome}="{escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def formatar_numero(valor: float) -> str:
+    return "+Inf" if valor == float("inf") else repr(float(valor))
+
+
+def formatar(agregado: dict[str, dict]) -> str:
+    """Métricas no formato texto do Prometheus (versão 0.0.4)."""
+    linhas = []
+    for nome, metrica in sorted(agregado.items()):
+        linhas.append(f"# HELP {nome} {metrica['ajuda']}")
+        linhas.append(f"# TYPE {nome} {metrica['tipo']}")
+        rotulos = metrica["rotulos"]
+        for chave, valor in sorted(metrica["valores"].items()):
+            if metrica["tipo"] == "counter":
+                linhas.append(f"{nome}{formatar_rotulos(rotulos, chave)} {formatar_numero(valor)}")
+                continue
+            contagens, soma = valor
+            acumulado = 0
+            limites = [*metrica["limites"], float("inf")]
+            for limite, contagem in zip(limites, contagens):
+                acumulado += contagem
+                rotulos_intervalo = formatar_rotulos(
+                    [*rotulos, "le"], [*chave, formatar_numero(limite)]
+                )
+                linhas.append(f"{nome}_bucket{rotulos_intervalo} {acumulado}")
+            linhas.append(f"{nome}_sum{formatar_rotulos(rotulos, chave)} {formatar_numero(soma)}")
+            linhas.append(f"{nome}_count{formatar_rotulos(rotulos, chave)} {acumulado}")
+    return "\n".join(linhas) + "\n"
+
+
+def limpar_instantaneos(diretorio: Path) -> int:
+    """Remove os instantâneos gravados no diretório. Deve ser chamada antes de iniciar os
+    workers, já que o pid de um processo que terminou pode ser reutilizado por outro.
+
+    Returns:
+        int: Quantidade de arquivos removidos.
+    """
+    removidos = 0
+    for arquivo in [*diretorio.glob("*.json"), *diretorio.glob("*.tmp")]:
+        arquivo.unlink(missing_ok=True)
+        removidos += 1
+    return removidos
+
+
+def exportar(diretorio: Optional[Path] = None) -> str:
+    """Métricas de todos os processos no formato do Prometheus.
+
+    Os valores deste processo são os atuais, e também são gravados no diretório; os dos
+    demais processos são os dos seus últimos instantâneos. Sem diretório, apenas as métricas
+    deste processo são exportadas.
+    """
+    instantaneos = [registro.instantaneo()]
+    if diretorio is not None:
+        registro.gravar(diretorio)
+        instantaneos += ler_instantaneos(diretorio, exceto_pid=os.getpid())
+    return formatar(agregar(instantaneos))
+
+
+def cronometrado(histograma: Histograma, **rotulos) -> Callable[[Callable], Callable]:
+    """Decorador que observa a duração de cada execução da função no histograma, inclusive
+    de corrotinas. Os rótulos não informados são lidos do contexto."""
+
+    def decorador(funcao: Callable) -> Callable:
+        if iscoroutinefunction(funcao):
+
+            @wraps(funcao)
+            async def corrotina_cronometrada(*args, **kwargs):
+                inicio = perf_counter()
+                try:
+                    return await funcao(*args, **kwargs)
+                finally:
+                    histograma.observar(perf_counter() - inicio, **rotulos)
+
+            return corrotina_cronometrada
+
+        @wraps(funcao)
+        def funcao_cronometrada(*args, **kwargs):
+            inicio = perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                histograma.observar(perf_counter() - inicio, **rotulos)
+
+        return funcao_cronometrada
+
+    return decorador
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from datetime import date
 from typing import Union
 
+from numpy import float64
+from numpy.typing import NDArray
 from tabatu.periodicidade import Periodicidade
 from tabatu.premissas import Premissas
 
@@ -67,3 +69,17 @@ class Pagamento:
         if tempo_decorrido < 0:
             raise ValueError("O tempo_decorrido deve ser positivo")
         return self.calculadora_vpa.calcular_vpa(tempo_atual=tempo_decorrido)
+
+    def vpa_curva(self, tempo_maximo: int) -> NDArray[float64]:
+        """Cálculo do valor presente atuarial dos pagamentos futuros para todos os tempos de 0 a
+        tempo_maximo.
+
+        Args:
+            tempo_maximo (int): Último tempo da curva, na periodicidade do pagamento.
+
+        Returns:
+            NDArray[float64]: Valor presente dos pagamentos futuros em cada tempo.
+        """
+        if tempo_maximo < 0:
+            raise ValueError("O tempo_maximo deve ser positivo")
+        return self.calculadora_vpa.calcular_vpa_curva(tempo_maximo)
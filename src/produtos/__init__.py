@@ -1,6 +1,13 @@
 from src.produtos.aposentadoria import aposentadoria_capitalizado
 from src.produtos.peculio import peculio_capitalizado_fluxo
 
+# Fábrica de cada fórmula, pelo nome da fórmula do produto (Formula.nome). As fábricas por
+# comutação (peculio_capitalizado_comutacao e aposentadoria_capitalizado_comutacao) não entram
+# no registro: elas calculam as mesmas fórmulas, e não fórmulas novas, mas só aceitam juros
+# constante e tábuas com fim. Como o registro é indexado pelo nome da fórmula, incluí-las
+# exigiria fórmulas artificiais no banco; elas são construídas diretamente a partir dos mesmos
+# argumentos das fábricas abaixo, e tests/test_comutacao.py garante que os dois motores
+# coincidem.
 produtos = {
     "aposentadoria": aposentadoria_capitalizado,
     "peculio": peculio_capitalizado_fluxo,
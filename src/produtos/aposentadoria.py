@@ -4,17 +4,22 @@ from typing import Union
 from src.array_infinita import ArrayInfinita
 from src.capitalizado import Capitalizado
 from src.cobertura import Cobertura
+from src.comutacao.comutacao_pagamento import ComutacaoPagamento
+from src.comutacao.comutacao_renda import ComutacaoRenda
 from src.pagamento import Pagamento
 from src.fluxo.fluxo_pagamento import FluxoPagamento
 from src.fluxo.fluxo_renda import FluxoRenda
 from src.idades_prazos import IdadesPrazosAposentadoria
 from src.idades_prazos import IdadesPrazosPagamento
+from src.metricas import cronometrado
+from src.produtos.metricas import duracao_precificacao
 from tabatu.typing import JurosInterface
 from tabatu.premissas import Premissas
 from tabatu.premissas import PremissasRenda
 from tabatu import Tabua
 
 
+@cronometrado(duracao_precificacao, fabrica="aposentadoria_capitalizado")
 def aposentadoria_capitalizado(
     tabua_acumulacao: Tabua,
     tabua_concessao: Tabua,
@@ -61,6 +66,80 @@ def aposentadoria_capitalizado(
     Returns:
         AposentadoriaCapitalizado: Contrato capitalizado de aposentadoria.
     """
+    return _aposentadoria_capitalizado(
+        FluxoRenda,
+        FluxoPagamento,
+        tabua_acumulacao=tabua_acumulacao,
+        tabua_concessao=tabua_concessao,
+        juros=juros,
+        data_assinatura=data_assinatura,
+        data_nascimento_segurado=data_nascimento_segurado,
+        prazo_cobertura=prazo_cobertura,
+        prazo_pagamento=prazo_pagamento,
+        prazo_renda=prazo_renda,
+        prazo_certo_renda=prazo_certo_renda,
+        beneficio=beneficio,
+        percentual_beneficio=percentual_beneficio,
+    )
+
+
+@cronometrado(duracao_precificacao, fabrica="aposentadoria_capitalizado_comutacao")
+def aposentadoria_capitalizado_comutacao(
+    tabua_acumulacao: Tabua,
+    tabua_concessao: Tabua,
+    juros: JurosInterface,
+    data_assinatura: date,
+    data_nascimento_segurado: date,
+    prazo_cobertura: int,
+    prazo_pagamento: int,
+    prazo_renda: Union[int, float],
+    prazo_certo_renda: int = 0,
+    beneficio: float = 1.0,
+    percentual_beneficio: Union[float, list[float]] = 1.0,
+) -> Capitalizado:
+    """Cria um contrato capitalizado de aposentadoria via funções de comutação.
+
+    Equivale a aposentadoria_capitalizado, mas os VPAs são lidos de tabelas de comutação
+    (Dx, Nx) calculadas uma única vez para cada tábua e juros. O juros deve ser constante.
+
+    Args:
+        Os mesmos de aposentadoria_capitalizado.
+
+    Returns:
+        AposentadoriaCapitalizado: Contrato capitalizado de aposentadoria.
+    """
+    return _aposentadoria_capitalizado(
+        ComutacaoRenda,
+        ComutacaoPagamento,
+        tabua_acumulacao=tabua_acumulacao,
+        tabua_concessao=tabua_concessao,
+        juros=juros,
+        data_assinatura=data_assinatura,
+        data_nascimento_segurado=data_nascimento_segurado,
+        prazo_cobertura=prazo_cobertura,
+        prazo_pagamento=prazo_pagamento,
+        prazo_renda=prazo_renda,
+        prazo_certo_renda=prazo_certo_renda,
+        beneficio=beneficio,
+        percentual_beneficio=percentual_beneficio,
+    )
+
+
+def _aposentadoria_capitalizado(
+    classe_cobertura: type,
+    classe_pagamento: type,
+    tabua_acumulacao: Tabua,
+    tabua_concessao: Tabua,
+    juros: JurosInterface,
+    data_assinatura: date,
+    data_nascimento_segurado: date,
+    prazo_cobertura: int,
+    prazo_pagamento: int,
+    prazo_renda: Union[int, float],
+    prazo_certo_renda: int,
+    beneficio: float,
+    percentual_beneficio: Union[float, list[float]],
+) -> Capitalizado:
     if tabua_acumulacao.numero_vidas != 1:
         raise ValueError("Tabua de acumulação deve ter apenas uma vida.")
     if tabua_acumulacao.numero_decrementos != 1:
@@ -83,7 +162,7 @@ def aposentadoria_capitalizado(
         prazo_certo_renda=prazo_certo_renda,
         periodicidade=tabua_acumulacao.periodicidade,
     )
-    calculadora_vpa = FluxoRenda(
+    calculadora_vpa = classe_cobertura(
         premissas_atuariais=premissas_atuariais,
         idades_prazos=idades_prazos,
         percentual_beneficio=ArrayInfinita(percentual_beneficio),
@@ -101,7 +180,7 @@ def aposentadoria_capitalizado(
         prazo_pagamento=prazo_pagamento,
         periodicidade=tabua_acumulacao.periodicidade,
     )
-    calculadora_vpa = FluxoPagamento(
+    calculadora_vpa = classe_pagamento(
         premissas_atuariais=premissas_pagamento, idades_prazos=idades_prazos_pagamento
     )
     pagamento = Pagamento(calculadora_vpa=calculadora_vpa)
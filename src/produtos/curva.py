@@ -0,0 +1,203 @@
+from datetime import date
+from typing import Union
+
+from numpy import (
+    asarray,
+    broadcast_arrays,
+    errstate,
+    float64,
+    full,
+    int64,
+    isfinite,
+    maximum,
+    minimum,
+    nan,
+    where,
+)
+from numpy.typing import ArrayLike, NDArray
+from tabatu.typing import JurosInterface, TabuaInterface
+
+from src.comutacao.tabela_comutacao import TabelaComutacao, tabela_comutacao
+from src.fluxo.fluxo_lote import prazo_valido_lote, tempo_futuro_maximo_lote
+from src.idades_prazos import calcula_idade
+from src.metricas import cronometrado
+from src.produtos.metricas import duracao_precificacao
+
+
+def razao(numerador: NDArray[float64], denominador: NDArray[float64]) -> NDArray[float64]:
+    """Divisão elemento a elemento, com zero onde o denominador é zero."""
+    with errstate(divide="ignore", invalid="ignore"):
+        return where(denominador == 0, 0.0, numerador / denominador)
+
+
+def vpa_pagamento_curva(
+    comutacao: TabelaComutacao,
+    tabua: TabuaInterface,
+    idade: int,
+    prazos: NDArray[float64],
+) -> NDArray[float64]:
+    """VPA de ComutacaoPagamento no início do contrato para cada prazo de pagamento.
+
+    A anuidade de cada prazo é (Nx - Nx+n) / Dx, a diferença entre duas posições da coluna
+    Nx, que é a soma acumulada de Dx.
+    """
+    tempo_futuro_maximo = tempo_futuro_maximo_lote(tabua, asarray([idade]))
+    restante = maximum(minimum(tempo_futuro_maximo, prazos), 1).astype(int64)
+    return razao(
+        comutacao.ler(comutacao.Nx, idade) - comutacao.ler_lote(comutacao.Nx, idade + restante),
+        comutacao.ler(comutacao.Dx, idade),
+    )
+
+
+def premio_curva(
+    vpa_cobertura: NDArray[float64],
+    vpa_pagamento: NDArray[float64],
+    beneficio: float,
+    prazo_pagamento: NDArray[float64],
+    valido: NDArray,
+) -> NDArray[float64]:
+    """Como premio_lote, mas com um prazo de pagamento em cada posição da curva."""
+    premio = razao(vpa_cobertura, vpa_pagamento) * beneficio
+    premio = where(prazo_pagamento <= 0, 0.0, premio)
+    return where(valido, premio, nan)
+
+
+@cronometrado(duracao_precificacao, fabrica="peculio_capitalizado_curva")
+def peculio_capitalizado_curva(
+    tabua_beneficio: TabuaInterface,
+    tabua_pagamento: TabuaInterface,
+    juros: JurosInterface,
+    data_assinatura: date,
+    data_nascimento_segurado: date,
+    prazos: ArrayLike,
+    beneficio: float = 1.0,
+    imediato: bool = False,
+) -> NDArray[float64]:
+    """Calcula o prêmio de um contrato capitalizado de pecúlio para vários prazos.
+
+    Equivale a criar um contrato com peculio_capitalizado_comutacao para cada prazo, com o
+    prazo de pagamento igual ao de cobertura e o percentual do benefício de 100%, e calcular
+    o seu prêmio comercial. Como Mx e Nx são somas acumuladas, o VPA de cada prazo é a
+    diferença entre duas posições das tabelas de comutação, que são calculadas uma única vez
+    para a tábua e o juros.
+
+    Args:
+        tabua_beneficio (TabuaInterface): Tabua que descreve o pagamento de benefícios.
+        tabua_pagamento (TabuaInterface): Tabua que descreve o pagamento de contribuições.
+        juros (JurosInterface): Juros do produto, deve ser constante.
+        data_assinatura (date): Data de assinatura do contrato.
+        data_nascimento_segurado (date): Data de nascimento do segurado.
+        prazos (ArrayLike): Prazos de cobertura e pagamento, na mesma periodicidade que as
+            tábuas.
+        beneficio (float, optional): Valor do benefício no momento da contratação.
+        imediato (bool, optional): Se o benefício será pago imediatamente após o sinistro.
+
+    Returns:
+        NDArray[float64]: Prêmio de cada prazo, nan para os prazos inválidos.
+    """
+    prazos = asarray(prazos, dtype=float64)
+    idade = calcula_idade(
+        data_nascimento_segurado, data_assinatura, tabua_beneficio.periodicidade
+    )
+    if idade < 0 or beneficio <= 0:
+        return full(prazos.shape, nan)
+    idades = asarray([idade])
+    valido = (
+        (prazos > 0)
+        & prazo_valido_lote(tabua_beneficio, prazos, idades)
+        & prazo_valido_lote(tabua_pagamento, prazos, idades)
+    )
+
+    comutacao = tabela_comutacao(tabua_beneficio, juros, imediato)
+    tempo_futuro_maximo = tempo_futuro_maximo_lote(tabua_beneficio, idades)
+    limite = maximum(minimum(tempo_futuro_maximo, prazos), 1).astype(int64)
+    vpa_cobertura = razao(
+        comutacao.ler(comutacao.Mx, idade) - comutacao.ler_lote(comutacao.Mx, idade + limite),
+        comutacao.ler(comutacao.Dx, idade),
+    )
+    vpa_pagamento = vpa_pagamento_curva(
+        tabela_comutacao(tabua_pagamento, juros), tabua_pagamento, idade, prazos
+    )
+    return premio_curva(vpa_cobertura, vpa_pagamento, beneficio, prazos, valido)
+
+
+@cronometrado(duracao_precificacao, fabrica="aposentadoria_capitalizado_curva")
+def aposentadoria_capitalizado_curva(
+    tabua_acumulacao: TabuaInterface,
+    tabua_concessao: TabuaInterface,
+    juros: JurosInterface,
+    data_assinatura: date,
+    data_nascimento_segurado: date,
+    prazos: ArrayLike,
+    prazos_renda: ArrayLike,
+    prazos_certos_renda: Union[ArrayLike, int] = 0,
+    beneficio: float = 1.0,
+) -> NDArray[float64]:
+    """Calcula o prêmio de um contrato capitalizado de aposentadoria para várias
+    combinações de prazos.
+
+    Equivale a criar um contrato com aposentadoria_capitalizado para cada combinação, com o
+    prazo de pagamento igual ao de cobertura e o percentual do benefício de 100%, e calcular
+    o seu prêmio comercial. O VPA de cada combinação é obtido, como em vpa_renda_comutacao,
+    de poucas posições das tabelas de comutação das tábuas de acumulação e de concessão,
+    que são calculadas uma única vez para as tábuas e o juros.
+
+    Args:
+        tabua_acumulacao (TabuaInterface): Tábua do período de acumulação.
+        tabua_concessao (TabuaInterface): Tábua do período de concessão.
+        juros (JurosInterface): Juros do produto, deve ser constante.
+        data_assinatura (date): Data de assinatura do contrato.
+        data_nascimento_segurado (date): Data de nascimento do segurado.
+        prazos (ArrayLike): Prazo de cobertura e pagamento de cada combinação.
+        prazos_renda (ArrayLike): Prazo de renda de cada combinação.
+        prazos_certos_renda (ArrayLike, optional): Prazo certo da renda de cada combinação.
+        beneficio (float, optional): Valor do benefício no momento da contratação.
+
+    Returns:
+        NDArray[float64]: Prêmio de cada combinação, nan para as combinações inválidas.
+    """
+    prazos, prazos_renda, prazos_certos_renda = broadcast_arrays(
+        asarray(prazos, dtype=float64),
+        asarray(prazos_renda, dtype=float64),
+        asarray(prazos_certos_renda, dtype=float64),
+    )
+    idade = calcula_idade(
+        data_nascimento_segurado, data_assinatura, tabua_acumulacao.periodicidade
+    )
+    if idade < 0 or beneficio <= 0:
+        return full(prazos.shape, nan)
+    idades = asarray([idade])
+    valido = (
+        (prazos >= 0)
+        & isfinite(prazos)
+        & (prazos_renda > 0)
+        & (prazos_certos_renda >= 0)
+        & (prazos_renda >= prazos_certos_renda)
+        & prazo_valido_lote(tabua_concessao, prazos_renda, idades)
+        & prazo_valido_lote(tabua_acumulacao, prazos, idades)
+    )
+    prazos_cobertura = where(valido, prazos, 0).astype(int64)
+
+    acumulacao = tabela_comutacao(tabua_acumulacao, juros)
+    concessao = tabela_comutacao(tabua_concessao, juros)
+    prazo_renda_efetivo = minimum(
+        tempo_futuro_maximo_lote(tabua_concessao, idades) - prazos_cobertura, prazos_renda
+    )
+    restante = maximum(where(valido, prazo_renda_efetivo, 1), 1).astype(int64)
+    fim_prazo_certo = minimum(maximum(prazos_certos_renda, 0), restante).astype(int64)
+    idade_renda = idade + prazos_cobertura
+
+    diferimento = razao(
+        acumulacao.ler_lote(acumulacao.Dx, idade_renda), acumulacao.ler(acumulacao.Dx, idade)
+    )
+    renda_certa = concessao.ler(concessao.desconto_acumulado, 0) - concessao.ler_lote(
+        concessao.desconto_acumulado, fim_prazo_certo
+    )
+    renda_vitalicia = razao(
+        concessao.ler_lote(concessao.Nx, idade_renda + fim_prazo_certo)
+        - concessao.ler_lote(concessao.Nx, idade_renda + restante),
+        concessao.ler_lote(concessao.Dx, idade_renda),
+    )
+    vpa_cobertura = diferimento * (renda_certa + renda_vitalicia)
+    vpa_pagamento = vpa_pagamento_curva(acumulacao, tabua_acumulacao, idade, prazos_cobertura)
+    return premio_curva(vpa_cobertura, vpa_pagamento, beneficio, prazos_cobertura, valido)
@@ -0,0 +1,230 @@
+from datetime import date
+from typing import Union
+
+from numpy import (
+    asarray,
+    broadcast_to,
+    errstate,
+    float64,
+    full,
+    int64,
+    isinf,
+    nan,
+    where,
+)
+from numpy.typing import ArrayLike, NDArray
+from tabatu.typing import JurosInterface, TabuaInterface
+
+from src.array_infinita import ArrayInfinitaLote
+from src.fluxo.fluxo_lote import (
+    fluxo_peculio_lote,
+    fluxo_renda_lote,
+    prazo_valido_lote,
+)
+from src.idades_prazos import calcula_idades
+from src.metricas import cronometrado
+from src.produtos.metricas import duracao_precificacao
+
+# Percentual de 100% do benefício em todos os tempos, compartilhado por todas as propostas.
+PERCENTUAL_INTEGRAL = ArrayInfinitaLote([[1.0]])
+
+
+def percentual_lote(
+    percentual_beneficio: Union[float, list[float], ArrayInfinitaLote], valido: NDArray
+) -> ArrayInfinitaLote:
+    """Percentual do benefício das propostas válidas. Um percentual informado como float ou
+    lista é compartilhado por todas as propostas."""
+    if not isinstance(percentual_beneficio, ArrayInfinitaLote):
+        percentual_beneficio = ArrayInfinitaLote([percentual_beneficio])
+    return percentual_beneficio.filtrar(valido)
+
+
+def premio_lote(
+    vpa_cobertura: NDArray[float64],
+    vpa_pagamento: NDArray[float64],
+    beneficio: NDArray[float64],
+    prazo_pagamento: Union[int, float],
+    valido: NDArray,
+) -> NDArray[float64]:
+    """Prêmio comercial no início do contrato, com nan para as propostas inválidas.
+
+    Equivale a Capitalizado.premio_comercial(0) sem carregamento e com pagamento na
+    periodicidade da tábua. Os VPAs devem conter apenas as propostas válidas.
+    """
+    premio = full(valido.shape, nan)
+    if prazo_pagamento <= 0:
+        premio[valido] = 0.0
+        return premio
+    with errstate(divide="ignore", invalid="ignore"):
+        taxa_pura = where(vpa_pagamento == 0, 0.0, vpa_cobertura / vpa_pagamento)
+    premio[valido] = taxa_pura * beneficio[valido]
+    return premio
+
+
+@cronometrado(duracao_precificacao, fabrica="peculio_capitalizado_lote")
+def peculio_capitalizado_lote(
+    tabua_beneficio: TabuaInterface,
+    tabua_pagamento: TabuaInterface,
+    juros: JurosInterface,
+    data_assinatura: date,
+    data_nascimento_segurado: list[date],
+    prazo_cobertura: Union[int, float],
+    prazo_pagamento: Union[int, float],
+    beneficio: ArrayLike,
+    percentual_beneficio: Union[float, list[float], ArrayInfinitaLote] = 1.0,
+    imediato: bool = False,
+) -> NDArray[float64]:
+    """Calcula o prêmio de um lote de contratos capitalizados de pecúlio.
+
+    Equivale a criar um contrato com peculio_capitalizado_fluxo para cada data de
+    nascimento e calcular o seu prêmio comercial, mas todas as propostas são avaliadas
+    em um único cálculo vetorizado.
+
+    Args:
+        tabua_beneficio (TabuaInterface): Tabua que descreve o pagamento de benefícios.
+        tabua_pagamento (TabuaInterface): Tabua que descreve o pagamento de contribuições.
+        juros (JurosInterface): Juros do produto.
+        data_assinatura (date): Data de assinatura dos contratos.
+        data_nascimento_segurado (list[date]): Data de nascimento do segurado de cada proposta.
+        prazo_cobertura (int): Prazo de cobertura na mesma periodicidade que as tábuas.
+        prazo_pagamento (int): Prazo de pagamento na mesma periodicidade que as tábuas.
+        beneficio (ArrayLike): Valor do benefício de cada proposta.
+        percentual_beneficio (float, list[float] ou ArrayInfinitaLote, optional): Percentual de
+            benefício que será pago em cada período, o mesmo para todas as propostas ou, em um
+            ArrayInfinitaLote, um por proposta.
+        imediato (bool, optional): Se o benefício será pago imediatamente após o sinistro.
+
+    Returns:
+        NDArray[float64]: Prêmio de cada proposta, nan para as propostas inválidas.
+    """
+    idades = calcula_idades(
+        data_nascimento_segurado, data_assinatura, tabua_beneficio.periodicidade
+    )
+    beneficio = broadcast_to(asarray(beneficio, dtype=float64), idades.shape)
+    valido = (
+        (idades >= 0)
+        & (beneficio > 0)
+        & (prazo_cobertura > 0)
+        & (prazo_cobertura >= prazo_pagamento)
+    )
+    valido[valido] = prazo_valido_lote(
+        tabua_beneficio, prazo_cobertura, idades[valido]
+    ) & prazo_valido_lote(tabua_pagamento, prazo_pagamento, idades[valido])
+    idades = idades[valido]
+    vpa_cobertura = fluxo_peculio_lote(
+        tempo_atual=0,
+        tabua=tabua_beneficio,
+        juros=juros,
+        idade_ingresso_segurado=idades,
+        prazo_cobertura=prazo_cobertura,
+        percentual_beneficio=percentual_lote(percentual_beneficio, valido),
+        imediato=imediato,
+    ).vpa()
+    vpa_pagamento = fluxo_renda_lote(
+        tempo_atual=0,
+        idade_ingresso=idades,
+        prazo_cobertura=0,
+        prazo_renda=prazo_pagamento,
+        prazo_certo_renda=0,
+        tabua=tabua_pagamento,
+        tabua_concessao=tabua_pagamento,
+        juros=juros,
+        percentual_beneficio=PERCENTUAL_INTEGRAL,
+        postecipada=False,
+    ).vpa()
+    return premio_lote(vpa_cobertura, vpa_pagamento, beneficio, prazo_pagamento, valido)
+
+
+@cronometrado(duracao_precificacao, fabrica="aposentadoria_capitalizado_lote")
+def aposentadoria_capitalizado_lote(
+    tabua_acumulacao: TabuaInterface,
+    tabua_concessao: TabuaInterface,
+    juros: JurosInterface,
+    data_assinatura: date,
+    data_nascimento_segurado: list[date],
+    prazo_cobertura: int,
+    prazo_pagamento: int,
+    prazo_renda: ArrayLike,
+    prazo_certo_renda: ArrayLike = 0,
+    beneficio: ArrayLike = 1.0,
+    percentual_beneficio: Union[float, list[float], ArrayInfinitaLote] = 1.0,
+) -> NDArray[float64]:
+    """Calcula o prêmio de um lote de contratos capitalizados de aposentadoria.
+
+    Equivale a criar um contrato com aposentadoria_capitalizado para cada data de
+    nascimento e calcular o seu prêmio comercial, mas todas as propostas são avaliadas
+    em um único cálculo vetorizado.
+
+    Args:
+        tabua_acumulacao (Tabua): Tábua do período de acumulação.
+        tabua_concessao (Tabua): Tábua do período de concessão.
+        juros (Juros): Juros do produto
+        data_assinatura (date): Data de assinatura dos contratos.
+        data_nascimento_segurado (list[date]): Data de nascimento do segurado de cada proposta.
+        prazo_cobertura (int): Prazo de cobertura na mesma periodicidade que as tábuas.
+        prazo_pagamento (int): Prazo de pagamento na mesma periodicidade que as tábuas.
+        prazo_renda (ArrayLike): Prazo de renda de cada proposta.
+        prazo_certo_renda (ArrayLike, optional): Prazo certo da renda de cada proposta.
+        beneficio (ArrayLike, optional): Valor do benefício de cada proposta.
+        percentual_beneficio (float, list[float] ou ArrayInfinitaLote, optional): Percentual de
+            benefício que será pago em cada período, o mesmo para todas as propostas ou, em um
+            ArrayInfinitaLote, um por proposta.
+
+    Returns:
+        NDArray[float64]: Prêmio de cada proposta, nan para as propostas inválidas.
+    """
+    if tabua_acumulacao.numero_vidas != 1:
+        raise ValueError("Tabua de acumulação deve ter apenas uma vida.")
+    if tabua_acumulacao.numero_decrementos != 1:
+        raise ValueError("Tabua de acumulação deve ter apenas um decremento.")
+    if tabua_concessao.numero_vidas != 1:
+        raise ValueError("Tabua de concessão deve ter apenas uma vida.")
+    if tabua_concessao.numero_decrementos != 1:
+        raise ValueError("Tabua de concessão deve ter apenas um decremento.")
+    idades = calcula_idades(
+        data_nascimento_segurado, data_assinatura, tabua_acumulacao.periodicidade
+    )
+    beneficio = broadcast_to(asarray(beneficio, dtype=float64), idades.shape)
+    prazo_renda = broadcast_to(asarray(prazo_renda, dtype=float64), idades.shape)
+    prazo_certo_renda = broadcast_to(
+        asarray(prazo_certo_renda, dtype=int64), idades.shape
+    )
+    valido = (
+        (idades >= 0)
+        & (beneficio > 0)
+        & (prazo_cobertura >= 0)
+        & ~isinf(prazo_cobertura)
+        & (prazo_cobertura >= prazo_pagamento)
+        & (prazo_renda > 0)
+        & (prazo_certo_renda >= 0)
+        & (prazo_renda >= prazo_certo_renda)
+    )
+    valido[valido] = prazo_valido_lote(
+        tabua_concessao, prazo_renda[valido], idades[valido]
+    ) & prazo_valido_lote(tabua_acumulacao, prazo_pagamento, idades[valido])
+    idades = idades[valido]
+    vpa_cobertura = fluxo_renda_lote(
+        tempo_atual=0,
+        idade_ingresso=idades,
+        prazo_cobertura=prazo_cobertura,
+        prazo_renda=prazo_renda[valido],
+        prazo_certo_renda=prazo_certo_renda[valido],
+        tabua=tabua_acumulacao,
+        tabua_concessao=tabua_concessao,
+        juros=juros,
+        percentual_beneficio=percentual_lote(percentual_beneficio, valido),
+        postecipada=False,
+    ).vpa()
+    vpa_pagamento = fluxo_renda_lote(
+        tempo_atual=0,
+        idade_ingresso=idades,
+        prazo_cobertura=0,
+        prazo_renda=prazo_pagamento,
+        prazo_certo_renda=0,
+        tabua=tabua_acumulacao,
+        tabua_concessao=tabua_acumulacao,
+        juros=juros,
+        percentual_beneficio=PERCENTUAL_INTEGRAL,
+        postecipada=False,
+    ).vpa()
+    return premio_lote(vpa_cobertura, vpa_pagamento, beneficio, prazo_pagamento, valido)
@@ -0,0 +1,8 @@
+from src.metricas import LIMITES_CALCULOS, registro
+
+duracao_precificacao = registro.histograma(
+    "sistema_seguros_precificacao_duracao_segundos",
+    "Duração da criação dos contratos pelas funções de src.produtos.",
+    ("fabrica", "produto", "formula"),
+    LIMITES_CALCULOS,
+)
@@ -7,12 +7,17 @@ from tabatu.typing import JurosInterface, TabuaInterface
 from src.array_infinita import ArrayInfinita
 from src.capitalizado import Capitalizado
 from src.cobertura import Cobertura
+from src.comutacao.comutacao_pagamento import ComutacaoPagamento
+from src.comutacao.comutacao_peculio import ComutacaoPeculio
 from src.fluxo.fluxo_pagamento import FluxoPagamento
 from src.fluxo.fluxo_peculio import FluxoPeculio
 from src.idades_prazos import IdadesPrazosPagamento, IdadesPrazosPeculio
+from src.metricas import cronometrado
 from src.pagamento import Pagamento
+from src.produtos.metricas import duracao_precificacao
 
 
+@cronometrado(duracao_precificacao, fabrica="peculio_capitalizado_fluxo")
 def peculio_capitalizado_fluxo(
     tabua_beneficio: TabuaInterface,
     tabua_pagamento: TabuaInterface,
@@ -53,6 +58,76 @@ def peculio_capitalizado_fluxo(
     Returns:
         Capitalizado: Contrato capitalizado de pecúlio.
     """
+    return _peculio_capitalizado(
+        FluxoPeculio,
+        FluxoPagamento,
+        tabua_beneficio=tabua_beneficio,
+        tabua_pagamento=tabua_pagamento,
+        juros=juros,
+        data_assinatura=data_assinatura,
+        data_nascimento_segurado=data_nascimento_segurado,
+        prazo_cobertura=prazo_cobertura,
+        prazo_pagamento=prazo_pagamento,
+        beneficio=beneficio,
+        percentual_beneficio=percentual_beneficio,
+        imediato=imediato,
+    )
+
+
+@cronometrado(duracao_precificacao, fabrica="peculio_capitalizado_comutacao")
+def peculio_capitalizado_comutacao(
+    tabua_beneficio: TabuaInterface,
+    tabua_pagamento: TabuaInterface,
+    juros: JurosInterface,
+    data_assinatura: date,
+    data_nascimento_segurado: date,
+    prazo_cobertura: Union[int, float],
+    prazo_pagamento: Union[int, float],
+    beneficio: float = 1.0,
+    percentual_beneficio: Union[float, list[float]] = 1.0,
+    imediato: bool = False,
+) -> Capitalizado:
+    """Cria um contrato capitalizado de pecúlio via funções de comutação.
+
+    Equivale a peculio_capitalizado_fluxo, mas os VPAs são lidos de tabelas de comutação
+    (Dx, Nx, Cx, Mx) calculadas uma única vez para cada tábua e juros. O juros deve ser constante.
+
+    Args:
+        Os mesmos de peculio_capitalizado_fluxo.
+
+    Returns:
+        Capitalizado: Contrato capitalizado de pecúlio.
+    """
+    return _peculio_capitalizado(
+        ComutacaoPeculio,
+        ComutacaoPagamento,
+        tabua_beneficio=tabua_beneficio,
+        tabua_pagamento=tabua_pagamento,
+        juros=juros,
+        data_assinatura=data_assinatura,
+        data_nascimento_segurado=data_nascimento_segurado,
+        prazo_cobertura=prazo_cobertura,
+        prazo_pagamento=prazo_pagamento,
+        beneficio=beneficio,
+        percentual_beneficio=percentual_beneficio,
+        imediato=imediato,
+    )
+
+
+def _peculio_capitalizado(
+    classe_cobertura: type,
+    classe_pagamento: type,
+    tabua_beneficio: TabuaInterface,
+    tabua_pagamento: TabuaInterface,
+    juros: JurosInterface,
+    data_assinatura: date,
+    data_nascimento_segurado: date,
+    prazo_cobertura: Union[int, float],
+    prazo_pagamento: Union[int, float],
+    beneficio: float,
+    percentual_beneficio: Union[float, list[float]],
+    imediato: bool,
+) -> Capitalizado:
     idades_prazos = IdadesPrazosPeculio(
         data_assinatura=data_assinatura,
         data_nascimento_segurado=[data_nascimento_segurado] * len(tabua_beneficio.tabuas),  # type: ignore
@@ -60,7 +135,7 @@ def peculio_capitalizado_fluxo(
         periodicidade=tabua_beneficio.periodicidade,
     )
     premissas = Premissas(tabua=tabua_beneficio, juros=juros)
-    calculadora_vpa = FluxoPeculio(
+    calculadora_vpa = classe_cobertura(
         premissas_atuariais=premissas,
         idades_prazos=idades_prazos,
         percentual_beneficio=ArrayInfinita(percentual_beneficio),
@@ -74,7 +149,7 @@ def peculio_capitalizado_fluxo(
         prazo_pagamento=prazo_pagamento,
         periodicidade=tabua_beneficio.periodicidade,
     )
-    calculadora_vpa = FluxoPagamento(
+    calculadora_vpa = classe_pagamento(
         premissas_atuariais=premissas_pagamento, idades_prazos=idades_prazos_pagamento
     )
     pagamento = Pagamento(calculadora_vpa=calculadora_vpa)
@@ -0,0 +1,66 @@
+from collections import defaultdict
+
+import pytest
+import tabatu as tb
+from sqlalchemy import select
+
+from model.database import db
+
+# Tábuas dos dados iniciais: sinistro (BREMS MT M), DPI (Alvaro Vindas DPI) e concessão
+# de renda (BREMS SB M).
+TABUA_SINISTRO = 2
+TABUA_DPI = 5
+TABUA_CONCESSAO = 6
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    """Aplicação com um banco de dados inicializado com os dados iniciais em um diretório
+    temporário."""
+    from app import create_app
+
+    raiz = tmp_path_factory.mktemp("instancia")
+    return create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{raiz / 'db.sqlite3'}",
+            "ARMAZEM_TABUAS": str(raiz / "tabuas"),
+            "METRICAS_DIRETORIO": str(raiz / "metricas"),
+            "CACHES_DIRETORIO": str(raiz / "caches"),
+        }
+    )
+
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope="session")
+def taxas(app) -> dict[int, list[float]]:
+    """Taxas de cada tábua dos dados iniciais, em ordem de idade."""
+    from model.tabua import Taxa
+
+    with app.app_context():
+        linhas = db.session.execute(
+            select(Taxa.tabuaId, Taxa.taxa).order_by(Taxa.tabuaId, Taxa.idade)
+        ).all()
+    taxas = defaultdict(list)
+    for tabua_id, taxa in linhas:
+        taxas[tabua_id].append(taxa)
+    return taxas
+
+
+@pytest.fixture(scope="session")
+def tabua_sinistro(taxas) -> tb.Tabua:
+    return tb.Tabua(taxas[TABUA_SINISTRO])
+
+
+@pytest.fixture(scope="session")
+def tabua_dpi(taxas) -> tb.TabuaMDT:
+    return tb.TabuaMDT(tb.Tabua(taxas[TABUA_SINISTRO]), tb.Tabua(taxas[TABUA_DPI]))
+
+
+@pytest.fixture(scope="session")
+def tabua_concessao(taxas) -> tb.Tabua:
+    return tb.Tabua(taxas[TABUA_CONCESSAO])
@@ -0,0 +1,39 @@
+"""A rota de reservas lê a apólice pelo pool de leitura."""
+from sqlalchemy import event
+
+from model.cache import caches
+from model.database import db
+
+
+def test_reservas_apolice(cliente):
+    resposta = cliente.get("/apolices/1/reservas")
+    assert resposta.status_code == 200
+    corpo = resposta.get_json()
+    assert corpo["apolice_id"] == 1
+    assert len(corpo["reservas"]) == 11
+
+
+def test_reservas_apolice_inexistente(cliente):
+    assert cliente.get("/apolices/999/reservas").status_code == 404
+
+
+def test_reservas_apolice_prazo_inexistente(cliente):
+    assert cliente.get("/apolices/2/reservas").status_code == 404
+
+
+def test_reservas_apolice_nao_usa_conexao_de_escrita(app, cliente):
+    for cache in list(caches.values()):
+        cache.invalidar()
+    with app.app_context():
+        engine = db.engine
+    conexoes = []
+
+    def registrar(*args):
+        conexoes.append(args)
+
+    event.listen(engine, "checkout", registrar)
+    try:
+        assert cliente.get("/apolices/1/reservas").status_code == 200
+    finally:
+        event.remove(engine, "checkout", registrar)
+    assert conexoes == []
@@ -0,0 +1,47 @@
+"""O armazém guarda as tabelas de comutação e é reconstruído após o commit."""
+from pathlib import Path
+
+import tabatu as tb
+from numpy.testing import assert_allclose
+
+from model import armazem_tabuas
+from model.armazem_tabuas import ARQUIVO_ATUAL, preparar_armazem_tabuas
+from model.armazenamento import aguardar_segundo_plano
+from model.database import db
+from model.tabua import Taxa
+from src.comutacao.tabela_comutacao import ChaveComutacao, calcular_tabela_comutacao
+from tests.conftest import TABUA_SINISTRO
+
+
+def versao_atual(app) -> str:
+    return (Path(app.config["ARMAZEM_TABUAS"]) / ARQUIVO_ATUAL).read_text(encoding="utf-8")
+
+
+def test_armazem_guarda_apenas_tabelas_de_comutacao(app, tabua_sinistro):
+    with app.app_context():
+        preparar_armazem_tabuas(db)
+    armazem = armazem_tabuas.armazem_atual.pegar()
+    arquivos = {arquivo.name for arquivo in armazem.diretorio.iterdir()}
+    assert arquivos == {"indice.json", *armazem.indice["comutacao"].values()}
+
+    chave = ChaveComutacao(tabua_sinistro, tb.JurosConstante(0.04), False)
+    assert_allclose(
+        armazem.tabela_comutacao(chave).Dx, calcular_tabela_comutacao(chave).Dx
+    )
+
+
+def test_armazem_reconstruido_apos_commit(app):
+    with app.app_context():
+        preparar_armazem_tabuas(db)
+        anterior = versao_atual(app)
+        taxa = db.session.get(Taxa, (TABUA_SINISTRO, 30))
+        original = taxa.taxa
+        taxa.taxa = original / 2
+        db.session.commit()
+        aguardar_segundo_plano()
+        assert versao_atual(app) != anterior
+
+        db.session.get(Taxa, (TABUA_SINISTRO, 30)).taxa = original
+        db.session.commit()
+        aguardar_segundo_plano()
+        assert versao_atual(app) == anterior
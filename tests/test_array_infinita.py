@@ -0,0 +1,166 @@
+"""ArrayInfinitaLote deve coincidir com uma ArrayInfinita por proposta."""
+from datetime import date
+
+import pytest
+import tabatu as tb
+from numpy import arange, shares_memory
+from numpy.testing import assert_allclose, assert_array_equal
+
+from src.array_infinita import ArrayInfinita, ArrayInfinitaLote
+from src.fluxo.fluxo_lote import fluxo_peculio_lote, fluxo_renda_lote
+from src.fluxo.fluxo_peculio import fluxo_peculio
+from src.fluxo.fluxo_renda import fluxo_renda
+from src.produtos import produtos
+from src.produtos.lote import aposentadoria_capitalizado_lote, peculio_capitalizado_lote
+
+LINHAS = [[1.0], [0.5, 0.75, 1.0, 1.25], [2.0, 1.0]]
+JUROS = tb.JurosConstante(0.04)
+DATA_ASSINATURA = date(2024, 1, 1)
+NASCIMENTOS = [date(2000, 1, 1), date(1980, 6, 15), date(1970, 3, 31)]
+
+
+def test_matriz_igual_array_infinita():
+    lote = ArrayInfinitaLote(LINHAS)
+    tempos = arange(8)
+    assert_array_equal(lote[tempos], [ArrayInfinita(linha)[tempos] for linha in LINHAS])
+
+
+def test_indice_proposta_tempo():
+    lote = ArrayInfinitaLote(LINHAS)
+    propostas, tempos = [0, 1, 1, 2], [5, 0, 9, 1]
+    assert_array_equal(
+        lote[propostas, tempos],
+        [ArrayInfinita(LINHAS[p])[t][0] for p, t in zip(propostas, tempos)],
+    )
+
+
+def test_linha_e_filtrar():
+    lote = ArrayInfinitaLote(LINHAS)
+    assert lote.linha(1) == ArrayInfinita(LINHAS[1])
+    assert_array_equal(lote.linha(2).data, LINHAS[2])
+    assert lote.filtrar([True, False, True]) == ArrayInfinitaLote([LINHAS[0], LINHAS[2]])
+    with pytest.raises(ValueError):
+        lote.filtrar([True, False])
+
+
+def test_constante_sem_alocacao():
+    lote = ArrayInfinitaLote([[1.0], [1.0]])
+    valores = lote[arange(50)]
+    assert valores.shape == (2, 50)
+    assert (valores == 1.0).all()
+    assert shares_memory(valores, lote.dados)
+    assert not valores.flags.writeable
+
+
+def test_uma_linha_compartilhada():
+    lote = ArrayInfinitaLote([LINHAS[1]])
+    assert lote.filtrar([True, False, True]) is lote
+    assert_array_equal(lote[arange(6)], [ArrayInfinita(LINHAS[1])[arange(6)]])
+
+
+@pytest.mark.parametrize("linhas", ([[]], []))
+def test_linha_vazia(linhas):
+    with pytest.raises(ValueError):
+        ArrayInfinitaLote(linhas)
+
+
+def test_fluxos_lote_com_percentual_por_proposta(tabua_sinistro, tabua_concessao):
+    idades = [20, 45, 60]
+    lote = ArrayInfinitaLote(LINHAS)
+    peculio = fluxo_peculio_lote(
+        tempo_atual=2,
+        tabua=tabua_sinistro,
+        juros=JUROS,
+        idade_ingresso_segurado=idades,
+        prazo_cobertura=20,
+        percentual_beneficio=lote,
+        imediato=False,
+    ).vpa()
+    assert_allclose(
+        peculio,
+        [
+            fluxo_peculio(2, tabua_sinistro, JUROS, [idade], 20, lote.linha(i), False).vpa()
+            for i, idade in enumerate(idades)
+        ],
+        rtol=1e-12,
+    )
+    argumentos = dict(
+        tempo_atual=0,
+        prazo_cobertura=5,
+        prazo_renda=10,
+        prazo_certo_renda=2,
+        tabua=tabua_sinistro,
+        tabua_concessao=tabua_concessao,
+        juros=JUROS,
+        postecipada=False,
+    )
+    renda = fluxo_renda_lote(idade_ingresso=idades, percentual_beneficio=lote, **argumentos)
+    assert_allclose(
+        renda.vpa(),
+        [
+            fluxo_renda(
+                idade_ingresso=[idade], percentual_beneficio=lote.linha(i), **argumentos
+            ).vpa()
+            for i, idade in enumerate(idades)
+        ],
+        rtol=1e-12,
+    )
+
+
+def test_produtos_lote_com_percentual_por_proposta(tabua_sinistro, tabua_concessao):
+    lote = ArrayInfinitaLote(LINHAS)
+    beneficios = [1000.0, 500.0, 2000.0]
+    peculio = dict(
+        tabua_beneficio=tabua_sinistro,
+        tabua_pagamento=tabua_sinistro,
+        juros=JUROS,
+        data_assinatura=DATA_ASSINATURA,
+        prazo_cobertura=20,
+        prazo_pagamento=10,
+    )
+    assert_allclose(
+        peculio_capitalizado_lote(
+            data_nascimento_segurado=NASCIMENTOS,
+            beneficio=beneficios,
+            percentual_beneficio=lote,
+            **peculio,
+        ),
+        [
+            produtos["peculio"](
+                data_nascimento_segurado=nascimento,
+                beneficio=beneficio,
+                percentual_beneficio=linha,
+                **peculio,
+            ).premio_comercial(0)
+            for nascimento, beneficio, linha in zip(NASCIMENTOS, beneficios, LINHAS)
+        ],
+        rtol=1e-10,
+    )
+    aposentadoria = dict(
+        tabua_acumulacao=tabua_sinistro,
+        tabua_concessao=tabua_concessao,
+        juros=JUROS,
+        data_assinatura=DATA_ASSINATURA,
+        prazo_cobertura=20,
+        prazo_pagamento=20,
+        prazo_renda=15,
+        prazo_certo_renda=3,
+    )
+    assert_allclose(
+        aposentadoria_capitalizado_lote(
+            data_nascimento_segurado=NASCIMENTOS,
+            beneficio=beneficios,
+            percentual_beneficio=lote,
+            **aposentadoria,
+        ),
+        [
+            produtos["aposentadoria"](
+                data_nascimento_segurado=nascimento,
+                beneficio=beneficio,
+                percentual_beneficio=linha,
+                **aposentadoria,
+            ).premio_comercial(0)
+            for nascimento, beneficio, linha in zip(NASCIMENTOS, beneficios, LINHAS)
+        ],
+        rtol=1e-10,
+    )
@@ -0,0 +1,136 @@
+"""Rotas de simulação atendidas pela entrada ASGI (asgi.py), comparadas às rotas do Flask."""
+import asyncio
+import json
+import threading
+from urllib.parse import urlencode
+
+import pytest
+from sqlalchemy import event
+
+from model.armazenamento import aguardar_segundo_plano, engine_leitura
+from model.cache import caches
+from model.database import db
+
+SIMULACAO = {"data_nascimento": "1990-01-01", "beneficio": 1000}
+
+
+async def pedir(aplicacao, caminho: str, form=None, corpo_json=None) -> tuple[int, object]:
+    """Envia uma requisição POST à aplicação ASGI e retorna o status e o corpo decodificado."""
+    if form is not None:
+        corpo = urlencode(form).encode()
+        tipo = b"application/x-www-form-urlencoded"
+    else:
+        corpo = json.dumps(corpo_json).encode()
+        tipo = b"application/json"
+    mensagens = [{"type": "http.request", "body": corpo, "more_body": False}]
+    enviadas = []
+
+    async def receive():
+        return mensagens.pop(0)
+
+    async def send(mensagem):
+        enviadas.append(mensagem)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": caminho,
+        "headers": [(b"content-type", tipo)],
+    }
+    await aplicacao(scope, receive, send)
+    return enviadas[0]["status"], json.loads(enviadas[1]["body"])
+
+
+@pytest.fixture
+def aplicacao(app):
+    from asgi import AplicacaoAssincrona
+
+    aplicacao = AplicacaoAssincrona(app)
+    yield aplicacao
+    aplicacao.contexto.executor.shutdown()
+
+
+def atender(aplicacao, pedidos: list[tuple]) -> list[tuple[int, object]]:
+    """Respostas da aplicação ASGI aos pedidos (caminho, form, json), em um único loop."""
+
+    async def executar():
+        try:
+            return [await pedir(aplicacao, *pedido) for pedido in pedidos]
+        finally:
+            # As conexões do engine assíncrono pertencem ao loop encerrado por asyncio.run.
+            await aplicacao.contexto.engine.dispose()
+
+    return asyncio.run(executar())
+
+
+@pytest.fixture
+def consultas_sincronas(app, aplicacao):
+    """Comandos executados pelos engines síncronos depois da criação da aplicação ASGI,
+    exceto pelas gravações em segundo plano."""
+    comandos = []
+
+    def registrar(conexao, cursor, comando, *args):
+        if not threading.current_thread().name.startswith("segundo_plano"):
+            comandos.append(comando)
+
+    with app.app_context():
+        engines = {db.engine, engine_leitura(db)}
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", registrar)
+    yield comandos
+    aguardar_segundo_plano()
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+
+PEDIDOS = [
+    ("/simular", {"produto_id": 1, "sexo": "F", "prazo": 20, **SIMULACAO}, None),
+    ("/simular/curva", {"produto_id": 7, "sexo": "F", **SIMULACAO}, None),
+    (
+        "/simular/lote",
+        None,
+        [
+            {"produto_id": 1, "sexo": "M", "prazo": 10, **SIMULACAO},
+            {"produto_id": 7, "sexo": "F", "prazo": 30, "prazo_renda": 30, **SIMULACAO},
+        ],
+    ),
+]
+
+
+def test_consultas_pelo_engine_assincrono(aplicacao, consultas_sincronas):
+    for cache in list(caches.values()):
+        cache.invalidar()
+    respostas = atender(aplicacao, PEDIDOS)
+    assert [status for status, _ in respostas] == [200, 200, 200]
+    assert consultas_sincronas == []
+
+
+def test_mesmas_respostas_do_flask(aplicacao, cliente):
+    respostas = atender(aplicacao, PEDIDOS)
+    for (caminho, form, corpo_json), (status, conteudo) in zip(PEDIDOS, respostas):
+        resposta = cliente.post(caminho, data=form, json=corpo_json)
+        assert (status, conteudo) == (resposta.status_code, resposta.get_json())
+
+
+@pytest.mark.parametrize("caminho", ["/simular", "/simular/peculio", "/simular/curva"])
+def test_sexo_sem_tabuas(aplicacao, cliente, caminho):
+    form = {"produto_id": 2, "sexo": "X", "prazo": 10, **SIMULACAO}
+    erro = {"mesage": "Sexo X não disponível para o produto 2."}
+    assert atender(aplicacao, [(caminho, form, None)]) == [(400, erro)]
+    resposta = cliente.post(caminho, data=form)
+    assert (resposta.status_code, resposta.get_json()) == (400, erro)
+
+
+def test_sexo_sem_tabuas_lote(aplicacao, cliente):
+    proposta = {"produto_id": 1, "sexo": "X", "prazo": 10, **SIMULACAO}
+    esperado = [{"premio": None, "erro": "Sexo X não disponível para o produto 1."}]
+    assert atender(aplicacao, [("/simular/lote", None, [proposta])]) == [(200, esperado)]
+    assert cliente.post("/simular/lote", json=[proposta]).get_json() == esperado
+
+
+def test_banco_sem_driver_assincrono():
+    from model.armazenamento import pegar_perfil
+    from model.queries_assincronas import criar_engine_assincrona
+
+    with pytest.raises(ValueError, match="postgresql"):
+        criar_engine_assincrona("postgresql://localhost/seguros", pegar_perfil("concorrente"))
@@ -0,0 +1,41 @@
+"""A avaliação da carteira grava e confirma as reservas de cada lote."""
+from datetime import date
+
+from sqlalchemy import func, select
+
+from model.armazenamento import engine_leitura
+from model.avaliacao import avaliar_carteira, avaliar_carteira_paralela
+from model.database import db
+from model.reserva import Reserva
+
+DATA_BASE = date(2024, 12, 31)
+
+
+def reservas_confirmadas() -> int:
+    """Quantidade de reservas da data base visíveis para outra conexão."""
+    with engine_leitura(db).connect() as conexao:
+        return conexao.execute(
+            select(func.count()).select_from(Reserva).where(Reserva.dataBase == DATA_BASE)
+        ).scalar_one()
+
+
+def test_avaliar_carteira_confirma_cada_lote(app):
+    with app.app_context():
+        gravadas = []
+        resumo = avaliar_carteira(
+            db,
+            DATA_BASE,
+            tamanho_lote=1,
+            progresso=lambda parcial: gravadas.append(
+                (parcial.quantidade, reservas_confirmadas())
+            ),
+        )
+        assert resumo.quantidade + resumo.ignoradas > 1
+        assert len(gravadas) == resumo.quantidade + resumo.ignoradas
+        assert all(quantidade == confirmadas for quantidade, confirmadas in gravadas)
+
+        paralela = avaliar_carteira_paralela(
+            db, DATA_BASE, processos=1, inicializador=lambda: None, tamanho_fatia=1
+        )
+        assert paralela.reserva_total_centavos == resumo.reserva_total_centavos
+        assert reservas_confirmadas() == resumo.quantidade
@@ -0,0 +1,75 @@
+"""Os caches são invalidados após o commit das alterações, em todos os processos."""
+import pytest
+from sqlalchemy import select, update
+
+from model import cache
+from model.cache import CacheLRU, sinalizar
+from model.database import db
+from model.queries import cache_tabuas
+from model.tabua import Taxa
+from tests.conftest import TABUA_SINISTRO
+
+
+@pytest.fixture
+def contexto(app):
+    with app.app_context():
+        yield
+        db.session.rollback()
+
+
+def primeira_taxa() -> Taxa:
+    return db.session.execute(
+        select(Taxa).where(Taxa.tabuaId == TABUA_SINISTRO).order_by(Taxa.idade)
+    ).scalars().first()
+
+
+def test_invalida_apos_commit_e_nao_no_flush(contexto):
+    taxa = primeira_taxa()
+    original = taxa.taxa
+    cache_tabuas.pegar("teste", lambda: "antes")
+
+    taxa.taxa = original / 2
+    db.session.flush()
+    assert cache_tabuas.pegar("teste", lambda: "depois") == "antes"
+
+    db.session.commit()
+    assert cache_tabuas.pegar("teste", lambda: "depois") == "depois"
+
+    primeira_taxa().taxa = original
+    db.session.commit()
+
+
+def test_rollback_nao_invalida(contexto):
+    taxa = primeira_taxa()
+    cache_tabuas.pegar("teste", lambda: "antes")
+
+    taxa.taxa = taxa.taxa / 2
+    db.session.flush()
+    db.session.rollback()
+    db.session.commit()
+    assert cache_tabuas.pegar("teste", lambda: "depois") == "antes"
+
+
+def test_alteracao_em_lote_invalida_apos_commit(contexto):
+    cache_tabuas.pegar("teste", lambda: "antes")
+
+    db.session.execute(update(Taxa).where(Taxa.tabuaId == -1).values(taxa=0))
+    assert cache_tabuas.pegar("teste", lambda: "depois") == "antes"
+
+    db.session.commit()
+    assert cache_tabuas.pegar("teste", lambda: "depois") == "depois"
+
+
+def test_invalidacao_de_outro_processo(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "diretorio_sinais", tmp_path)
+    cache_teste = CacheLRU(nome="teste_sinal")
+    assert cache_teste.pegar("chave", lambda: "antes") == "antes"
+    assert cache_teste.pegar("chave", lambda: "depois") == "antes"
+
+    # Outro processo invalidou o mesmo cache, substituindo o arquivo de sinal.
+    sinalizar(tmp_path / "teste_sinal")
+    assert cache_teste.pegar("chave", lambda: "depois") == "depois"
+
+    cache_teste.invalidar()
+    assert cache_teste.pegar("chave", lambda: "novo") == "novo"
+    assert cache_teste.pegar("chave", lambda: "outro") == "novo"
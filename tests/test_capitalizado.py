@@ -0,0 +1,60 @@
+"""A curva de reservas deve coincidir com a reserva calculada tempo a tempo."""
+from datetime import date
+
+import pytest
+import tabatu as tb
+from numpy.testing import assert_allclose
+
+from src.produtos.peculio import peculio_capitalizado_fluxo
+
+TAXA_JUROS = 0.04
+JUROS = tb.JurosConstante(TAXA_JUROS)
+
+
+def reserva_por_tempo(contrato, tempo: int) -> float:
+    """Reserva em um tempo, a partir de um cálculo de VPA da cobertura e do pagamento."""
+    cobertura = contrato.cobertura.calculadora_vpa
+    pagamento = contrato.pagamento.calculadora_vpa
+    taxa_pura = cobertura.calcular_vpa(0) / pagamento.calcular_vpa(0)
+    return contrato.beneficio * (
+        cobertura.calcular_vpa(tempo) - taxa_pura * pagamento.calcular_vpa(tempo)
+    )
+
+
+def peculio(tabua, nascimento: date, prazo) -> object:
+    return peculio_capitalizado_fluxo(
+        tabua_beneficio=tabua,
+        tabua_pagamento=tabua,
+        juros=JUROS,
+        data_assinatura=date(2024, 1, 1),
+        data_nascimento_segurado=nascimento,
+        prazo_cobertura=prazo,
+        prazo_pagamento=10,
+    )
+
+
+@pytest.mark.parametrize("prazo", (10, 30))
+@pytest.mark.parametrize("nascimento", (date(1980, 6, 15), date(1955, 3, 31)))
+def test_reserva_curva_igual_reserva_por_tempo(tabua_sinistro, nascimento, prazo):
+    contrato = peculio(tabua_sinistro, nascimento, prazo)
+    curva = contrato.reserva_curva()
+    assert len(curva) == prazo + 1
+    assert_allclose(
+        curva, [reserva_por_tempo(contrato, tempo) for tempo in range(prazo + 1)], atol=1e-10
+    )
+
+
+def test_reserva_curva_no_fim_da_tabua(tabua_sinistro):
+    """No último tempo da tábua, o motor de fluxo tempo a tempo paga uma parcela certa
+    (limite max(..., 1) em fluxo_peculio), enquanto a curva não possui mais obrigações e
+    retorna zero. Os demais tempos coincidem."""
+    contrato = peculio(tabua_sinistro, date(1955, 3, 31), float("inf"))
+    curva = contrato.reserva_curva()
+    idade = contrato.cobertura.idades_prazos.idade_ingresso_segurado
+    ultimo = int(tabua_sinistro.tempo_futuro_maximo(idade))
+    assert len(curva) == ultimo + 1
+
+    por_tempo = [reserva_por_tempo(contrato, tempo) for tempo in range(ultimo + 1)]
+    assert_allclose(curva[:-1], por_tempo[:-1], atol=1e-10)
+    assert curva[-1] == 0
+    assert por_tempo[-1] == pytest.approx(contrato.beneficio / (1 + TAXA_JUROS))
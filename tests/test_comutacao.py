@@ -0,0 +1,90 @@
+"""O motor de comutação deve ter os mesmos VPAs que o motor de fluxo."""
+from datetime import date
+
+import pytest
+import tabatu as tb
+from numpy.testing import assert_allclose
+
+from src.produtos.aposentadoria import (
+    aposentadoria_capitalizado,
+    aposentadoria_capitalizado_comutacao,
+)
+from src.produtos.peculio import peculio_capitalizado_comutacao, peculio_capitalizado_fluxo
+
+DATA_ASSINATURA = date(2024, 1, 1)
+JUROS = tb.JurosConstante(0.04)
+NASCIMENTOS = (date(2000, 1, 1), date(1980, 6, 15), date(1955, 3, 31))
+PERCENTUAIS = (1.0, [0.5, 0.75, 1.0, 1.25])
+
+
+def vpas(contrato, tempos) -> list[tuple[float, float]]:
+    """VPA da cobertura e do pagamento do contrato em cada tempo."""
+    return [
+        (
+            contrato.cobertura.calculadora_vpa.calcular_vpa(tempo),
+            contrato.pagamento.calculadora_vpa.calcular_vpa(tempo),
+        )
+        for tempo in tempos
+    ]
+
+
+@pytest.mark.parametrize("nascimento", NASCIMENTOS)
+@pytest.mark.parametrize("prazo", (10, 30, float("inf")))
+@pytest.mark.parametrize("dpi", (False, True))
+@pytest.mark.parametrize("percentual", PERCENTUAIS)
+@pytest.mark.parametrize("imediato", (False, True))
+def test_peculio_comutacao_igual_fluxo(
+    tabua_sinistro, tabua_dpi, nascimento, prazo, dpi, percentual, imediato
+):
+    argumentos = dict(
+        tabua_beneficio=tabua_sinistro,
+        tabua_pagamento=tabua_dpi if dpi else tabua_sinistro,
+        juros=JUROS,
+        data_assinatura=DATA_ASSINATURA,
+        data_nascimento_segurado=nascimento,
+        prazo_cobertura=prazo,
+        prazo_pagamento=min(prazo, 10),
+        percentual_beneficio=percentual,
+        imediato=imediato,
+    )
+    tempos = range(0, 40, 3)
+    assert_allclose(
+        vpas(peculio_capitalizado_comutacao(**argumentos), tempos),
+        vpas(peculio_capitalizado_fluxo(**argumentos), tempos),
+        rtol=1e-10,
+        atol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("nascimento", NASCIMENTOS[:2])
+@pytest.mark.parametrize("prazo", (0, 10, 30))
+@pytest.mark.parametrize("prazo_renda,prazo_certo_renda", ((1, 0), (20, 5), (40, 40)))
+@pytest.mark.parametrize("percentual", PERCENTUAIS)
+def test_aposentadoria_comutacao_igual_fluxo(
+    tabua_sinistro,
+    tabua_concessao,
+    nascimento,
+    prazo,
+    prazo_renda,
+    prazo_certo_renda,
+    percentual,
+):
+    argumentos = dict(
+        tabua_acumulacao=tabua_sinistro,
+        tabua_concessao=tabua_concessao,
+        juros=JUROS,
+        data_assinatura=DATA_ASSINATURA,
+        data_nascimento_segurado=nascimento,
+        prazo_cobertura=prazo,
+        prazo_pagamento=prazo,
+        prazo_renda=prazo_renda,
+        prazo_certo_renda=prazo_certo_renda,
+        percentual_beneficio=percentual,
+    )
+    tempos = range(0, prazo + prazo_renda + 2, 2)
+    assert_allclose(
+        vpas(aposentadoria_capitalizado_comutacao(**argumentos), tempos),
+        vpas(aposentadoria_capitalizado(**argumentos), tempos),
+        rtol=1e-10,
+        atol=1e-12,
+    )
@@ -0,0 +1,123 @@
+"""Rotas de contratação (rotas.contratacao)."""
+import pytest
+from sqlalchemy import select
+
+from model.database import db
+from model.segurado import Matricula, Segurado
+
+
+def cliente_contratacao(cpf: int, **campos) -> dict:
+    return {
+        "cpf": cpf,
+        "nome": f"Cliente {cpf}",
+        "email": f"cliente{cpf}@email.com",
+        "sexo": "M",
+        "data_nascimento": "1990-01-01",
+        "produto_id": 2,
+        "data_assinatura": "2024-01-01",
+        "prazo": 10,
+        "beneficio": 1000,
+        **campos,
+    }
+
+
+def matriculas(app, cpf: int) -> list[Matricula]:
+    with app.app_context():
+        query = select(Matricula).where(Matricula.cpfSegurado == cpf).order_by(Matricula.id)
+        return db.session.execute(query).scalars().all()
+
+
+def segurado(app, cpf: int) -> Segurado:
+    with app.app_context():
+        return db.session.get(Segurado, cpf)
+
+
+@pytest.mark.parametrize("tamanho_lote", (None, 2))
+def test_contratar_lote(app, cliente, monkeypatch, tamanho_lote):
+    monkeypatch.setitem(app.config, "CONTRATACAO_TAMANHO_LOTE", tamanho_lote)
+    cpf = 40_000_000_000 + 100 * (tamanho_lote or 0)
+    lote = [
+        cliente_contratacao(cpf),
+        cliente_contratacao(cpf + 1, prazo=13),
+        cliente_contratacao(cpf + 2, produto_id=7, sexo="F", prazo=30, prazo_renda=30),
+        # Mesmo cpf repetido no lote: uma matrícula por item e um único segurado.
+        cliente_contratacao(cpf, nome="Outro nome", prazo=20, produto_id=1),
+    ]
+    resposta = cliente.post("/contratar/lote", json=lote)
+    assert resposta.status_code == 200
+    resultado = resposta.get_json()
+    assert [item["status"] for item in resultado] == [
+        "contratado",
+        "erro",
+        "contratado",
+        "contratado",
+    ]
+    assert resultado[1] == {
+        "matricula_id": None,
+        "status": "erro",
+        "erro": "Produto 2 com prazo 13 não encontrado.",
+    }
+
+    assert [m.id for m in matriculas(app, cpf)] == [
+        resultado[0]["matricula_id"],
+        resultado[3]["matricula_id"],
+    ]
+    assert [(m.produtoId, m.prazo) for m in matriculas(app, cpf)] == [(2, 10), (1, 20)]
+    assert matriculas(app, cpf + 1) == []
+    [aposentadoria] = matriculas(app, cpf + 2)
+    assert (aposentadoria.id, aposentadoria.prazoRenda) == (resultado[2]["matricula_id"], 30)
+    assert segurado(app, cpf).nome == f"Cliente {cpf}"
+
+
+def test_contratar_lote_mantem_segurado_existente(app, cliente):
+    cpf = 40_000_001_000
+    assert cliente.post("/contratar", data=cliente_contratacao(cpf)).status_code == 200
+    resultado = cliente.post(
+        "/contratar/lote", json=[cliente_contratacao(cpf, nome="Outro nome")]
+    ).get_json()
+    assert resultado[0]["status"] == "contratado"
+    assert segurado(app, cpf).nome == f"Cliente {cpf}"
+    assert len(matriculas(app, cpf)) == 2
+
+
+@pytest.mark.parametrize("corpo", [{"cpf": 1}, [{"cpf": "x"}]])
+def test_contratar_lote_invalido(cliente, corpo):
+    assert cliente.post("/contratar/lote", json=corpo).status_code == 422
+
+
+def test_contratar_mesmo_cpf_mantem_segurado(app, cliente):
+    cpf = 40_000_002_000
+    primeira = cliente.post("/contratar", data=cliente_contratacao(cpf))
+    segunda = cliente.post("/contratar", data=cliente_contratacao(cpf, nome="Outro nome"))
+    assert primeira.status_code == segunda.status_code == 200
+    assert "Idempotent-Replayed" not in segunda.headers
+    assert segurado(app, cpf).nome == f"Cliente {cpf}"
+    assert len(matriculas(app, cpf)) == 2
+
+
+def test_contratar_repeticao_idempotente(app, cliente):
+    cpf = 40_000_003_000
+    cabecalhos = {"Idempotency-Key": "test-contratar-repeticao"}
+    primeira = cliente.post("/contratar", data=cliente_contratacao(cpf), headers=cabecalhos)
+    segunda = cliente.post("/contratar", data=cliente_contratacao(cpf), headers=cabecalhos)
+    assert primeira.status_code == segunda.status_code == 200
+    assert "Idempotent-Replayed" not in primeira.headers
+    assert segunda.headers["Idempotent-Replayed"] == "true"
+    assert segunda.get_json() == primeira.get_json()
+    assert len(matriculas(app, cpf)) == 1
+
+
+def test_contratar_chave_com_outros_parametros(app, cliente):
+    cpf = 40_000_004_000
+    cabecalhos = {"Idempotency-Key": "test-contratar-conflito"}
+    primeira = cliente.post("/contratar", data=cliente_contratacao(cpf), headers=cabecalhos)
+    assert primeira.status_code == 200
+    resposta = cliente.post(
+        "/contratar", data=cliente_contratacao(cpf, beneficio=2000), headers=cabecalhos
+    )
+    assert resposta.status_code == 422
+    assert resposta.get_json() == {
+        "mesage": "Chave de idempotência test-contratar-conflito já utilizada com outros "
+        "parâmetros."
+    }
+    assert [m.beneficio for m in matriculas(app, cpf)] == [1000]
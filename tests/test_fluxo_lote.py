@@ -0,0 +1,153 @@
+"""Os fluxos e as fábricas em lote devem coincidir com o cálculo de um contrato por vez."""
+from datetime import date
+
+import pytest
+import tabatu as tb
+from numpy import isnan
+from numpy.testing import assert_allclose
+
+from src.array_infinita import ArrayInfinita
+from src.fluxo.fluxo_lote import fluxo_peculio_lote, fluxo_renda_lote
+from src.fluxo.fluxo_peculio import fluxo_peculio
+from src.fluxo.fluxo_renda import fluxo_renda
+from src.produtos import produtos
+from src.produtos.lote import aposentadoria_capitalizado_lote, peculio_capitalizado_lote
+
+DATA_ASSINATURA = date(2024, 1, 1)
+JUROS = tb.JurosConstante(0.04)
+IDADES = [0, 25, 43, 68, 100]
+NASCIMENTOS = [date(2000, 1, 1), date(1980, 6, 15), date(1955, 3, 31), date(1940, 2, 29)]
+PERCENTUAL = ArrayInfinita([0.5, 0.75, 1.0])
+
+
+@pytest.mark.parametrize("tempo_atual", (0, 5))
+@pytest.mark.parametrize("prazo", (10, 30, float("inf")))
+@pytest.mark.parametrize("imediato", (False, True))
+@pytest.mark.parametrize("dpi", (False, True))
+def test_fluxo_peculio_lote(tabua_sinistro, tabua_dpi, tempo_atual, prazo, imediato, dpi):
+    tabua = tabua_dpi if dpi else tabua_sinistro
+    argumentos = dict(
+        tempo_atual=tempo_atual,
+        tabua=tabua,
+        juros=JUROS,
+        prazo_cobertura=prazo,
+        percentual_beneficio=PERCENTUAL,
+        imediato=imediato,
+    )
+    lote = fluxo_peculio_lote(idade_ingresso_segurado=IDADES, **argumentos).vpa()
+    por_contrato = [
+        fluxo_peculio(idade_ingresso_segurado=[idade] * len(tabua.tabuas), **argumentos).vpa()
+        for idade in IDADES
+    ]
+    assert_allclose(lote, por_contrato, rtol=1e-12)
+
+
+@pytest.mark.parametrize("tempo_atual", (0, 12, 40))
+@pytest.mark.parametrize("prazo", (0, 10, 30))
+@pytest.mark.parametrize("prazo_renda,prazo_certo_renda", ((1, 0), (20, 5), (float("inf"), 0)))
+@pytest.mark.parametrize("postecipada", (False, True))
+def test_fluxo_renda_lote(
+    tabua_sinistro,
+    tabua_concessao,
+    tempo_atual,
+    prazo,
+    prazo_renda,
+    prazo_certo_renda,
+    postecipada,
+):
+    argumentos = dict(
+        tempo_atual=tempo_atual,
+        prazo_cobertura=prazo,
+        prazo_renda=prazo_renda,
+        prazo_certo_renda=prazo_certo_renda,
+        tabua=tabua_sinistro,
+        tabua_concessao=tabua_concessao,
+        juros=JUROS,
+        percentual_beneficio=PERCENTUAL,
+        postecipada=postecipada,
+    )
+    idades = IDADES[:4]
+    lote = fluxo_renda_lote(idade_ingresso=idades, **argumentos).vpa()
+    por_contrato = [fluxo_renda(idade_ingresso=[idade], **argumentos).vpa() for idade in idades]
+    assert_allclose(lote, por_contrato, rtol=1e-12)
+
+
+def premio_por_contrato(formula: str, **argumentos) -> float:
+    """Prêmio pela fábrica registrada (src.produtos.produtos), nan se a proposta é inválida."""
+    try:
+        return produtos[formula](**argumentos).premio_comercial(0)
+    except ValueError:
+        return float("nan")
+
+
+@pytest.mark.parametrize("prazo", (10, 30))
+@pytest.mark.parametrize("dpi", (False, True))
+def test_peculio_lote_igual_precificar(tabua_sinistro, tabua_dpi, prazo, dpi):
+    argumentos = dict(
+        tabua_beneficio=tabua_sinistro,
+        tabua_pagamento=tabua_dpi if dpi else tabua_sinistro,
+        juros=JUROS,
+        data_assinatura=DATA_ASSINATURA,
+        prazo_cobertura=prazo,
+        prazo_pagamento=prazo,
+        percentual_beneficio=[1.0],
+    )
+    beneficios = [1000.0, 2500.0, 10.0, 500.0]
+    lote = peculio_capitalizado_lote(
+        data_nascimento_segurado=NASCIMENTOS, beneficio=beneficios, **argumentos
+    )
+    por_contrato = [
+        premio_por_contrato(
+            "peculio", data_nascimento_segurado=nascimento, beneficio=beneficio, **argumentos
+        )
+        for nascimento, beneficio in zip(NASCIMENTOS, beneficios)
+    ]
+    assert not isnan(lote).all()
+    assert_allclose(lote, por_contrato, rtol=1e-10)
+
+
+def test_peculio_lote_propostas_invalidas(tabua_sinistro):
+    # Nascimento posterior à assinatura, benefício nulo e prazo além do fim da tábua.
+    premios = peculio_capitalizado_lote(
+        tabua_beneficio=tabua_sinistro,
+        tabua_pagamento=tabua_sinistro,
+        juros=JUROS,
+        data_assinatura=DATA_ASSINATURA,
+        data_nascimento_segurado=[date(2025, 1, 1), date(1990, 1, 1), date(1920, 1, 1)],
+        prazo_cobertura=30,
+        prazo_pagamento=30,
+        beneficio=[1000.0, 0.0, 1000.0],
+    )
+    assert isnan(premios).all()
+
+
+@pytest.mark.parametrize("prazo", (10, 30))
+@pytest.mark.parametrize("prazo_renda,prazo_certo_renda", ((10, 0), (20, 5)))
+def test_aposentadoria_lote_igual_precificar(
+    tabua_sinistro, tabua_concessao, prazo, prazo_renda, prazo_certo_renda
+):
+    argumentos = dict(
+        tabua_acumulacao=tabua_sinistro,
+        tabua_concessao=tabua_concessao,
+        juros=JUROS,
+        data_assinatura=DATA_ASSINATURA,
+        prazo_cobertura=prazo,
+        prazo_pagamento=prazo,
+        prazo_renda=prazo_renda,
+        prazo_certo_renda=prazo_certo_renda,
+        percentual_beneficio=[1.0],
+    )
+    lote = aposentadoria_capitalizado_lote(
+        data_nascimento_segurado=NASCIMENTOS[:3], beneficio=1000.0, **argumentos
+    )
+    por_contrato = [
+        premio_por_contrato(
+            "aposentadoria",
+            data_nascimento_segurado=nascimento,
+            beneficio=1000.0,
+            **argumentos,
+        )
+        for nascimento in NASCIMENTOS[:3]
+    ]
+    assert not isnan(lote).all()
+    assert_allclose(lote, por_contrato, rtol=1e-10)
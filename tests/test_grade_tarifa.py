@@ -0,0 +1,54 @@
+"""As grades de tarifas são gravadas em segundo plano e descartadas quando as premissas mudam."""
+import pytest
+from sqlalchemy import select
+
+from model.armazenamento import aguardar_segundo_plano
+from model.database import db
+from model.grade_tarifa import cache_tarifas, pegar_tarifa, sexos_tarifa
+from model.produto import Formula, Produto
+from model.tarifa import Tarifa
+
+
+@pytest.fixture
+def contexto(app):
+    with app.app_context():
+        cache_tarifas.invalidar()
+        yield
+        aguardar_segundo_plano()
+        db.session.rollback()
+
+
+def tarifa_gravada(produto_id: int, sexo: str, prazo: int):
+    return db.session.execute(
+        select(Tarifa)
+        .where(Tarifa.produtoId == produto_id)
+        .where(Tarifa.sexo == sexo)
+        .where(Tarifa.prazo == prazo)
+    ).scalar_one_or_none()
+
+
+def test_grade_gravada_em_segundo_plano(contexto):
+    grade = pegar_tarifa(db, 1, "M", 10)
+    aguardar_segundo_plano()
+    registro = tarifa_gravada(1, "M", 10)
+    assert registro is not None
+    assert registro.assinatura == grade.assinatura
+
+
+def test_sexos_tarifa(contexto):
+    assert sorted(sexos_tarifa(db, 1)) == ["F", "M"]
+
+
+@pytest.mark.parametrize("modelo", [Produto, Formula])
+def test_alteracao_do_produto_descarta_grades(contexto, modelo):
+    grade = pegar_tarifa(db, 1, "M", 10)
+    assert pegar_tarifa(db, 1, "M", 10) is grade
+
+    objeto = db.session.get(modelo, 1)
+    nome = objeto.nome
+    objeto.nome = f"{nome} alterado"
+    db.session.commit()
+    assert pegar_tarifa(db, 1, "M", 10) is not grade
+
+    db.session.get(modelo, 1).nome = nome
+    db.session.commit()
@@ -0,0 +1,74 @@
+"""calcula_idades deve ter o mesmo resultado que calcula_idade para cada par de datas."""
+from calendar import monthrange
+from datetime import date, timedelta
+from itertools import product
+from random import Random
+
+import pytest
+from numpy import array, datetime64
+from numpy.testing import assert_array_equal
+from tabatu.periodicidade import Periodicidade
+
+from src.idades_prazos import calcula_idade, calcula_idades
+
+PERIODICIDADES = [p for p in Periodicidade if p >= Periodicidade.MENSAL]
+
+
+def datas_aleatorias(gerador: Random, quantidade: int) -> list[date]:
+    inicio = date(1900, 1, 1).toordinal()
+    fim = date(2100, 12, 31).toordinal()
+    return [date.fromordinal(gerador.randint(inicio, fim)) for _ in range(quantidade)]
+
+
+def datas_especiais() -> list[date]:
+    """Fins de mês, 29 de fevereiro e os dias vizinhos, em anos bissextos ou não."""
+    datas = []
+    for ano, mes in product((1900, 2000, 2023, 2024), range(1, 13)):
+        fim_mes = date(ano, mes, monthrange(ano, mes)[1])
+        datas += [fim_mes - timedelta(days=1), fim_mes, fim_mes + timedelta(days=1)]
+    return datas
+
+
+def esperado(origens, calculos, periodicidade) -> list[int]:
+    return [
+        calcula_idade(origem, calculo, periodicidade)
+        for origem, calculo in zip(origens, calculos)
+    ]
+
+
+@pytest.mark.parametrize("periodicidade", PERIODICIDADES)
+def test_pares_aleatorios(periodicidade):
+    gerador = Random(42)
+    origens = datas_aleatorias(gerador, 2000)
+    calculos = datas_aleatorias(gerador, 2000)
+    assert_array_equal(
+        calcula_idades(origens, calculos, periodicidade),
+        esperado(origens, calculos, periodicidade),
+    )
+
+
+@pytest.mark.parametrize("periodicidade", PERIODICIDADES)
+def test_fins_de_mes_e_29_de_fevereiro(periodicidade):
+    pares = list(product(datas_especiais(), repeat=2))
+    origens = [origem for origem, _ in pares]
+    calculos = [calculo for _, calculo in pares]
+    assert_array_equal(
+        calcula_idades(origens, calculos, periodicidade),
+        esperado(origens, calculos, periodicidade),
+    )
+
+
+def test_datetime64_e_broadcasting():
+    origens = datas_especiais()
+    calculo = date(2024, 2, 29)
+    idades = esperado(origens, [calculo] * len(origens), Periodicidade.MENSAL)
+    assert_array_equal(calcula_idades(origens, calculo), idades)
+    assert_array_equal(
+        calcula_idades(array(origens, dtype="datetime64[D]"), datetime64(calculo, "D")), idades
+    )
+
+
+@pytest.mark.parametrize("periodicidade", [p for p in Periodicidade if p < Periodicidade.MENSAL])
+def test_periodicidade_menor_que_mensal(periodicidade):
+    with pytest.raises(ValueError):
+        calcula_idades([date(2000, 1, 1)], [date(2024, 1, 1)], periodicidade)
@@ -0,0 +1,33 @@
+"""A exportação não deve somar os instantâneos de processos que já terminaram."""
+import json
+import os
+import subprocess
+import sys
+
+from src.metricas import ler_instantaneos, limpar_instantaneos
+
+
+def pid_encerrado() -> int:
+    processo = subprocess.Popen([sys.executable, "-c", "pass"])
+    processo.wait()
+    return processo.pid
+
+
+def test_ignora_e_remove_instantaneos_de_processos_encerrados(tmp_path):
+    ativo = tmp_path / f"{os.getppid()}.json"
+    encerrado = tmp_path / f"{pid_encerrado()}.json"
+    ativo.write_text(json.dumps({"ativo": {}}))
+    encerrado.write_text(json.dumps({"encerrado": {}}))
+
+    assert ler_instantaneos(tmp_path) == [{"ativo": {}}]
+    assert ativo.exists()
+    assert not encerrado.exists()
+
+
+def test_limpar_instantaneos(tmp_path):
+    (tmp_path / "1.json").write_text("{}")
+    (tmp_path / "2.tmp").write_text("{}")
+    (tmp_path / "outro.txt").write_text("")
+
+    assert limpar_instantaneos(tmp_path) == 2
+    assert [arquivo.name for arquivo in tmp_path.iterdir()] == ["outro.txt"]
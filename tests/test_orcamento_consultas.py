@@ -0,0 +1,29 @@
+"""Orçamento de instruções SQL das rotas com CONSULTAS_ORCAMENTO_ESTRITO (rotas.consultas)."""
+import pytest
+
+from benchmarks.orcamento_consultas import CASOS, executar_caso
+from model.cache import caches
+from rotas.consultas import OrcamentoConsultasExcedido
+
+
+@pytest.fixture
+def estrito(app, monkeypatch):
+    monkeypatch.setitem(app.config, "CONSULTAS_ORCAMENTO_ESTRITO", True)
+
+
+@pytest.mark.parametrize("caso", CASOS, ids=lambda caso: f"{caso.metodo} {caso.caminho}")
+def test_casos_no_orcamento(app, cliente, estrito, caso):
+    # Cada caso é enviado com os caches vazios e novamente com os caches preenchidos; uma
+    # requisição acima do orçamento levanta OrcamentoConsultasExcedido no cliente de teste.
+    resultado = executar_caso(app, cliente, caso)
+    assert resultado["status"] < 500
+    if resultado["orcamento"] is not None:
+        assert resultado["frio"] <= resultado["orcamento"]
+
+
+def test_excedido_falha(app, cliente, estrito, monkeypatch):
+    monkeypatch.setitem(app.config["CONSULTAS_ORCAMENTO"], "GET /produtos", 0)
+    for cache in list(caches.values()):
+        cache.invalidar()
+    with pytest.raises(OrcamentoConsultasExcedido, match="GET /produtos"):
+        cliente.get("/produtos")
@@ -0,0 +1,161 @@
+"""Rotas de simulação (rotas.simulacao)."""
+import pytest
+from pydantic import ValidationError
+
+from model.simulacao import pegar_formula_simulacao
+from rotas.simulacao import validar_parametros
+from schemas.simulacao import SimulacaoSchema
+
+PECULIO = {
+    "produto_id": 2,
+    "sexo": "M",
+    "data_nascimento": "1990-01-01",
+    "prazo": 10,
+    "beneficio": 1000,
+}
+APOSENTADORIA = {
+    "produto_id": 7,
+    "sexo": "F",
+    "data_nascimento": "1980-05-01",
+    "prazo": 30,
+    "prazo_renda": 30,
+    "prazo_certo_renda": 5,
+    "beneficio": 1000,
+}
+
+
+def test_lote_igual_simulacao_individual(cliente):
+    propostas = [
+        PECULIO,
+        {**PECULIO, "data_nascimento": "1960-07-15", "beneficio": 2500},
+        APOSENTADORIA,
+        {**APOSENTADORIA, "prazo_certo_renda": 0, "data_nascimento": "1995-03-01"},
+        {**PECULIO, "produto_id": 1, "sexo": "F", "prazo": 20},
+    ]
+    resposta = cliente.post("/simular/lote", json=propostas)
+    assert resposta.status_code == 200
+    for proposta, resultado in zip(propostas, resposta.get_json(), strict=True):
+        individual = cliente.post("/simular", data=proposta)
+        assert individual.status_code == 200
+        assert resultado == {
+            "premio": pytest.approx(individual.get_json()["premio"], rel=1e-10),
+            "erro": None,
+        }
+
+
+def test_lote_erros_por_proposta(cliente):
+    propostas = [
+        PECULIO,
+        {**PECULIO, "produto_id": 99},
+        {**PECULIO, "prazo": 13},
+        {**PECULIO, "beneficio": 0},
+    ]
+    resultado = cliente.post("/simular/lote", json=propostas).get_json()
+    assert resultado[0]["premio"] > 0
+    assert resultado[1:] == [
+        {"premio": None, "erro": "Produto 99 com prazo 10 não encontrado."},
+        {"premio": None, "erro": "Produto 2 com prazo 13 não encontrado."},
+        {"premio": None, "erro": "Parâmetros inválidos para o produto 2."},
+    ]
+
+
+@pytest.mark.parametrize("corpo", [{"produto_id": 1}, [{"produto_id": "x"}]])
+def test_lote_invalido(cliente, corpo):
+    assert cliente.post("/simular/lote", json=corpo).status_code == 422
+
+
+@pytest.mark.parametrize(
+    "formula,proposta", [("peculio", PECULIO), ("aposentadoria", APOSENTADORIA)]
+)
+def test_simular_despacha_pela_formula(cliente, formula, proposta):
+    resposta = cliente.post("/simular", data=proposta)
+    assert resposta.status_code == 200
+    assert resposta.get_json() == cliente.post(f"/simular/{formula}", data=proposta).get_json()
+
+
+def test_simular_produto_inexistente(cliente):
+    resposta = cliente.post("/simular", data={**PECULIO, "produto_id": 99})
+    assert resposta.status_code == 404
+    assert resposta.get_json() == {"mesage": "Produto 99 não encontrado."}
+
+
+def test_simular_parametros_da_formula(cliente):
+    # A aposentadoria exige o prazo de renda, que é opcional no esquema genérico.
+    sem_renda = {
+        chave: valor for chave, valor in APOSENTADORIA.items() if chave != "prazo_renda"
+    }
+    resposta = cliente.post("/simular", data=sem_renda)
+    especifica = cliente.post("/simular/aposentadoria", data=sem_renda)
+    assert resposta.status_code == especifica.status_code == 422
+    assert resposta.get_json() == especifica.get_json()
+    assert cliente.post("/simular", data={**PECULIO, "prazo": "x"}).status_code == 422
+
+
+
+def curva(proposta: dict) -> dict:
+    campos = ("produto_id", "sexo", "data_nascimento", "beneficio")
+    return {chave: proposta[chave] for chave in campos}
+
+
+@pytest.mark.parametrize(
+    "proposta", [{**PECULIO, "produto_id": 1}, APOSENTADORIA], ids=["peculio", "aposentadoria"]
+)
+def test_curva_igual_simulacao_por_prazo(cliente, proposta):
+    resposta = cliente.post("/simular/curva", data=curva(proposta))
+    assert resposta.status_code == 200
+    resultado = resposta.get_json()
+    assert any(item["premio"] is not None for item in resultado)
+    for item in resultado:
+        # Pecúlios retornam os prazos de renda vazios, que não são enviados a /simular.
+        prazos = {
+            chave: valor
+            for chave, valor in item.items()
+            if chave != "premio" and valor is not None
+        }
+        individual = cliente.post("/simular", data={**proposta, **prazos})
+        if item["premio"] is None:
+            assert individual.status_code == 400
+        else:
+            assert individual.status_code == 200
+            assert item["premio"] == pytest.approx(individual.get_json()["premio"], rel=1e-10)
+    assert resultado == sorted(
+        resultado,
+        key=lambda item: (item["prazo"], item["prazo_renda"] or 0, item["prazo_certo_renda"] or 0),
+    )
+
+
+def test_curva_produto_inexistente(cliente):
+    resposta = cliente.post("/simular/curva", data=curva({**PECULIO, "produto_id": 99}))
+    assert resposta.status_code == 404
+    assert resposta.get_json() == {"mesage": "Produto 99 não encontrado."}
+
+
+@pytest.mark.parametrize("campo,valor", [("beneficio", "x"), ("data_nascimento", "1990-13-01")])
+def test_curva_invalida(cliente, campo, valor):
+    resposta = cliente.post("/simular/curva", data={**curva(PECULIO), campo: valor})
+    assert resposta.status_code == 422
+
+
+def test_curva_sexo_indisponivel(cliente):
+    resposta = cliente.post("/simular/curva", data=curva({**PECULIO, "sexo": "X"}))
+    individual = cliente.post("/simular", data={**PECULIO, "sexo": "X"})
+    assert resposta.status_code == individual.status_code == 400
+    assert resposta.get_json() == individual.get_json()
+    assert resposta.get_json() == {"mesage": "Sexo X não disponível para o produto 2."}
+
+
+@pytest.mark.parametrize(
+    "nome_formula,proposta", [("peculio", PECULIO), ("aposentadoria", APOSENTADORIA)]
+)
+def test_validar_parametros(app, nome_formula, proposta):
+    formula = pegar_formula_simulacao(nome_formula)
+    parametros = validar_parametros(formula, SimulacaoSchema.model_validate(proposta))
+    assert isinstance(parametros, formula.esquema)
+    assert parametros.model_dump() == formula.esquema.model_validate(proposta).model_dump()
+
+
+def test_validar_parametros_campo_ausente(app):
+    # Sem o prazo de renda, a aposentadoria falha em vez de usar o padrão do seu esquema.
+    form = SimulacaoSchema.model_validate({**APOSENTADORIA, "prazo_renda": None})
+    with pytest.raises(ValidationError, match="prazo_renda"):
+        validar_parametros(pegar_formula_simulacao("aposentadoria"), form)
@@ -0,0 +1,72 @@
+"""As taxas empacotadas e a tabela taxa são iguais após o commit que altera qualquer uma delas."""
+import pytest
+from numpy.testing import assert_array_equal
+from sqlalchemy import select, update
+
+from model.database import db
+from model.tabua import Tabua, Taxa
+from model.tabua_empacotada import desempacotar_taxas, empacotar_taxas
+from tests.conftest import TABUA_SINISTRO
+
+
+@pytest.fixture
+def contexto(app):
+    with app.app_context():
+        yield
+        db.session.rollback()
+
+
+def linhas(tabua_id: int) -> list[float]:
+    return db.session.execute(
+        select(Taxa.taxa).where(Taxa.tabuaId == tabua_id).order_by(Taxa.idade)
+    ).scalars().all()
+
+
+def empacotadas(tabua_id: int) -> list[float]:
+    tabua = db.session.execute(
+        select(Tabua.taxas, Tabua.dtypeTaxas, Tabua.versaoTaxas).where(Tabua.id == tabua_id)
+    ).one()
+    assert tabua.taxas is not None
+    return desempacotar_taxas(*tabua).tolist()
+
+
+def test_empacotar_e_desempacotar():
+    taxas = [0.001, 0.5, 1.0]
+    assert_array_equal(desempacotar_taxas(empacotar_taxas(taxas), "<f8", 1), taxas)
+    with pytest.raises(ValueError):
+        desempacotar_taxas(empacotar_taxas(taxas), "<f8", 2)
+
+
+def test_alteracao_de_taxa_reempacota_no_mesmo_commit(contexto):
+    originais = linhas(TABUA_SINISTRO)
+    taxa = db.session.get(Taxa, (TABUA_SINISTRO, 30))
+    taxa.taxa = 0.5
+    db.session.commit()
+    assert empacotadas(TABUA_SINISTRO)[30] == 0.5
+
+    db.session.execute(
+        update(Taxa).where(Taxa.tabuaId == TABUA_SINISTRO).where(Taxa.idade == 30)
+        .values(taxa=originais[30])
+    )
+    db.session.commit()
+    assert empacotadas(TABUA_SINISTRO) == originais
+
+
+def test_alteracao_das_taxas_empacotadas_regrava_linhas(contexto):
+    originais = linhas(TABUA_SINISTRO)
+    alteradas = [taxa / 2 for taxa in originais[:-1]] + [1.0]
+    db.session.get(Tabua, TABUA_SINISTRO).taxas = empacotar_taxas(alteradas)
+    db.session.commit()
+    assert linhas(TABUA_SINISTRO) == alteradas
+
+    db.session.get(Tabua, TABUA_SINISTRO).taxas = empacotar_taxas(originais)
+    db.session.commit()
+    assert linhas(TABUA_SINISTRO) == originais
+
+
+def test_rollback_mantem_taxas(contexto):
+    originais = linhas(TABUA_SINISTRO)
+    db.session.get(Taxa, (TABUA_SINISTRO, 30)).taxa = 0.5
+    db.session.flush()
+    db.session.rollback()
+    assert empacotadas(TABUA_SINISTRO) == linhas(TABUA_SINISTRO) == originais
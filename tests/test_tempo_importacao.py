@@ -0,0 +1,23 @@
+"""A criação da aplicação com a configuração padrão não importa os módulos de cálculo."""
+from benchmarks.tempo_importacao import (
+    ORCAMENTO_MS,
+    medir_importacao,
+    modulos_adiados_importados,
+)
+
+
+def test_tempo_importacao(app):
+    # Banco de dados já existente, criado pela fixture app, com o restante da configuração
+    # padrão, inclusive INICIALIZAR_BANCO.
+    config = {
+        chave: app.config[chave]
+        for chave in (
+            "SQLALCHEMY_DATABASE_URI",
+            "ARMAZEM_TABUAS",
+            "METRICAS_DIRETORIO",
+            "CACHES_DIRETORIO",
+        )
+    }
+    tempos, modulos = medir_importacao(config)
+    assert modulos_adiados_importados(modulos) == []
+    assert sum(tempos.values()) / 1000 < ORCAMENTO_MS